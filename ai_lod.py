@@ -0,0 +1,123 @@
+"""
+Niveaux de détail de l'IA des ennemis : pleine cadence à l'écran et à portée de
+détection, marche aléatoire grossière un peu plus loin, gel complet au-delà avec
+avance rapide statistique quand l'ennemi revient à portée.
+"""
+
+import math
+import random
+from collections import deque
+from config_new import (
+    AI_LOD_VIEW_MARGIN, AI_LOD_COARSE_DISTANCE, AI_LOD_COARSE_FACTOR,
+    AI_LOD_FROZEN_CHECK, AI_LOD_SNAP_RADIUS, STEP_DIRECTIONS
+)
+
+TIER_FULL = "full"
+TIER_COARSE = "coarse"
+TIER_FROZEN = "frozen"
+
+
+class AILevelOfDetail:
+    """Choisit le niveau de simulation de chaque ennemi à son réveil et retourne son prochain délai."""
+
+    def __init__(self, view_margin=AI_LOD_VIEW_MARGIN, coarse_distance=AI_LOD_COARSE_DISTANCE,
+                 coarse_factor=AI_LOD_COARSE_FACTOR, frozen_check=AI_LOD_FROZEN_CHECK,
+                 snap_radius=AI_LOD_SNAP_RADIUS):
+        self.view_margin = view_margin
+        self.coarse_distance = coarse_distance
+        self.coarse_factor = coarse_factor
+        self.frozen_check = frozen_check
+        self.snap_radius = snap_radius
+        self.tiers = {}         # ennemi -> niveau courant
+        self.frozen_since = {}  # ennemi gelé -> tick du gel
+        self.stats = {TIER_FULL: 0, TIER_COARSE: 0, TIER_FROZEN: 0, "fast_forwards": 0}
+
+    def forget(self, enemy):
+        """Oublie un ennemi retiré du jeu."""
+        self.tiers.pop(enemy, None)
+        self.frozen_since.pop(enemy, None)
+
+    def get_tier(self, enemy):
+        """Niveau courant de l'ennemi (pleine cadence tant qu'il n'a pas été classé)."""
+        return self.tiers.get(enemy, TIER_FULL)
+
+    def classify(self, enemy, player_pos, visible_range):
+        """Niveau de simulation selon la distance à la zone visible et la portée de détection."""
+        ex, ey = enemy.grid_x, enemy.grid_y
+        px, py = player_pos
+        if enemy.detection_range_base > 0 and abs(ex - px) + abs(ey - py) <= enemy.detection_range_base + self.view_margin:
+            return TIER_FULL
+        if visible_range is None:
+            distance = abs(ex - px) + abs(ey - py)
+        else:
+            x0, y0, x1, y1 = visible_range
+            distance = max(x0 - ex, ex - (x1 - 1), y0 - ey, ey - (y1 - 1), 0)
+        if distance <= self.view_margin:
+            return TIER_FULL
+        if distance <= self.coarse_distance:
+            return TIER_COARSE
+        return TIER_FROZEN
+
+    def wake(self, enemy, player_pos, maze, visible_range, tick, influence=None, planner=None):
+        """Fait agir l'ennemi au niveau adapté ; retourne le délai avant son prochain réveil."""
+        tier = self.classify(enemy, player_pos, visible_range)
+        previous = self.tiers.get(enemy, TIER_FULL)
+        if previous == TIER_FROZEN and tier != TIER_FROZEN:
+            self.fast_forward(enemy, maze, tick - self.frozen_since.pop(enemy, tick))
+        self.tiers[enemy] = tier
+        self.stats[tier] += 1
+
+        if tier == TIER_FULL:
+            enemy.act(player_pos, maze, influence, planner)
+            return enemy.get_action_interval()
+        if tier == TIER_COARSE:
+            self.random_walk(enemy, maze, self.coarse_factor)
+            return enemy.get_action_interval() * self.coarse_factor
+        if previous != TIER_FROZEN:
+            self.frozen_since[enemy] = tick
+        return self.frozen_check
+
+    def random_walk(self, enemy, maze, steps):
+        """Marche aléatoire de plusieurs pas regroupés, sans test de visibilité."""
+        x, y = enemy.grid_x, enemy.grid_y
+        for _ in range(steps):
+            neighbors = [(x + dx, y + dy) for dx, dy in STEP_DIRECTIONS if maze.is_walkable(x + dx, y + dy)]
+            if not neighbors:
+                break
+            x, y = random.choice(neighbors)
+        enemy.grid_x, enemy.grid_y = x, y
+
+    def fast_forward(self, enemy, maze, elapsed_ticks):
+        """
+        Avance rapide d'un ennemi dégelé : déplacement gaussien équivalent à la marche
+        aléatoire manquée, ramené sur la case atteignable la plus proche (BFS borné).
+        """
+        steps = elapsed_ticks // max(1, enemy.get_action_interval())
+        if steps <= 0:
+            return
+        self.stats["fast_forwards"] += 1
+        # Marche aléatoire sur la grille : variance de n/2 par axe
+        sigma = math.sqrt(steps / 2)
+        target_x = enemy.grid_x + random.gauss(0, sigma)
+        target_y = enemy.grid_y + random.gauss(0, sigma)
+        enemy.grid_x, enemy.grid_y = self.snap(maze, (enemy.grid_x, enemy.grid_y), (target_x, target_y),
+                                               min(steps, self.snap_radius))
+
+    def snap(self, maze, start, target, radius):
+        """Case atteignable depuis `start` en au plus `radius` pas, la plus proche de `target`."""
+        best, best_distance = start, (start[0] - target[0]) ** 2 + (start[1] - target[1]) ** 2
+        visited = {start}
+        queue = deque([(start, 0)])
+        while queue:
+            (x, y), depth = queue.popleft()
+            if depth == radius:
+                continue
+            for dx, dy in STEP_DIRECTIONS:
+                cell = (x + dx, y + dy)
+                if cell not in visited and maze.is_walkable(cell[0], cell[1]):
+                    visited.add(cell)
+                    distance = (cell[0] - target[0]) ** 2 + (cell[1] - target[1]) ** 2
+                    if distance < best_distance:
+                        best, best_distance = cell, distance
+                    queue.append((cell, depth + 1))
+        return best
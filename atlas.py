@@ -0,0 +1,331 @@
+"""
+Atlas de sprites : regroupe les tiles utilisées dans une seule image par taille
+de case, avec un index de rectangles et un cache disque déjà redimensionné.
+
+Au démarrage à froid, le jeu charge un seul fichier PNG (aucun redimensionnement),
+ce qui compte surtout pour la version web (pygbag) où chaque fichier coûte une requête.
+
+Un atlas pré-construit est livré dans assets/atlas (python atlas.py --ship) : son
+index porte l'empreinte du contenu des sources et il est utilisé sans relire les PNG
+(seules leurs tailles sont comparées), là où les dates des fichiers copiés ne valent rien.
+"""
+
+import glob
+import hashlib
+import json
+import math
+import os
+import pygame
+from config_new import (
+    ASSET_MAPPING, ATLAS_DIR, CACHE_DIR, COLORS, get_asset_path, get_fallback_color
+)
+
+# À incrémenter si le format de l'atlas ou de l'index change
+ATLAS_FORMAT_VERSION = 1
+
+# Atlas déjà chargés dans ce processus (taille de case -> SpriteAtlas)
+_loaded_atlases = {}
+
+
+def get_source_signature():
+    """
+    Retourne la signature "légère" des sources (taille et date de chaque fichier).
+    Ne lit aucun fichier : sert à valider le cache sans ouvrir les PNG.
+    """
+    signature = {}
+    for key in sorted(ASSET_MAPPING):
+        filename = ASSET_MAPPING[key]
+        path = get_asset_path(key)
+        try:
+            stat = os.stat(path)
+            signature[filename] = [stat.st_size, stat.st_mtime_ns]
+        except OSError:
+            signature[filename] = None
+    return signature
+
+
+def get_source_sizes(signature):
+    """Tailles des sources d'une signature (stables quand les fichiers sont copiés, contrairement aux dates)."""
+    return {filename: entry[0] if entry else None for filename, entry in signature.items()}
+
+
+def compute_source_hash():
+    """
+    Empreinte du contenu des sources de l'atlas (mapping + octets des PNG utilisés).
+    Stable d'une machine à l'autre (contrairement aux dates de fichiers).
+    """
+    digest = hashlib.sha1()
+    digest.update(f"atlas-v{ATLAS_FORMAT_VERSION};".encode())
+    for key in sorted(ASSET_MAPPING):
+        filename = ASSET_MAPPING[key]
+        digest.update(f"{key}={filename};".encode())
+        path = get_asset_path(key)
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(b"<absent>")
+    return digest.hexdigest()[:16]
+
+
+def compute_layout(filenames, tile_size):
+    """
+    Calcule la disposition en grille des tiles dans l'atlas.
+    Retourne ((largeur, hauteur), {filename: (x, y, w, h)}).
+    """
+    count = max(1, len(filenames))
+    columns = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / columns)
+    rects = {}
+    for index, filename in enumerate(filenames):
+        col = index % columns
+        row = index // columns
+        rects[filename] = (col * tile_size, row * tile_size, tile_size, tile_size)
+    return (columns * tile_size, rows * tile_size), rects
+
+
+class SpriteAtlas:
+    """Image unique contenant toutes les tiles utilisées, à une taille de case donnée."""
+
+    def __init__(self, tile_size, cache_dir=CACHE_DIR, shipped_dir=ATLAS_DIR):
+        self.tile_size = tile_size
+        self.cache_dir = cache_dir
+        self.shipped_dir = shipped_dir  # Atlas livré avec le jeu (None : aucun)
+        self.surface = None
+        self.rects = {}        # clé d'asset -> pygame.Rect dans l'atlas
+        self.source_hash = None
+        self.from_cache = False
+
+    # ------------------------------------------------------------------
+    # Chemins du cache
+    # ------------------------------------------------------------------
+
+    def get_index_path(self, directory=None):
+        """Index JSON de l'atlas pour cette taille de case (dans le cache par défaut)."""
+        return os.path.join(directory or self.cache_dir, f"atlas_{self.tile_size}.json")
+
+    def get_image_path(self, source_hash, directory=None):
+        """Image de l'atlas, nommée par l'empreinte des sources et la taille."""
+        return os.path.join(directory or self.cache_dir, f"atlas_{source_hash}_{self.tile_size}.png")
+
+    # ------------------------------------------------------------------
+    # Chargement
+    # ------------------------------------------------------------------
+
+    def load(self):
+        """Charge l'atlas depuis le cache disque, ou le construit puis le sauvegarde."""
+        for _ in self.load_steps():
+            pass
+        return self
+
+    def load_steps(self):
+        """Comme load(), mais rend la main après chaque tile construite (chargement de fond)."""
+        if self.load_from_cache():
+            self.from_cache = True
+            return
+        yield from self.build_steps()
+        self.save_to_cache()
+        self.from_cache = False
+
+    def load_from_cache(self):
+        """
+        Tente de charger l'atlas, du moins coûteux au plus coûteux : cache local validé
+        par la date et la taille des sources, atlas livré validé par les tailles seules
+        (son empreinte fait foi, aucun PNG source n'est lu), puis cache local validé par
+        le contenu des sources. Retourne True si réussi.
+        """
+        signature = get_source_signature()
+        index = self.read_index(self.cache_dir)
+        if index is not None and index.get("sources") == signature and self.load_image(self.cache_dir, index):
+            return True
+        if self.shipped_dir is not None:
+            shipped = self.read_index(self.shipped_dir)
+            if (shipped is not None and get_source_sizes(shipped.get("sources", {})) == get_source_sizes(signature)
+                    and self.load_image(self.shipped_dir, shipped)):
+                return True
+        # Cache local dont les dates ne correspondent plus (assets copiés) : contenu relu
+        return (index is not None and index.get("source_hash") == compute_source_hash()
+                and self.load_image(self.cache_dir, index))
+
+    def read_index(self, directory):
+        """Index de l'atlas d'un dossier s'il existe et correspond au format et à la taille, sinon None."""
+        index_path = self.get_index_path(directory)
+        if not os.path.exists(index_path):
+            return None
+        try:
+            with open(index_path, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f">>> Atlas: Index illisible ({e}), ignoré")
+            return None
+        if index.get("version") != ATLAS_FORMAT_VERSION or index.get("tile_size") != self.tile_size:
+            return None
+        return index
+
+    def load_image(self, directory, index):
+        """Charge l'image désignée par un index ; retourne True si réussi."""
+        image_path = self.get_image_path(index["source_hash"], directory)
+        if not os.path.exists(image_path):
+            return False
+        try:
+            surface = pygame.image.load(image_path)
+        except pygame.error as e:
+            print(f">>> Atlas: Image de cache illisible ({e}), reconstruction")
+            return False
+
+        self.surface = self.convert_surface(surface)
+        self.source_hash = index["source_hash"]
+        self.rects = {key: pygame.Rect(rect) for key, rect in index["rects"].items()}
+        return True
+
+    def build(self):
+        """Construit l'atlas depuis les PNG sources (chargement + redimensionnement)."""
+        for _ in self.build_steps():
+            pass
+
+    def build_steps(self):
+        """Construction de l'atlas, une étape (yield) par tile chargée."""
+        size = self.tile_size
+        filenames = sorted(set(ASSET_MAPPING.values()))
+        atlas_size, file_rects = compute_layout(filenames, size)
+        atlas = pygame.Surface(atlas_size, pygame.SRCALPHA)
+        atlas.fill((0, 0, 0, 0))
+
+        packed = set()
+        for key, filename in sorted(ASSET_MAPPING.items()):
+            rect = pygame.Rect(file_rects[filename])
+            self.rects[key] = rect
+            if filename in packed:
+                continue  # Tile partagée par plusieurs clés : déjà dans l'atlas
+            packed.add(filename)
+            path = get_asset_path(key)
+            tile = None
+            if path and os.path.exists(path):
+                try:
+                    tile = pygame.image.load(path)
+                    # Redimensionner de 16x16 à la taille de case avec NEAREST neighbor
+                    tile = pygame.transform.scale(tile, (size, size))
+                except pygame.error as e:
+                    print(f"  ✗ {filename} (erreur: {e})")
+                    tile = None
+            else:
+                print(f"  ✗ {filename} (fichier non trouvé)")
+            if tile is None:
+                tile = self.create_fallback_tile(key)
+            atlas.blit(tile, rect)
+            yield key
+
+        self.surface = self.convert_surface(atlas)
+        self.source_hash = compute_source_hash()
+
+    def create_fallback_tile(self, key):
+        """Crée une tile de fallback (carré coloré) pour un asset manquant."""
+        surface = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
+        surface.fill(get_fallback_color(key))
+        pygame.draw.rect(surface, COLORS["black"], (0, 0, self.tile_size, self.tile_size), 2)
+        return surface
+
+    def save_to_cache(self, directory=None):
+        """
+        Écrit l'image et l'index de l'atlas de manière atomique (fichier temporaire + rename)
+        dans le cache (ou `directory`), et retire les images d'empreintes périmées.
+        """
+        directory = directory or self.cache_dir
+        try:
+            os.makedirs(directory, exist_ok=True)
+            image_path = self.get_image_path(self.source_hash, directory)
+            tmp_image = image_path[:-len(".png")] + ".tmp.png"
+            pygame.image.save(self.surface, tmp_image)
+            os.replace(tmp_image, image_path)
+
+            index = {
+                "version": ATLAS_FORMAT_VERSION,
+                "tile_size": self.tile_size,
+                "source_hash": self.source_hash,
+                "sources": get_source_signature(),
+                "rects": {key: list(rect) for key, rect in self.rects.items()},
+            }
+            index_path = self.get_index_path(directory)
+            tmp_index = index_path + ".tmp"
+            with open(tmp_index, "w") as f:
+                json.dump(index, f, indent=2)
+            os.replace(tmp_index, index_path)
+            for stale in glob.glob(os.path.join(directory, f"atlas_*_{self.tile_size}.png")):
+                if stale != image_path:
+                    os.remove(stale)
+        except (OSError, pygame.error) as e:
+            # Système de fichiers en lecture seule (ex. navigateur) : on garde l'atlas en mémoire
+            print(f">>> Atlas: Impossible d'écrire le cache ({e})")
+
+    @staticmethod
+    def convert_surface(surface):
+        """Convertit au format de l'écran si un affichage est ouvert."""
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            return surface.convert_alpha()
+        return surface
+
+    # ------------------------------------------------------------------
+    # Accès aux sprites
+    # ------------------------------------------------------------------
+
+    def get_sprite(self, key):
+        """Retourne le sprite d'une clé (sous-surface de l'atlas, sans copie)."""
+        rect = self.rects.get(key)
+        if rect is None:
+            return None
+        return self.surface.subsurface(rect)
+
+    def get_sprites(self):
+        """Retourne le dictionnaire {clé: sprite} attendu par le Renderer."""
+        return {key: self.surface.subsurface(rect) for key, rect in self.rects.items()}
+
+    def __repr__(self):
+        return f"SpriteAtlas({self.tile_size}px, {len(self.rects)} sprites, cache={self.from_cache})"
+
+
+def load_atlas(tile_size):
+    """Retourne l'atlas pour une taille de case (chargé une seule fois par processus)."""
+    steps = load_atlas_steps(tile_size)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+
+def load_atlas_steps(tile_size):
+    """
+    Générateur de chargement de l'atlas par étapes (une par tile si le cache disque
+    est absent) ; sa valeur de retour est l'atlas (`atlas = yield from ...`).
+    """
+    atlas = _loaded_atlases.get(tile_size)
+    if atlas is None:
+        atlas = SpriteAtlas(tile_size)
+        yield from atlas.load_steps()
+        _loaded_atlases[tile_size] = atlas
+    return atlas
+
+
+def clear_loaded_atlases():
+    """Oublie les atlas chargés (ex. après un changement de mode d'affichage)."""
+    _loaded_atlases.clear()
+
+
+if __name__ == "__main__":
+    # Pré-construction du cache local, ou avec --ship de l'atlas livré dans assets/atlas
+    # (à relancer et committer après tout changement des tiles : le build web l'embarque)
+    import sys
+    from config_new import TILE_SIZE
+
+    ship = "--ship" in sys.argv[1:]
+    sizes = [int(arg) for arg in sys.argv[1:] if arg != "--ship"] or [TILE_SIZE]
+    pygame.init()
+    for tile_size in sizes:
+        if ship:
+            atlas = SpriteAtlas(tile_size, cache_dir=ATLAS_DIR, shipped_dir=None)
+            atlas.build()
+            atlas.save_to_cache()
+        else:
+            atlas = SpriteAtlas(tile_size).load()
+        print(f"{atlas} -> {atlas.get_image_path(atlas.source_hash)}")
+    pygame.quit()
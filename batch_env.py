@@ -0,0 +1,304 @@
+"""
+Environnement par lots pour l'entraînement d'agents : N parties menées de front
+dans des tableaux NumPy empilés (une ligne par partie), sans pygame ni objets
+Player/Enemy/Item. Un pas applique N actions d'un coup : validation des
+déplacements contre les masques de cases traversables, collisions, récompenses,
+puis BOT_MOVE_FRAMES frames de jeu (même cadence que le tournoi de bots).
+
+Les règles sont celles de Player.move, Game.check_collisions et
+check_win_condition : dégâts et invincibilité (PLAYER_INVINCIBILITY_DURATION),
+knockback qui bloque les déplacements, potions (POTION_ODDS, gel des ennemis),
+coffres (CHEST_ODDS), victoire avec toutes les potions sur la sortie. Les ennemis
+suivent les intervalles de l'EnemyScheduler ; un stalker qui voit le joueur
+avance d'un pas glouton (get_greedy_step), sinon tout ennemi patrouille au hasard.
+Le plus court chemin JPS, les cartes d'influence et la poursuite coopérative ne
+sont pas reproduits (approximés par ces deux règles).
+
+Les labyrinthes viennent d'une réserve générée une fois (generate_valid_maze) ;
+une partie terminée repart aussitôt sur un labyrinthe tiré dans la réserve.
+
+Actions : 0 haut, 1 bas, 2 gauche, 3 droite (ordre de STEP_DIRECTIONS), 4 attendre.
+"""
+
+import numpy as np
+
+from config_new import (
+    Difficulty, CellType, DIFFICULTY_SETTINGS, FPS, BOT_MOVE_FRAMES, BOT_MAX_SECONDS,
+    PLAYER_MAX_HEALTH, PLAYER_INVINCIBILITY_DURATION, PLAYER_KNOCKBACK_DURATION,
+    POTION_FREEZE_DURATION_MS, EnemyType, ItemType, STEP_DIRECTIONS
+)
+from entities_new import Enemy, CHEST_ODDS, POTION_ODDS
+from maze_new import generate_valid_maze
+
+ACTION_WAIT = len(STEP_DIRECTIONS)
+
+# Issues d'une partie (info["outcome"] des parties terminées pendant le pas)
+OUTCOME_RUNNING = 0
+OUTCOME_WIN = 1
+OUTCOME_DEATH = 2
+OUTCOME_TIMEOUT = 3
+
+# Récompenses
+REWARD_STEP = -0.01
+REWARD_POTION = 1.0
+REWARD_DAMAGE = -1.0
+REWARD_WIN = 10.0
+REWARD_DEATH = -5.0
+
+# Tirages partagés avec le jeu : seuils cumulés et indices des issues utiles
+CHEST_THRESHOLDS = np.array([threshold for threshold, _ in CHEST_ODDS])
+CHEST_DAMAGE = [outcome for _, outcome in CHEST_ODDS].index(("trap", "damage"))
+CHEST_HEALTH = [outcome for _, outcome in CHEST_ODDS].index(("bonus", "health"))
+POTION_THRESHOLDS = np.array([threshold for threshold, _ in POTION_ODDS])
+POTION_FREEZE = [kind for _, kind in POTION_ODDS].index(ItemType.POTION_FREEZE)
+
+FAR = 1 << 20  # Distance des voisins bloqués (jamais choisis par le pas glouton)
+
+
+def padded_cells(positions, count, stride):
+    """Cases aplaties (bordure comprise) d'une liste de positions, complétée par des 0 invalides."""
+    cells = np.zeros(count, dtype=np.int32)
+    valid = np.zeros(count, dtype=bool)
+    for i, (x, y) in enumerate(positions):
+        cells[i] = (x + 1) * stride + y + 1
+        valid[i] = True
+    return cells, valid
+
+
+class BatchEnv:
+    """N parties d'une même difficulté dans des tableaux NumPy, avancées par pas vectorisés."""
+
+    def __init__(self, n, difficulty=Difficulty.MEDIUM, pool_size=32, seed=None, mazes=None,
+                 max_steps=None, frames_per_step=BOT_MOVE_FRAMES):
+        self.n = n
+        self.difficulty = difficulty
+        self.rng = np.random.default_rng(seed)
+        self.frames_per_step = frames_per_step
+        self.frame_ms = 1000 // FPS
+        self.max_steps = max_steps or BOT_MAX_SECONDS * FPS // frames_per_step
+        settings = DIFFICULTY_SETTINGS[difficulty]
+        self.total_potions = settings["potions"]  # Comme Player : objectif fixé par la difficulté
+
+        # Règles des ennemis lues sur un Enemy de la difficulté (intervalles du scheduler)
+        probe = Enemy(0, 0, EnemyType.MONSTER, difficulty)
+        self.enemy_interval = probe.get_action_interval()
+        self.enemy_first_delay = probe.get_first_action_delay()
+        self.stalker = probe.is_stalker()
+        self.detection_range = probe.detection_range_base
+        self.night_blindness = probe.night_blindness
+
+        if mazes is None:
+            seeds = self.rng.integers(1 << 32, size=pool_size)
+            mazes = [generate_valid_maze(difficulty, seed=int(maze_seed)) for maze_seed in seeds]
+        self.build_pool(mazes)
+
+        # État des parties (une ligne par partie)
+        self.maze_ids = np.zeros(n, dtype=np.int32)
+        self.base = np.zeros(n, dtype=np.int32)       # Début du labyrinthe dans self.walkable
+        self.pos = np.zeros(n, dtype=np.int32)        # Case aplatie du joueur
+        self.health = np.zeros(n, dtype=np.int32)
+        self.invincible = np.zeros(n, dtype=np.int32)  # Frames d'invincibilité restantes
+        self.knockback = np.zeros(n, dtype=np.int32)   # Frames de knockback restantes
+        self.ticks = np.zeros(n, dtype=np.int64)       # Horloge de la partie (ms)
+        self.freeze_until = np.zeros(n, dtype=np.int64)
+        self.steps = np.zeros(n, dtype=np.int32)
+        self.potions = np.zeros(n, dtype=np.int32)
+        self.moves = np.zeros(n, dtype=np.int32)
+        self.damage = np.zeros(n, dtype=np.int32)
+        self.potion_cells = np.zeros((n, self.max_potions), dtype=np.int32)
+        self.potion_alive = np.zeros((n, self.max_potions), dtype=bool)
+        self.potion_kind = np.zeros((n, self.max_potions), dtype=np.int32)  # Indice dans POTION_ODDS
+        self.chest_cells = np.zeros((n, self.max_chests), dtype=np.int32)
+        self.chest_alive = np.zeros((n, self.max_chests), dtype=bool)
+        self.enemy_cells = np.zeros((n, self.max_enemies), dtype=np.int32)
+        self.enemy_valid = np.zeros((n, self.max_enemies), dtype=bool)
+        self.enemy_timer = np.zeros((n, self.max_enemies), dtype=np.int32)
+        self.reset()
+        print(f">>> BatchEnv: {n} parties {difficulty.name}, réserve de {len(mazes)} labyrinthes "
+              f"{self.width}x{self.height}")
+
+    def build_pool(self, mazes):
+        """Empile les labyrinthes : cases traversables avec une bordure de murs, objets complétés."""
+        self.width, self.height = mazes[0].width, mazes[0].height
+        self.stride = self.height + 2  # Case aplatie (x, y) -> (x + 1) * stride + y + 1
+        self.maze_cells = (self.width + 2) * self.stride
+        self.offsets = np.array([dx * self.stride + dy for dx, dy in STEP_DIRECTIONS] + [0], dtype=np.int32)
+        walkable = np.zeros((len(mazes), self.width + 2, self.stride), dtype=bool)
+        for i, maze in enumerate(mazes):
+            walkable[i, 1:-1, 1:-1] = maze.get_type_array() != CellType.WALL.value
+        self.walkable = walkable.reshape(-1)
+        self.walkable_grid = walkable[:, 1:-1, 1:-1]  # Vue [labyrinthe, x, y] pour les agents
+
+        self.max_potions = max(1, max(len(maze.potions) for maze in mazes))
+        self.max_chests = max(1, max(len(maze.chests) for maze in mazes))
+        self.max_enemies = max(1, max(len(maze.enemy_positions) for maze in mazes))
+        layouts = []
+        for maze in mazes:
+            layouts.append((
+                padded_cells([maze.start_pos], 1, self.stride)[0][0],
+                padded_cells([maze.exit_pos], 1, self.stride)[0][0],
+                padded_cells(maze.potions, self.max_potions, self.stride),
+                padded_cells(maze.chests, self.max_chests, self.stride),
+                padded_cells(maze.enemy_positions, self.max_enemies, self.stride),
+            ))
+        self.pool_start = np.array([layout[0] for layout in layouts], dtype=np.int32)
+        self.pool_exit = np.array([layout[1] for layout in layouts], dtype=np.int32)
+        self.pool_potions, self.pool_potion_valid = (np.array(a) for a in zip(*(layout[2] for layout in layouts)))
+        self.pool_chests, self.pool_chest_valid = (np.array(a) for a in zip(*(layout[3] for layout in layouts)))
+        self.pool_enemies, self.pool_enemy_valid = (np.array(a) for a in zip(*(layout[4] for layout in layouts)))
+        self.pool_size = len(mazes)
+
+    def reset(self, indices=None):
+        """(Re)démarre les parties `indices` (toutes par défaut) sur des labyrinthes de la réserve."""
+        if indices is None:
+            indices = np.arange(self.n)
+        count = len(indices)
+        if count == 0:
+            return self.observe()
+        mazes = self.rng.integers(self.pool_size, size=count)
+        self.maze_ids[indices] = mazes
+        self.base[indices] = mazes * self.maze_cells
+        self.pos[indices] = self.pool_start[mazes]
+        self.health[indices] = PLAYER_MAX_HEALTH
+        for counter in (self.invincible, self.knockback, self.ticks, self.freeze_until,
+                        self.steps, self.potions, self.moves, self.damage):
+            counter[indices] = 0
+        self.potion_cells[indices] = self.pool_potions[mazes]
+        self.potion_alive[indices] = self.pool_potion_valid[mazes]
+        self.potion_kind[indices] = np.searchsorted(
+            POTION_THRESHOLDS, self.rng.random((count, self.max_potions)), side="right")
+        self.chest_cells[indices] = self.pool_chests[mazes]
+        self.chest_alive[indices] = self.pool_chest_valid[mazes]
+        self.enemy_cells[indices] = self.pool_enemies[mazes]
+        self.enemy_valid[indices] = self.pool_enemy_valid[mazes]
+        self.enemy_timer[indices] = self.enemy_first_delay
+        return self.observe()
+
+    def step(self, actions):
+        """
+        Applique une action par partie puis avance de frames_per_step frames.
+        Retourne (observations, récompenses, terminées, info) ; les parties terminées
+        sont déjà redémarrées dans les observations renvoyées.
+        """
+        actions = np.asarray(actions)
+        rewards = np.full(self.n, REWARD_STEP, dtype=np.float32)
+        outcome = np.zeros(self.n, dtype=np.int8)
+        live = np.ones(self.n, dtype=bool)
+
+        for frame in range(self.frames_per_step):
+            self.ticks[live] += self.frame_ms
+            if frame == 0:
+                # Player.move : bloqué pendant le knockback et contre les murs
+                target = self.pos + self.offsets[actions]
+                moved = (actions != ACTION_WAIT) & (self.knockback == 0) & self.walkable[self.base + target]
+                self.pos = np.where(moved, target, self.pos)
+                self.moves += moved
+                self.collide(moved, rewards)
+                self.check_win(moved, outcome, rewards)
+                live &= outcome == OUTCOME_RUNNING
+            # Game.update : minuteurs du joueur, ennemis (sauf gel), collisions, défaite, victoire
+            self.invincible = np.maximum(self.invincible - 1, 0)
+            self.knockback = np.maximum(self.knockback - 1, 0)
+            self.advance_enemies(live & (self.ticks >= self.freeze_until))
+            self.collide(live, rewards)
+            died = live & (self.health <= 0)
+            outcome[died] = OUTCOME_DEATH
+            rewards[died] += REWARD_DEATH
+            live &= ~died
+            self.check_win(live, outcome, rewards)
+            live &= outcome == OUTCOME_RUNNING
+
+        self.steps += 1
+        outcome[(outcome == OUTCOME_RUNNING) & (self.steps >= self.max_steps)] = OUTCOME_TIMEOUT
+        dones = outcome != OUTCOME_RUNNING
+        info = {"outcome": outcome, "episode_steps": self.steps.copy(), "episode_potions": self.potions.copy(),
+                "episode_damage": self.damage.copy()}
+        return self.reset(np.flatnonzero(dones)), rewards, dones, info
+
+    def hurt(self, mask, rewards):
+        """Player.take_damage(1) là où `mask` : ignoré pendant l'invincibilité ; retourne les touchés."""
+        hurt = mask & (self.invincible == 0)
+        self.health -= hurt
+        self.damage += hurt
+        self.invincible[hurt] = PLAYER_INVINCIBILITY_DURATION
+        rewards[hurt] += REWARD_DAMAGE
+        return hurt
+
+    def collide(self, mask, rewards):
+        """Game.check_collisions pour les parties de `mask` : ennemis, puis potions et coffres."""
+        pos = self.pos[:, None]
+        touched = mask & ((self.enemy_cells == pos) & self.enemy_valid).any(axis=1)
+        # Ennemi sur la case : knockback sans déplacement (direction nulle)
+        self.knockback[self.hurt(touched, rewards)] = PLAYER_KNOCKBACK_DURATION
+
+        collected = (self.potion_cells == pos) & self.potion_alive & mask[:, None]
+        if collected.any():
+            self.potion_alive &= ~collected
+            count = collected.sum(axis=1)
+            self.potions += count
+            rewards += REWARD_POTION * count
+            frozen = (collected & (self.potion_kind == POTION_FREEZE)).any(axis=1)
+            self.freeze_until[frozen] = self.ticks[frozen] + POTION_FREEZE_DURATION_MS
+
+        opened = (self.chest_cells == pos) & self.chest_alive & mask[:, None]
+        if opened.any():
+            self.chest_alive &= ~opened
+            chests = opened.any(axis=1)
+            result = np.full(self.n, -1)
+            result[chests] = np.searchsorted(CHEST_THRESHOLDS, self.rng.random(chests.sum()), side="right")
+            self.hurt(result == CHEST_DAMAGE, rewards)
+            bonus = result == CHEST_HEALTH
+            self.health[bonus] = np.minimum(self.health[bonus] + 1, PLAYER_MAX_HEALTH)
+
+    def check_win(self, mask, outcome, rewards):
+        """Game.check_win_condition : toutes les potions et le joueur sur la sortie."""
+        won = mask & (self.potions >= self.total_potions) & (self.pos == self.pool_exit[self.maze_ids])
+        outcome[won] = OUTCOME_WIN
+        rewards[won] += REWARD_WIN
+
+    def advance_enemies(self, running):
+        """Une frame d'EnemyScheduler : seuls les ennemis dont l'action est due bougent."""
+        self.enemy_timer -= running[:, None]
+        due = (self.enemy_timer <= 0) & self.enemy_valid
+        if not due.any():
+            return
+        envs, slots = np.nonzero(due)
+        self.enemy_timer[envs, slots] = self.enemy_interval
+        cells = self.enemy_cells[envs, slots]
+        neighbours = cells[:, None] + self.offsets[None, :-1]
+        walkable = self.walkable[self.base[envs, None] + neighbours]
+        # Enemy.patrol : voisin traversable tiré uniformément (ou rester sur place)
+        keys = np.where(walkable, self.rng.random(walkable.shape), -1.0)
+        choice = keys.argmax(axis=1)
+        if self.stalker:
+            px, py = np.divmod(self.pos[envs], self.stride)
+            ex, ey = np.divmod(cells, self.stride)
+            detection = self.detection_range
+            if self.night_blindness:
+                # Murs invisibles hors des 2 premières secondes du cycle de 6 s : portée réduite à 2
+                detection = np.where((self.ticks[envs] // 1000) % 6 < 2, detection, 2)
+            sees = np.abs(ex - px) + np.abs(ey - py) <= detection
+            # Enemy.get_greedy_step : premier voisin qui minimise la distance de Manhattan
+            nx, ny = np.divmod(neighbours, self.stride)
+            distance = np.where(walkable, np.abs(nx - px[:, None]) + np.abs(ny - py[:, None]), FAR)
+            choice = np.where(sees, distance.argmin(axis=1), choice)
+        rows = np.arange(len(cells))
+        self.enemy_cells[envs, slots] = np.where(walkable[rows, choice], neighbours[rows, choice], cells)
+
+    def cell_positions(self, cells):
+        """Cases aplaties -> coordonnées (x, y) de la grille, dernier axe de taille 2."""
+        x, y = np.divmod(cells, self.stride)
+        return np.stack((x - 1, y - 1), axis=-1)
+
+    def observe(self):
+        """Observations de toutes les parties (copies) ; les positions absentes valent -1."""
+        return {
+            "maze": self.maze_ids.copy(),
+            "player": self.cell_positions(self.pos),
+            "health": self.health.copy(),
+            "potions": self.potions.copy(),
+            "potion_positions": np.where(self.potion_alive[..., None], self.cell_positions(self.potion_cells), -1),
+            "enemies": np.where(self.enemy_valid[..., None], self.cell_positions(self.enemy_cells), -1),
+            "frozen": self.ticks < self.freeze_until,
+            "exit": self.cell_positions(self.pool_exit[self.maze_ids]),
+        }
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark des niveaux de détail de l'IA : des milliers d'ennemis en mode Extrême,
+joueur immobile avec une fenêtre de vue fixe. Compare la mise à jour de tous les
+ennemis à chaque frame, la roue temporelle seule, et la roue avec niveaux de détail.
+
+Usage : python benchmarks/bench_ai_lod.py [taille] [ennemis] [frames]
+"""
+
+import os
+import sys
+import time
+import random
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_new import Difficulty, EnemyType, SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE
+from maze_new import Maze
+from entities_new import Enemy
+from enemy_scheduler import EnemyScheduler
+from ai_lod import AILevelOfDetail, TIER_FULL, TIER_COARSE, TIER_FROZEN
+
+
+def spawn_enemies(maze, count):
+    """Ennemis répartis sur des cases libres tirées au hasard (positions reproductibles)."""
+    rng = random.Random(1)
+    floor = [(x, y) for x in range(maze.width) for y in range(maze.height) if maze.is_walkable(x, y)]
+    types = list(EnemyType)
+    return [Enemy(x, y, types[i % len(types)], Difficulty.EXTREME)
+            for i, (x, y) in enumerate(rng.choice(floor) for _ in range(count))]
+
+
+def run(maze, count, frames, mode, player_pos, visible_range):
+    """Temps moyen par frame (ms) et nombre moyen de réveils par frame."""
+    enemies = spawn_enemies(maze, count)
+    lod = AILevelOfDetail() if mode == "lod" else None
+    scheduler = EnemyScheduler(enemies, lod=lod)
+    random.seed(2)
+    woken = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        if mode == "per_frame":
+            for enemy in enemies:
+                enemy.update(player_pos, maze)
+        else:
+            woken += scheduler.advance(player_pos, maze, visible_range)
+    elapsed = (time.perf_counter() - start) * 1000 / frames
+    tiers = None
+    if lod is not None:
+        tiers = {tier: sum(1 for e in enemies if lod.get_tier(e) == tier)
+                 for tier in (TIER_FULL, TIER_COARSE, TIER_FROZEN)}
+    return elapsed, woken / frames, tiers
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    frames = int(sys.argv[3]) if len(sys.argv) > 3 else 300
+
+    print(f"Génération d'un labyrinthe {size}x{size}, {count} ennemis...")
+    with contextlib.redirect_stdout(io.StringIO()):
+        random.seed(0)
+        maze = Maze(Difficulty.EXTREME, grid_size=size)
+    player_pos = maze.start_pos
+    # Fenêtre de vue du zoom x1 centrée sur le joueur
+    half_w, half_h = SCREEN_WIDTH // TILE_SIZE // 2 + 1, SCREEN_HEIGHT // TILE_SIZE // 2 + 1
+    visible_range = (max(0, player_pos[0] - half_w), max(0, player_pos[1] - half_h),
+                     min(size, player_pos[0] + half_w + 1), min(size, player_pos[1] + half_h + 1))
+
+    print(f"{'mode':<28}{'ms/frame':>10}{'réveils/frame':>16}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = [(label, run(maze, count, frames, mode, player_pos, visible_range))
+                   for label, mode in [("compte à rebours par frame", "per_frame"),
+                                       ("roue temporelle", "wheel"),
+                                       ("roue + niveaux de détail", "lod")]]
+    for label, (ms, woken, tiers) in results:
+        wake_label = "-" if label.startswith("compte") else f"{woken:.1f}"
+        print(f"{label:<28}{ms:>10.3f}{wake_label:>16}")
+        if tiers:
+            print(f"  ennemis par niveau : {tiers}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'environnement par lots : pas d'environnement par seconde (un pas =
+une action par partie + BOT_MOVE_FRAMES frames) selon la taille du lot, actions
+aléatoires, redémarrages automatiques compris, sur un seul cœur.
+
+Usage : python benchmarks/bench_batch_env.py [pas] [difficulté]
+"""
+
+import os
+import sys
+import time
+import contextlib
+import io
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_new import Difficulty
+from maze_new import generate_valid_maze
+from batch_env import BatchEnv
+
+
+def steps_per_second(env, steps, rng):
+    """Pas d'environnement par seconde (N parties x pas) et parties terminées."""
+    actions = rng.integers(5, size=(steps, env.n))
+    finished = 0
+    start = time.perf_counter()
+    for step in range(steps):
+        _, _, dones, _ = env.step(actions[step])
+        finished += int(dones.sum())
+    elapsed = time.perf_counter() - start
+    return env.n * steps / elapsed, finished
+
+
+def main():
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    difficulty = Difficulty[sys.argv[2].upper()] if len(sys.argv) > 2 else Difficulty.HARD
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        mazes = [generate_valid_maze(difficulty, seed=seed) for seed in range(0, 32 * 50, 50)]
+    print(f"{difficulty.name}, réserve de {len(mazes)} labyrinthes, {steps} pas")
+    print(f"{'parties':>8}{'pas/s':>14}{'terminées':>11}")
+    rng = np.random.default_rng(0)
+    for n in (64, 256, 1024, 4096):
+        with contextlib.redirect_stdout(io.StringIO()):
+            env = BatchEnv(n, difficulty, mazes=mazes, seed=0)
+        rate, finished = steps_per_second(env, steps, rng)
+        print(f"{n:>8}{rate:>14,.0f}{finished:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la poursuite coopérative : de plus en plus de poursuivants autour
+d'un joueur qui se déplace. Compare le pas glouton (plus court chemin, ennemis
+empilés) et les plans réservés dans l'espace-temps, calculés dans le budget de
+chaque frame : temps de frame moyen et 99e centile, ennemis empilés.
+
+Usage : python benchmarks/bench_cooperative.py [taille] [frames]
+"""
+
+import os
+import sys
+import time
+import random
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_new import Difficulty, EnemyType, COOP_PLAN_BUDGET_MS
+from maze_new import Maze
+from entities_new import Enemy
+from enemy_scheduler import EnemyScheduler
+from cooperative import CooperativePlanner
+
+
+def spawn_chasers(maze, count):
+    """Stalkers qui voient toujours le joueur, sur des cases libres distinctes."""
+    rng = random.Random(1)
+    floor = [(x, y) for x in range(maze.width) for y in range(maze.height) if maze.is_walkable(x, y)]
+    enemies = []
+    for x, y in rng.sample(floor, count):
+        enemy = Enemy(x, y, EnemyType.MONSTER, Difficulty.EXTREME)
+        enemy.detection_range_base = maze.width + maze.height
+        enemy.night_blindness = False
+        enemies.append(enemy)
+    return enemies
+
+
+def run(maze, count, frames, cooperative):
+    """Temps moyen et 99e centile par frame (ms), nombre moyen d'ennemis empilés."""
+    enemies = spawn_chasers(maze, count)
+    scheduler = EnemyScheduler(enemies)
+    planner = None
+    if cooperative:
+        planner = CooperativePlanner(maze, scheduler)
+        scheduler.planner = planner
+    rng = random.Random(2)
+    player_pos = maze.start_pos
+    times, stacked = [], 0
+    for frame in range(frames):
+        if frame % 6 == 0:
+            x, y = player_pos
+            moves = [(x + dx, y + dy) for dx, dy in ((0, 1), (1, 0), (0, -1), (-1, 0)) if maze.is_walkable(x + dx, y + dy)]
+            player_pos = rng.choice(moves)
+        start = time.perf_counter()
+        scheduler.advance(player_pos, maze)
+        if planner is not None:
+            planner.run(player_pos, COOP_PLAN_BUDGET_MS)
+        times.append((time.perf_counter() - start) * 1000)
+        stacked += count - len({(e.grid_x, e.grid_y) for e in enemies})
+    times.sort()
+    return sum(times) / frames, times[int(frames * 0.99)], stacked / frames
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 900
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        random.seed(0)
+        maze = Maze(Difficulty.EXTREME, grid_size=size)
+
+    print(f"Labyrinthe {size}x{size}, {frames} frames, budget {COOP_PLAN_BUDGET_MS} ms/frame")
+    print(f"{'ennemis':>8}{'mode':>14}{'ms/frame':>10}{'p99 ms':>10}{'empilés':>10}")
+    for count in (4, 8, 16, 32):
+        for label, cooperative in (("glouton", False), ("coopératif", True)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                mean, p99, stacked = run(maze, count, frames, cooperative)
+            print(f"{count:>8}{label:>14}{mean:>10.3f}{p99:>10.2f}{stacked:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
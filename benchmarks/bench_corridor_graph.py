@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark du graphe de couloirs : taux de compression par difficulté, puis
+distances, connexité et tournées sur le graphe compressé contre les parcours
+case par case de la grille.
+
+Usage : python benchmarks/bench_corridor_graph.py [répétitions]
+"""
+
+import os
+import sys
+import time
+import random
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_new import Difficulty, DIFFICULTY_SETTINGS
+from maze_new import Maze
+from corridor_graph import CorridorGraph
+from pathfinding import bfs_distances
+
+
+def timed(function, repeat):
+    """Temps moyen d'un appel en ms."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"{'difficulté':<12}{'cases':>7}{'sommets':>9}{'couloirs':>10}{'ratio':>7}"
+          f"{'constr.':>9}{'BFS':>8}{'graphe':>8}{'conn.':>8}{'graphe':>8}{'tournée':>9}{'graphe':>8}")
+    for difficulty in Difficulty:
+        with contextlib.redirect_stdout(io.StringIO()):
+            random.seed(0)
+            maze = Maze(difficulty)
+        walkable = sum(1 for x in range(maze.width) for y in range(maze.height) if maze.is_walkable(x, y))
+        build_ms = timed(lambda: CorridorGraph.from_maze(maze), repeat)
+        graph = CorridorGraph.from_maze(maze)
+        grid = maze.get_pathfinder().get_grid()
+        targets = maze.potions + [maze.exit_pos]
+
+        bfs_ms = timed(lambda: bfs_distances(grid, maze.start_pos, targets), repeat)
+        graph_ms = timed(lambda: graph.distances_from(maze.start_pos, targets), repeat)
+        flood_ms = timed(lambda: maze.get_accessible_tiles(), repeat)
+        components_ms = timed(lambda: graph.get_cell_components(), repeat)
+
+        def grid_route():
+            points = [maze.start_pos] + targets
+            for point in points:
+                bfs_distances(grid, point, points)
+        grid_route_ms = timed(grid_route, max(1, repeat // 4))
+        graph_route_ms = timed(lambda: graph.plan_route(maze.start_pos, maze.potions, maze.exit_pos), max(1, repeat // 4))
+
+        name = DIFFICULTY_SETTINGS[difficulty]["name"]
+        print(f"{name:<12}{walkable:>7}{graph.node_count:>9}{graph.edge_count:>10}{graph.get_compression_ratio():>7.2f}"
+              f"{build_ms:>9.2f}{bfs_ms:>8.2f}{graph_ms:>8.2f}{flood_ms:>8.2f}{components_ms:>8.2f}"
+              f"{grid_route_ms:>9.2f}{graph_route_ms:>8.2f}")
+    print("(temps en ms ; « tournée » grille = matrice de distances seule, graphe = matrice + 2-opt)")
+
+
+if __name__ == "__main__":
+    main()
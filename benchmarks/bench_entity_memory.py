@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark mémoire des entités : octets alloués par Player, Enemy, Item et Cell
+(tracemalloc), puis entités allouées et collectes du GC sur une suite de parties
+rejouées avec et sans réserves d'entités réutilisées.
+
+Usage : python benchmarks/bench_entity_memory.py [nombre] [parties]
+"""
+
+import os
+import sys
+import gc
+import time
+import random
+import tracemalloc
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_new import Difficulty, EnemyType, ItemType
+from maze_new import Maze, Cell
+import entities_new
+from entities_new import Player, Enemy, Item, create_enemies_from_maze, create_items_from_maze
+
+
+def bytes_per_instance(factory, count):
+    """Octets alloués par instance (objet, __dict__ éventuel et attributs propres)."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # La liste elle-même n'est pas comptée
+    return (after - before - sys.getsizeof(instances)) / count
+
+
+def replay_allocations(maze, games, pooled):
+    """Entités allouées, collectes du GC (génération 0) et temps (ms) par partie rejouée."""
+    pools = None
+    if pooled:
+        pools = (entities_new.EntityPool(Enemy), entities_new.EntityPool(Item))
+    allocated = 0
+    gc.collect()
+    collections = gc.get_stats()[0]["collections"]
+    start = time.perf_counter()
+    for _ in range(games):
+        if pools:
+            for pool in pools:
+                pool.release_all()
+            enemies = create_enemies_from_maze(maze, Difficulty.HARD, pools[0])
+            items = create_items_from_maze(maze, pools[1])
+        else:
+            enemies = create_enemies_from_maze(maze, Difficulty.HARD)
+            items = create_items_from_maze(maze)
+            allocated += len(enemies) + len(items)
+    elapsed = (time.perf_counter() - start) * 1000 / games
+    if pools:
+        allocated = sum(pool.created for pool in pools)
+    return allocated, gc.get_stats()[0]["collections"] - collections, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        random.seed(0)
+        maze = Maze(Difficulty.HARD, grid_size=60)
+        factories = [
+            ("Player", lambda i: Player(i, i, 3)),
+            ("Enemy", lambda i: Enemy(i, i, EnemyType.GHOST, Difficulty.EXTREME)),
+            ("Item (coffre)", lambda i: Item(i, i, ItemType.CHEST)),
+            ("Cell", lambda i: Cell(i, i)),
+        ]
+        sizes = [(label, bytes_per_instance(factory, count)) for label, factory in factories]
+
+    print(f"{'entité':<16}{'octets/instance':>16}")
+    for label, size in sizes:
+        print(f"{label:<16}{size:>16.0f}")
+
+    if hasattr(entities_new, "EntityPool"):
+        print(f"\n{games} parties rejouées ({len(maze.enemy_positions)} ennemis, "
+              f"{len(maze.potions) + len(maze.chests)} objets)")
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = [(label, replay_allocations(maze, games, pooled))
+                       for label, pooled in (("sans réserve", False), ("avec réserve", True))]
+        print(f"{'':<16}{'entités allouées':>18}{'collectes GC':>14}{'ms/partie':>11}")
+        for label, (allocated, collections, elapsed) in results:
+            print(f"{label:<16}{allocated:>18}{collections:>14}{elapsed:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la recherche hiérarchique (HPA*) sur un grand labyrinthe : construction
+du graphe abstrait, requêtes lointaines contre BFS et JPS, reconstruction locale
+après des changements de cases, et plus proche potion pour la boussole.
+
+Usage : python benchmarks/bench_hpa.py [taille] [requêtes]
+"""
+
+import os
+import sys
+import time
+import random
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_new import Difficulty, CellType
+from maze_new import Maze
+from pathfinding import find_path_bfs, find_path_jps
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    print(f"Génération d'un labyrinthe {size}x{size}...")
+    with contextlib.redirect_stdout(io.StringIO()):
+        random.seed(0)
+        maze = Maze(Difficulty.HARD, grid_size=size)
+        hpa = maze.get_hierarchical_pathfinder()
+        start = time.perf_counter()
+        hpa.refresh()
+        build_ms = (time.perf_counter() - start) * 1000
+    nodes = sum(len(n) for n in hpa.cluster_nodes.values())
+    print(f"Graphe abstrait : {len(hpa.cluster_nodes)} clusters, {nodes} entrées, construit en {build_ms:.0f} ms")
+
+    grid = maze.get_pathfinder().get_grid()
+    rng = random.Random(1)
+    free = [(x, y) for x in range(size) for y in range(size) if maze.is_walkable(x, y)]
+    pairs = [(rng.choice(free), rng.choice(free)) for _ in range(queries)]
+
+    print(f"{'algo':<6}{'ms/requête':>12}{'surcoût chemin':>16}")
+    lengths = {}
+    for name, function in [("BFS", lambda s, g: find_path_bfs(grid, s, g)),
+                           ("JPS", lambda s, g: find_path_jps(grid, s, g)),
+                           ("HPA*", hpa.find_path)]:
+        start = time.perf_counter()
+        lengths[name] = [len(path) if path else 0 for path in (function(s, g) for s, g in pairs)]
+        ms = (time.perf_counter() - start) * 1000 / queries
+        overhead = sum(a / b for a, b in zip(lengths[name], lengths["BFS"]) if b) / max(1, sum(1 for b in lengths["BFS"] if b))
+        print(f"{name:<6}{ms:>12.2f}{(overhead - 1) * 100:>15.2f}%")
+
+    # Boussole : plus proche de 15 potions
+    potions = rng.sample(free, 15)
+    start = time.perf_counter()
+    nearest = maze.nearest_target(pairs[0][0], potions)
+    print(f"Plus proche potion (HPA*) : {nearest} en {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    # Reconstruction locale après quelques changements de cases
+    for x, y in rng.sample(free, 10):
+        maze.set_cell_type(x, y, CellType.WALL)
+    rebuilt = hpa.stats["rebuilt_clusters"]
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        hpa.refresh()
+    print(f"10 cases murées : {hpa.stats['rebuilt_clusters'] - rebuilt} clusters reconstruits "
+          f"en {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark du rendu à niveaux de détail : labyrinthe 1000x1000 entièrement dézoomé.
+Objectif : au moins 30 FPS (33 ms par frame) pour la vue d'ensemble.
+
+Usage : python benchmarks/bench_lod_render.py [taille] [frames]
+"""
+
+import os
+import sys
+import time
+import contextlib
+import io
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from config_new import SCREEN_WIDTH, SCREEN_HEIGHT, Difficulty
+from maze_new import Maze
+from entities_new import Player, create_enemies_from_maze, create_items_from_maze
+from renderer_new import Renderer
+
+
+def time_frames(renderer, maze, player, enemies, items, frames, rebuild=False):
+    """Temps moyen d'une frame complète (monde + brouillard + HUD), en ms."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        if rebuild:
+            renderer.lod_cache_key = None  # Pire cas : la caméra bouge à chaque frame
+        renderer.update_camera(player.grid_x, player.grid_y, maze.width, maze.height)
+        renderer.draw_all(maze, player, enemies, items, 0.0)
+    return (time.perf_counter() - start) * 1000 / frames
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    print(f"Génération d'un labyrinthe {size}x{size}...")
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        maze = Maze(Difficulty.HARD, grid_size=size)
+        enemies = create_enemies_from_maze(maze, Difficulty.HARD)
+        items = create_items_from_maze(maze)
+        player = Player(*maze.start_pos, len(maze.potions))
+        renderer = Renderer(screen)
+        renderer.init_fog(None)
+        renderer.set_zoom_limits(maze.width, maze.height)
+    print(f"  généré en {time.perf_counter() - start:.1f} s")
+
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for label, zoom, rebuild in [("zoom x1", 1.0, False),
+                                     ("zoom x0.2", 0.2, False),
+                                     ("zoom x0.2, caméra mobile", 0.2, True),
+                                     ("dézoom total", renderer.min_zoom, False),
+                                     ("dézoom total, sans cache", renderer.min_zoom, True)]:
+            renderer.set_zoom(zoom)
+            time_frames(renderer, maze, player, enemies, items, 3)  # chauffe (cache du fond)
+            ms = time_frames(renderer, maze, player, enemies, items, frames, rebuild)
+            results.append((label, renderer.lod_mode, ms))
+
+    print(f"{'vue':<28}{'mode':<10}{'ms/frame':>10}{'FPS':>8}")
+    for label, mode, ms in results:
+        print(f"{label:<28}{mode:<10}{ms:>10.2f}{1000 / ms:>8.0f}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
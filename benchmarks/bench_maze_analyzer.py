@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'analyseur de labyrinthes : temps de génération et de mesure par
+labyrinthe selon la difficulté (mesures par BFS sur la grille aplatie contre la
+tournée de Maze.plan_route et le graphe de couloirs), puis débit du pool de
+processus et durée estimée pour 100 000 labyrinthes.
+
+Usage : python benchmarks/bench_maze_analyzer.py [graines par difficulté]
+"""
+
+import os
+import sys
+import time
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_new import Difficulty
+from maze_new import generate_valid_maze
+from corridor_graph import CorridorGraph
+from maze_analyzer import analyze_layout, analyze_seed_range
+
+
+def main():
+    seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    print(f"{'difficulté':<11}{'génération (ms)':>16}{'mesures (ms)':>14}{'plan_route + couloirs (ms)':>28}")
+    for difficulty in Difficulty:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            mazes = [generate_valid_maze(difficulty, seed=seed) for seed in range(seeds)]
+            generate_ms = (time.perf_counter() - start) * 1000 / seeds
+        start = time.perf_counter()
+        for maze in mazes:
+            analyze_layout(maze.get_type_array(), maze.start_pos, maze.exit_pos, maze.potions, maze.enemy_positions)
+        analyze_ms = (time.perf_counter() - start) * 1000 / seeds
+        # Référence : tournée et couloirs par les services du labyrinthe
+        start = time.perf_counter()
+        for maze in mazes:
+            maze.plan_route(maze.start_pos, maze.potions, maze.exit_pos)
+            CorridorGraph.from_maze(maze)
+        reference_ms = (time.perf_counter() - start) * 1000 / seeds
+        print(f"{difficulty.name.lower():<11}{generate_ms:>16.2f}{analyze_ms:>14.2f}{reference_ms:>28.2f}")
+
+    workers = os.cpu_count() or 1
+    names = [difficulty.name.lower() for difficulty in Difficulty]
+    start = time.perf_counter()
+    columns, _ = analyze_seed_range(names, seeds, workers=workers)
+    elapsed = time.perf_counter() - start
+    rate = len(columns["seed"]) / elapsed
+    print(f"\n{len(columns['seed'])} labyrinthes sur {workers} processus : {rate:.0f} labyrinthes/s, "
+          f"100 000 labyrinthes en {100000 / rate / 60:.1f} min")
+
+
+if __name__ == "__main__":
+    main()
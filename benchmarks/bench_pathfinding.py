@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la recherche de chemin : JPS contre BFS et A* sur des grilles à 20 %
+de murs aléatoires (même densité que generate_recursive_backtracking), de 40x40
+à 2000x2000. Requêtes entre coins opposés de la grille.
+
+Usage : python benchmarks/bench_pathfinding.py [tailles...]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from pathfinding import WalkableGrid, find_path_jps, find_path_bfs, find_path_astar
+
+ALGORITHMS = [("BFS", find_path_bfs), ("A*", find_path_astar), ("JPS", find_path_jps)]
+
+
+def make_grid(size, rng):
+    """Grille à 20 % de murs, coins et leurs voisins libres (comme autour du départ)."""
+    walkable = rng.random((size, size)) >= 0.2
+    for cx, cy in ((0, 0), (size - 1, size - 1)):
+        walkable[max(0, cx - 1):cx + 2, max(0, cy - 1):cy + 2] = True
+    return WalkableGrid(walkable)
+
+
+def time_query(function, grid, start, goal, repeat):
+    """Temps moyen (ms) d'une requête et longueur du chemin."""
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        path = function(grid, start, goal)
+    return (time.perf_counter() - start_time) * 1000 / repeat, (len(path) if path else None)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [40, 100, 300, 1000, 2000]
+    rng = np.random.default_rng(0)
+    print(f"{'taille':>8}{'algo':>6}{'ms/requête':>14}{'longueur':>10}{'gain':>8}")
+    for size in sizes:
+        grid = make_grid(size, rng)
+        start, goal = (0, 0), (size - 1, size - 1)
+        repeat = max(1, 20000 // (size * size) * 10) if size < 300 else 1
+        results = [(name, *time_query(function, grid, start, goal, repeat)) for name, function in ALGORITHMS]
+        reference = results[0][1]
+        for name, ms, length in results:
+            print(f"{size:>8}{name:>6}{ms:>14.2f}{str(length):>10}{reference / ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark du placement des objets : temps du placement par point le plus éloigné
+(BFS NumPy élagués) selon la taille de la grille et le nombre d'objets, avec
+l'étalement des potions et la distance du plus proche ennemi au départ, comparés
+à l'ancien tirage au hasard parmi les cases accessibles.
+
+Usage : python benchmarks/bench_placement.py
+"""
+
+import os
+import sys
+import time
+import random
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_new import Difficulty
+from maze_new import Maze, run_generator
+from pathfinding import bfs_distances
+
+
+def shuffled_placement(maze, potions, enemies):
+    """Ancien placement : cases accessibles mélangées, prises dans l'ordre."""
+    floor = sorted(set(maze.get_accessible_tiles()) - {maze.start_pos, maze.exit_pos})
+    random.Random(0).shuffle(floor)
+    return floor[:potions], floor[potions:potions + enemies]
+
+
+def nearest_enemy(maze, enemies):
+    distances = bfs_distances(maze.get_pathfinder().get_grid(), maze.start_pos, enemies)
+    return min(distances.values()) if distances else None
+
+
+def main():
+    print(f"{'taille':>7}{'objets':>8}{'placement (ms)':>16}{'étalement':>11}{'hasard':>8}"
+          f"{'ennemi min':>12}{'hasard':>8}")
+    for size in (21, 51, 101, 201, 401):
+        potions, enemies, chests = max(3, size // 4), max(1, size // 8), max(2, size // 6)
+        with contextlib.redirect_stdout(io.StringIO()):
+            maze = Maze(Difficulty.HARD, size, seed=1, generate=False)
+            run_generator(maze.iter_recursive_backtracking())
+            start = time.perf_counter()
+            maze.place_items(potions, enemies, chests, None, 8)
+            place_ms = (time.perf_counter() - start) * 1000
+        spread = maze.get_potion_spread()
+        enemy = nearest_enemy(maze, maze.enemy_positions)
+        maze.potions, shuffled_enemies = shuffled_placement(maze, potions, enemies)
+        print(f"{size:>7}{potions + enemies + chests:>8}{place_ms:>16.1f}{spread:>11}{maze.get_potion_spread():>8}"
+              f"{enemy:>12}{nearest_enemy(maze, shuffled_enemies):>8}")
+
+
+if __name__ == "__main__":
+    main()
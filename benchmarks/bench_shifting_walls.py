@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark des murs mouvants : coût d'un déplacement de mur (fermeture vérifiée par
+recherche locale + ouverture par union) contre une validation complète par
+bfs_path_exists après chaque changement, et coût de la mise à jour locale du
+cache de chemins contre sa reconstruction.
+
+Usage : python benchmarks/bench_shifting_walls.py [déplacements]
+"""
+
+import os
+import sys
+import time
+import random
+import contextlib
+import io
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_new import Difficulty
+from maze_new import generate_valid_maze
+from pathfinding import WalkableGrid
+from shifting_walls import ShiftingWalls
+
+
+def main():
+    shifts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"{'taille':>7}{'dépl. (µs)':>12}{'BFS (µs)':>12}{'gain':>7}{'refus':>7}"
+          f"{'grille loc. (µs)':>18}{'grille compl. (µs)':>20}")
+    for size in (21, 61, 121, 201):
+        with contextlib.redirect_stdout(io.StringIO()):
+            maze = generate_valid_maze(Difficulty.HARD, grid_size=size, seed=1)
+        walls = ShiftingWalls(maze, seed=2)
+        anchors = [maze.start_pos, maze.exit_pos] + maze.potions
+        rng = random.Random(3)
+        centers = [(rng.randrange(size), rng.randrange(size)) for _ in range(shifts)]
+
+        start = time.perf_counter()
+        for center in centers:
+            walls.shift(center, anchors)
+        shift_us = (time.perf_counter() - start) * 1e6 / shifts
+
+        # Référence : une validation complète à chaque changement
+        checks = max(1, shifts // 20)
+        start = time.perf_counter()
+        for _ in range(checks):
+            maze.bfs_path_exists(maze.start_pos, anchors)
+        bfs_us = (time.perf_counter() - start) * 1e6 / checks
+
+        # Grille de marche du cache de chemins : deux cases recopiées contre reconstruction
+        pathfinder = maze.get_pathfinder()
+        grid = pathfinder.get_grid()
+        cells = [maze.start_pos, maze.exit_pos]
+        start = time.perf_counter()
+        for _ in range(checks):
+            grid.update_cells(maze, cells)
+        local_us = (time.perf_counter() - start) * 1e6 / checks
+        start = time.perf_counter()
+        for _ in range(checks):
+            WalkableGrid.from_maze(maze)
+        full_us = (time.perf_counter() - start) * 1e6 / checks
+
+        print(f"{size:>7}{shift_us:>12.1f}{bfs_us:>12.1f}{bfs_us / shift_us:>6.1f}x"
+              f"{walls.stats['rejected']:>7}{local_us:>18.1f}{full_us:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,12 @@ from enum import Enum
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
-HIGHSCORE_FILE = os.path.join(BASE_DIR, "highscore.json")
+HIGHSCORE_FILE = os.path.join(BASE_DIR, "highscore.json")  # Ancien format, importé une fois dans l'historique
+RUN_HISTORY_FILE = os.path.join(BASE_DIR, "run_history.db")  # Historique des parties (SQLite, WAL)
+AUTOSAVE_FILE = os.path.join(BASE_DIR, "autosave.bin")       # Dernier instantané de la partie en cours
+CACHE_DIR = os.path.join(BASE_DIR, "cache")  # Atlas de sprites pré-redimensionnés
+ATLAS_DIR = os.path.join(ASSETS_DIR, "atlas")  # Atlas embarqué avec les assets (build web), voir atlas.py
+TELEMETRY_DIR = os.path.join(BASE_DIR, "telemetry")  # Cartes de chaleur cumulées (un fichier par graine)
 
 # ============================================================================
 # PARAMÈTRES D'AFFICHAGE
@@ -21,6 +26,27 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 TILE_SIZE = 48  # Taille d'une case en pixels
 FPS = 30
+IDLE_FPS = 10  # Cadence réduite dans les menus, la pause et les écrans de fin
+
+# Chargement : la génération du labyrinthe avance par tranches de GENERATION_SLICE_MS
+# par frame (écran de progression, animation optionnelle du creusement)
+GENERATION_SLICE_MS = 8
+LOADING_CARVE_ANIMATION = True
+
+# Rendu basse résolution : le monde est dessiné à TILE_SIZE // RENDER_SCALE pixels par case
+# dans une surface réduite, puis agrandi une seule fois par frame (facteur entier, plus proche voisin).
+# 1 = dessin direct à l'écran, 3 = tiles natives 16x16. Doit diviser TILE_SIZE.
+RENDER_SCALE = 1
+
+# Zoom continu avec niveaux de détail : sprites au-dessus de LOD_SPRITE_MIN_TILE pixels
+# écran par case, sinon vue d'ensemble écrite directement en pixels (entités en points)
+ZOOM_STEP = 1.25
+MAX_ZOOM = 2.0
+LOD_SPRITE_MIN_TILE = 12
+
+# Minimap (taille du widget en pixels ; affichée d'office à partir de cette taille de grille)
+MINIMAP_SIZE = 160
+MINIMAP_MIN_GRID_SIZE = 40
 
 # Couleurs (format RGB)
 COLORS = {
@@ -59,6 +85,7 @@ DIFFICULTY_SETTINGS = {
         "grid_size": 10,
         "potions": 3,
         "enemies": 1,
+        "enemy_min_distance": 4,  # Distance de chemin minimale départ -> ennemi
         "chests": 2,
         "fog_radius": None,  # Pas de brouillard
         "enemy_speed": 10,   # Frames entre mouvements
@@ -70,6 +97,7 @@ DIFFICULTY_SETTINGS = {
         "grid_size": 20,
         "potions": 6,
         "enemies": 3,
+        "enemy_min_distance": 6,  # Distance de chemin minimale départ -> ennemi
         "chests": 4,
         "fog_radius": 5,     # Rayon de visibilité en cases
         "enemy_speed": 8,
@@ -81,17 +109,20 @@ DIFFICULTY_SETTINGS = {
         "grid_size": 30,
         "potions": 10,
         "enemies": 5,
+        "enemy_min_distance": 8,  # Distance de chemin minimale départ -> ennemi
         "chests": 6,
         "fog_radius": 3,
         "enemy_speed": 6,
         "enemy_ai": "random",
         "detection_range": 0,
+        "influence_ai": True,      # Déplacements guidés par les cartes d'influence
     },
     Difficulty.EXTREME: {
         "name": "Extrême",
         "grid_size": 40,
         "potions": 15,
         "enemies": 8,
+        "enemy_min_distance": 10,  # Distance de chemin minimale départ -> ennemi
         "chests": 8,
         "fog_radius": 2,
         "enemy_speed": 4,
@@ -99,6 +130,8 @@ DIFFICULTY_SETTINGS = {
         "detection_range": 7,      # Portée de détection du joueur (cases)
         "cooldown_moves": 2,       # Mouvement tous les 2 mouvements du joueur
         "night_blindness": True,   # Réduction de détection quand murs invisibles
+        "influence_ai": True,
+        "cooperative_ai": True,    # Poursuite coordonnée (table de réservation espace-temps)
     },
 }
 
@@ -172,6 +205,7 @@ class GameState(Enum):
     GAME_OVER = 2
     WIN = 3
     PAUSED = 4
+    LOADING = 5
 
 # ============================================================================
 # PARAMÈTRES DE JEU
@@ -180,6 +214,84 @@ class GameState(Enum):
 PLAYER_MAX_HEALTH = 3
 PLAYER_INVINCIBILITY_DURATION = 60  # frames (2 secondes à 30 FPS)
 PLAYER_KNOCKBACK_DURATION = 20      # frames
+POTION_VISION_DURATION_MS = 10000   # Effet vision : +3 cases de visibilité
+POTION_FREEZE_DURATION_MS = 5000    # Effet gel : ennemis immobiles
+TRAIL_DURATION_MS = 1000            # Durée de vie des positions de la traînée du joueur
+TRAIL_CAPACITY = 64                 # Positions gardées au plus (tampon circulaire)
+RUN_HISTORY_TOP_N = 5               # Parties listées par classement (difficulté ou graine)
+SNAPSHOT_INTERVAL_MS = 1000         # Instantané gardé en mémoire (retour en arrière) chaque seconde
+AUTOSAVE_INTERVAL_MS = 5000         # Dernier instantané écrit sur disque toutes les 5 secondes
+ROLLBACK_CAPACITY = 30              # Instantanés gardés en mémoire (30 s de retour en arrière)
+HEATMAP_MAX_ALPHA = 170             # Opacité des cases les plus chaudes de la carte de chaleur (touche H)
+
+# Tournois de bots (parties sans affichage, temps simulé)
+BOT_MOVE_FRAMES = 5                 # Une décision du bot toutes les 5 frames (6 déplacements/s à 30 FPS)
+BOT_MAX_SECONDS = 180               # Partie abandonnée (temps écoulé) au-delà de ce temps simulé
+ENEMY_WHEEL_SIZE = 64               # Cases de la roue temporelle des ennemis (puissance de 2, en ticks)
+
+# Course en réseau (serveur autoritaire, asyncio)
+NET_HOST = "127.0.0.1"
+NET_PORT = 8765
+NET_TICK_RATE = FPS                 # Ticks du serveur par seconde (vitesses des ennemis comptées en frames)
+NET_ROOM_SIZE = 8                   # Coureurs au plus par course (un labyrinthe à graine par course)
+NET_MAX_INPUTS = 8                  # Entrées en attente par coureur (une appliquée par tick, le reste ignoré)
+NET_MAX_WRITE_BUFFER = 65536        # Octets en attente d'envoi au-delà desquels un client trop lent est coupé
+
+# Niveaux de détail de l'IA (distances en cases, mesurées depuis la zone visible)
+AI_LOD_ENABLED = True
+AI_LOD_VIEW_MARGIN = 6          # Pleine cadence jusqu'à cette distance hors de l'écran
+AI_LOD_COARSE_DISTANCE = 40     # Simulation grossière jusqu'à cette distance, gel au-delà
+AI_LOD_COARSE_FACTOR = 4        # Pas de marche aléatoire regroupés par réveil grossier
+AI_LOD_FROZEN_CHECK = 30        # Ticks entre deux vérifications d'un ennemi gelé
+AI_LOD_SNAP_RADIUS = 12         # Rayon du BFS qui replace un ennemi gelé sur le labyrinthe
+
+# Recherche de chemin (nombre de chemins gardés en cache par labyrinthe)
+PATH_CACHE_SIZE = 256
+
+# Placement des objets (point le plus éloigné en distance de chemin) : tirage parmi les
+# cases à au moins PLACEMENT_SLACK fois la plus grande distance (1.0 = toujours la plus loin)
+PLACEMENT_SLACK = 0.75
+
+# Changements de cases gardés par le labyrinthe pour la mise à jour locale des caches
+# (au-delà, les caches en retard sont reconstruits entièrement)
+MAZE_CHANGE_LOG_SIZE = 256
+
+# Murs mouvants (mode de jeu, touche W du menu) : toutes les SHIFTING_INTERVAL_MS, un mur
+# se ferme et un autre s'ouvre à moins de SHIFTING_RADIUS cases du joueur. Une fermeture
+# est refusée si la recherche locale dépasse SHIFTING_SEARCH_BUDGET cases.
+SHIFTING_INTERVAL_MS = 1500
+SHIFTING_RADIUS = 8
+SHIFTING_SEARCH_BUDGET = 600
+SHIFTING_PICK_TRIES = 12
+
+# Analyseur de labyrinthes hors ligne (maze_analyzer.py)
+ANALYZER_PRESSURE_RADIUS = 3    # Case de la tournée sous pression si un ennemi est à cette distance de chemin au plus
+ANALYZER_BATCH_SIZE = 256       # Graines consécutives par tâche envoyée à un processus
+
+# Recherche hiérarchique (HPA*) pour les grands labyrinthes
+HPA_MIN_GRID_SIZE = 100     # En dessous, recherches exactes sur toute la grille
+HPA_CLUSTER_SIZE = 16       # Côté d'un cluster en cases
+HPA_ENTRANCE_SPLIT = 6      # Une ouverture plus longue donne deux entrées (une à chaque bout)
+HPA_BATCH_CLUSTERS = 1024   # Clusters traités ensemble par le calcul NumPy des distances internes
+
+# Cartes d'influence de l'IA (couches par case : odeur du joueur, densité d'ennemis, potions)
+INFLUENCE_UPDATE_TICKS = 3      # Ticks IA entre deux mises à jour des couches
+INFLUENCE_DECAY = 0.8           # Atténuation de l'influence à chaque case parcourue
+INFLUENCE_SCENT_FADE = 0.9      # Évaporation de l'odeur à chaque mise à jour
+INFLUENCE_SCENT_STEPS = 2       # Propagations de l'odeur par mise à jour
+INFLUENCE_DENSITY_STEPS = 3     # Portée (en cases) de la répulsion entre ennemis
+INFLUENCE_ATTRACTION_STEPS = 12 # Portée (en cases) de l'attraction des potions
+INFLUENCE_WINDOW = 48           # Demi-côté de la zone mise à jour autour du joueur
+INFLUENCE_WEIGHTS = {"scent": 1.0, "attraction": 0.3, "density": 0.5}
+INFLUENCE_MIN_SIGNAL = 0.02     # En dessous, l'ennemi patrouille au hasard
+
+# Poursuite coopérative (WHCA*) : fenêtre de planification et budget par frame
+COOP_WINDOW = 8                 # Coups planifiés par ennemi (fenêtre espace-temps)
+COOP_REPLAN_AFTER = 4           # Replanification après ce nombre de coups exécutés
+COOP_HEURISTIC_RADIUS = 32      # Rayon du champ de distances vers le joueur (heuristique)
+COOP_PLAN_BUDGET_MS = 2.0       # Temps de planification maximal par frame
+COOP_MAX_EXPANSIONS = 600       # États espace-temps développés au plus par plan
+COOP_HEADLESS_PLANS = 4         # Plans par frame sans affichage (budget indépendant de la machine)
 
 ENEMY_TYPES = [EnemyType.WIZARD, EnemyType.GHOST, EnemyType.MONSTER]
 ITEM_TYPES = [
@@ -196,9 +308,15 @@ DIRECTIONS = {
     "LEFT": (-1, 0),
     "RIGHT": (1, 0),
 }
+# Les mêmes, dans l'ordre des actions 0-3 (haut, bas, gauche, droite) : voisins d'une case
+STEP_DIRECTIONS = tuple(DIRECTIONS.values())
 
-# Contrôles (flèches + ZQSD) - défini dynamiquement après import pygame
+# Contrôles (flèches + ZQSD) - pygame importé seulement à l'appel (import du module sans effet)
 def get_controls():
+    try:
+        import pygame
+    except ImportError:
+        pygame = None
     if pygame:
         return {
             pygame.K_UP: "UP",
@@ -241,10 +359,3 @@ def get_difficulty_by_index(index):
         return Difficulty.EXTREME
     else:
         return Difficulty.EASY  # fallback
-
-# Import de pygame pour les constantes de touches
-try:
-    import pygame
-    pygame.init()
-except ImportError:
-    pygame = None
\ No newline at end of file
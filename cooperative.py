@@ -0,0 +1,284 @@
+"""
+Poursuite coopérative des ennemis (Windowed Hierarchical Cooperative A*) : chaque
+poursuivant planifie une courte fenêtre de coups dans l'espace-temps en évitant
+les cases et les échanges réservés par les autres, avec pour heuristique un
+champ de distances réelles vers le joueur partagé par tous. Les planifications
+sont étalées sur les frames dans un budget de temps fixe (ou, sans affichage, dans
+un nombre de plans fixe : la partie ne dépend plus de la vitesse de la machine).
+"""
+
+import heapq
+import time
+from collections import deque
+from config_new import (
+    COOP_WINDOW, COOP_REPLAN_AFTER, COOP_HEURISTIC_RADIUS, COOP_PLAN_BUDGET_MS,
+    COOP_MAX_EXPANSIONS, STEP_DIRECTIONS
+)
+
+
+class ReservationTable:
+    """Réservations espace-temps : (case, tick) occupés et passages (de, vers, tick)."""
+
+    def __init__(self):
+        self.cells = {}    # (x, y, tick) -> ennemi
+        self.edges = {}    # (de, vers, tick) -> ennemi
+        self.owned = {}    # ennemi -> clés réservées (pour tout libérer d'un coup)
+        self.expiry = {}   # tick -> clés de ce tick (oubli du passé sans tout parcourir)
+        self.pruned_tick = 0
+
+    def is_free(self, cell, start_tick, duration, enemy):
+        """Vrai si la case est libre (ou à l'ennemi) pendant [start_tick, start_tick + duration)."""
+        x, y = cell
+        for tick in range(start_tick, start_tick + duration):
+            owner = self.cells.get((x, y, tick))
+            if owner is not None and owner is not enemy:
+                return False
+        return True
+
+    def is_swap(self, origin, destination, tick, enemy):
+        """Vrai si un autre ennemi fait le passage inverse au même tick (échange de cases)."""
+        owner = self.edges.get((destination, origin, tick))
+        return owner is not None and owner is not enemy
+
+    def reserve(self, enemy, cell, start_tick, end_tick, origin=None):
+        """Réserve la case pendant [start_tick, end_tick) ; origin : case quittée à start_tick."""
+        keys = self.owned.setdefault(enemy, [])
+        for tick in range(max(start_tick, self.pruned_tick), end_tick):
+            key = (cell[0], cell[1], tick)
+            self.cells[key] = enemy
+            keys.append(key)
+            self.expiry.setdefault(tick, []).append(key)
+        if origin is not None and origin != cell and start_tick >= self.pruned_tick:
+            key = (origin, cell, start_tick)
+            self.edges[key] = enemy
+            keys.append(key)
+            self.expiry.setdefault(start_tick, []).append(key)
+
+    def drop(self, key, enemy=None):
+        """Supprime une clé (seulement si elle appartient encore à `enemy` quand il est donné)."""
+        table = self.edges if isinstance(key[0], tuple) else self.cells
+        if key in table and (enemy is None or table[key] is enemy):
+            del table[key]
+
+    def release(self, enemy):
+        """Libère toutes les réservations d'un ennemi."""
+        for key in self.owned.pop(enemy, ()):
+            self.drop(key, enemy)
+
+    def prune(self, tick):
+        """Oublie les réservations des ticks passés (seulement celles de ces ticks)."""
+        for past in range(self.pruned_tick, tick):
+            for key in self.expiry.pop(past, ()):
+                self.drop(key)
+        self.pruned_tick = max(self.pruned_tick, tick)
+
+
+class CooperativePlanner:
+    """Plans espace-temps des ennemis qui poursuivent le joueur, calculés dans un budget par frame."""
+
+    def __init__(self, maze, scheduler, window=COOP_WINDOW, replan_after=COOP_REPLAN_AFTER,
+                 heuristic_radius=COOP_HEURISTIC_RADIUS, max_expansions=COOP_MAX_EXPANSIONS, plan_limit=None):
+        self.maze = maze
+        self.scheduler = scheduler  # EnemyScheduler : horloge IA et ticks des prochaines actions
+        self.window = window
+        self.replan_after = replan_after
+        self.heuristic_radius = heuristic_radius
+        self.max_expansions = max_expansions  # Borne le coût d'un plan (une frame ne dépasse pas le budget de plus d'un plan)
+        self.plan_limit = plan_limit  # Plans par frame à la place du budget de temps (parties reproductibles)
+        self.reservations = ReservationTable()
+        self.plans = {}        # ennemi -> deque [(tick, case)] des coups à venir
+        self.plan_goals = {}   # ennemi -> position du joueur au moment du plan
+        self.queue = deque()   # ennemis en attente de planification
+        self.queued = set()
+        self.goal = None
+        self.distance_field = {}
+        self.field_revision = None
+        self.stats = {"plans": 0, "fallbacks": 0, "deferred": 0}
+
+    # ------------------------------------------------------------------
+    # Heuristique : distances réelles vers le joueur
+    # ------------------------------------------------------------------
+
+    def update_distance_field(self, goal):
+        """BFS borné depuis le joueur, partagé par tous les poursuivants (recalculé s'il bouge)."""
+        if goal == self.goal and self.field_revision != self.maze.revision:
+            # Une case changée hors du rayon (distance de Manhattan) ne modifie pas le champ
+            changes = self.maze.changes_since(self.field_revision)
+            if changes is not None and all(abs(x - goal[0]) + abs(y - goal[1]) > self.heuristic_radius
+                                           for x, y in changes):
+                self.field_revision = self.maze.revision
+        if goal == self.goal and self.field_revision == self.maze.revision:
+            return
+        self.goal = goal
+        self.field_revision = self.maze.revision
+        field = {goal: 0}
+        queue = deque([goal])
+        while queue:
+            x, y = queue.popleft()
+            distance = field[(x, y)] + 1
+            if distance > self.heuristic_radius:
+                continue
+            for dx, dy in STEP_DIRECTIONS:
+                cell = (x + dx, y + dy)
+                if cell not in field and self.maze.is_walkable(*cell):
+                    field[cell] = distance
+                    queue.append(cell)
+        self.distance_field = field
+
+    def heuristic(self, cell):
+        """Distance réelle au joueur dans le rayon du champ, estimation minorante au-delà."""
+        distance = self.distance_field.get(cell)
+        if distance is not None:
+            return distance
+        return max(self.heuristic_radius + 1, abs(cell[0] - self.goal[0]) + abs(cell[1] - self.goal[1]))
+
+    # ------------------------------------------------------------------
+    # Planification
+    # ------------------------------------------------------------------
+
+    def plan(self, enemy, goal):
+        """A* espace-temps sur la fenêtre : réserve et retourne les coups [(tick, case)]."""
+        self.update_distance_field(goal)
+        start = (enemy.grid_x, enemy.grid_y)
+        interval = enemy.get_action_interval()
+        first_tick = self.scheduler.get_due_tick(enemy)
+        if first_tick is None:
+            first_tick = self.scheduler.tick + 1
+
+        # États (case, coup) ; un coup (déplacement ou attente) coûte 1, sauf l'attente sur
+        # la case du joueur : f = g + h est alors exact pour une fenêtre de profondeur fixe
+        counter = 0
+        costs = {(start, 0): 0}
+        open_list = [(self.heuristic(start), 0, counter, start, 0)]
+        parents = {(start, 0): None}
+        closed = set()
+        best_state = (start, 0)
+        while open_list:
+            _, _, _, cell, step = heapq.heappop(open_list)
+            state = (cell, step)
+            if state in closed:
+                continue
+            closed.add(state)
+            cost = costs[state]
+            if step > best_state[1]:
+                best_state = state
+            if step == self.window or len(closed) >= self.max_expansions:
+                # Premier état en bout de fenêtre = meilleur coût + heuristique ; un ennemi
+                # qui atteint le joueur y attend (et garde sa case réservée)
+                break
+            tick = first_tick + step * interval
+            for dx, dy in STEP_DIRECTIONS + ((0, 0),):
+                nxt = (cell[0] + dx, cell[1] + dy)
+                if (dx or dy) and not self.maze.is_walkable(*nxt):
+                    continue
+                if not self.reservations.is_free(nxt, tick, interval, enemy):
+                    continue
+                if self.reservations.is_swap(cell, nxt, tick, enemy):
+                    continue
+                next_state = (nxt, step + 1)
+                next_cost = cost + (0 if nxt == cell == goal else 1)
+                if next_state in closed or costs.get(next_state, next_cost + 1) <= next_cost:
+                    continue
+                costs[next_state] = next_cost
+                parents[next_state] = state
+                counter += 1
+                heapq.heappush(open_list, (next_cost + self.heuristic(nxt), -(step + 1), counter, nxt, step + 1))
+
+        if best_state[1] < self.window and self.plans.get(enemy):
+            # Fenêtre bloquée (ou recherche trop longue) : l'ancien plan reste valide
+            # (les autres ennemis comptent dessus)
+            return list(self.plans[enemy])
+
+        # Suite des coups jusqu'au meilleur état
+        states = []
+        state = best_state
+        while state is not None:
+            states.append(state)
+            state = parents[state]
+        states.reverse()
+        # Réservations : case de départ jusqu'au premier coup, chaque coup pendant un
+        # intervalle, et la case finale une fenêtre de plus (l'ennemi y reste s'il ne
+        # peut pas replanifier à temps)
+        self.reservations.release(enemy)
+        self.reservations.reserve(enemy, start, self.scheduler.tick, first_tick)
+        plan = deque()
+        for i in range(1, len(states)):
+            tick = first_tick + (i - 1) * interval
+            end = tick + interval * (1 + self.window if i == len(states) - 1 else 1)
+            self.reservations.reserve(enemy, states[i][0], tick, end, origin=states[i - 1][0])
+            plan.append((tick, states[i][0]))
+        self.plans[enemy] = plan
+        self.plan_goals[enemy] = goal
+        self.stats["plans"] += 1
+        return list(self.plans[enemy])
+
+    def request(self, enemy):
+        """Met l'ennemi dans la file de planification (sans doublon)."""
+        if enemy not in self.queued:
+            self.queued.add(enemy)
+            self.queue.append(enemy)
+
+    def run(self, goal, budget_ms=COOP_PLAN_BUDGET_MS):
+        """
+        Planifie les ennemis en attente tant que le budget de la frame le permet : temps
+        écoulé, ou nombre de plans si plan_limit est fixé.
+        """
+        self.reservations.prune(self.scheduler.tick)
+        deadline = time.perf_counter() + budget_ms / 1000
+        planned = 0
+        while self.queue and (planned < self.plan_limit if self.plan_limit is not None
+                              else time.perf_counter() < deadline):
+            enemy = self.queue.popleft()
+            self.queued.discard(enemy)
+            self.plan(enemy, goal)
+            planned += 1
+        if self.queue:
+            self.stats["deferred"] += len(self.queue)
+        return planned
+
+    def forget(self, enemy):
+        """Abandonne le plan d'un ennemi qui ne poursuit plus le joueur."""
+        if enemy in self.plans:
+            del self.plans[enemy]
+            self.plan_goals.pop(enemy, None)
+            self.reservations.release(enemy)
+
+    def next_step(self, enemy, goal):
+        """
+        Case où l'ennemi doit aller à ce tick (sa case actuelle pour attendre). Sans plan
+        valide (ou plan abandonné), demande de planification pour une prochaine frame et
+        repli immédiat : un pas vers la case voisine la plus proche du joueur dans le champ
+        de distances partagé, si elle est libre et sans échange de cases ; sinon l'ennemi
+        attend sur place. La case choisie est réservée aussitôt. Rien de coûteux pendant l'action.
+        """
+        tick = self.scheduler.tick
+        plan = self.plans.get(enemy)
+        if plan:
+            while plan and plan[0][0] < tick:
+                plan.popleft()  # Coups manqués (ne devrait pas arriver)
+            if len(plan) <= self.window - self.replan_after or self.plan_goals.get(enemy) != goal:
+                self.request(enemy)
+            if plan and plan[0][0] == tick:
+                step = plan.popleft()[1]
+                if abs(step[0] - enemy.grid_x) + abs(step[1] - enemy.grid_y) <= 1 \
+                        and self.reservations.is_free(step, tick, 1, enemy) and self.maze.is_walkable(*step):
+                    return step
+                # Ennemi déplacé hors de son plan (avance rapide), case reprise par un
+                # ennemi bloqué sur place ou fermée depuis (murs mouvants) : plan abandonné
+                self.forget(enemy)
+        self.request(enemy)
+
+        # Repli sans plan : descente du champ de distances partagé vers une case libre
+        self.stats["fallbacks"] += 1
+        self.update_distance_field(goal)
+        current = (enemy.grid_x, enemy.grid_y)
+        interval = enemy.get_action_interval()
+        step = current
+        for dx, dy in STEP_DIRECTIONS:
+            cell = (current[0] + dx, current[1] + dy)
+            if self.heuristic(cell) < self.heuristic(step) and self.maze.is_walkable(*cell) \
+                    and self.reservations.is_free(cell, tick, interval, enemy) \
+                    and not self.reservations.is_swap(current, cell, tick, enemy):
+                step = cell
+        self.reservations.reserve(enemy, step, tick, tick + interval, origin=current)
+        return step
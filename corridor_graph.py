@@ -0,0 +1,366 @@
+"""
+Graphe de couloirs : compression de la grille de marche en un graphe dont les
+sommets sont les carrefours et les culs-de-sac, et dont les arêtes sont les
+couloirs (suites de cases de degré 2) pondérés par leur longueur.
+
+Le graphe est stocké au format CSR (tableaux NumPy) avec la correspondance vers
+les cases, et porte BFS, Dijkstra, composantes connexes et tournées ; les
+résultats sont ramenés sur la grille.
+"""
+
+import heapq
+from collections import deque
+import numpy as np
+from config_new import CellType, STEP_DIRECTIONS
+from route_solver import solve_route, INFINITY
+
+
+class CorridorGraph:
+    """
+    Graphe compressé d'un labyrinthe.
+
+    Sommets : node_cells[i] = (x, y). Demi-arêtes (CSR) : pour le sommet u,
+    indices[indptr[u]:indptr[u + 1]] sont ses voisins, weights les longueurs des
+    couloirs et edge_ids les couloirs correspondants. Couloir e : de edge_u[e] à
+    edge_v[e], cases intérieures edge_cells[edge_cell_ptr[e]:edge_cell_ptr[e + 1]]
+    dans le sens u -> v (indices aplatis x * height + y).
+    """
+
+    def __init__(self, walkable):
+        """walkable: tableau booléen NumPy indexé [x, y]."""
+        self.width, self.height = walkable.shape
+        self.walkable = walkable
+        self.build()
+
+    @classmethod
+    def from_maze(cls, maze):
+        """Graphe de couloirs de la grille courante du labyrinthe."""
+        return cls(maze.get_type_array() != CellType.WALL.value)
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    def cell_index(self, cell):
+        """Indice aplati d'une case."""
+        return cell[0] * self.height + cell[1]
+
+    def index_cell(self, index):
+        """Case d'un indice aplati."""
+        return divmod(int(index), self.height)
+
+    def compute_degrees(self):
+        """Nombre de voisins traversables de chaque case (0 pour les murs)."""
+        padded = np.pad(self.walkable, 1).astype(np.int8)
+        degrees = padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:]
+        return np.where(self.walkable, degrees, 0)
+
+    def walkable_neighbors(self, x, y):
+        """Cases voisines traversables."""
+        walkable = self.walkable
+        return [(x + dx, y + dy) for dx, dy in STEP_DIRECTIONS
+                if 0 <= x + dx < self.width and 0 <= y + dy < self.height and walkable[x + dx, y + dy]]
+
+    def trace(self, node_cell, first):
+        """Suit un couloir depuis un sommet : (cases intérieures, case du sommet d'arrivée)."""
+        interior = []
+        previous, current = node_cell, first
+        while self.node_of[current[0], current[1]] < 0:
+            interior.append(current)
+            step = [cell for cell in self.walkable_neighbors(*current) if cell != previous]
+            previous, current = current, step[0]
+        return interior, current
+
+    def build(self):
+        """Extrait sommets et couloirs, puis construit les tableaux CSR."""
+        degrees = self.compute_degrees()
+        self.degrees = degrees
+        node_mask = self.walkable & (degrees != 2)
+        self.node_of = np.full((self.width, self.height), -1, dtype=np.int32)
+        node_cells = [tuple(int(v) for v in cell) for cell in np.argwhere(node_mask)]
+        for i, (x, y) in enumerate(node_cells):
+            self.node_of[x, y] = i
+
+        edges = []        # (u, v, cases intérieures)
+        traced = set()    # (case du sommet, première case) déjà suivis
+        visited = np.zeros_like(self.walkable)
+
+        def trace_from(node_id):
+            cell = node_cells[node_id]
+            for first in self.walkable_neighbors(*cell):
+                if (cell, first) in traced:
+                    continue
+                interior, end = self.trace(cell, first)
+                last = interior[-1] if interior else cell
+                traced.add((cell, first))
+                traced.add((end, last))
+                for x, y in interior:
+                    visited[x, y] = True
+                edges.append((node_id, int(self.node_of[end[0], end[1]]), interior))
+
+        for node_id in range(len(node_cells)):
+            trace_from(node_id)
+
+        # Boucles fermées sans carrefour : une case de la boucle devient sommet
+        for x, y in np.argwhere(self.walkable & ~node_mask & ~visited):
+            if visited[x, y]:
+                continue
+            node_cells.append((int(x), int(y)))
+            self.node_of[x, y] = len(node_cells) - 1
+            visited[x, y] = True
+            trace_from(len(node_cells) - 1)
+
+        self.node_cells = np.array(node_cells, dtype=np.int32).reshape(-1, 2)
+        count = len(node_cells)
+
+        # Couloirs : extrémités, longueurs et cases intérieures
+        self.edge_u = np.array([u for u, _, _ in edges], dtype=np.int32)
+        self.edge_v = np.array([v for _, v, _ in edges], dtype=np.int32)
+        self.edge_length = np.array([len(interior) + 1 for _, _, interior in edges], dtype=np.int32)
+        self.edge_cell_ptr = np.zeros(len(edges) + 1, dtype=np.int64)
+        np.cumsum([len(interior) for _, _, interior in edges], out=self.edge_cell_ptr[1:])
+        self.edge_cells = np.array([x * self.height + y for _, _, interior in edges for x, y in interior],
+                                   dtype=np.int64)
+
+        # Case intérieure -> (couloir, rang dans le couloir à partir de 1)
+        self.cell_edge = np.full(self.width * self.height, -1, dtype=np.int32)
+        self.cell_offset = np.zeros(self.width * self.height, dtype=np.int32)
+        for e in range(len(edges)):
+            cells = self.edge_cells[self.edge_cell_ptr[e]:self.edge_cell_ptr[e + 1]]
+            self.cell_edge[cells] = e
+            self.cell_offset[cells] = np.arange(1, len(cells) + 1)
+
+        # CSR des demi-arêtes (chaque couloir dans les deux sens)
+        sources = np.concatenate([self.edge_u, self.edge_v])
+        order = np.argsort(sources, kind="stable")
+        self.indices = np.concatenate([self.edge_v, self.edge_u])[order]
+        self.edge_ids = np.concatenate([np.arange(len(edges)), np.arange(len(edges))])[order].astype(np.int32)
+        self.weights = np.concatenate([self.edge_length, self.edge_length])[order]
+        self.indptr = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=count), out=self.indptr[1:])
+
+        # Listes Python pour les parcours (plus rapides que l'indexation NumPy élément par élément)
+        self.adjacency = [list(zip(self.indices[self.indptr[u]:self.indptr[u + 1]].tolist(),
+                                   self.weights[self.indptr[u]:self.indptr[u + 1]].tolist(),
+                                   self.edge_ids[self.indptr[u]:self.indptr[u + 1]].tolist()))
+                          for u in range(count)]
+
+    @property
+    def node_count(self):
+        return len(self.node_cells)
+
+    @property
+    def edge_count(self):
+        return len(self.edge_u)
+
+    def get_compression_ratio(self):
+        """Cases traversables par sommet du graphe (plus c'est grand, plus la compression est forte)."""
+        return int(self.walkable.sum()) / max(1, self.node_count)
+
+    # ------------------------------------------------------------------
+    # Correspondance case <-> graphe
+    # ------------------------------------------------------------------
+
+    def get_anchors(self, cell):
+        """
+        Sommets d'accès d'une case : [(sommet, distance, côté)], un seul pour un sommet,
+        les deux bouts du couloir sinon (côté True vers edge_u, False vers edge_v).
+        """
+        x, y = cell
+        node = int(self.node_of[x, y])
+        if node >= 0:
+            return [(node, 0, True)]
+        edge = int(self.cell_edge[self.cell_index(cell)])
+        if edge < 0:
+            return []
+        offset = int(self.cell_offset[self.cell_index(cell)])
+        length = int(self.edge_length[edge])
+        return [(int(self.edge_u[edge]), offset, True), (int(self.edge_v[edge]), length - offset, False)]
+
+    def get_edge_cells(self, edge, from_node):
+        """Cases intérieures d'un couloir dans le sens de parcours depuis from_node."""
+        cells = [self.index_cell(i) for i in self.edge_cells[self.edge_cell_ptr[edge]:self.edge_cell_ptr[edge + 1]]]
+        if from_node != self.edge_u[edge]:
+            cells.reverse()
+        return cells
+
+    # ------------------------------------------------------------------
+    # Algorithmes sur le graphe compressé
+    # ------------------------------------------------------------------
+
+    def get_components(self):
+        """Composante connexe de chaque sommet (BFS sur le graphe), tableau NumPy."""
+        labels = np.full(self.node_count, -1, dtype=np.int32)
+        label = 0
+        for root in range(self.node_count):
+            if labels[root] >= 0:
+                continue
+            labels[root] = label
+            queue = deque([root])
+            while queue:
+                node = queue.popleft()
+                for other, _, _ in self.adjacency[node]:
+                    if labels[other] < 0:
+                        labels[other] = label
+                        queue.append(other)
+            label += 1
+        return labels
+
+    def get_cell_components(self):
+        """Composante connexe de chaque case traversable ([x, y], -1 pour les murs)."""
+        labels = self.get_components()
+        cells = np.full(self.width * self.height, -1, dtype=np.int32)
+        cells[self.node_cells[:, 0] * self.height + self.node_cells[:, 1]] = labels
+        interior = self.cell_edge >= 0
+        cells[interior] = labels[self.edge_u[self.cell_edge[interior]]]
+        return cells.reshape(self.width, self.height)
+
+    def all_reachable(self, start, targets):
+        """Vrai si toutes les cibles sont dans la composante de start."""
+        components = self.get_cell_components()
+        label = components[start]
+        return label >= 0 and all(components[target] == label for target in targets)
+
+    def dijkstra(self, start, stop_nodes=None):
+        """Distances en cases depuis une case vers les sommets, et sommets précédents."""
+        distances = {}
+        parents = {}
+        heap = []
+        for node, distance, side in self.get_anchors(start):
+            if distance < distances.get(node, INFINITY):
+                distances[node] = distance
+                parents[node] = side  # Sommet de départ : côté du couloir de start
+                heap.append((distance, node))
+        heapq.heapify(heap)
+        remaining = set(stop_nodes) if stop_nodes is not None else None
+        done = set()
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            if remaining is not None:
+                remaining.discard(node)
+                if not remaining:
+                    break
+            for other, weight, edge in self.adjacency[node]:
+                new_distance = distance + weight
+                if new_distance < distances.get(other, INFINITY):
+                    distances[other] = new_distance
+                    parents[other] = (node, edge)
+                    heapq.heappush(heap, (new_distance, other))
+        return distances, parents
+
+    def same_edge_distance(self, a, b):
+        """Distance directe entre deux cases du même couloir (None sinon)."""
+        if self.node_of[a] >= 0 or self.node_of[b] >= 0:
+            return None
+        edge_a = self.cell_edge[self.cell_index(a)]
+        if edge_a < 0 or edge_a != self.cell_edge[self.cell_index(b)]:
+            return None
+        return abs(int(self.cell_offset[self.cell_index(a)]) - int(self.cell_offset[self.cell_index(b)]))
+
+    def distances_from(self, start, targets):
+        """Distances de chemin {cible: distance} (cibles inaccessibles absentes)."""
+        if not self.walkable[start]:
+            return {}
+        anchors = {target: self.get_anchors(target) for target in targets if self.walkable[target]}
+        distances, _ = self.dijkstra(start, {anchor[0] for pairs in anchors.values() for anchor in pairs})
+        result = {}
+        for target, pairs in anchors.items():
+            best = min((distances[node] + offset for node, offset, _ in pairs if node in distances), default=INFINITY)
+            direct = self.same_edge_distance(start, target)
+            if direct is not None:
+                best = min(best, direct)
+            if target == start:
+                best = 0
+            if best < INFINITY:
+                result[target] = best
+        return result
+
+    def find_path(self, start, goal):
+        """Plus court chemin case par case (tuple) de start à goal, ou None."""
+        if not self.walkable[start] or not self.walkable[goal]:
+            return None
+        if start == goal:
+            return (start,)
+        goal_anchors = self.get_anchors(goal)
+        distances, parents = self.dijkstra(start, {node for node, _, _ in goal_anchors})
+        best, end, end_side = INFINITY, None, True
+        for node, offset, side in goal_anchors:
+            if node in distances and distances[node] + offset < best:
+                best, end, end_side = distances[node] + offset, node, side
+        direct = self.same_edge_distance(start, goal)
+        if direct is not None and direct <= best:
+            return self.walk_edge(start, goal)
+        if end is None:
+            return None
+
+        # Chemin de sommets, puis cases des couloirs traversés
+        hops = []
+        node = end
+        while not isinstance(parents[node], bool):
+            previous, edge = parents[node]
+            hops.append((previous, node, edge))
+            node = previous
+        path = self.walk_to_end(start, parents[node])
+        for previous, node, edge in reversed(hops):
+            path.extend(self.get_edge_cells(edge, previous))
+            path.append(tuple(int(v) for v in self.node_cells[node]))
+        path.extend(reversed(self.walk_to_end(goal, end_side)[:-1]))
+        return tuple(path)
+
+    def walk_to_end(self, cell, toward_u):
+        """Cases de cell jusqu'au bout de son couloir (sommet inclus), vers edge_u ou edge_v."""
+        x, y = cell
+        if self.node_of[x, y] >= 0:
+            return [cell]
+        edge = int(self.cell_edge[self.cell_index(cell)])
+        cells = self.get_edge_cells(edge, int(self.edge_u[edge]))  # Sens u -> v
+        rank = cells.index(cell)
+        if toward_u:
+            return cells[rank::-1] + [tuple(int(v) for v in self.node_cells[self.edge_u[edge]])]
+        return cells[rank:] + [tuple(int(v) for v in self.node_cells[self.edge_v[edge]])]
+
+    def walk_edge(self, a, b):
+        """Cases de a à b dans un même couloir."""
+        edge = int(self.cell_edge[self.cell_index(a)])
+        cells = self.get_edge_cells(edge, int(self.edge_u[edge]))
+        i, j = cells.index(a), cells.index(b)
+        return tuple(cells[i:j + 1] if i <= j else cells[j:i + 1][::-1])
+
+    def plan_route(self, start, targets, end=None):
+        """Tournée (plus proche voisin + 2-opt) sur les distances du graphe : (ordre, longueur)."""
+        points = [start] + list(targets) + ([end] if end is not None else [])
+        matrix = []
+        for point in points:
+            distances = self.distances_from(point, points)
+            matrix.append([distances.get(other, INFINITY) for other in points])
+        order, length = solve_route(matrix, len(points) - 1 if end is not None else None)
+        return [points[i] for i in order], length
+
+
+def compression_report(seed=0):
+    """Taux de compression du graphe de couloirs pour chaque difficulté : [(nom, cases, sommets, couloirs, ratio)]."""
+    import random
+    import contextlib
+    import io
+    from config_new import Difficulty, DIFFICULTY_SETTINGS
+    from maze_new import Maze
+
+    rows = []
+    for difficulty in Difficulty:
+        random.seed(seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            maze = Maze(difficulty)
+        graph = CorridorGraph.from_maze(maze)
+        rows.append((DIFFICULTY_SETTINGS[difficulty]["name"], int(graph.walkable.sum()),
+                     graph.node_count, graph.edge_count, graph.get_compression_ratio()))
+    return rows
+
+
+if __name__ == "__main__":
+    # Usage : python corridor_graph.py -> taux de compression par difficulté
+    print(f"{'difficulté':<12}{'cases':>7}{'sommets':>9}{'couloirs':>10}{'ratio':>7}")
+    for name, cells, nodes, edges, ratio in compression_report():
+        print(f"{name:<12}{cells:>7}{nodes:>9}{edges:>10}{ratio:>7.2f}")
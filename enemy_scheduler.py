@@ -0,0 +1,120 @@
+"""
+Ordonnanceur des ennemis : roue temporelle indexée par le tick de la prochaine
+action. À chaque tick seuls les ennemis dont le mouvement est dû sont réveillés,
+au lieu de décrémenter le compteur de chaque ennemi à chaque frame.
+"""
+
+import heapq
+from config_new import ENEMY_WHEEL_SIZE
+
+
+class EnemyScheduler:
+    """
+    Roue temporelle (délais courts) complétée d'un tas pour les délais au-delà de la roue.
+    L'horloge est un tick IA virtuel : tant qu'elle n'avance pas (potion de gel),
+    tout le planning est décalé d'autant sans toucher aux ennemis.
+    """
+
+    def __init__(self, enemies=(), wheel_size=ENEMY_WHEEL_SIZE, lod=None, influence=None):
+        if wheel_size <= 0 or wheel_size & (wheel_size - 1):
+            raise ValueError(f"Taille de roue invalide ({wheel_size}) : puissance de 2 attendue")
+        self.wheel_size = wheel_size
+        self.mask = wheel_size - 1
+        self.wheel = [[] for _ in range(wheel_size)]
+        self.overflow = []  # Tas (tick, ordre, ennemi) des actions hors de la roue
+        self.sequence = 0
+        self.due_ticks = {}  # ennemi -> tick de sa prochaine action
+        self.tick = 0
+        self.lod = lod  # AILevelOfDetail optionnel (None : tous les ennemis à pleine cadence)
+        self.influence = influence  # InfluenceMap partagée, transmise aux ennemis qui agissent
+        self.planner = None  # CooperativePlanner optionnel (il lit l'horloge de cet ordonnanceur)
+        for enemy in enemies:
+            self.add(enemy)
+
+    def __len__(self):
+        return len(self.due_ticks)
+
+    def add(self, enemy):
+        """Ajoute un ennemi avec le même délai initial que son compte à rebours par frame."""
+        self.schedule(enemy, enemy.get_first_action_delay())
+
+    def remove(self, enemy):
+        """Retire un ennemi ; ses entrées restantes dans la roue sont ignorées au réveil."""
+        self.due_ticks.pop(enemy, None)
+        if self.lod is not None:
+            self.lod.forget(enemy)
+        if self.planner is not None:
+            self.planner.forget(enemy)
+
+    def schedule(self, enemy, delay):
+        """Programme la prochaine action de l'ennemi dans `delay` ticks (au moins 1)."""
+        due = self.tick + max(1, delay)
+        self.due_ticks[enemy] = due
+        if due - self.tick < self.wheel_size:
+            self.wheel[due & self.mask].append(enemy)
+        else:
+            heapq.heappush(self.overflow, (due, self.sequence, enemy))
+            self.sequence += 1
+
+    def get_schedule(self):
+        """
+        Ennemis programmés et tick de leur prochaine action, dans l'ordre exact où ils
+        seront réveillés (ordre des cases de la roue, puis du tas) : de quoi reconstruire
+        un ordonnanceur identique avec restore_schedule().
+        """
+        entries = []
+        seen = set()
+        for due in range(self.tick + 1, self.tick + self.wheel_size):
+            for enemy in self.wheel[due & self.mask]:
+                if self.due_ticks.get(enemy) == due and enemy not in seen:
+                    seen.add(enemy)
+                    entries.append((enemy, due))
+        for due, _, enemy in sorted(self.overflow, key=lambda entry: entry[:2]):
+            if self.due_ticks.get(enemy) == due and enemy not in seen:
+                seen.add(enemy)
+                entries.append((enemy, due))
+        return entries
+
+    def restore_schedule(self, tick, entries):
+        """Remet l'horloge à `tick` et reprogramme les ennemis [(ennemi, tick dû)] dans cet ordre."""
+        self.wheel = [[] for _ in range(self.wheel_size)]
+        self.overflow = []
+        self.due_ticks = {}
+        self.tick = tick
+        for enemy, due in entries:
+            self.schedule(enemy, due - tick)
+
+    def get_due_tick(self, enemy):
+        """Tick de la prochaine action de l'ennemi (None s'il n'est pas programmé)."""
+        return self.due_ticks.get(enemy)
+
+    def advance(self, player_pos, maze, visible_range=None):
+        """
+        Avance d'un tick et fait agir les ennemis dont l'action est due ; retourne leur nombre.
+        visible_range: plage (x0, y0, x1, y1) des cases à l'écran, pour les niveaux de détail.
+        """
+        self.tick += 1
+        # Les actions lointaines entrent dans la roue dès qu'elles sont à sa portée
+        while self.overflow and self.overflow[0][0] - self.tick < self.wheel_size:
+            due, _, enemy = heapq.heappop(self.overflow)
+            self.wheel[due & self.mask].append(enemy)
+
+        index = self.tick & self.mask
+        slot = self.wheel[index]
+        if not slot:
+            return 0
+        self.wheel[index] = []
+
+        woken = 0
+        for enemy in slot:
+            if self.due_ticks.get(enemy) != self.tick:
+                continue  # Entrée périmée (ennemi retiré ou reprogrammé)
+            if self.lod is None:
+                enemy.act(player_pos, maze, self.influence, self.planner)
+                delay = enemy.get_action_interval()
+            else:
+                delay = self.lod.wake(enemy, player_pos, maze, visible_range, self.tick,
+                                       self.influence, self.planner)
+            woken += 1
+            self.schedule(enemy, delay)
+        return woken
@@ -5,18 +5,32 @@ Version révisée avec mouvement grid-based.
 
 import random
 from collections import deque
+from types import MappingProxyType
 from config_new import (
     EnemyType, ItemType, PLAYER_MAX_HEALTH, PLAYER_INVINCIBILITY_DURATION,
     PLAYER_KNOCKBACK_DURATION, DIFFICULTY_SETTINGS, DIRECTIONS, FPS
 )
+from trail_buffer import TrailBuffer
 
-print(">>> entities_new.py: Démarrage du module")
 
 class Player:
     """Représente le joueur contrôlé par l'utilisateur (mouvement case par case)."""
     
+    __slots__ = (
+        "grid_x", "grid_y", "health", "max_health", "potions_collected", "total_potions",
+        "invincible", "invincible_timer", "knockback_direction", "knockback_timer", "trail",
+        "dash_cooldown", "dash_active", "dash_direction", "dash_progress", "dash_speed",
+        "dash_target", "last_direction", "moves", "damage_taken", "telemetry",
+    )
+    
     def __init__(self, x, y, total_potions):
         print(f">>> Player: Initialisation à ({x}, {y}) avec {total_potions} potions totales")
+        self.trail = TrailBuffer()  # Positions précédentes avec timestamp (tampon circulaire)
+        self.telemetry = None  # Cartes de chaleur (voir telemetry.py), branchées par le jeu
+        self.reset(x, y, total_potions)
+    
+    def reset(self, x, y, total_potions):
+        """Remet le joueur à l'état de début de partie (réutilisé d'une partie à l'autre)."""
         self.grid_x = x  # Position en cases
         self.grid_y = y
         self.health = PLAYER_MAX_HEALTH
@@ -27,14 +41,18 @@ class Player:
         self.invincible_timer = 0
         self.knockback_direction = (0, 0)
         self.knockback_timer = 0
-        self.trail = []  # Liste des positions précédentes avec timestamp
+        self.trail.clear()
         # Dash magique (mode Extrême uniquement)
         self.dash_cooldown = 0  # Temps restant avant prochain dash (ms)
         self.dash_active = False  # En cours de dash
         self.dash_direction = (0, 0)  # Direction du dash
         self.dash_progress = 0  # Progression du dash (0-1)
         self.dash_speed = 0.3  # Vitesse de déplacement par case (en fraction)
+        self.dash_target = None  # Case d'arrivée du dash en cours
         self.last_direction = (0, -1)  # Dernière direction de déplacement (haut par défaut)
+        # Statistiques de la partie (historique des parties)
+        self.moves = 0
+        self.damage_taken = 0
     
     def move(self, direction, maze):
         """
@@ -54,12 +72,13 @@ class Player:
         if maze.is_walkable(new_x, new_y):
             # Ajouter l'ancienne position à la traînée (avec timestamp)
             import pygame
-            self.trail.append((self.grid_x, self.grid_y, pygame.time.get_ticks()))
+            self.trail.append(self.grid_x, self.grid_y, pygame.time.get_ticks())
             # Déplacer
             self.grid_x = new_x
             self.grid_y = new_y
             # Mettre à jour la dernière direction
             self.last_direction = (dx, dy)
+            self.moves += 1
             print(f">>> Player: Déplacement vers ({self.grid_x}, {self.grid_y})")
             return True
         else:
@@ -69,9 +88,12 @@ class Player:
     def take_damage(self, amount=1):
         """Inflige des dégâts au joueur et active l'invincibilité temporaire."""
         if not self.invincible:
+            self.damage_taken += min(amount, self.health)
             self.health = max(0, self.health - amount)
             self.invincible = True
             self.invincible_timer = PLAYER_INVINCIBILITY_DURATION
+            if self.telemetry is not None:
+                self.telemetry.record_damage(self.grid_x, self.grid_y)
             import traceback
             # Capturer la pile d'appel pour savoir d'où viennent les dégâts
             stack = traceback.extract_stack()
@@ -115,18 +137,8 @@ class Player:
         # Vérifier si la direction est valide (au moins une composante non nulle)
         if dx == 0 and dy == 0:
             return False
-        # Calculer la distance de dash (3 cases)
-        target_x = self.grid_x + dx * 3
-        target_y = self.grid_y + dy * 3
-        # Vérifier les obstacles sur le chemin
-        for step in range(1, 4):
-            check_x = self.grid_x + dx * step
-            check_y = self.grid_y + dy * step
-            if not maze.is_walkable(check_x, check_y):
-                # S'arrêter avant l'obstacle
-                target_x = self.grid_x + dx * (step - 1)
-                target_y = self.grid_y + dy * (step - 1)
-                break
+        # Distance de dash : 3 cases, en s'arrêtant avant le premier obstacle
+        target_x, target_y = maze.cast_ray((self.grid_x, self.grid_y), direction, 3)
         # Activer le dash
         self.dash_active = True
         self.dash_direction = (dx, dy)
@@ -165,8 +177,8 @@ class Player:
                 self.dash_active = False
                 print(f">>> Player: Dash terminé à ({self.grid_x}, {self.grid_y})")
         
-        # Nettoyer la traînée (supprimer les positions de plus de 1000 ms)
-        self.trail = [(x, y, t) for (x, y, t) in self.trail if current_time - t <= 1000]
+        # Nettoyer la traînée (positions de plus de TRAIL_DURATION_MS, sans recopie)
+        self.trail.expire(current_time)
     
     def collect_potion(self):
         """Collecte une potion."""
@@ -192,7 +204,17 @@ class Player:
 class Enemy:
     """Représente un ennemi avec IA."""
     
+    __slots__ = (
+        "grid_x", "grid_y", "type", "difficulty", "speed", "ai_type", "detection_range_base",
+        "cooldown_moves", "night_blindness", "move_timer", "target", "cooldown_counter",
+        "color", "attack_range", "can_phase",
+    )
+    
     def __init__(self, x, y, enemy_type, difficulty):
+        self.reset(x, y, enemy_type, difficulty)
+    
+    def reset(self, x, y, enemy_type, difficulty):
+        """(Ré)initialise l'ennemi ; appelé aussi par EntityPool pour réutiliser l'instance."""
         self.grid_x = x
         self.grid_y = y
         self.type = enemy_type
@@ -210,18 +232,19 @@ class Enemy:
         self.cooldown_counter = 0  # Compteur de cooldown pour le mode stalker
         
         # Attributs spécifiques au type
+        self.attack_range = None
+        self.can_phase = False  # Peut traverser les murs ? (pour future extension)
         if enemy_type == EnemyType.WIZARD:
             self.color = "purple"
             self.attack_range = 2
         elif enemy_type == EnemyType.GHOST:
             self.color = "cyan"
-            self.can_phase = False  # Peut traverser les murs ? (pour future extension)
         elif enemy_type == EnemyType.MONSTER:
             self.color = "red"
             self.attack_range = 1
     
     def update(self, player_pos, maze):
-        """Met à jour la position de l'ennemi selon son IA."""
+        """Met à jour la position de l'ennemi selon son IA (compte à rebours par frame)."""
         self.move_timer -= 1
         if self.move_timer > 0:
             return
@@ -229,26 +252,64 @@ class Enemy:
         # Réinitialiser le timer de mouvement
         self.move_timer = self.speed
         
-        # Choix du comportement selon l'IA
-        if self.ai_type == "stalker" and self.detection_range_base > 0:
-            # Gestion du cooldown
+        # Gestion du cooldown du mode stalker : un réveil sur `cooldown_moves` est actif
+        if self.is_stalker():
             self.cooldown_counter += 1
-            if self.cooldown_counter >= self.cooldown_moves:
-                self.cooldown_counter = 0
-                if self.can_see_player(player_pos, maze):
-                    self.move_towards_player(player_pos, maze)
-                else:
-                    self.patrol(maze)
-            else:
+            if self.cooldown_counter < self.cooldown_moves:
                 # Cooldown : l'ennemi reste immobile
-                pass
-        elif self.ai_type == "hunter" and self.detection_range_base > 0:
+                return
+            self.cooldown_counter = 0
+        self.act(player_pos, maze)
+    
+    def is_stalker(self):
+        """Retourne True si l'ennemi suit l'IA stalker (mouvement ralenti par un cooldown)."""
+        return self.ai_type == "stalker" and self.detection_range_base > 0
+    
+    def get_action_interval(self):
+        """Nombre de frames entre deux actions effectives (cooldown stalker compris)."""
+        if self.is_stalker():
+            return self.speed * self.cooldown_moves
+        return self.speed
+    
+    def get_first_action_delay(self):
+        """Frames avant la première action, identique au compte à rebours de update()."""
+        if self.is_stalker():
+            return 1 + self.speed * (self.cooldown_moves - 1)
+        return 1
+    
+    def act(self, player_pos, maze, influence=None, planner=None):
+        """
+        Choisit et effectue un mouvement selon l'IA (appelé quand l'action est due).
+        influence: InfluenceMap partagée (difficultés avec "influence_ai"), sinon patrouille aléatoire.
+        planner: CooperativePlanner partagé (difficultés avec "cooperative_ai") pour les poursuites.
+        """
+        if self.ai_type in ("stalker", "hunter") and self.detection_range_base > 0:
             if self.can_see_player(player_pos, maze):
-                self.move_towards_player(player_pos, maze)
-            else:
-                self.patrol(maze)
-        else:
-            self.patrol(maze)
+                if planner is not None:
+                    self.follow_plan(player_pos, planner)
+                else:
+                    self.move_towards_player(player_pos, maze)
+                return
+            if planner is not None:
+                planner.forget(self)
+        if influence is not None and self.follow_influence(influence):
+            return
+        self.patrol(maze)
+    
+    def follow_influence(self, influence):
+        """Avance vers la case voisine de plus forte influence ; False si le signal est trop faible."""
+        step = influence.choose_step(self.grid_x, self.grid_y)
+        if step is None:
+            return False
+        self.grid_x, self.grid_y = step
+        return True
+    
+    def follow_plan(self, player_pos, planner):
+        """Exécute le coup réservé pour ce tick (ou attend) dans la poursuite coopérative."""
+        step = planner.next_step(self, player_pos)
+        if step != (self.grid_x, self.grid_y):
+            self.grid_x, self.grid_y = step
+            print(f">>> Enemy {self.type.name}: Déplacement coopératif vers ({self.grid_x}, {self.grid_y})")
     
     def can_see_player(self, player_pos, maze):
         """Vérifie si le joueur est dans le rayon de détection."""
@@ -272,11 +333,19 @@ class Enemy:
         return distance <= detection_range
     
     def move_towards_player(self, player_pos, maze):
-        """Déplace l'ennemi vers le joueur (chemin le plus court simplifié)."""
+        """Déplace l'ennemi d'une case sur le plus court chemin vers le joueur (JPS en cache)."""
+        step = maze.next_step_towards((self.grid_x, self.grid_y), player_pos)
+        if step is None:
+            # Joueur inaccessible : se rapprocher à vol d'oiseau
+            step = self.get_greedy_step(player_pos, maze)
+        if step is not None:
+            self.grid_x, self.grid_y = step
+            print(f">>> Enemy {self.type.name}: Déplacement chasseur vers ({self.grid_x}, {self.grid_y})")
+    
+    def get_greedy_step(self, player_pos, maze):
+        """Case voisine qui réduit le plus la distance de Manhattan au joueur (ou None)."""
         px, py = player_pos
-        
-        # Chercher la direction qui rapproche le plus du joueur
-        best_dir = None
+        best_step = None
         best_distance = float('inf')
         
         for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
@@ -285,14 +354,8 @@ class Enemy:
                 distance = abs(nx - px) + abs(ny - py)
                 if distance < best_distance:
                     best_distance = distance
-                    best_dir = (dx, dy)
-        
-        if best_dir:
-            dx, dy = best_dir
-            if maze.is_walkable(self.grid_x + dx, self.grid_y + dy):
-                self.grid_x += dx
-                self.grid_y += dy
-                print(f">>> Enemy {self.type.name}: Déplacement chasseur vers ({self.grid_x}, {self.grid_y})")
+                    best_step = (nx, ny)
+        return best_step
     
     def patrol(self, maze):
         """Déplacement aléatoire."""
@@ -315,10 +378,49 @@ class Enemy:
         return f"Enemy({self.grid_x},{self.grid_y}) {self.type.name}"
 
 
+# Résultats d'ouverture de coffre : un seul dictionnaire en lecture seule par issue,
+# partagé par tous les coffres (au lieu d'un nouveau dict à chaque ouverture)
+CHEST_RESULTS = {
+    ("trap", "damage"): MappingProxyType({"type": "trap", "subtype": "damage"}),
+    ("trap", "fog"): MappingProxyType({"type": "trap", "subtype": "fog"}),
+    ("bonus", "health"): MappingProxyType({"type": "bonus", "subtype": "health"}),
+    ("neutral", "empty"): MappingProxyType({"type": "neutral", "subtype": "empty"}),
+}
+
+# Tirages partagés avec l'environnement par lots : (seuil cumulé, issue), dans l'ordre
+# Coffres : 30% dégât, 20% brouillard, 20% vie, 30% vide
+CHEST_ODDS = (
+    (0.30, ("trap", "damage")),
+    (0.50, ("trap", "fog")),
+    (0.70, ("bonus", "health")),
+    (1.00, ("neutral", "empty")),
+)
+# Potions : 70% normale, 15% vision, 15% gel
+POTION_ODDS = (
+    (0.70, ItemType.POTION_NORMAL),
+    (0.85, ItemType.POTION_VISION),
+    (1.00, ItemType.POTION_FREEZE),
+)
+
+
+def draw(odds, r):
+    """Issue d'un tirage r dans [0, 1) selon une table (seuil cumulé, issue)."""
+    for threshold, outcome in odds:
+        if r < threshold:
+            return outcome
+    return odds[-1][1]
+
+
 class Item:
     """Représente un objet interactif (potion, coffre)."""
     
+    __slots__ = ("grid_x", "grid_y", "type", "collected", "effect", "chest_opened", "chest_result")
+    
     def __init__(self, x, y, item_type):
+        self.reset(x, y, item_type)
+    
+    def reset(self, x, y, item_type):
+        """(Ré)initialise l'objet ; appelé aussi par EntityPool pour réutiliser l'instance."""
         self.grid_x = x
         self.grid_y = y
         self.type = item_type
@@ -332,7 +434,7 @@ class Item:
         self.collected = True
     
     def open_chest(self):
-        """Ouvre un coffre et détermine aléatoirement le résultat."""
+        """Ouvre un coffre et détermine aléatoirement le résultat (mapping partagé, lecture seule)."""
         import random
         if self.type != ItemType.CHEST:
             return None
@@ -341,25 +443,11 @@ class Item:
             print(f">>> Item.open_chest: Coffre déjà ouvert à ({self.grid_x}, {self.grid_y}) - sécurité")
             return None
         self.chest_opened = True
-        # Nouvelles probabilités selon spécification
-        # 30% dégât, 20% brouillard, 20% vie, 30% vide
+        # Issue tirée selon CHEST_ODDS (30% dégât, 20% brouillard, 20% vie, 30% vide)
         r = random.random()
-        if r < 0.30:
-            # Piège dégât (30%)
-            self.chest_result = "trap"
-            return {"type": "trap", "subtype": "damage"}
-        elif r < 0.50:
-            # Piège brouillard étendu (20%)
-            self.chest_result = "trap"
-            return {"type": "trap", "subtype": "fog"}
-        elif r < 0.70:
-            # Bonus vie (20%)
-            self.chest_result = "bonus"
-            return {"type": "bonus", "subtype": "health"}
-        else:
-            # Neutre/vide (30%)
-            self.chest_result = "neutral"
-            return {"type": "neutral", "subtype": "empty"}
+        result = CHEST_RESULTS[draw(CHEST_ODDS, r)]
+        self.chest_result = result["type"]
+        return result
     
     def get_grid_position(self):
         """Retourne la position de l'objet en cases."""
@@ -381,43 +469,72 @@ class Item:
             return f"Item({self.grid_x},{self.grid_y}) {self.type.name}"
 
 
-def create_enemies_from_maze(maze, difficulty):
-    """Crée une liste d'ennemis à partir des positions du labyrinthe."""
+class EntityPool:
+    """
+    Réserve d'entités d'une classe (Enemy, Item) réutilisées d'une partie à l'autre :
+    release_all() rend toutes les entités distribuées, acquire() les réinitialise
+    avec reset() au lieu d'en allouer de nouvelles.
+    """
+    
+    __slots__ = ("factory", "free", "active", "created", "reused")
+    
+    def __init__(self, factory):
+        self.factory = factory
+        self.free = []
+        self.active = []
+        self.created = 0
+        self.reused = 0
+    
+    def acquire(self, *args):
+        """Entité initialisée avec args (réutilisée si la réserve en contient une)."""
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args)
+            self.reused += 1
+        else:
+            entity = self.factory(*args)
+            self.created += 1
+        self.active.append(entity)
+        return entity
+    
+    def release_all(self):
+        """Rend à la réserve toutes les entités distribuées (fin de partie)."""
+        self.free.extend(self.active)
+        self.active.clear()
+    
+    def __len__(self):
+        return len(self.free) + len(self.active)
+
+
+def create_enemies_from_maze(maze, difficulty, pool=None):
+    """Crée une liste d'ennemis à partir des positions du labyrinthe (pris dans `pool` s'il est fourni)."""
     enemies = []
     enemy_types = list(EnemyType)
+    make_enemy = pool.acquire if pool is not None else Enemy
     
     for i, (x, y) in enumerate(maze.enemy_positions):
         enemy_type = enemy_types[i % len(enemy_types)]
-        enemy = Enemy(x, y, enemy_type, difficulty)
+        enemy = make_enemy(x, y, enemy_type, difficulty)
         enemies.append(enemy)
     
     print(f">>> create_enemies_from_maze: {len(enemies)} ennemis créés")
     return enemies
 
 
-def create_items_from_maze(maze):
-    """Crée une liste d'items à partir des positions du labyrinthe."""
+def create_items_from_maze(maze, pool=None):
+    """Crée une liste d'items à partir des positions du labyrinthe (pris dans `pool` s'il est fourni)."""
     items = []
+    make_item = pool.acquire if pool is not None else Item
     
-    # Distribution probabiliste des potions
-    # 70% normale, 15% vision, 15% freeze
-    import random
-    
+    # Distribution probabiliste des potions (POTION_ODDS : 70% normale, 15% vision, 15% freeze)
     for i, (x, y) in enumerate(maze.potions):
-        r = random.random()
-        if r < 0.70:
-            potion_type = ItemType.POTION_NORMAL
-        elif r < 0.85:
-            potion_type = ItemType.POTION_VISION
-        else:
-            potion_type = ItemType.POTION_FREEZE
-        item = Item(x, y, potion_type)
+        item = make_item(x, y, draw(POTION_ODDS, random.random()))
         items.append(item)
     
     # Coffres
     for x, y in maze.chests:
-        chest_item = Item(x, y, ItemType.CHEST)
+        chest_item = make_item(x, y, ItemType.CHEST)
         items.append(chest_item)
     
     print(f">>> create_items_from_maze: {len(items)} items créés ({len(maze.potions)} potions)")
-    return items
\ No newline at end of file
+    return items
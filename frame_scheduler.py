@@ -0,0 +1,113 @@
+"""
+Ordonnanceur de frames asynchrone : attend exactement le temps restant de la
+frame avec asyncio (au lieu de l'attente bloquante de pygame.time.Clock.tick),
+ce qui laisse tourner les autres coroutines (pygbag, tâches de fond) pendant le
+budget inutilisé.
+"""
+
+import asyncio
+import time
+from config_new import FPS, IDLE_FPS
+
+
+class FrameScheduler:
+    """Cadence la boucle de jeu et mesure dépassements et dérive des frames."""
+
+    def __init__(self, fps=FPS, idle_fps=IDLE_FPS, clock=time.perf_counter, sleep=asyncio.sleep):
+        """clock (secondes) et sleep (coroutine) remplaçables : cadence vérifiable sans horloge réelle."""
+        self.clock = clock
+        self.sleep = sleep
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.target_fps = fps
+        self.idle = False
+
+        self.frame_start = clock()
+        self.next_deadline = None
+        self.frame_time_ms = 0.0   # Durée réelle de la dernière frame (remplace Clock.get_time)
+        self.work_time_ms = 0.0    # Temps de calcul de la dernière frame (hors attente)
+
+        # Statistiques
+        self.frames = 0
+        self.overruns = 0          # Frames dont le calcul a dépassé le budget
+        self.resyncs = 0           # Échéances recalées après un gros retard
+        self.total_drift_ms = 0.0  # Retard cumulé du réveil par rapport à l'échéance
+        self.max_drift_ms = 0.0
+
+        # Coroutines de fond (gardées référencées jusqu'à leur fin)
+        self.background_tasks = set()
+
+    def set_idle(self, idle):
+        """Passe au rythme réduit (menus, pause, écrans de fin) ou revient au rythme normal."""
+        if idle == self.idle:
+            return
+        self.idle = idle
+        self.target_fps = self.idle_fps if idle else self.fps
+        # Nouvelle cadence à partir de maintenant (pas de rattrapage)
+        self.next_deadline = None
+        print(f">>> FrameScheduler: Cadence {self.target_fps} FPS ({'repos' if idle else 'jeu'})")
+
+    def get_frame_period(self):
+        """Durée cible d'une frame en secondes."""
+        return 1.0 / self.target_fps
+
+    def time_left(self):
+        """Temps restant (s) avant la prochaine frame ; utile aux tâches de fond découpées."""
+        if self.next_deadline is None:
+            return 0.0
+        return max(0.0, self.next_deadline - self.clock())
+
+    async def wait_next_frame(self):
+        """Attend la fin de la frame courante en rendant la main à la boucle asyncio."""
+        period = self.get_frame_period()
+        now = self.clock()
+        self.work_time_ms = (now - self.frame_start) * 1000
+        if self.next_deadline is None:
+            self.next_deadline = self.frame_start + period
+
+        remaining = self.next_deadline - now
+        if remaining > 0:
+            await self.sleep(remaining)
+        else:
+            self.overruns += 1
+            # Toujours céder la main, même en retard
+            await self.sleep(0)
+            if -remaining > period:
+                # Plus d'une frame de retard : recaler plutôt que d'enchaîner des frames en rafale
+                self.next_deadline = self.clock()
+                self.resyncs += 1
+
+        woke = self.clock()
+        drift_ms = max(0.0, (woke - self.next_deadline) * 1000)
+        self.total_drift_ms += drift_ms
+        self.max_drift_ms = max(self.max_drift_ms, drift_ms)
+
+        self.frames += 1
+        self.frame_time_ms = (woke - self.frame_start) * 1000
+        self.frame_start = woke
+        self.next_deadline += period
+
+    def spawn(self, coroutine):
+        """Lance une coroutine de fond qui s'exécute pendant le temps libre des frames."""
+        task = asyncio.ensure_future(coroutine)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
+
+    def get_stats(self):
+        """Statistiques de cadence depuis le démarrage."""
+        frames = max(1, self.frames)
+        return {
+            "frames": self.frames,
+            "overruns": self.overruns,
+            "resyncs": self.resyncs,
+            "mean_drift_ms": self.total_drift_ms / frames,
+            "max_drift_ms": self.max_drift_ms,
+        }
+
+    def print_report(self):
+        """Affiche le bilan de cadence."""
+        stats = self.get_stats()
+        print(f">>> FrameScheduler: {stats['frames']} frames, {stats['overruns']} dépassements, "
+              f"{stats['resyncs']} recalages, dérive moyenne {stats['mean_drift_ms']:.2f} ms "
+              f"(max {stats['max_drift_ms']:.2f} ms)")
@@ -3,47 +3,103 @@ Classe principale du jeu - Version révisée avec boucle d'événements correcte
 """
 
 import pygame
+import asyncio
+import gc
 import time
-import json
+import sqlite3
 import os
-import asyncio
 from config_new import (
     SCREEN_WIDTH, SCREEN_HEIGHT, FPS, COLORS, get_controls, DIFFICULTY_SETTINGS,
-    GameState, Difficulty, CellType, ItemType, DIRECTIONS, HIGHSCORE_FILE
+    GameState, Difficulty, CellType, ItemType, DIRECTIONS,
+    MINIMAP_MIN_GRID_SIZE, AI_LOD_ENABLED, AUTOSAVE_FILE, SNAPSHOT_INTERVAL_MS, AUTOSAVE_INTERVAL_MS,
+    POTION_VISION_DURATION_MS, POTION_FREEZE_DURATION_MS, GENERATION_SLICE_MS, LOADING_CARVE_ANIMATION,
+    SHIFTING_INTERVAL_MS, COOP_HEADLESS_PLANS
 )
-from maze_new import generate_valid_maze
-from entities_new import Player, create_enemies_from_maze, create_items_from_maze
+from maze_new import generate_valid_maze, iter_generate_valid_maze, generation_progress
+from entities_new import Player, Enemy, Item, EntityPool, create_enemies_from_maze, create_items_from_maze
+from enemy_scheduler import EnemyScheduler
+from ai_lod import AILevelOfDetail
+from influence import InfluenceMap
+from cooperative import CooperativePlanner
+from shifting_walls import ShiftingWalls
+from run_history import RunHistory, OUTCOME_WIN, OUTCOME_DEATH, OUTCOME_QUIT
+import snapshot
+import telemetry
 from renderer_new import Renderer
+from minimap import Minimap
+from frame_scheduler import FrameScheduler
+import startup_trace
+
 
-print(">>> game_new.py: Démarrage du module")
+# États où le jeu tourne au rythme réduit IDLE_FPS
+IDLE_STATES = (GameState.MENU, GameState.PAUSED, GameState.WIN, GameState.GAME_OVER)
+
+# Libellés des phases de génération affichés pendant le chargement
+LOADING_PHASE_LABELS = {
+    "grid": "Construction de la grille",
+    "carve": "Creusement des couloirs",
+    "walls": "Murs intérieurs",
+    "flood": "Cases accessibles",
+    "place": "Placement des objets",
+    "validate": "Vérification",
+}
 
 class Game:
     """Classe principale du jeu."""
     
-    def __init__(self):
+    def __init__(self, grid_size=None, headless=False):
         print(">>> Game: Initialisation (pièges supprimés, unification visuelle coffres)")
-        pygame.init()
+        # Sans affichage (tournois de bots) : pilote vidéo factice, ni historique ni sauvegarde
+        self.headless = headless
+        if headless:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        # Démarrage paresseux : le menu n'a besoin que de l'affichage et des polices ;
+        # les autres sous-systèmes et les sprites sont chargés après sa première frame
+        pygame.display.init()
+        pygame.font.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Labyrinthe Pygame - Redéveloppement")
-        self.clock = pygame.time.Clock()
+        startup_trace.mark("display")
+        self.scheduler = FrameScheduler()
         self.running = True
         
         # État du jeu
         self.state = GameState.MENU
         self.difficulty = Difficulty.EASY
+        self.grid_size = grid_size  # Taille de labyrinthe personnalisée (None = selon la difficulté)
         
         # Composants
         self.maze = None
         self.player = None
         self.enemies = []
+        self.enemy_scheduler = EnemyScheduler()
+        self.influence_map = None
+        self.cooperative_planner = None
         self.items = []
-        self.renderer = Renderer(self.screen)
+        # Réserves d'entités réutilisées d'une partie à l'autre (pas de réallocation)
+        self.enemy_pool = EntityPool(Enemy)
+        self.item_pool = EntityPool(Item)
+        self.renderer = Renderer(self.screen, load_sprites=False)
+        self.sprite_loader = self.renderer.iter_load_sprites()  # Avancé en tâche de fond
+        self.subsystems_ready = False
         
         # Variables de jeu
         self.start_time = None
         self.elapsed_time = 0
         self.new_highscore = False
+        self.run_history = None if headless else self.open_run_history()
         self.highscores = self.load_highscores()
+        # Instantanés : anneau en mémoire (retour en arrière) et sauvegarde automatique sur disque
+        self.autosave = None if headless else snapshot.AutosaveWriter(AUTOSAVE_FILE)
+        self.rollback_ring = snapshot.RollbackRing()
+        self.next_snapshot = 0  # Ticks du prochain instantané en mémoire
+        self.next_autosave = 0  # Ticks de la prochaine écriture sur disque
+        self.saved_run_available = self.autosave is not None and os.path.exists(AUTOSAVE_FILE)
+        # Cartes de chaleur (passages, dégâts, morts, coffres, dashs) et couche affichée (touche H)
+        self.telemetry = None if headless else telemetry.Telemetry()
+        self.heatmap_layer = None
+        self.heatmap_label = None
         self.damage_flash_end = 0  # Timestamp de fin du flash rouge (ms)
         self.potion_effects = {
             "vision": 0,  # Timestamp de fin de l'effet vision (ms)
@@ -54,39 +110,56 @@ class Game:
         self.compass_target = None  # (x, y) de la potion cible
         self.compass_cooldown = 0   # Temps restant avant réactivation (ms)
         self.compass_active = True  # La boussole est-elle active ?
+        self.compass_key = None     # (position, potions restantes, révision) du dernier calcul
+        self.compass_path_target = None
+        self.uncollected_potions = []  # Positions des potions restantes (boussole + minimap)
+        # Minimap (affichée d'office sur les grands labyrinthes, touche M pour basculer)
+        self.minimap = None
+        self.minimap_visible = False
+        self.rivals = []  # Autres coureurs affichés (course en réseau, voir net_game.py)
         
         # Sélection du menu
         self.selected_option = 0  # 0-3 pour les 4 difficultés
+        self.shifting_walls_mode = False  # Mode murs mouvants (touche W du menu)
+        self.shifting_walls = None
+        self.next_wall_shift = 0
+        # Chargement découpé (état LOADING) : génération en cours et son avancement
+        self.loading = None
+        self.loading_maze = None
+        self.loading_phase = None
+        self.loading_progress = 0.0
+        self.loading_preview = None   # Aperçu du creusement (une case = un pixel)
+        self.loading_carved = 0       # Cases de carve_order déjà peintes dans l'aperçu
         
         print(">>> Game: Initialisation terminée")
     
+    def open_run_history(self):
+        """Ouvre l'historique des parties (None si la base est inutilisable : rien n'est enregistré)."""
+        try:
+            return RunHistory()
+        except sqlite3.Error as e:
+            print(f">>> Game: Historique des parties indisponible: {e}")
+            return None
+    
     def load_highscores(self):
-        """Charge les meilleurs scores depuis le fichier JSON."""
-        default_scores = {
-            "easy": 0.0,
-            "medium": 0.0,
-            "hard": 0.0,
-            "extreme": 0.0
-        }
-        
-        if os.path.exists(HIGHSCORE_FILE):
-            try:
-                with open(HIGHSCORE_FILE, "r") as f:
-                    scores = json.load(f)
-                    # Fusionner avec les valeurs par défaut
-                    for key in default_scores:
-                        if key in scores:
-                            default_scores[key] = float(scores[key])
-                print(">>> Game: High scores chargés")
-            except Exception as e:
-                print(f">>> Game: Erreur lors du chargement des high scores: {e}")
-        else:
-            print(">>> Game: Fichier highscore.json non trouvé, utilisation des valeurs par défaut")
-        
-        return default_scores
+        """Meilleurs temps par difficulté, lus dans l'historique des parties."""
+        if self.run_history is None:
+            return {"easy": 0.0, "medium": 0.0, "hard": 0.0, "extreme": 0.0}
+        scores = self.run_history.best_times()
+        print(">>> Game: High scores chargés")
+        return scores
+    
+    def record_run(self, outcome):
+        """Dépose la partie terminée dans l'historique (écrite en tâche de fond, sans attendre)."""
+        if self.run_history is None or self.maze is None or self.player is None:
+            return
+        self.run_history.record_run(
+            self.maze.seed, self.difficulty.name.lower(), self.elapsed_time, self.player.moves,
+            self.player.damage_taken, self.player.potions_collected, outcome)
     
     def save_highscore(self):
-        """Sauvegarde un nouveau high score si battu."""
+        """Enregistre la victoire ; retourne True si le meilleur temps est battu."""
+        self.record_run(OUTCOME_WIN)
         diff_key = self.difficulty.name.lower()
         current_best = self.highscores.get(diff_key, 0.0)
         
@@ -94,45 +167,214 @@ class Game:
         if current_best == 0.0 or self.elapsed_time < current_best:
             self.highscores[diff_key] = self.elapsed_time
             self.new_highscore = True
-            try:
-                with open(HIGHSCORE_FILE, "w") as f:
-                    json.dump(self.highscores, f, indent=2)
-                print(f">>> Game: NOUVEAU RECORD pour {diff_key}: {self.elapsed_time:.2f}s")
-                return True
-            except Exception as e:
-                print(f">>> Game: Erreur lors de la sauvegarde du high score: {e}")
+            print(f">>> Game: NOUVEAU RECORD pour {diff_key}: {self.elapsed_time:.2f}s")
+            return True
         
         return False
     
-    def reset_game(self, difficulty):
-        """Réinitialise le jeu pour une nouvelle partie."""
+    def init_subsystems(self):
+        """Initialise les sous-systèmes pygame restants (horloge, son, manettes)."""
+        if not self.subsystems_ready:
+            pygame.init()
+            self.subsystems_ready = True
+            startup_trace.mark("subsystems")
+    
+    def ensure_started(self):
+        """Termine tout de suite le démarrage différé (partie lancée avant la fin du chargement)."""
+        self.init_subsystems()
+        for _ in self.sprite_loader:
+            pass
+        startup_trace.mark("sprites")
+    
+    async def finish_startup(self):
+        """Tâche de fond : sous-systèmes puis sprites, une étape par tour de boucle."""
+        await asyncio.sleep(0)  # Laisser passer la première frame du menu
+        self.init_subsystems()
+        for _ in self.sprite_loader:
+            await asyncio.sleep(0)
+        startup_trace.mark("sprites")
+    
+    def reset_game(self, difficulty, seed=None):
+        """Réinitialise le jeu pour une nouvelle partie (labyrinthe rejouable si seed est donnée)."""
         print(f">>> Game: Réinitialisation du jeu pour la difficulté {difficulty}")
+        self.abandon_saved_run()
+        # Générer un labyrinthe valide
+        self.start_game(difficulty, generate_valid_maze(difficulty, grid_size=self.grid_size, seed=seed))
+        self.reset_snapshots()
+    
+    def begin_loading(self, difficulty, seed=None):
+        """
+        Lance une nouvelle partie sans bloquer la boucle : la génération avance de
+        GENERATION_SLICE_MS par frame (update_loading) pendant l'écran de chargement.
+        """
+        print(f">>> Game: Chargement d'une partie {difficulty}")
+        # Objets gelés par le chargement précédent (voir update_loading) rendus au ramasse-miettes :
+        # une seule collecte complète au lancement, aucune pendant le chargement ni la partie
+        gc.unfreeze()
+        gc.collect()
+        self.difficulty = difficulty
+        self.loading = iter_generate_valid_maze(difficulty, grid_size=self.grid_size, seed=seed)
+        self.loading_maze = None
+        self.loading_phase = None
+        self.loading_progress = 0.0
+        self.loading_preview = None
+        self.loading_carved = 0
+        self.state = GameState.LOADING
+    
+    def update_loading(self):
+        """Avance la génération pendant au plus GENERATION_SLICE_MS ; démarre la partie à la fin."""
+        deadline = time.perf_counter() + GENERATION_SLICE_MS / 1000
+        try:
+            while True:
+                maze, self.loading_phase, fraction = next(self.loading)
+                # Cellules créées à cette étape hors de portée du ramasse-miettes (gel en O(1)) :
+                # une collecte complète ne parcourt jamais la grille, qui vit toute la partie
+                gc.freeze()
+                if maze is not self.loading_maze:
+                    # Nouvel essai : l'aperçu et la barre repartent de zéro
+                    self.loading_maze = maze
+                    self.loading_preview = None
+                    self.loading_carved = 0
+                    self.loading_progress = 0.0
+                # La validation est parcourue deux fois : la barre ne recule pas
+                self.loading_progress = max(self.loading_progress, generation_progress(self.loading_phase, fraction))
+                if time.perf_counter() >= deadline:
+                    return
+        except StopIteration as stop:
+            maze = stop.value
+        self.cancel_loading()
+        self.abandon_saved_run()
+        self.start_game(self.difficulty, maze)
+        self.reset_snapshots()
+    
+    def cancel_loading(self):
+        """Abandonne la génération en cours (Échap pendant le chargement)."""
+        if self.loading is not None:
+            self.loading.close()
+        self.loading = None
+        self.loading_maze = None
+        self.loading_preview = None
+    
+    def reset_snapshots(self):
+        """Repart d'un anneau vide ; premiers instantanés après un intervalle complet."""
+        now = pygame.time.get_ticks()
+        self.rollback_ring.clear()
+        self.next_snapshot = now + SNAPSHOT_INTERVAL_MS
+        self.next_autosave = now + AUTOSAVE_INTERVAL_MS
+    
+    def take_snapshot(self, save=False):
+        """Instantané de la partie, gardé pour le retour en arrière ; écrit en tâche de fond si save."""
+        data = snapshot.capture(self, pygame.time.get_ticks())
+        self.rollback_ring.push(data)
+        if save and self.autosave is not None:
+            self.autosave.submit(data)
+            self.saved_run_available = True
+        return data
+    
+    def update_snapshots(self):
+        """Instantané périodique en mémoire, et sur disque une fois sur AUTOSAVE_INTERVAL_MS."""
+        now = pygame.time.get_ticks()
+        if now < self.next_snapshot:
+            return
+        self.next_snapshot = now + SNAPSHOT_INTERVAL_MS
+        save = now >= self.next_autosave
+        if save:
+            self.next_autosave = now + AUTOSAVE_INTERVAL_MS
+        self.take_snapshot(save)
+    
+    def rewind(self, steps=1):
+        """Revient à l'instantané pris `steps` captures en arrière ; False si l'anneau est trop court."""
+        data = self.rollback_ring.rewind(steps)
+        if data is None:
+            return False
+        snapshot.restore(self, data, pygame.time.get_ticks())
+        print(f">>> Game: Retour en arrière de {steps} instantané(s)")
+        return True
+    
+    def resume_game(self):
+        """Reprend la partie sauvegardée automatiquement ; False si aucune n'est lisible."""
+        if self.autosave is None:
+            return False
+        self.autosave.flush()  # La sauvegarde de l'Échap est peut-être encore en écriture
+        try:
+            data = snapshot.read_snapshot(self.autosave.path)
+            if data is not None:
+                snapshot.restore(self, data, pygame.time.get_ticks())
+        except (OSError, snapshot.SnapshotError) as e:
+            print(f">>> Game: Sauvegarde illisible: {e}")
+            data = None
+        if data is None:
+            self.saved_run_available = False
+            return False
+        self.reset_snapshots()
+        self.rollback_ring.push(data)
+        print(f">>> Game: Partie reprise ({self.difficulty.name}, {self.elapsed_time:.1f}s)")
+        return True
+    
+    def start_game(self, difficulty, maze):
+        """Démarre une partie sur un labyrinthe donné (nouveau ou reconstruit d'une sauvegarde)."""
+        self.ensure_started()
         self.difficulty = difficulty
         self.state = GameState.PLAYING
         self.new_highscore = False
-        
-        # Générer un labyrinthe valide
-        self.maze = generate_valid_maze(difficulty)
+        self.maze = maze
         
         # Créer le joueur
         start_x, start_y = self.maze.start_pos
         settings = DIFFICULTY_SETTINGS[difficulty]
-        self.player = Player(start_x, start_y, settings["potions"])
+        if self.player is None:
+            self.player = Player(start_x, start_y, settings["potions"])
+        else:
+            self.player.reset(start_x, start_y, settings["potions"])
+        self.player.telemetry = self.telemetry
+        if self.telemetry is not None:
+            self.telemetry.begin(self.maze, difficulty)
         
-        # Créer les ennemis
-        self.enemies = create_enemies_from_maze(self.maze, difficulty)
+        # Créer les ennemis (les entités de la partie précédente retournent dans les réserves)
+        self.enemy_pool.release_all()
+        self.item_pool.release_all()
+        self.enemies = create_enemies_from_maze(self.maze, difficulty, self.enemy_pool)
+        # Cartes d'influence partagées (difficultés avec "influence_ai")
+        self.influence_map = InfluenceMap(self.maze) if settings.get("influence_ai") else None
+        self.enemy_scheduler = EnemyScheduler(self.enemies, lod=AILevelOfDetail() if AI_LOD_ENABLED else None,
+                                              influence=self.influence_map)
+        # Poursuite coopérative (difficultés avec "cooperative_ai") : plans réservés dans l'espace-temps
+        self.cooperative_planner = None
+        if settings.get("cooperative_ai"):
+            # Sans affichage (tournoi, entraînement) : budget en plans, même partie sur toute machine
+            self.cooperative_planner = CooperativePlanner(
+                self.maze, self.enemy_scheduler, plan_limit=COOP_HEADLESS_PLANS if self.headless else None)
+            self.enemy_scheduler.planner = self.cooperative_planner
+        # Murs mouvants : connexité départ/potions/sortie maintenue à chaque déplacement
+        self.shifting_walls = ShiftingWalls(self.maze, self.maze.seed) if self.shifting_walls_mode else None
+        self.next_wall_shift = pygame.time.get_ticks() + SHIFTING_INTERVAL_MS
         
         # Créer les items
-        self.items = create_items_from_maze(self.maze)
+        self.items = create_items_from_maze(self.maze, self.item_pool)
         
         # Configurer le rendu
         fog_radius = settings.get("fog_radius")
         self.renderer.init_fog(fog_radius)
+        self.renderer.set_zoom_limits(self.maze.width, self.maze.height)
+        self.renderer.set_zoom(1.0)
+        # Caméra centrée sur le départ : les niveaux de détail des ennemis ne dépendent
+        # pas de la caméra laissée par la partie précédente
+        self.renderer.update_camera(start_x, start_y, self.maze.width, self.maze.height)
+
+        # Effets et flash de la partie précédente terminés
+        self.potion_effects = {"vision": 0, "freeze": 0}
+        self.damage_flash_end = 0
         
         # Réinitialiser la boussole
         self.compass_target = None
         self.compass_cooldown = 0
         self.compass_active = True
+        self.compass_key = None
+        self.uncollected_potions = list(self.maze.potions)
+        
+        # Minimap construite une fois depuis la grille
+        self.minimap = Minimap(self.maze, fog_radius)
+        self.minimap_visible = self.maze.grid_size >= MINIMAP_MIN_GRID_SIZE
         
         # Démarrer le chronomètre
         self.start_time = time.time()
@@ -149,11 +391,27 @@ class Game:
                 self.running = False
                 print(">>> Game: QUIT event")
             
+            elif event.type == pygame.MOUSEWHEEL and self.state == GameState.PLAYING:
+                # Molette : zoom continu
+                if event.y > 0:
+                    self.renderer.zoom_in()
+                elif event.y < 0:
+                    self.renderer.zoom_out()
+            
             elif event.type == pygame.KEYDOWN:
                 # Touche Échap pour quitter
                 if event.key == pygame.K_ESCAPE:
-                    if self.state == GameState.PLAYING:
+                    if self.state == GameState.LOADING:
+                        self.cancel_loading()
                         self.state = GameState.MENU
+                        print(">>> Game: Chargement annulé (ESC)")
+                    elif self.state == GameState.PLAYING:
+                        # Reprise possible depuis le menu : la partie n'est enregistrée
+                        # qu'à sa fin, ou abandonnée au lancement d'une autre partie
+                        self.take_snapshot(save=True)
+                        self.state = GameState.MENU
+                        if self.telemetry is not None:
+                            self.telemetry.suspend()  # Session comptée à la fin de la partie reprise
                         print(">>> Game: Retour au menu (ESC)")
                     else:
                         self.running = False
@@ -173,9 +431,16 @@ class Game:
                         # Sélection directe par chiffre
                         index = event.key - pygame.K_1 + 1
                         self.selected_option = index - 1
-                        self.reset_game(Difficulty(index))
+                        self.begin_loading(Difficulty(index))
                         print(f">>> Game: Difficulté sélectionnée par touche: {index}")
                     
+                    elif event.key == pygame.K_r and self.saved_run_available:
+                        self.resume_game()
+                    
+                    elif event.key == pygame.K_w:
+                        self.shifting_walls_mode = not self.shifting_walls_mode
+                        print(f">>> Game: Murs mouvants {'activés' if self.shifting_walls_mode else 'désactivés'}")
+                    
                     elif event.key == pygame.K_UP or event.key == pygame.K_z:
                         self.selected_option = (self.selected_option - 1) % 4
                         print(f">>> Game: Option menu: {self.selected_option}")
@@ -187,7 +452,7 @@ class Game:
                     elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
                         # Convertir l'option sélectionnée en difficulté
                         difficulty = Difficulty(self.selected_option + 1)
-                        self.reset_game(difficulty)
+                        self.begin_loading(difficulty)
                         print(f">>> Game: Difficulté sélectionnée: {difficulty}")
                 
                 # Gestion des mouvements pendant le jeu (un appui = une case)
@@ -201,9 +466,20 @@ class Game:
                         moved = self.player.move(DIRECTIONS["LEFT"], self.maze)
                     elif event.key == pygame.K_RIGHT or event.key == pygame.K_d:
                         moved = self.player.move(DIRECTIONS["RIGHT"], self.maze)
+                    elif event.key == pygame.K_m:
+                        self.minimap_visible = not self.minimap_visible
+                        print(f">>> Game: Minimap {'affichée' if self.minimap_visible else 'masquée'}")
+                    elif event.key == pygame.K_h:
+                        self.cycle_heatmap()
+                    elif event.key in (pygame.K_PLUS, pygame.K_KP_PLUS, pygame.K_EQUALS):
+                        self.renderer.zoom_in()
+                    elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                        self.renderer.zoom_out()
                     elif event.key == pygame.K_SPACE:
                         # Dash dans la dernière direction
                         if self.player.dash(self.player.last_direction, self.maze):
+                            if self.telemetry is not None:
+                                self.telemetry.record_dash(*self.player.get_grid_position())
                             # Après un dash, vérifier les collisions et victoire
                             self.check_collisions()
                             self.check_win_condition()
@@ -222,6 +498,14 @@ class Game:
         
         return events
     
+    def step_player(self, direction):
+        """Déplace le joueur d'une case (comme une touche fléchée) ; retourne True s'il a bougé."""
+        moved = self.player.move(direction, self.maze)
+        if moved:
+            self.check_collisions()
+            self.check_win_condition()
+        return moved
+    
     def check_collisions(self):
         """Vérifie les collisions entre les entités."""
         player_pos = self.player.get_grid_position()
@@ -252,6 +536,8 @@ class Game:
                         self.items.remove(item)
                         continue
                     item.collected = True
+                    if self.telemetry is not None:
+                        self.telemetry.record_chest(*player_pos)
                     # Appliquer le résultat selon le type
                     result_type = result["type"]
                     subtype = result["subtype"]
@@ -293,10 +579,10 @@ class Game:
                     # Appliquer effet spécial si potion spéciale
                     effect = item.get_effect()
                     if effect == "vision":
-                        self.potion_effects["vision"] = pygame.time.get_ticks() + 10000  # 10 secondes
+                        self.potion_effects["vision"] = pygame.time.get_ticks() + POTION_VISION_DURATION_MS
                         print(">>> Effet VISION activé (+3 cases de visibilité)")
                     elif effect == "freeze":
-                        self.potion_effects["freeze"] = pygame.time.get_ticks() + 5000   # 5 secondes
+                        self.potion_effects["freeze"] = pygame.time.get_ticks() + POTION_FREEZE_DURATION_MS
                         print(">>> Effet FREEZE activé (ennemis gelés)")
                     self.items.remove(item)
     
@@ -310,16 +596,80 @@ class Game:
             self.state = GameState.WIN
             self.elapsed_time = time.time() - self.start_time
             self.save_highscore()
+            self.discard_autosave()
+            self.end_telemetry()
             print(f">>> Game: VICTOIRE ! Temps: {self.elapsed_time:.2f}s")
     
     def check_game_over(self):
         """Vérifie si le joueur a perdu."""
         if not self.player.is_alive():
             self.state = GameState.GAME_OVER
+            self.record_run(OUTCOME_DEATH)
+            self.discard_autosave()
+            if self.telemetry is not None:
+                self.telemetry.record_death(*self.player.get_grid_position())
+            self.end_telemetry()
             print(">>> Game: GAME OVER")
     
+    def abandon_saved_run(self):
+        """
+        Nouvelle partie à la place de la partie sauvegardée : celle-ci est enregistrée
+        comme abandonnée (OUTCOME_QUIT) et la sauvegarde supprimée. Une partie quittée
+        n'est enregistrée qu'ici, pour ne pas la compter deux fois si elle est reprise.
+        """
+        if not self.saved_run_available:
+            return
+        self.autosave.flush()  # La sauvegarde de l'Échap est peut-être encore en écriture
+        try:
+            data = snapshot.read_snapshot(self.autosave.path)
+            summary = None if data is None else snapshot.read_run_summary(data)
+        except (OSError, snapshot.SnapshotError) as e:
+            print(f">>> Game: Sauvegarde illisible, partie abandonnée non enregistrée: {e}")
+            summary = None
+        if summary is not None:
+            seed, difficulty, elapsed, moves, damage, potions, grid_size = summary
+            if self.run_history is not None:
+                self.run_history.record_run(seed, difficulty.name.lower(), elapsed, moves, damage, potions,
+                                            OUTCOME_QUIT)
+            if self.telemetry is not None:
+                self.telemetry.end_abandoned(difficulty, grid_size, grid_size, seed)
+        self.discard_autosave()
+    
+    def discard_autosave(self):
+        """Partie terminée : plus rien à reprendre."""
+        if self.autosave is not None:
+            self.autosave.discard()
+        self.saved_run_available = False
+    
+    def end_telemetry(self):
+        """Partie terminée : les cartes de chaleur de la session partent au thread d'écriture."""
+        if self.telemetry is not None:
+            self.telemetry.end()
+    
+    def cycle_heatmap(self):
+        """Touche H : couche suivante de la carte de chaleur (passages, dégâts, morts...), puis rien."""
+        if self.telemetry is None:
+            return
+        layer = 0 if self.heatmap_layer is None else self.heatmap_layer + 1
+        self.heatmap_layer = layer if layer < len(telemetry.LAYERS) else None
+        self.heatmap_label = None
+        if self.heatmap_layer is not None:
+            font = pygame.font.Font(None, 24)
+            self.heatmap_label = font.render(f"Carte de chaleur : {telemetry.LAYERS[self.heatmap_layer]} (H)",
+                                             True, COLORS["yellow"])
+        print(f">>> Game: Carte de chaleur {'masquée' if self.heatmap_layer is None else telemetry.LAYERS[self.heatmap_layer]}")
+    
+    def get_heatmap(self):
+        """(niveaux, clé) de la couche affichée, ou None."""
+        if self.heatmap_layer is None or self.telemetry is None:
+            return None
+        return self.telemetry.get_heat(self.heatmap_layer)
+    
     def update(self):
         """Met à jour la logique du jeu."""
+        if self.state == GameState.LOADING:
+            self.update_loading()
+            return
         if self.state != GameState.PLAYING:
             return
         
@@ -329,23 +679,48 @@ class Game:
         # Mettre à jour le joueur
         self.player.update(self.maze)
         
-        # Mettre à jour les ennemis (sauf si gelés)
+        # Mettre à jour les ennemis (sauf si gelés) : seuls ceux dont l'action est due
+        # sont réveillés ; pendant le gel l'horloge des ennemis ne tourne pas
         current_time = pygame.time.get_ticks()
         frozen = current_time < self.potion_effects["freeze"]
-        player_pos = self.player.get_grid_position()
-        for enemy in self.enemies:
-            if not frozen:
-                enemy.update(player_pos, self.maze)
+        if not frozen:
+            if self.influence_map is not None:
+                # Une seule mise à jour groupée des couches pour tous les ennemis
+                self.influence_map.tick(self.player.get_grid_position(), self.player.trail, self.enemies,
+                                        self.uncollected_potions, current_time)
+            visible_range = self.renderer.get_visible_grid_range(self.maze.width, self.maze.height)
+            self.enemy_scheduler.advance(self.player.get_grid_position(), self.maze, visible_range)
+            if self.cooperative_planner is not None:
+                # Plans en attente calculés dans le budget de la frame (le reste à la suivante)
+                self.cooperative_planner.run(self.player.get_grid_position())
+        
+        # Murs mouvants (figés eux aussi pendant le gel)
+        if self.shifting_walls is not None and not frozen and current_time >= self.next_wall_shift:
+            self.next_wall_shift = current_time + SHIFTING_INTERVAL_MS
+            self.shift_walls()
         
         # Vérifier les collisions (après déplacement des ennemis)
         self.check_collisions()
         
+        # Télémétrie : passage compté quand le joueur change de case (dash et recul compris)
+        if self.telemetry is not None:
+            self.telemetry.record_visit(self.player.get_grid_position())
+        
+        # Exploration de la minimap suivie à chaque frame, même masquée : les instantanés
+        # et l'affichage ultérieur (touche M) en dépendent
+        if self.minimap is not None:
+            self.minimap.update(self.player.get_grid_position(), self.get_visibility_radius())
+        
         # Vérifier les conditions de défaite
         self.check_game_over()
         
         # Vérifier les conditions de victoire
         self.check_win_condition()
         
+        # Instantanés périodiques (la compression et l'écriture se font en tâche de fond)
+        if self.state == GameState.PLAYING:
+            self.update_snapshots()
+        
         # Mettre à jour la caméra
         self.renderer.update_camera(
             self.player.grid_x, self.player.grid_y,
@@ -355,34 +730,64 @@ class Game:
         # Mettre à jour la boussole
         self.update_compass()
     
+    def shift_walls(self):
+        """Déplace un mur près du joueur sans couper le joueur, le départ, les potions restantes ni la sortie."""
+        player_pos = self.player.get_grid_position()
+        anchors = [player_pos, self.maze.start_pos, self.maze.exit_pos] + self.uncollected_potions
+        # Pas de mur sur une entité ni sur un objet encore au sol
+        blocked = {enemy.get_grid_position() for enemy in self.enemies}
+        blocked.update(item.get_grid_position() for item in self.items if not item.collected)
+        closed, opened = self.shifting_walls.shift(player_pos, anchors, blocked)
+        if closed or opened:
+            print(f">>> Game: Murs mouvants : fermé {closed}, ouvert {opened}")
+    
+    def get_visibility_radius(self):
+        """Rayon de visibilité actuel en cases (brouillard + effet vision), None sans brouillard."""
+        fog_radius = self.renderer.fog_radius
+        if fog_radius is None:
+            return None
+        if pygame.time.get_ticks() < self.potion_effects["vision"]:
+            return fog_radius + 3
+        return fog_radius
+    
     def update_compass(self):
         """Met à jour la boussole qui indique la potion la plus proche."""
         current_time = pygame.time.get_ticks()
         # Désactiver temporairement après collecte ?
         if self.compass_cooldown > 0:
-            self.compass_cooldown -= self.clock.get_time()
+            self.compass_cooldown -= self.scheduler.frame_time_ms
             if self.compass_cooldown <= 0:
                 self.compass_cooldown = 0
                 self.compass_active = True
         
-        if not self.compass_active:
-            self.compass_target = None
-            return
-        
-        # Trouver les potions non collectées
+        # Trouver les potions non collectées (partagé avec la minimap)
         uncollected = []
         for item in self.items:
             if item.type in (ItemType.POTION_NORMAL, ItemType.POTION_VISION, ItemType.POTION_FREEZE) and not item.collected:
                 uncollected.append(item)
+        self.uncollected_potions = [item.get_grid_position() for item in uncollected]
+        
+        if not self.compass_active:
+            self.compass_target = None
+            return
         
         if not uncollected:
             self.compass_target = None
             return
         
-        # Choisir la potion la plus proche en distance de Manhattan
+        # Choisir la potion la plus proche en distance de chemin (recalculée seulement
+        # quand le joueur bouge ou qu'une potion est ramassée)
         player_pos = self.player.get_grid_position()
-        closest = min(uncollected, key=lambda item: abs(item.grid_x - player_pos[0]) + abs(item.grid_y - player_pos[1]))
-        self.compass_target = (closest.grid_x, closest.grid_y)
+        compass_key = (player_pos, len(self.uncollected_potions), self.maze.revision)
+        if compass_key != self.compass_key:
+            self.compass_key = compass_key
+            nearest = self.maze.nearest_target(player_pos, self.uncollected_potions)
+            if nearest is not None:
+                self.compass_path_target = nearest[0]
+            else:
+                # Potions inaccessibles : repli sur la distance de Manhattan
+                self.compass_path_target = min(self.uncollected_potions, key=lambda pos: abs(pos[0] - player_pos[0]) + abs(pos[1] - player_pos[1]))
+        self.compass_target = self.compass_path_target
     
     def draw_menu(self):
         """Dessine le menu principal."""
@@ -414,12 +819,14 @@ class Game:
         instructions = [
             "Utilisez les flèches ↑↓ ou Z/S pour naviguer, ENTREE pour sélectionner",
             "Appuyez sur 1-4 pour sélectionner directement",
-            "Échap pour quitter"
+            f"W : murs mouvants ({'OUI' if self.shifting_walls_mode else 'NON'})  -  Échap pour quitter"
         ]
+        if self.saved_run_available:
+            instructions.append("R pour reprendre la partie sauvegardée")
         
         for i, text in enumerate(instructions):
             instr = font_small.render(text, True, COLORS["gray"])
-            instr_rect = instr.get_rect(center=(SCREEN_WIDTH // 2, 450 + i * 30))
+            instr_rect = instr.get_rect(center=(SCREEN_WIDTH // 2, 450 + i * 25))
             self.screen.blit(instr, instr_rect)
         
         # High scores
@@ -440,6 +847,42 @@ class Game:
             self.screen.blit(score_text, score_rect)
             y_offset += 25
     
+    def draw_loading_screen(self):
+        """Écran de chargement : phase, barre de progression et aperçu du creusement."""
+        self.screen.fill(COLORS["black"])
+        font_big = pygame.font.Font(None, 56)
+        title = font_big.render("GÉNÉRATION DU LABYRINTHE", True, COLORS["cyan"])
+        self.screen.blit(title, title.get_rect(center=(SCREEN_WIDTH // 2, 80)))
+        
+        maze = self.loading_maze
+        if LOADING_CARVE_ANIMATION and maze is not None and maze.carve_order is not None:
+            # Seules les cases creusées depuis la frame précédente sont peintes
+            if self.loading_preview is None:
+                self.loading_preview = pygame.Surface((maze.width, maze.height))
+                self.loading_preview.fill(COLORS["dark_gray"])
+            carve_order = maze.carve_order
+            floor = COLORS["light_gray"]
+            for position in carve_order[self.loading_carved:]:
+                self.loading_preview.set_at(position, floor)
+            self.loading_carved = len(carve_order)
+        if self.loading_preview is not None:
+            side = min(SCREEN_WIDTH - 200, SCREEN_HEIGHT - 260)
+            scale = max(1, side // max(self.loading_preview.get_size()))
+            width, height = self.loading_preview.get_size()
+            preview = pygame.transform.scale(self.loading_preview, (width * scale, height * scale))
+            self.screen.blit(preview, preview.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
+        
+        # Barre de progression
+        bar = pygame.Rect(100, SCREEN_HEIGHT - 110, SCREEN_WIDTH - 200, 20)
+        pygame.draw.rect(self.screen, COLORS["dark_gray"], bar)
+        pygame.draw.rect(self.screen, COLORS["green"], (bar.x, bar.y, int(bar.width * self.loading_progress), bar.height))
+        pygame.draw.rect(self.screen, COLORS["white"], bar, 2)
+        font_small = pygame.font.Font(None, 24)
+        label = font_small.render(f"{LOADING_PHASE_LABELS.get(self.loading_phase, '')} {self.loading_progress:.0%}", True, COLORS["white"])
+        self.screen.blit(label, label.get_rect(center=(SCREEN_WIDTH // 2, bar.y - 18)))
+        hint = font_small.render("Échap pour annuler", True, COLORS["gray"])
+        self.screen.blit(hint, hint.get_rect(center=(SCREEN_WIDTH // 2, bar.bottom + 25)))
+    
     def draw_game_over(self):
         """Dessine l'écran Game Over."""
         # Rendu du jeu en arrière-plan
@@ -525,8 +968,19 @@ class Game:
         if self.state == GameState.MENU:
             self.draw_menu()
         
+        elif self.state == GameState.LOADING:
+            self.draw_loading_screen()
+        
         elif self.state == GameState.PLAYING:
-            self.renderer.draw_all(self.maze, self.player, self.enemies, self.items, self.elapsed_time, self.potion_effects, self.compass_target)
+            self.renderer.draw_all(self.maze, self.player, self.enemies, self.items, self.elapsed_time, self.potion_effects, self.compass_target, self.rivals,
+                                   self.get_heatmap())
+            if self.heatmap_label is not None:
+                self.screen.blit(self.heatmap_label, (10, SCREEN_HEIGHT - 30))
+            if self.minimap_visible and self.minimap is not None:
+                self.minimap.draw(
+                    self.screen, self.player.get_grid_position(), self.enemies,
+                    self.uncollected_potions, self.compass_target, self.get_visibility_radius()
+                )
             # Flash rouge si dégâts récents
             current_ticks = pygame.time.get_ticks()
             if current_ticks < self.damage_flash_end:
@@ -546,6 +1000,7 @@ class Game:
     async def run(self):
         """Boucle principale du jeu."""
         print(">>> Game: Démarrage de la boucle principale")
+        self.scheduler.spawn(self.finish_startup())
         
         while self.running:
             events = self.handle_events()
@@ -555,9 +1010,22 @@ class Game:
             
             self.update()
             self.render()
+            if startup_trace.get_mark("first_frame") is None:
+                startup_trace.mark("first_frame")
+                startup_trace.report()
             
-            self.clock.tick(FPS)
-            await asyncio.sleep(0)
+            # Cadence réduite hors partie ; l'attente laisse tourner les autres coroutines
+            self.scheduler.set_idle(self.state in IDLE_STATES)
+            await self.scheduler.wait_next_frame()
         
+        if self.state in (GameState.PLAYING, GameState.PAUSED):
+            self.take_snapshot(save=True)  # Reprise à la prochaine session (enregistrée à sa fin)
+        if self.telemetry is not None:
+            self.telemetry.close()  # Écrit les compteurs de la partie en cours (suspendue)
+        if self.autosave is not None:
+            self.autosave.close()  # Termine l'écriture en cours
+        if self.run_history is not None:
+            self.run_history.close()  # Écrit les parties encore en file
+        self.scheduler.print_report()
         pygame.quit()
         print(">>> Game: Fermeture du jeu")
\ No newline at end of file
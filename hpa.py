@@ -0,0 +1,352 @@
+"""
+Recherche de chemin hiérarchique (HPA*) pour les grands labyrinthes : la grille est
+découpée en clusters, les entrées entre clusters voisins et les distances internes
+entre entrées sont précalculées une fois, puis les requêtes lointaines sont
+résolues sur ce petit graphe abstrait avant d'être raffinées localement.
+
+Quand des cases changent, seuls les clusters concernés sont reconstruits.
+"""
+
+import heapq
+from collections import deque
+import numpy as np
+from config_new import CellType, STEP_DIRECTIONS, HPA_CLUSTER_SIZE, HPA_ENTRANCE_SPLIT, HPA_BATCH_CLUSTERS
+
+
+class HierarchicalPathfinder:
+    """Graphe abstrait (entrées de clusters) d'un labyrinthe et requêtes HPA*."""
+
+    def __init__(self, maze, cluster_size=HPA_CLUSTER_SIZE):
+        self.maze = maze
+        self.cluster_size = cluster_size
+        self.clusters_x = -(-maze.width // cluster_size)
+        self.clusters_y = -(-maze.height // cluster_size)
+
+        self.revision = None        # Révision du labyrinthe du graphe courant
+        self.marked_revision = None  # Révision après le dernier mark_dirty
+        self.dirty = set()          # Clusters dont des cases ont changé
+        self.walkable = None        # Tableau booléen [x, y]
+
+        self.borders = {}        # (cluster, voisin droite/bas) -> [(case_a, case_b)]
+        self.inter = {}          # entrée -> {entrées voisines dans l'autre cluster}
+        self.cluster_nodes = {}  # cluster -> [entrées]
+        self.node_rank = {}      # cluster -> {entrée: rang}
+        self.cluster_dist = {}   # cluster -> distances internes [rang][rang] (-1 : inaccessible)
+        self.stats = {"full_builds": 0, "rebuilt_clusters": 0}
+
+    # ------------------------------------------------------------------
+    # Construction du graphe abstrait
+    # ------------------------------------------------------------------
+
+    def get_cluster(self, x, y):
+        """Cluster (cx, cy) contenant la case."""
+        return (x // self.cluster_size, y // self.cluster_size)
+
+    def get_bounds(self, cluster):
+        """Bornes (x0, y0, x1, y1) exclusives d'un cluster."""
+        size = self.cluster_size
+        x0, y0 = cluster[0] * size, cluster[1] * size
+        return (x0, y0, min(self.maze.width, x0 + size), min(self.maze.height, y0 + size))
+
+    def get_cluster_borders(self, cluster):
+        """Clés des frontières d'un cluster avec ses voisins existants."""
+        cx, cy = cluster
+        keys = []
+        if cx + 1 < self.clusters_x:
+            keys.append((cluster, (cx + 1, cy)))
+        if cx > 0:
+            keys.append(((cx - 1, cy), cluster))
+        if cy + 1 < self.clusters_y:
+            keys.append((cluster, (cx, cy + 1)))
+        if cy > 0:
+            keys.append(((cx, cy - 1), cluster))
+        return keys
+
+    def find_entrances(self, border):
+        """Entrées d'une frontière : une par ouverture, deux pour les longues ouvertures."""
+        cluster, neighbor = border
+        x0, y0, x1, y1 = self.get_bounds(cluster)
+        if neighbor[0] != cluster[0]:
+            pairs = [((x1 - 1, y), (x1, y)) for y in range(y0, y1)]
+        else:
+            pairs = [((x, y1 - 1), (x, y1)) for x in range(x0, x1)]
+        entrances = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and self.walkable[pair[0]] and self.walkable[pair[1]]:
+                run.append(pair)
+                continue
+            if len(run) >= HPA_ENTRANCE_SPLIT:
+                entrances += [run[0], run[-1]]
+            elif run:
+                entrances.append(run[len(run) // 2])
+            run = []
+        return entrances
+
+    def set_border(self, border, entrances):
+        """Remplace les entrées d'une frontière et les arêtes entre clusters correspondantes."""
+        for a, b in self.borders.get(border, ()):
+            self.inter[a].discard(b)
+            self.inter[b].discard(a)
+        self.borders[border] = entrances
+        for a, b in entrances:
+            self.inter.setdefault(a, set()).add(b)
+            self.inter.setdefault(b, set()).add(a)
+
+    def collect_nodes(self, cluster):
+        """Entrées d'un cluster (côté du cluster de chaque frontière), sans doublon."""
+        nodes = set()
+        for border in self.get_cluster_borders(cluster):
+            side = 0 if border[0] == cluster else 1
+            nodes.update(pair[side] for pair in self.borders.get(border, ()))
+        return sorted(nodes)
+
+    def compute_intra_distances(self, clusters):
+        """
+        Distances internes entre entrées de chaque cluster : BFS simultanés de toutes les
+        entrées de tous les clusters d'un lot, par dilatations NumPy successives.
+        """
+        size = self.cluster_size
+        for start in range(0, len(clusters), HPA_BATCH_CLUSTERS):
+            batch = clusters[start:start + HPA_BATCH_CLUSTERS]
+            nodes = [self.collect_nodes(cluster) for cluster in batch]
+            count = len(batch)
+            width = max(1, max(len(n) for n in nodes))
+
+            # Fenêtres des clusters avec une bordure de murs
+            walk = np.zeros((count, size + 2, size + 2), dtype=bool)
+            xs = np.zeros((count, width), dtype=np.intp)
+            ys = np.zeros((count, width), dtype=np.intp)
+            valid = np.zeros((count, width), dtype=bool)
+            for i, cluster in enumerate(batch):
+                x0, y0, x1, y1 = self.get_bounds(cluster)
+                walk[i, 1:1 + x1 - x0, 1:1 + y1 - y0] = self.walkable[x0:x1, y0:y1]
+                for k, (x, y) in enumerate(nodes[i]):
+                    xs[i, k], ys[i, k] = x - x0 + 1, y - y0 + 1
+                    valid[i, k] = True
+
+            rows = np.arange(count)[:, None]
+            sources = np.arange(width)[None, :]
+            reached = np.zeros((count, width, size + 2, size + 2), dtype=bool)
+            reached[rows, sources, xs, ys] = valid
+            distances = np.full((count, width, width), -1, dtype=np.int32)
+            distances[:, np.arange(width), np.arange(width)] = np.where(valid, 0, -1)
+
+            # Lecture de l'état des entrées : [cluster, source, cible]
+            gather = (rows[:, :, None], sources[:, :, None], xs[:, None, :], ys[:, None, :])
+            walk = walk[:, None]
+            step = 0
+            while True:
+                step += 1
+                grown = reached.copy()
+                grown[..., 1:-1, :] |= reached[..., :-2, :] | reached[..., 2:, :]
+                grown[..., :, 1:-1] |= reached[..., :, :-2] | reached[..., :, 2:]
+                grown &= walk
+                new = grown & ~reached
+                if not new.any():
+                    break
+                distances[new[gather]] = step
+                reached = grown
+
+            for i, cluster in enumerate(batch):
+                k = len(nodes[i])
+                self.cluster_nodes[cluster] = nodes[i]
+                self.node_rank[cluster] = {node: rank for rank, node in enumerate(nodes[i])}
+                self.cluster_dist[cluster] = distances[i, :k, :k].tolist()
+        self.stats["rebuilt_clusters"] += len(clusters)
+
+    def build(self):
+        """Construit tout le graphe abstrait."""
+        print(f">>> HPA: Construction ({self.clusters_x}x{self.clusters_y} clusters de {self.cluster_size} cases)")
+        self.walkable = self.maze.get_type_array() != CellType.WALL.value
+        self.borders = {}
+        self.inter = {}
+        clusters = [(cx, cy) for cx in range(self.clusters_x) for cy in range(self.clusters_y)]
+        for cluster in clusters:
+            for border in self.get_cluster_borders(cluster):
+                if border[0] == cluster:
+                    self.set_border(border, self.find_entrances(border))
+        self.cluster_nodes, self.node_rank, self.cluster_dist = {}, {}, {}
+        self.compute_intra_distances(clusters)
+        self.stats["full_builds"] += 1
+
+    def rebuild_dirty(self):
+        """Reconstruit les frontières des clusters modifiés et les distances internes voisines."""
+        self.walkable = self.maze.get_type_array() != CellType.WALL.value
+        affected = set()
+        for cluster in self.dirty:
+            for border in self.get_cluster_borders(cluster):
+                self.set_border(border, self.find_entrances(border))
+                affected.update(border)
+        self.compute_intra_distances(sorted(affected))
+
+    def mark_dirty(self, x, y):
+        """Signale le changement d'une case (appelé par Maze.set_cell_type)."""
+        if self.revision is None:
+            return
+        self.dirty.add(self.get_cluster(x, y))
+        self.marked_revision = self.maze.revision
+
+    def refresh(self):
+        """Met le graphe à jour : reconstruction locale si possible, complète sinon."""
+        revision = self.maze.revision
+        if self.revision == revision:
+            return
+        if self.revision is not None and self.marked_revision == revision and self.dirty:
+            self.rebuild_dirty()
+        else:
+            self.build()
+        self.dirty.clear()
+        self.revision = revision
+
+    # ------------------------------------------------------------------
+    # Requêtes
+    # ------------------------------------------------------------------
+
+    def is_walkable(self, cell):
+        """Vrai si la case est dans la grille et traversable."""
+        x, y = cell
+        return 0 <= x < self.maze.width and 0 <= y < self.maze.height and bool(self.walkable[x, y])
+
+    def local_bfs(self, cell):
+        """BFS limité au cluster de la case : (distances, parents)."""
+        x0, y0, x1, y1 = self.get_bounds(self.get_cluster(*cell))
+        walkable = self.walkable
+        distances = {cell: 0}
+        parents = {cell: None}
+        queue = deque([cell])
+        while queue:
+            x, y = queue.popleft()
+            distance = distances[(x, y)] + 1
+            for dx, dy in STEP_DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if x0 <= nx < x1 and y0 <= ny < y1 and walkable[nx, ny] and (nx, ny) not in distances:
+                    distances[(nx, ny)] = distance
+                    parents[(nx, ny)] = (x, y)
+                    queue.append((nx, ny))
+        return distances, parents
+
+    def get_neighbors(self, node):
+        """Voisins abstraits d'une entrée : (entrée, coût)."""
+        cluster = self.get_cluster(*node)
+        rank = self.node_rank[cluster].get(node)
+        if rank is not None:
+            nodes = self.cluster_nodes[cluster]
+            for other, distance in enumerate(self.cluster_dist[cluster][rank]):
+                if distance > 0:
+                    yield nodes[other], distance
+        for other in self.inter.get(node, ()):
+            yield other, 1
+
+    def start_entries(self, start):
+        """Distances locales de start et entrées de départ de son cluster."""
+        distances, parents = self.local_bfs(start)
+        ranks = self.node_rank[self.get_cluster(*start)]
+        return distances, parents, [(distance, node) for node, distance in distances.items() if node in ranks]
+
+    def distances_from(self, start, targets, nearest_only=False):
+        """
+        Distances de chemin de start vers chaque cible (dictionnaire, cibles inaccessibles absentes).
+        nearest_only : s'arrête dès que la cible la plus proche est certaine.
+        """
+        self.refresh()
+        if not self.is_walkable(start):
+            return {}
+        start_distances, _, heap = self.start_entries(start)
+        best = {}
+        target_distances = {}
+        by_cluster = {}
+        for target in targets:
+            if not self.is_walkable(target) or target in target_distances:
+                continue
+            target_distances[target] = self.local_bfs(target)[0]
+            by_cluster.setdefault(self.get_cluster(*target), []).append(target)
+            if target in start_distances:
+                best[target] = start_distances[target]
+
+        heapq.heapify(heap)
+        settled = set()
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if node in settled:
+                continue
+            # Plus aucune amélioration possible au-delà de cette distance
+            if nearest_only and best and distance >= min(best.values()):
+                break
+            if len(best) == len(target_distances) and distance >= max(best.values(), default=0):
+                break
+            settled.add(node)
+            for target in by_cluster.get(self.get_cluster(*node), ()):
+                local = target_distances[target].get(node)
+                if local is not None and distance + local < best.get(target, float('inf')):
+                    best[target] = distance + local
+            for other, cost in self.get_neighbors(node):
+                if other not in settled:
+                    heapq.heappush(heap, (distance + cost, other))
+        return best
+
+    def find_path(self, start, goal):
+        """Chemin HPA* (tuple de cases) de start à goal, ou None si goal est inaccessible."""
+        self.refresh()
+        if not self.is_walkable(start) or not self.is_walkable(goal):
+            return None
+        start_distances, start_parents, entries = self.start_entries(start)
+        goal_distances, goal_parents = self.local_bfs(goal)
+        goal_cluster = self.get_cluster(*goal)
+        gx, gy = goal
+
+        best_cost = start_distances.get(goal, float('inf'))  # Chemin direct dans le cluster
+        best_end = None
+        costs = {}
+        came_from = {}
+        heap = []
+        for distance, node in entries:
+            costs[node] = distance
+            came_from[node] = None
+            heapq.heappush(heap, (distance + abs(node[0] - gx) + abs(node[1] - gy), -distance, node))
+        closed = set()
+        while heap:
+            estimate, negative_cost, node = heapq.heappop(heap)
+            if estimate >= best_cost:
+                break
+            if node in closed:
+                continue
+            closed.add(node)
+            cost = -negative_cost
+            if self.get_cluster(*node) == goal_cluster and node in goal_distances:
+                if cost + goal_distances[node] < best_cost:
+                    best_cost = cost + goal_distances[node]
+                    best_end = node
+            for other, step_cost in self.get_neighbors(node):
+                new_cost = cost + step_cost
+                if other not in closed and new_cost < costs.get(other, new_cost + 1):
+                    costs[other] = new_cost
+                    came_from[other] = node
+                    heapq.heappush(heap, (new_cost + abs(other[0] - gx) + abs(other[1] - gy), -new_cost, other))
+
+        if best_cost == float('inf'):
+            return None
+        if best_end is None:
+            return self.trace(start_parents, goal)[::-1]
+        return self.refine(start_parents, goal_parents, came_from, best_end)
+
+    def trace(self, parents, cell):
+        """Remonte une table de parents depuis cell jusqu'à l'origine du BFS."""
+        path = []
+        while cell is not None:
+            path.append(cell)
+            cell = parents[cell]
+        return path
+
+    def refine(self, start_parents, goal_parents, came_from, end):
+        """Chemin case par case depuis la suite d'entrées du chemin abstrait."""
+        abstract = self.trace(came_from, end)[::-1]
+        path = self.trace(start_parents, abstract[0])[::-1]
+        for a, b in zip(abstract, abstract[1:]):
+            if self.get_cluster(*a) != self.get_cluster(*b):
+                path.append(b)  # Passage d'une frontière
+            else:
+                parents = self.local_bfs(b)[1]
+                path.extend(self.trace(parents, a)[1:])
+        path.extend(self.trace(goal_parents, end)[1:])
+        return tuple(path)
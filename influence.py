@@ -0,0 +1,139 @@
+"""
+Cartes d'influence partagées par les ennemis : couches NumPy par case (odeur du
+joueur le long de sa traînée, densité d'ennemis, attraction des potions),
+propagées à travers les couloirs en une mise à jour groupée par tick IA. Chaque
+ennemi choisit ensuite son pas en comparant ses 4 voisins sur la carte combinée.
+"""
+
+import random
+import numpy as np
+from config_new import (
+    CellType, INFLUENCE_UPDATE_TICKS, INFLUENCE_DECAY, INFLUENCE_SCENT_FADE,
+    INFLUENCE_SCENT_STEPS, INFLUENCE_DENSITY_STEPS, INFLUENCE_ATTRACTION_STEPS,
+    INFLUENCE_WINDOW, INFLUENCE_WEIGHTS, INFLUENCE_MIN_SIGNAL, TRAIL_DURATION_MS, STEP_DIRECTIONS
+)
+
+
+def propagate(layer, walkable, steps, decay=INFLUENCE_DECAY):
+    """
+    Propage une couche vers les cases voisines traversables : chaque case garde le
+    maximum entre sa valeur et celle de ses voisins atténuée (les murs bloquent).
+    """
+    for _ in range(steps):
+        padded = np.pad(layer, 1)
+        neighbors = np.maximum(np.maximum(padded[:-2, 1:-1], padded[2:, 1:-1]),
+                               np.maximum(padded[1:-1, :-2], padded[1:-1, 2:]))
+        layer = np.maximum(layer, neighbors * decay) * walkable
+    return layer
+
+
+class InfluenceMap:
+    """Couches d'influence d'un labyrinthe, mises à jour autour du joueur."""
+
+    def __init__(self, maze, update_ticks=INFLUENCE_UPDATE_TICKS, window=INFLUENCE_WINDOW):
+        self.maze = maze
+        self.update_ticks = update_ticks
+        self.window = window
+        shape = (maze.width, maze.height)
+        self.walkable = (maze.get_type_array() != CellType.WALL.value).astype(np.float32)
+        self.revision = maze.revision
+        self.scent = np.zeros(shape, dtype=np.float32)
+        self.density = np.zeros(shape, dtype=np.float32)
+        self.attraction = np.zeros(shape, dtype=np.float32)
+        self.signal = np.zeros(shape, dtype=np.float32)    # Couches attractives seules
+        self.combined = np.zeros(shape, dtype=np.float32)  # Signal moins la densité d'ennemis
+        self.potion_key = None
+        self.extent = None  # (x0, y0, x1, y1) des zones déjà mises à jour : couches nulles au-delà
+        self.ticks = 0
+        self.updates = 0
+
+    def get_window(self, player_pos):
+        """Tranches (x, y) de la zone mise à jour autour du joueur."""
+        px, py = player_pos
+        return (slice(max(0, px - self.window), min(self.maze.width, px + self.window + 1)),
+                slice(max(0, py - self.window), min(self.maze.height, py + self.window + 1)))
+
+    def tick(self, player_pos, trail, enemies, potion_positions, current_time):
+        """Avance d'un tick IA ; met les couches à jour tous les update_ticks ticks."""
+        self.ticks += 1
+        if (self.ticks - 1) % self.update_ticks == 0:
+            self.update(player_pos, trail, enemies, potion_positions, current_time)
+
+    def update(self, player_pos, trail, enemies, potion_positions, current_time):
+        """Mise à jour groupée des trois couches et de la carte combinée."""
+        if self.revision != self.maze.revision:
+            changes = self.maze.changes_since(self.revision)
+            if changes is None:
+                self.walkable = (self.maze.get_type_array() != CellType.WALL.value).astype(np.float32)
+            else:
+                for x, y in changes:
+                    self.walkable[x, y] = self.maze.is_walkable(x, y)
+            self.revision = self.maze.revision
+            self.potion_key = None
+        window = self.get_window(player_pos)
+        x0, y0 = window[0].start, window[1].start
+        walkable = self.walkable[window]
+        bounds = (x0, y0, window[0].stop, window[1].stop)
+        if self.extent is None:
+            self.extent = bounds
+        else:
+            self.extent = (min(self.extent[0], bounds[0]), min(self.extent[1], bounds[1]),
+                           max(self.extent[2], bounds[2]), max(self.extent[3], bounds[3]))
+
+        # Odeur : dépôt le long de la traînée (plus fort pour les positions récentes), évaporation
+        deposit = np.zeros_like(walkable)
+        for x, y, timestamp in trail:
+            age = current_time - timestamp
+            if 0 <= x - x0 < deposit.shape[0] and 0 <= y - y0 < deposit.shape[1] and age < TRAIL_DURATION_MS:
+                deposit[x - x0, y - y0] = max(deposit[x - x0, y - y0], 1.0 - age / TRAIL_DURATION_MS)
+        deposit[player_pos[0] - x0, player_pos[1] - y0] = 1.0
+        scent = np.maximum(self.scent[window] * INFLUENCE_SCENT_FADE, deposit)
+        self.scent[window] = propagate(scent, walkable, INFLUENCE_SCENT_STEPS)
+
+        # Densité d'ennemis : répulsion locale pour qu'ils se répartissent
+        density = np.zeros_like(walkable)
+        for enemy in enemies:
+            x, y = enemy.grid_x - x0, enemy.grid_y - y0
+            if 0 <= x < density.shape[0] and 0 <= y < density.shape[1]:
+                density[x, y] += 1.0
+        self.density[window] = propagate(density, walkable, INFLUENCE_DENSITY_STEPS)
+
+        # Attraction des potions : recalculée seulement quand les potions changent
+        potion_key = (window[0].start, window[1].start, tuple(potion_positions))
+        if potion_key != self.potion_key:
+            self.potion_key = potion_key
+            attraction = np.zeros_like(walkable)
+            for x, y in potion_positions:
+                if 0 <= x - x0 < attraction.shape[0] and 0 <= y - y0 < attraction.shape[1]:
+                    attraction[x - x0, y - y0] = 1.0
+            self.attraction[window] = propagate(attraction, walkable, INFLUENCE_ATTRACTION_STEPS)
+
+        self.combine(window)
+        self.updates += 1
+
+    def combine(self, area):
+        """Recalcule signal et carte combinée sur une zone, case par case depuis les trois couches."""
+        self.signal[area] = (INFLUENCE_WEIGHTS["scent"] * self.scent[area]
+                             + INFLUENCE_WEIGHTS["attraction"] * self.attraction[area])
+        self.combined[area] = self.signal[area] - INFLUENCE_WEIGHTS["density"] * self.density[area]
+
+    def choose_step(self, x, y):
+        """
+        Case voisine traversable de plus forte influence combinée, ou None si aucune
+        odeur ni potion ne se fait sentir autour (l'ennemi patrouille alors au hasard).
+        Égalités départagées au hasard.
+        """
+        directions = list(STEP_DIRECTIONS)
+        random.shuffle(directions)
+        best, best_value = None, None
+        strongest_signal = 0.0
+        for dx, dy in directions:
+            nx, ny = x + dx, y + dy
+            if self.maze.is_walkable(nx, ny):
+                strongest_signal = max(strongest_signal, self.signal[nx, ny])
+                value = self.combined[nx, ny]
+                if best_value is None or value > best_value:
+                    best, best_value = (nx, ny), value
+        if best is None or strongest_signal < INFLUENCE_MIN_SIGNAL:
+            return None
+        return best
@@ -3,6 +3,7 @@
 Point d'entrée principal du jeu de labyrinthe - Version révisée.
 """
 
+import startup_trace  # En premier : origine de la trace de démarrage
 import sys
 import os
 import asyncio
@@ -57,6 +58,16 @@ def check_assets():
     print("✓ Assets trouvés")
     return True
 
+def get_grid_size_argument():
+    """Lit une taille de labyrinthe personnalisée (--taille N) sur la ligne de commande."""
+    if "--taille" in sys.argv:
+        index = sys.argv.index("--taille")
+        try:
+            return int(sys.argv[index + 1])
+        except (IndexError, ValueError):
+            print("✗ --taille attend un entier, taille par défaut utilisée")
+    return None
+
 async def main():
     """Fonction principale asynchrone."""
     # Vérifications
@@ -80,6 +91,7 @@ async def main():
     print("  - FPS: 30")
     print("  - Taille des tiles: 48x48")
     print("  - Contrôles: Flèches ou ZQSD")
+    print("  - Zoom: +/- ou molette")
     print("  - Échap: Menu/Pause")
     print("  - P: Pause")
     print()
@@ -89,7 +101,8 @@ async def main():
     try:
         # Importer et lancer le jeu
         from game_new import Game
-        game = Game()
+        startup_trace.mark("imports")
+        game = Game(grid_size=get_grid_size_argument())
         await game.run()
         print("\nJeu terminé. Merci d'avoir joué !")
     except Exception as e:
@@ -0,0 +1,447 @@
+"""
+Analyseur de labyrinthes hors ligne : génère (ou charge) des labyrinthes pour de
+grandes plages de graines, répartis par paquets sur un pool de processus, et mesure
+chacun : part de la grille accessible, culs-de-sac, longueurs des couloirs, plus
+courte tournée des potions jusqu'à la sortie et pression des ennemis le long de
+cette tournée.
+
+Les mesures sont rangées en colonnes (un tableau NumPy par mesure) et écrites en
+.npz compressé, ou en Parquet si pyarrow est installé et que le fichier se termine
+par .parquet. Le rapport donne les centiles de chaque mesure par difficulté ;
+--pick liste les graines dont une mesure tombe dans un intervalle (choix de graines).
+
+Les mesures ne passent que par des tableaux (types de cases, positions) : un corpus
+de labyrinthes enregistré avec --save-mazes est réanalysé avec --mazes sans relancer
+la génération (comparer les mêmes dispositions après avoir changé les mesures).
+
+Usage : python maze_analyzer.py [--seeds N] [--first-seed S] [--difficulty easy,hard]
+                                [--grid-size N] [--workers N] [--output mesures.npz]
+                                [--save-mazes corpus.npz] [--mazes corpus.npz]
+                                [--load mesures.npz] [--pick mesure:min:max] [--json rapport.json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from config_new import CellType, Difficulty, ANALYZER_PRESSURE_RADIUS, ANALYZER_BATCH_SIZE
+from pathfinding import WalkableGrid
+from placement import UNREACHED, walkable_cells
+from route_solver import solve_route, INFINITY
+
+# Colonnes du fichier de mesures, dans l'ordre, avec leur type
+COLUMNS = {
+    "seed": np.int64,               # Graine demandée
+    "difficulty": np.int8,          # Difficulty.value
+    "width": np.int16,
+    "attempts": np.int16,           # Essais de génération avant un labyrinthe valide (0 : chargé)
+    "floor_cells": np.int32,        # Cases traversables
+    "reachable_ratio": np.float32,  # Part des cases traversables accessibles depuis le départ
+    "dead_ends": np.int32,          # Cases accessibles avec un seul voisin traversable
+    "corridor_mean": np.float32,    # Longueur moyenne des couloirs (suites de cases de degré 2)
+    "corridor_max": np.int32,
+    "route_length": np.int32,       # Plus courte tournée départ -> potions -> sortie (-1 si sortie coupée)
+    "route_missed": np.int16,       # Potions inaccessibles, ignorées par la tournée
+    "enemy_pressure": np.float32,   # Part des cases de la tournée à portée d'un ennemi
+    "enemy_route_distance": np.int32,  # Distance de chemin du plus proche ennemi à la tournée (-1 si aucun)
+}
+# Mesures du rapport (centiles par difficulté)
+METRICS = ("reachable_ratio", "dead_ends", "corridor_mean", "corridor_max", "route_length",
+           "enemy_pressure", "enemy_route_distance", "attempts")
+PERCENTILES = (0.10, 0.50, 0.90)
+
+
+# ============================================================================
+# MESURES D'UN LABYRINTHE
+# ============================================================================
+
+def bfs_field(cells, stride, sources):
+    """Distances de chemin vers la source la plus proche sur une grille aplatie bordée (liste, UNREACHED sinon)."""
+    distances = [UNREACHED] * len(cells)
+    frontier = [source for source in sources if cells[source]]
+    for source in frontier:
+        distances[source] = 0
+    level = 0
+    while frontier:
+        level += 1
+        next_frontier = []
+        for node in frontier:
+            for neighbor in (node + 1, node - 1, node + stride, node - stride):
+                if cells[neighbor] and distances[neighbor] == UNREACHED:
+                    distances[neighbor] = level
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    return distances
+
+
+def corridor_lengths(corridor, stride):
+    """
+    Longueurs des couloirs : composantes connexes des cases marquées (masque aplati bordé),
+    étiquetées par propagation du plus petit indice avec saut de pointeurs.
+    """
+    cells = np.flatnonzero(corridor)
+    if not cells.size:
+        return np.zeros(0, dtype=np.int64)
+    labels = np.arange(corridor.size)
+    for _ in range(cells.size):
+        current = labels[cells]
+        best = current
+        for offset in (1, -1, stride, -stride):
+            neighbors = cells + offset
+            best = np.minimum(best, np.where(corridor[neighbors], labels[neighbors], best))
+        labels[cells] = best
+        labels[cells] = labels[labels[cells]]
+        if (labels[cells] == current).all():
+            break
+    return np.bincount(np.unique(labels[cells], return_inverse=True)[1])
+
+
+def analyze_layout(types, start, exit_pos, potions, enemies, pressure_radius=ANALYZER_PRESSURE_RADIUS):
+    """
+    Mesures d'un labyrinthe donné par son tableau de types ([x, y], valeurs de CellType)
+    et ses positions ; retourne un dictionnaire {colonne: valeur} (colonnes de mesure de COLUMNS).
+    """
+    grid = WalkableGrid(types != CellType.WALL.value)
+    cells, stride = grid.cells, grid.stride
+    walkable = walkable_cells(grid)
+    floor_cells = int(walkable.sum())
+
+    # Distances depuis le départ, chaque potion et la sortie : matrice de la tournée
+    points = [start] + list(potions) + [exit_pos]
+    indices = [grid.index(*point) for point in points]
+    fields = [np.array(bfs_field(cells, stride, [index]), dtype=np.int64) for index in indices]
+    matrix = [[int(field[other]) if field[other] != UNREACHED else INFINITY for other in indices]
+              for field in fields]
+    reached = fields[0] != UNREACHED
+
+    degrees = np.zeros(walkable.shape, dtype=np.int8)
+    for offset in (1, -1, stride, -stride):
+        degrees += np.roll(walkable, offset)  # La bordure de murs absorbe le repli du roll
+    lengths = corridor_lengths(reached & (degrees == 2), stride)
+
+    end = len(points) - 1
+    order, length = solve_route(matrix, end)
+    route = np.zeros(walkable.shape, dtype=bool)
+    if length < INFINITY:
+        # Cases de la tournée : sur un plus court chemin de chaque étape (d(a, c) + d(c, b) = d(a, b))
+        stops = [0] + list(order) + [end]
+        for a, b in zip(stops, stops[1:]):
+            route |= fields[a] + fields[b] == matrix[a][b]
+
+    pressure, route_distance = 0.0, -1
+    enemy_indices = [grid.index(*enemy) for enemy in enemies]
+    if route.any() and enemy_indices:
+        enemy_field = np.array(bfs_field(cells, stride, enemy_indices), dtype=np.int64)[route]
+        pressure = float((enemy_field <= pressure_radius).mean())
+        nearest = int(enemy_field.min())
+        route_distance = nearest if nearest != UNREACHED else -1
+
+    return {
+        "floor_cells": floor_cells,
+        "reachable_ratio": int(reached.sum()) / max(1, floor_cells),
+        "dead_ends": int((reached & (degrees == 1)).sum()),
+        "corridor_mean": float(lengths.mean()) if lengths.size else 0.0,
+        "corridor_max": int(lengths.max()) if lengths.size else 0,
+        "route_length": int(length) if length < INFINITY else -1,
+        "route_missed": len(potions) - len(order),
+        "enemy_pressure": pressure,
+        "enemy_route_distance": route_distance,
+    }
+
+
+# ============================================================================
+# COLONNES ET CORPUS DE LABYRINTHES
+# ============================================================================
+
+def empty_columns(count):
+    """Colonnes de mesures vides pour `count` labyrinthes."""
+    return {name: np.zeros(count, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+
+def concat_columns(parts):
+    """Réunit des paquets de colonnes (dans l'ordre)."""
+    if not parts:
+        return empty_columns(0)
+    return {name: np.concatenate([part[name] for part in parts]) for name in COLUMNS}
+
+
+def pack_layouts(layouts):
+    """
+    Corpus de labyrinthes en tableaux : types bordés de murs jusqu'à la plus grande
+    taille, positions des potions et ennemis complétées par -1.
+    """
+    count = len(layouts)
+    size = max((layout["types"].shape[0] for layout in layouts), default=0)
+    potions = max((len(layout["potions"]) for layout in layouts), default=0)
+    enemies = max((len(layout["enemies"]) for layout in layouts), default=0)
+    packed = {
+        "seed": np.array([layout["seed"] for layout in layouts], dtype=np.int64),
+        "difficulty": np.array([layout["difficulty"] for layout in layouts], dtype=np.int8),
+        "width": np.array([layout["types"].shape[0] for layout in layouts], dtype=np.int16),
+        "types": np.full((count, size, size), CellType.WALL.value, dtype=np.uint8),
+        "start": np.array([layout["start"] for layout in layouts], dtype=np.int16).reshape(count, 2),
+        "exit": np.array([layout["exit"] for layout in layouts], dtype=np.int16).reshape(count, 2),
+        "potions": np.full((count, potions, 2), -1, dtype=np.int16),
+        "enemies": np.full((count, enemies, 2), -1, dtype=np.int16),
+    }
+    for i, layout in enumerate(layouts):
+        width, height = layout["types"].shape
+        packed["types"][i, :width, :height] = layout["types"]
+        packed["potions"][i, :len(layout["potions"])] = layout["potions"]
+        packed["enemies"][i, :len(layout["enemies"])] = layout["enemies"]
+    return packed
+
+
+def unpack_layouts(packed, start=0, stop=None):
+    """Labyrinthes d'un corpus (tranche [start, stop)) au format de pack_layouts."""
+    layouts = []
+    for i in range(start, len(packed["seed"]) if stop is None else stop):
+        width = int(packed["width"][i])
+        layouts.append({
+            "seed": int(packed["seed"][i]), "difficulty": int(packed["difficulty"][i]),
+            "types": packed["types"][i, :width, :width],
+            "start": tuple(packed["start"][i].tolist()), "exit": tuple(packed["exit"][i].tolist()),
+            "potions": [tuple(cell) for cell in packed["potions"][i].tolist() if cell[0] >= 0],
+            "enemies": [tuple(cell) for cell in packed["enemies"][i].tolist() if cell[0] >= 0],
+        })
+    return layouts
+
+
+def save_columns(path, columns):
+    """Écrit des colonnes : Parquet si le chemin finit par .parquet (pyarrow), .npz compressé sinon."""
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("pyarrow est requis pour écrire du Parquet (sinon utiliser un fichier .npz)")
+        pyarrow.parquet.write_table(pyarrow.table(columns), path)
+    else:
+        np.savez_compressed(path, **columns)
+
+
+def load_columns(path):
+    """Relit des colonnes écrites par save_columns ({nom: tableau NumPy})."""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet
+        table = pyarrow.parquet.read_table(path)
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+# ============================================================================
+# PROCESSUS DE TRAVAIL
+# ============================================================================
+
+def init_worker(quiet=True):
+    """Prépare le processus : la génération trace chaque essai."""
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+
+
+def record(columns, i, seed, difficulty, width, attempts, metrics):
+    """Range les mesures d'un labyrinthe à la ligne i des colonnes."""
+    columns["seed"][i] = seed
+    columns["difficulty"][i] = difficulty
+    columns["width"][i] = width
+    columns["attempts"][i] = attempts
+    for name, value in metrics.items():
+        columns[name][i] = value
+
+
+def analyze_seeds(task):
+    """
+    Paquet de graines consécutives (difficulté, première graine, nombre, taille, garder
+    les labyrinthes) : génère chaque labyrinthe valide et le mesure. Retourne
+    (colonnes, labyrinthes ou None).
+    """
+    from maze_new import generate_valid_maze
+    difficulty_name, first_seed, count, grid_size, keep_layouts = task
+    difficulty = Difficulty[difficulty_name.upper()]
+    columns = empty_columns(count)
+    layouts = [] if keep_layouts else None
+    for i, seed in enumerate(range(first_seed, first_seed + count)):
+        maze = generate_valid_maze(difficulty, grid_size=grid_size, seed=seed)
+        types = maze.get_type_array()
+        metrics = analyze_layout(types, maze.start_pos, maze.exit_pos, maze.potions, maze.enemy_positions)
+        record(columns, i, seed, difficulty.value, maze.width, maze.seed - seed + 1, metrics)
+        if layouts is not None:
+            layouts.append({"seed": seed, "difficulty": difficulty.value, "types": types.copy(),
+                            "start": maze.start_pos, "exit": maze.exit_pos,
+                            "potions": list(maze.potions), "enemies": list(maze.enemy_positions)})
+    return columns, layouts
+
+
+def analyze_layouts(layouts):
+    """Paquet de labyrinthes chargés (format de unpack_layouts) : colonnes de mesures."""
+    columns = empty_columns(len(layouts))
+    for i, layout in enumerate(layouts):
+        metrics = analyze_layout(layout["types"], layout["start"], layout["exit"],
+                                 layout["potions"], layout["enemies"])
+        record(columns, i, layout["seed"], layout["difficulty"], layout["types"].shape[0], 0, metrics)
+    return columns
+
+
+def build_tasks(difficulties, seeds, first_seed=0, grid_size=None, keep_layouts=False,
+                batch_size=ANALYZER_BATCH_SIZE):
+    """Paquets de graines consécutives : mêmes graines pour chaque difficulté."""
+    return [(difficulty, first_seed + offset, min(batch_size, seeds - offset), grid_size, keep_layouts)
+            for difficulty in difficulties for offset in range(0, seeds, batch_size)]
+
+
+def run_batches(function, tasks, workers=None):
+    """Répartit les paquets sur `workers` processus (tous les cœurs par défaut) ; résultats dans l'ordre."""
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        return list(pool.map(function, tasks))
+
+
+def analyze_seed_range(difficulties, seeds, first_seed=0, grid_size=None, workers=None, keep_layouts=False):
+    """Génère et mesure `seeds` labyrinthes par difficulté ; retourne (colonnes, corpus ou None)."""
+    results = run_batches(analyze_seeds, build_tasks(difficulties, seeds, first_seed, grid_size, keep_layouts),
+                          workers)
+    columns = concat_columns([batch for batch, _ in results])
+    layouts = pack_layouts([layout for _, batch in results for layout in batch]) if keep_layouts else None
+    return columns, layouts
+
+
+def analyze_corpus(packed, workers=None, batch_size=ANALYZER_BATCH_SIZE):
+    """Mesure les labyrinthes d'un corpus (pack_layouts) sans les régénérer."""
+    count = len(packed["seed"])
+    tasks = [unpack_layouts(packed, start, min(count, start + batch_size)) for start in range(0, count, batch_size)]
+    return concat_columns(run_batches(analyze_layouts, tasks, workers))
+
+
+# ============================================================================
+# RAPPORT
+# ============================================================================
+
+def column_percentiles(values, fractions=PERCENTILES):
+    """Centiles (plus proche rang, comme le tournoi) d'une colonne, None si vide."""
+    if not len(values):
+        return [None for _ in fractions]
+    ordered = np.sort(values)
+    return [ordered[min(len(ordered) - 1, int(fraction * len(ordered)))].item() for fraction in fractions]
+
+
+def summarize(columns, wall_seconds=None):
+    """Centiles de chaque mesure par difficulté."""
+    groups = []
+    for difficulty in Difficulty:
+        selected = columns["difficulty"] == difficulty.value
+        if not selected.any():
+            continue
+        groups.append({
+            "difficulty": difficulty.name.lower(), "mazes": int(selected.sum()),
+            "metrics": {name: column_percentiles(columns[name][selected]) for name in METRICS},
+        })
+    count = len(columns["seed"])
+    return {
+        "mazes": count, "wall_seconds": wall_seconds,
+        "mazes_per_second": count / wall_seconds if wall_seconds else None,
+        "groups": groups,
+    }
+
+
+def select_seeds(columns, metric, low=None, high=None, difficulty=None):
+    """Graines dont la mesure est dans [low, high] (bornes optionnelles), pour une difficulté ou toutes."""
+    selected = np.ones(len(columns["seed"]), dtype=bool)
+    if difficulty is not None:
+        selected &= columns["difficulty"] == difficulty.value
+    if low is not None:
+        selected &= columns[metric] >= low
+    if high is not None:
+        selected &= columns[metric] <= high
+    return columns["seed"][selected].tolist()
+
+
+def format_value(value):
+    if value is None:
+        return "-"
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+
+def format_report(summary):
+    """Rapport texte : une ligne par difficulté et par mesure (p10, p50, p90)."""
+    lines = [f"{'difficulté':<11}{'mesure':<22}{'p10':>9}{'p50':>9}{'p90':>9}"]
+    for group in summary["groups"]:
+        for name in METRICS:
+            p10, p50, p90 = (format_value(value) for value in group["metrics"][name])
+            lines.append(f"{group['difficulty']:<11}{name:<22}{p10:>9}{p50:>9}{p90:>9}")
+        lines.append(f"{'':<11}{group['mazes']} labyrinthes")
+    if summary["wall_seconds"]:
+        lines.append("")
+        lines.append(f"{summary['mazes']} labyrinthes analysés en {summary['wall_seconds']:.1f} s "
+                     f"({summary['mazes_per_second']:.0f} labyrinthes/s)")
+    return "\n".join(lines)
+
+
+def parse_pick(text):
+    """'mesure:min:max' (bornes vides permises) -> (mesure, min, max)."""
+    metric, low, high = (text.split(":") + ["", ""])[:3]
+    if metric not in COLUMNS:
+        raise ValueError(f"Mesure inconnue: {metric} (connues: {', '.join(COLUMNS)})")
+    return metric, float(low) if low else None, float(high) if high else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyse hors ligne des labyrinthes générés")
+    parser.add_argument("--seeds", type=int, default=1000, help="Graines analysées par difficulté")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--difficulty", default="easy,medium,hard,extreme")
+    parser.add_argument("--grid-size", type=int, default=None, help="Taille imposée (défaut : celle de la difficulté)")
+    parser.add_argument("--workers", type=int, default=None, help="Processus (défaut : tous les cœurs)")
+    parser.add_argument("--output", help="Écrit les mesures en colonnes (.npz, ou .parquet avec pyarrow)")
+    parser.add_argument("--save-mazes", help="Écrit aussi les labyrinthes générés (corpus .npz)")
+    parser.add_argument("--mazes", help="Analyse un corpus de labyrinthes au lieu d'en générer")
+    parser.add_argument("--load", help="Relit un fichier de mesures au lieu d'analyser")
+    parser.add_argument("--pick", help="Liste les graines dont une mesure est dans l'intervalle (mesure:min:max)")
+    parser.add_argument("--json", help="Écrit aussi le rapport dans ce fichier")
+    args = parser.parse_args()
+
+    difficulties = [name.strip().lower() for name in args.difficulty.split(",")]
+    for name in difficulties:
+        Difficulty[name.upper()]  # Nom invalide : KeyError avant de lancer les processus
+    pick = parse_pick(args.pick) if args.pick else None
+
+    start = time.perf_counter()
+    if args.load:
+        columns, wall_seconds = load_columns(args.load), None
+        print(f">>> MazeAnalyzer: {len(columns['seed'])} mesures relues depuis {args.load}")
+    else:
+        workers = args.workers or os.cpu_count() or 1
+        if args.mazes:
+            with np.load(args.mazes) as data:
+                packed = {name: data[name] for name in data.files}
+            print(f">>> MazeAnalyzer: {len(packed['seed'])} labyrinthes chargés sur {workers} processus")
+            columns = analyze_corpus(packed, workers)
+        else:
+            print(f">>> MazeAnalyzer: {args.seeds * len(difficulties)} labyrinthes sur {workers} processus")
+            columns, packed = analyze_seed_range(difficulties, args.seeds, args.first_seed, args.grid_size,
+                                                 workers, keep_layouts=bool(args.save_mazes))
+            if args.save_mazes:
+                np.savez_compressed(args.save_mazes, **packed)
+                print(f">>> MazeAnalyzer: corpus écrit dans {args.save_mazes}")
+        wall_seconds = time.perf_counter() - start
+        if args.output:
+            save_columns(args.output, columns)
+            print(f">>> MazeAnalyzer: mesures écrites dans {args.output}")
+
+    summary = summarize(columns, wall_seconds)
+    print(format_report(summary))
+    if pick:
+        seeds = select_seeds(columns, *pick)
+        print(f">>> MazeAnalyzer: {len(seeds)} graines pour {args.pick}: {seeds[:50]}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f">>> MazeAnalyzer: rapport écrit dans {args.json}")
+
+
+if __name__ == "__main__":
+    main()
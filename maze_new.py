@@ -5,26 +5,72 @@ Version révisée avec génération robuste.
 
 import random
 from collections import deque
-from config_new import CellType, Difficulty, DIFFICULTY_SETTINGS
+import numpy as np
+from config_new import CellType, Difficulty, DIFFICULTY_SETTINGS, HPA_MIN_GRID_SIZE, MAZE_CHANGE_LOG_SIZE
+from pathfinding import Pathfinder, bfs_distances
+from hpa import HierarchicalPathfinder
+from route_solver import solve_route, INFINITY
+from placement import UNREACHED, walkable_cells, iter_relax_distances, farthest_points, spread_score
+
+
+# Bits des murs d'une cellule (masque de 4 bits au lieu d'un dict par cellule)
+WALL_BITS = {"N": 1, "S": 2, "E": 4, "W": 8}
+ALL_WALLS = 15
+
+# Génération découpée : étapes élémentaires entre deux reprises de main, et part de
+# chaque phase (phase, début, fin) dans l'avancement global affiché pendant le chargement
+GENERATION_CHUNK = 512
+GENERATION_PHASES = (
+    ("grid", 0.0, 0.1),
+    ("carve", 0.1, 0.5),
+    ("walls", 0.5, 0.6),
+    ("flood", 0.6, 0.7),
+    ("place", 0.7, 0.8),
+    ("validate", 0.8, 1.0),
+)
+
+
+def run_generator(steps):
+    """Exécute d'un seul tenant une génération découpée ; retourne sa valeur de retour."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def generation_progress(phase, fraction):
+    """Avancement global (0-1) d'une étape (phase, avancement dans la phase)."""
+    for name, start, end in GENERATION_PHASES:
+        if name == phase:
+            return start + (end - start) * min(1.0, fraction)
+    return 0.0
 
-print(">>> maze_new.py: Démarrage du module")
 
 class Cell:
     """Représente une cellule du labyrinthe."""
     
+    __slots__ = ("x", "y", "wall_bits", "visited", "type", "item")
+    
     def __init__(self, x, y):
         self.x = x
         self.y = y
-        self.walls = {"N": True, "S": True, "E": True, "W": True}
+        self.wall_bits = ALL_WALLS
         self.visited = False
         self.type = CellType.EMPTY
         self.item = None
     
+    @property
+    def walls(self):
+        """Vue {direction: mur présent} du masque (compatibilité, en lecture seule)."""
+        return {direction: bool(self.wall_bits & bit) for direction, bit in WALL_BITS.items()}
+    
     def has_wall(self, direction):
-        return self.walls.get(direction, True)
+        bit = WALL_BITS.get(direction)
+        return bit is None or bool(self.wall_bits & bit)
     
     def remove_wall(self, direction):
-        self.walls[direction] = False
+        self.wall_bits &= ~WALL_BITS[direction]
     
     def is_walkable(self):
         """Retourne True si la cellule est traversable (pas un mur)."""
@@ -37,16 +83,34 @@ class Cell:
 class Maze:
     """Gère la grille de cellules et la génération du labyrinthe."""
     
-    def __init__(self, difficulty):
+    def __init__(self, difficulty, grid_size=None, seed=None, generate=True):
         print(f">>> Maze: Initialisation avec difficulté {difficulty}")
         self.difficulty = difficulty
+        # Graine de génération (rejouable) : tirée du générateur global si absente,
+        # pour que random.seed(...) reste déterministe
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng = random.Random(self.seed)
         settings = DIFFICULTY_SETTINGS[difficulty]
-        self.grid_size = settings["grid_size"]
+        # Taille personnalisée possible (grands labyrinthes), sinon celle de la difficulté
+        self.grid_size = grid_size or settings["grid_size"]
         self.width = self.grid_size
         self.height = self.grid_size
         
-        # Initialiser la grille
-        self.grid = [[Cell(x, y) for y in range(self.height)] for x in range(self.width)]
+        # Grille de cellules, construite par paquets de colonnes au début de la génération
+        # (iter_build_grid) : sur une grande grille, la créer d'un bloc gèlerait le chargement
+        self.grid = []
+        self.carve_order = None  # Ordre de creusement (aperçu du chargement), pendant la génération
+        
+        # Révision de la grille (incrémentée à chaque changement de type de case)
+        # et tableau NumPy des types, reconstruit à la demande
+        self.revision = 0
+        self._type_array = None
+        # Journal (révision, case) des derniers set_cell_type : mises à jour locales des caches
+        self._changes = deque(maxlen=MAZE_CHANGE_LOG_SIZE)
+        self._pathfinder = None  # Service de chemins JPS, créé à la première requête
+        self._hierarchical = None  # Graphe HPA* des grands labyrinthes, construit à la demande
+        self._wall_array = None  # Masques des murs (uint8 [x, y]), reconstruits par révision
+        self._wall_array_revision = None
         
         # Positions importantes
         self.start_pos = (0, 0)
@@ -54,30 +118,61 @@ class Maze:
         self.potions = []      # Positions des potions
         self.enemy_positions = []  # Positions initiales des ennemis
         self.chests = []       # Positions des coffres
+        if not generate:
+            return  # Grille construite par l'appelant (from_arrays, iter_generate)
         
-        # Génération
-        self.generate_recursive_backtracking()
-        self.place_items(
+        # Génération (d'un seul tenant ; iter_generate pour la version découpée)
+        run_generator(self.iter_generate())
+    
+    def iter_generate(self):
+        """
+        Génération complète découpée (grille, creusement, murs, cases accessibles, objets,
+        validation) :
+        générateur qui rend la main avec (phase, avancement dans la phase) toutes les
+        GENERATION_CHUNK étapes. Même graine, même labyrinthe qu'en un seul tenant.
+        """
+        settings = DIFFICULTY_SETTINGS[self.difficulty]
+        yield from self.iter_recursive_backtracking()
+        yield from self.iter_place_items(
             settings["potions"],
             settings["enemies"],
             settings.get("chests", 0),
-            settings.get("fog_radius")
+            settings.get("fog_radius"),
+            settings.get("enemy_min_distance", 0)
         )
+        self.carve_order = None  # Animation du creusement terminée
         
         print(f">>> Maze: Génération terminée. Potions: {len(self.potions)}, Ennemis: {len(self.enemy_positions)}, Coffres: {len(self.chests)}")
     
     def generate_recursive_backtracking(self):
         """Génère un labyrinthe parfait avec l'algorithme Recursive Backtracking."""
+        run_generator(self.iter_recursive_backtracking())
+    
+    def iter_build_grid(self):
+        """Grille neuve (cellules non visitées, tous murs levés), construite colonne par colonne."""
+        self.grid = []
+        columns_per_chunk = max(1, GENERATION_CHUNK // self.height)
+        for x in range(self.width):
+            if x % columns_per_chunk == 0:
+                yield "grid", x / self.width
+            self.grid.append([Cell(x, y) for y in range(self.height)])
+    
+    def iter_recursive_backtracking(self):
+        """
+        Recursive Backtracking découpé sur une grille neuve, puis murs intérieurs. Les
+        cases creusées sont notées dans l'ordre dans self.carve_order (animation du chargement).
+        """
         print(">>> Maze: Début de la génération Recursive Backtracking")
         
-        # Initialiser toutes les cellules comme non visitées
-        for x in range(self.width):
-            for y in range(self.height):
-                self.grid[x][y].visited = False
+        # Grille neuve : toutes les cellules non visitées
+        yield from self.iter_build_grid()
         
         # Choisir une cellule de départ
         stack = [(0, 0)]
         self.grid[0][0].visited = True
+        self.carve_order = [(0, 0)]
+        cell_count = self.width * self.height
+        steps = 0
         
         while stack:
             x, y = stack[-1]
@@ -92,7 +187,7 @@ class Maze:
             
             if neighbors:
                 # Choisir un voisin aléatoire
-                nx, ny, direction = random.choice(neighbors)
+                nx, ny, direction = self.rng.choice(neighbors)
                 next_cell = self.grid[nx][ny]
                 
                 # Abattre le mur entre current et next_cell
@@ -111,46 +206,52 @@ class Maze:
                 
                 # Marquer comme visité et empiler
                 next_cell.visited = True
-                stack.append((nx, ny))
+                position = (nx, ny)
+                stack.append(position)
+                self.carve_order.append(position)
             else:
                 # Backtrack
                 stack.pop()
+            steps += 1
+            if steps % GENERATION_CHUNK == 0:
+                yield "carve", len(self.carve_order) / cell_count
         
-        # Marquer toutes les cellules comme FLOOR (pas de mur d'enceinte)
+        # Types des cases en une passe : FLOOR partout (pas de mur d'enceinte), et environ
+        # 20% de murs intérieurs (sauf départ, sortie et leurs alentours). Le tableau des
+        # types est rempli colonne par colonne en même temps.
+        types = np.empty((self.width, self.height), dtype=np.uint8)
+        columns_per_chunk = max(1, GENERATION_CHUNK // self.height)
         for x in range(self.width):
+            if x % columns_per_chunk == 0:
+                yield "walls", x / self.width
+            column = self.grid[x]
             for y in range(self.height):
-                self.grid[x][y].type = CellType.FLOOR
-        
-        # Créer des murs intérieurs : environ 20% des cellules deviennent des murs
-        # (sauf départ, sortie et leurs alentours)
-        for x in range(self.width):
-            for y in range(self.height):
-                # Éviter de mettre un mur sur le départ ou la sortie
-                if (x, y) == self.start_pos or (x, y) == self.exit_pos:
-                    continue
-                # Éviter les cases adjacentes au départ
-                if abs(x - self.start_pos[0]) + abs(y - self.start_pos[1]) <= 1:
-                    continue
-                # 20% de chance de devenir un mur
-                if random.random() < 0.2:
-                    self.grid[x][y].type = CellType.WALL
+                cell_type = CellType.FLOOR
+                # Pas de mur sur le départ, la sortie ni les cases adjacentes au départ ;
+                # ailleurs, 20% de chance de devenir un mur
+                if ((x, y) != self.exit_pos and abs(x - self.start_pos[0]) + abs(y - self.start_pos[1]) > 1
+                        and self.rng.random() < 0.2):
+                    cell_type = CellType.WALL
+                column[y].type = cell_type
+            types[x] = [cell.type.value for cell in column]
         
         # Assurer que la sortie est accessible (porte)
-        self.grid[self.exit_pos[0]][self.exit_pos[1]].type = CellType.EXIT
-        # Assurer que la position de départ est un FLOOR (déjà fait)
-        self.grid[self.start_pos[0]][self.start_pos[1]].type = CellType.FLOOR
-        
-        # Garantir que les cases adjacentes au départ sont également des FLOOR
+        forced = [(self.exit_pos, CellType.EXIT)]
+        # Garantir que le départ et les cases adjacentes sont des FLOOR (déjà fait)
         for dx, dy in [(0, 0), (0, -1), (0, 1), (-1, 0), (1, 0)]:
-            nx, ny = self.start_pos[0] + dx, self.start_pos[1] + dy
-            if 0 <= nx < self.width and 0 <= ny < self.height:
-                self.grid[nx][ny].type = CellType.FLOOR
-        
+            forced.append(((self.start_pos[0] + dx, self.start_pos[1] + dy), CellType.FLOOR))
         # Garantir que les cases adjacentes à la sortie sont également des FLOOR (au moins une)
         for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:  # exclure (0,0) pour ne pas écraser la sortie
-            nx, ny = self.exit_pos[0] + dx, self.exit_pos[1] + dy
+            forced.append(((self.exit_pos[0] + dx, self.exit_pos[1] + dy), CellType.FLOOR))
+        for (nx, ny), cell_type in forced:
             if 0 <= nx < self.width and 0 <= ny < self.height:
-                self.grid[nx][ny].type = CellType.FLOOR
+                self.grid[nx][ny].type = cell_type
+                types[nx, ny] = cell_type.value
+        
+        # La grille a changé : tableau des types déjà à jour
+        self.revision += 1
+        self._type_array = types
+        self._changes.clear()
         
         # Vérification console
         if self.grid[self.start_pos[0]][self.start_pos[1]].type == CellType.FLOOR:
@@ -160,8 +261,16 @@ class Maze:
         
         print(">>> Maze: Génération Recursive Backtracking terminée")
     
-    def place_items(self, num_potions, num_enemies, num_chests, fog_radius):
-        """Place les potions, ennemis et coffres de manière aléatoire."""
+    def place_items(self, num_potions, num_enemies, num_chests, fog_radius, enemy_min_distance=0):
+        """Place les potions, ennemis et coffres, étalés selon les distances de chemin."""
+        run_generator(self.iter_place_items(num_potions, num_enemies, num_chests, fog_radius, enemy_min_distance))
+    
+    def iter_place_items(self, num_potions, num_enemies, num_chests, fog_radius, enemy_min_distance=0):
+        """
+        Placement découpé (rend la main pendant le calcul des distances depuis le départ, entre
+        les objets et pendant la validation) :
+        échantillonnage du point le plus éloigné sur les distances de chemin (placement.py).
+        """
         print(f">>> Maze: Placement des items (potions: {num_potions}, ennemis: {num_enemies}, coffres: {num_chests})")
         
         # Réinitialiser les listes
@@ -169,62 +278,63 @@ class Maze:
         self.enemy_positions = []
         self.chests = []
         
-        # Obtenir toutes les cases accessibles depuis le départ (Flood Fill)
-        accessible_cells = self.get_accessible_tiles()
-        # Filtrer les cases FLOOR (et EXIT) et exclure le départ
-        floor_cells = []
-        for (x, y) in accessible_cells:
-            if self.grid[x][y].type in (CellType.FLOOR, CellType.EXIT) and (x, y) != self.start_pos:
-                floor_cells.append((x, y))
-        
-        if not floor_cells:
+        # Distances de chemin depuis le départ (BFS multi-sources NumPy, découpé) : cases accessibles
+        grid = self.get_pathfinder().get_grid()
+        walkable = walkable_cells(grid)
+        stride = grid.stride
+        start_distances = np.full(walkable.shape, UNREACHED, dtype=np.int32)
+        cell_count = self.width * self.height
+        for settled in iter_relax_distances(walkable, stride, [grid.index(*self.start_pos)], start_distances,
+                                            GENERATION_CHUNK):
+            yield "flood", settled / cell_count
+        yield "place", 0.0
+        # Cases libres : FLOOR accessibles, hors départ et sortie
+        free = start_distances != UNREACHED
+        free[[grid.index(*self.start_pos), grid.index(*self.exit_pos)]] = False
+        if not free.any():
             print(">>> Maze: Aucune cellule accessible disponible (hormis départ)!")
-            # Fallback: utiliser toutes les cases FLOOR (sans garantie d'accessibilité)
-            floor_cells = []
-            for x in range(self.width):
-                for y in range(self.height):
-                    if self.grid[x][y].type == CellType.FLOOR and (x, y) != self.start_pos:
-                        floor_cells.append((x, y))
-            if not floor_cells:
-                print(">>> Maze: Aucune cellule FLOOR disponible!")
-                return
+            return
+        total = max(1, num_potions + num_enemies + num_chests)
+        placed = 0
         
-        # Mélanger les cellules
-        random.shuffle(floor_cells)
-        
-        # Placer les potions
-        if len(floor_cells) >= num_potions:
-            self.potions = floor_cells[:num_potions]
-            floor_cells = floor_cells[num_potions:]
-        else:
-            self.potions = floor_cells[:]
-            floor_cells = []
+        # Potions : chacune au plus loin (en chemin) du départ et des potions déjà placées
+        nearest = start_distances.copy()
+        for index in farthest_points(walkable, stride, nearest, free, num_potions, self.rng):
+            self.potions.append(grid.position(index))
+            free[index] = False
+            placed += 1
+            yield "place", placed / total
+        if len(self.potions) < num_potions:
             print(f">>> Maze: Attention, moins de potions que demandé ({len(self.potions)} au lieu de {num_potions})")
         
-        # Placer les ennemis
-        if len(floor_cells) >= num_enemies:
-            self.enemy_positions = floor_cells[:num_enemies]
-            floor_cells = floor_cells[num_enemies:]
-        else:
-            self.enemy_positions = floor_cells[:]
-            floor_cells = []
+        # Ennemis : à enemy_min_distance cases de chemin au moins du départ (si la grille
+        # le permet), étalés entre eux
+        candidates = free & (start_distances >= enemy_min_distance)
+        if np.count_nonzero(candidates) < num_enemies:
+            candidates = free
+        for index in farthest_points(walkable, stride, start_distances.copy(), candidates, num_enemies, self.rng):
+            self.enemy_positions.append(grid.position(index))
+            free[index] = False
+            placed += 1
+            yield "place", placed / total
+        if len(self.enemy_positions) < num_enemies:
             print(f">>> Maze: Attention, moins d'ennemis que demandé ({len(self.enemy_positions)} au lieu de {num_enemies})")
         
-        # Placer les coffres
-        if len(floor_cells) >= num_chests:
-            self.chests = floor_cells[:num_chests]
-            floor_cells = floor_cells[num_chests:]
-        else:
-            self.chests = floor_cells[:]
-            floor_cells = []
+        # Coffres : dans les zones restées loin du départ et des potions
+        for index in farthest_points(walkable, stride, nearest, free, num_chests, self.rng):
+            self.chests.append(grid.position(index))
+            placed += 1
+            yield "place", placed / total
+        if len(self.chests) < num_chests:
             print(f">>> Maze: Attention, moins de coffres que demandé ({len(self.chests)} au lieu de {num_chests})")
         
         # Vérifier que le labyrinthe est valide (toutes les potions accessibles)
         # Cette vérification devrait maintenant toujours réussir, mais on garde pour sécurité.
-        if not self.is_valid():
+        valid = yield from self.iter_is_valid()
+        if not valid:
             print(">>> Maze: ERREUR CRITIQUE: Labyrinthe non valide après placement sur cases accessibles.")
             # Réessayer avec moins d'items si nécessaire
-            if not self.is_valid():
+            if not (yield from self.iter_is_valid()):
                 print(">>> Maze: Toujours non valide. Réduction des potions.")
                 # Garder seulement la première potion
                 if len(self.potions) > 1:
@@ -232,26 +342,49 @@ class Maze:
         
         print(f">>> Maze: Items placés. Potions: {len(self.potions)}, Ennemis: {len(self.enemy_positions)}, Coffres: {len(self.chests)}")
     
+    def get_potion_spread(self):
+        """Étalement des potions : plus petite distance de chemin entre deux potions, ou entre une potion et le départ."""
+        grid = self.get_pathfinder().get_grid()
+        sources = [grid.index(*cell) for cell in [self.start_pos] + self.potions]
+        return spread_score(walkable_cells(grid), grid.stride, sources)
+    
     def is_valid(self):
         """Vérifie que toutes les potions et la sortie sont accessibles depuis le départ."""
+        return run_generator(self.iter_is_valid())
+    
+    def iter_is_valid(self):
+        """is_valid découpé (BFS qui rend la main pendant son parcours)."""
         targets = self.potions + [self.exit_pos]
-        return self.bfs_path_exists(self.start_pos, targets)
+        return (yield from self.iter_bfs_path_exists(self.start_pos, targets))
     
     def bfs_path_exists(self, start, targets):
         """
         Vérifie via BFS si tous les targets sont accessibles depuis start.
         Retourne True si oui, False sinon.
         """
+        return run_generator(self.iter_bfs_path_exists(start, targets))
+    
+    def iter_bfs_path_exists(self, start, targets):
+        """bfs_path_exists découpé : rend la main ("validate", avancement) toutes les GENERATION_CHUNK cases."""
         if not targets:
             return True
         
-        visited = set()
+        # Cases vues : un octet par case (x * hauteur + y) plutôt qu'un ensemble de
+        # tuples, dont la libération bloquerait à elle seule sur une grande grille
+        height = self.height
+        visited = bytearray(self.width * height)
+        visited[start[0] * height + start[1]] = 1
+        seen = 1
         queue = deque([start])
-        visited.add(start)
         remaining = set(targets)
+        cell_count = self.width * height
+        steps = 0
         
         while queue and remaining:
             x, y = queue.popleft()
+            steps += 1
+            if steps % GENERATION_CHUNK == 0:
+                yield "validate", seen / cell_count
             
             # Vérifier si cette position est une cible
             if (x, y) in remaining:
@@ -262,10 +395,11 @@ class Maze:
             # Explorer les voisins accessibles
             for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
                 nx, ny = x + dx, y + dy
-                if (0 <= nx < self.width and 0 <= ny < self.height and
-                    (nx, ny) not in visited and
+                if (0 <= nx < self.width and 0 <= ny < height and
+                    not visited[nx * height + ny] and
                     self.grid[nx][ny].is_walkable()):
-                    visited.add((nx, ny))
+                    visited[nx * height + ny] = 1
+                    seen += 1
                     queue.append((nx, ny))
         
         return len(remaining) == 0
@@ -275,15 +409,23 @@ class Maze:
         Retourne un ensemble des positions (x, y) accessibles depuis la position de départ.
         Utilise un BFS (Flood Fill) pour explorer toutes les cases traversables.
         """
+        return run_generator(self.iter_accessible_tiles(start))
+    
+    def iter_accessible_tiles(self, start=None):
+        """Flood fill découpé : rend la main ("flood", avancement) toutes les GENERATION_CHUNK cases."""
         if start is None:
             start = self.start_pos
-        from collections import deque
         visited = set()
         queue = deque([start])
         visited.add(start)
+        cell_count = self.width * self.height
+        steps = 0
         
         while queue:
             x, y = queue.popleft()
+            steps += 1
+            if steps % GENERATION_CHUNK == 0:
+                yield "flood", len(visited) / cell_count
             
             # Explorer les voisins accessibles
             for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
@@ -317,19 +459,164 @@ class Maze:
             return self.grid[x][y]
         return None
     
+    def set_cell_type(self, x, y, cell_type):
+        """Change le type d'une case en gardant le tableau des types à jour."""
+        self.grid[x][y].type = cell_type
+        if self._type_array is not None:
+            self._type_array[x, y] = cell_type.value
+        # Les masques des murs ne dépendent pas du type : le tableau reste valable
+        if self._wall_array_revision == self.revision:
+            self._wall_array_revision += 1
+        self.revision += 1
+        self._changes.append((self.revision, (x, y)))
+        if self._hierarchical is not None:
+            self._hierarchical.mark_dirty(x, y)
+    
+    def changes_since(self, revision):
+        """
+        Cases modifiées par set_cell_type depuis `revision` (liste, éventuellement avec
+        doublons) ; None si le journal ne remonte pas jusque-là (tout reconstruire).
+        """
+        if revision == self.revision:
+            return []
+        changes = self._changes
+        if revision is None or not changes or changes[0][0] > revision + 1:
+            return None
+        return [cell for change_revision, cell in changes if change_revision > revision]
+    
+    def get_type_array(self):
+        """
+        Retourne les types de cases sous forme de tableau NumPy uint8 indexé [x, y]
+        (valeurs de CellType). Construit une fois, puis maintenu par set_cell_type.
+        """
+        if self._type_array is None:
+            self._type_array = np.array(
+                [[cell.type.value for cell in column] for column in self.grid],
+                dtype=np.uint8
+            ).reshape(self.width, self.height)
+        return self._type_array
+    
+    def get_wall_array(self):
+        """Masques des murs (WALL_BITS) en tableau NumPy uint8 indexé [x, y], reconstruit par révision."""
+        if self._wall_array is None or self._wall_array_revision != self.revision:
+            self._wall_array = np.array(
+                [[cell.wall_bits for cell in column] for column in self.grid],
+                dtype=np.uint8
+            ).reshape(self.width, self.height)
+            self._wall_array_revision = self.revision
+        return self._wall_array
+    
+    @classmethod
+    def from_arrays(cls, difficulty, seed, wall_array, type_array):
+        """
+        Reconstruit un labyrinthe depuis ses tableaux de murs et de types (sauvegarde),
+        sans repasser par la génération ni la validation.
+        """
+        maze = cls(difficulty, wall_array.shape[0], seed, generate=False)
+        run_generator(maze.iter_build_grid())
+        cell_types = {cell_type.value: cell_type for cell_type in CellType}
+        for x, (walls, types) in enumerate(zip(wall_array.tolist(), type_array.tolist())):
+            column = maze.grid[x]
+            for y in range(maze.height):
+                cell = column[y]
+                cell.wall_bits = walls[y]
+                cell.type = cell_types[types[y]]
+                cell.visited = True
+        maze.revision += 1
+        maze._changes.clear()
+        return maze
+    
+    def get_pathfinder(self):
+        """Retourne le service de chemins (JPS + cache) du labyrinthe."""
+        if self._pathfinder is None:
+            self._pathfinder = Pathfinder(self)
+        return self._pathfinder
+    
+    def find_path(self, start, goal):
+        """Plus court chemin de start à goal (tuple de cases) ou None si inaccessible."""
+        return self.get_pathfinder().find_path(start, goal)
+    
+    def next_step_towards(self, start, goal):
+        """Case suivante sur le plus court chemin de start vers goal, ou None."""
+        return self.get_pathfinder().next_step_towards(start, goal)
+    
+    def cast_ray(self, start, direction, max_steps):
+        """Dernière case traversable en ligne droite depuis start, au plus max_steps cases."""
+        return self.get_pathfinder().cast_ray(start, direction, max_steps)
+    
+    def uses_hierarchical_search(self):
+        """Vrai si le labyrinthe est assez grand pour les recherches hiérarchiques (HPA*)."""
+        return max(self.width, self.height) >= HPA_MIN_GRID_SIZE
+    
+    def get_hierarchical_pathfinder(self):
+        """Retourne le service HPA* du labyrinthe (partagé par l'IA, la boussole et les tournées)."""
+        if self._hierarchical is None:
+            self._hierarchical = HierarchicalPathfinder(self)
+        return self._hierarchical
+    
+    def path_distances(self, start, targets, nearest_only=False):
+        """
+        Distances de chemin de start vers les cibles ({cible: distance}, inaccessibles absentes).
+        BFS exact sur les petites grilles, HPA* sur les grandes.
+        """
+        if self.uses_hierarchical_search():
+            return self.get_hierarchical_pathfinder().distances_from(start, targets, nearest_only)
+        return bfs_distances(self.get_pathfinder().get_grid(), start, targets, nearest_only)
+    
+    def nearest_target(self, start, targets):
+        """Cible la plus proche en distance de chemin : (cible, distance), ou None."""
+        distances = self.path_distances(start, targets, nearest_only=True)
+        if not distances:
+            return None
+        return min(distances.items(), key=lambda item: (item[1], item[0]))
+    
+    def plan_route(self, start, targets, end=None):
+        """
+        Ordre de visite des cibles depuis start (puis end si donné) minimisant la distance de chemin.
+        Retourne (cibles dans l'ordre, longueur) ; les cibles inaccessibles sont ignorées.
+        """
+        points = [start] + list(targets) + ([end] if end is not None else [])
+        matrix = []
+        for point in points:
+            distances = self.path_distances(point, points)
+            matrix.append([distances.get(other, INFINITY) for other in points])
+        order, length = solve_route(matrix, len(points) - 1 if end is not None else None)
+        return [points[i] for i in order], length
+    
     def __repr__(self):
         return f"Maze({self.width}x{self.height}, potions={len(self.potions)}, enemies={len(self.enemy_positions)})"
 
 
-def generate_valid_maze(difficulty, max_attempts=50):
+def generate_valid_maze(difficulty, max_attempts=50, grid_size=None, seed=None):
     """
     Génère un labyrinthe valide (avec garantie de victoire).
-    Réessaie jusqu'à max_attempts fois.
+    Réessaie jusqu'à max_attempts fois ; avec une graine, les essais suivants
+    utilisent seed + 1, seed + 2... (même graine, même labyrinthe).
+    """
+    return run_generator(iter_generate_valid_maze(difficulty, max_attempts, grid_size, seed))
+
+
+def with_maze(maze, steps):
+    """Ajoute le labyrinthe en cours aux étapes (phase, avancement) ; retourne la valeur de `steps`."""
+    while True:
+        try:
+            phase, fraction = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        yield maze, phase, fraction
+
+
+def iter_generate_valid_maze(difficulty, max_attempts=50, grid_size=None, seed=None):
+    """
+    generate_valid_maze découpé (chargement sans bloquer la boucle de jeu) : rend la main
+    avec (labyrinthe en cours, phase, avancement) et retourne le labyrinthe retenu.
     """
     print(f">>> generate_valid_maze: Tentative de génération pour {difficulty}")
     for attempt in range(max_attempts):
-        maze = Maze(difficulty)
-        if maze.is_valid():
+        maze = Maze(difficulty, grid_size, None if seed is None else seed + attempt, generate=False)
+        yield from with_maze(maze, maze.iter_generate())
+        valid = yield from with_maze(maze, maze.iter_is_valid())
+        if valid:
             print(f">>> generate_valid_maze: Succès à l'essai {attempt + 1}")
             return maze
         else:
@@ -337,7 +624,8 @@ def generate_valid_maze(difficulty, max_attempts=50):
     
     # Fallback : créer un labyrinthe minimal valide
     print(f">>> generate_valid_maze: Échec après {max_attempts} tentatives. Fallback.")
-    maze = Maze(difficulty)
+    maze = Maze(difficulty, grid_size, None if seed is None else seed + max_attempts, generate=False)
+    yield from with_maze(maze, maze.iter_generate())
     # Forcer la validité en réduisant les items
     maze.potions = maze.potions[:1] if maze.potions else []
     return maze
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+Minimap : vue réduite du labyrinthe construite une seule fois depuis le tableau
+des types de cases, puis mise à jour seulement pour les cases qui changent
+(zones explorées, marqueurs d'entités).
+"""
+
+import pygame
+import numpy as np
+from config_new import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, COLORS, MINIMAP_SIZE, CellType, get_fallback_color
+)
+
+# Couleur des cases pas encore explorées (sous le brouillard)
+UNEXPLORED_COLOR = (24, 24, 32)
+
+
+class Minimap:
+    """Minimap à 1 pixel par case, agrandie/réduite vers un widget de taille fixe."""
+
+    def __init__(self, maze, fog_radius, size=MINIMAP_SIZE):
+        self.maze = maze
+        self.width = maze.width
+        self.height = maze.height
+
+        # Taille du widget (proportions du labyrinthe conservées)
+        scale = size / max(self.width, self.height)
+        self.cell_scale = scale
+        self.widget_size = (max(1, round(self.width * scale)), max(1, round(self.height * scale)))
+        self.position = (SCREEN_WIDTH - self.widget_size[0] - 10, SCREEN_HEIGHT - self.widget_size[1] - 10)
+
+        # Couche de base : couleur réelle de chaque case
+        self.base_colors = self.build_base_colors()
+        self.revision = maze.revision
+
+        # État d'exploration (tout est visible sans brouillard)
+        self.explored = np.full((self.width, self.height), fog_radius is None, dtype=bool)
+        self.map_surface = pygame.Surface((self.width, self.height))
+        self.write_full_map()
+        self.scaled_surface = None
+        self.dirty = True
+        self.last_reveal = None  # (x, y, rayon) de la dernière révélation
+
+        # Marqueurs d'entités : surface transparente à la taille du widget
+        self.marker_surface = pygame.Surface(self.widget_size, pygame.SRCALPHA)
+        self.markers = {}  # (x, y) -> couleur actuellement dessinée
+
+        print(f">>> Minimap: {self.width}x{self.height} cases -> widget {self.widget_size[0]}x{self.widget_size[1]}")
+
+    # ------------------------------------------------------------------
+    # Couche des cases
+    # ------------------------------------------------------------------
+
+    def build_base_colors(self, types=None):
+        """Couleurs (W, H, 3) des cases depuis le tableau des types (une seule passe NumPy)."""
+        palette = np.zeros((256, 3), dtype=np.uint8)
+        palette[CellType.FLOOR.value] = COLORS["dark_gray"]
+        palette[CellType.EMPTY.value] = COLORS["dark_gray"]
+        palette[CellType.WALL.value] = COLORS["light_gray"]
+        palette[CellType.EXIT.value] = get_fallback_color("exit")
+        return palette[self.maze.get_type_array() if types is None else types]
+
+    def update_cells(self, cells):
+        """Recolore quelques cases changées (murs mouvants) sans reconstruire la carte."""
+        types = self.maze.get_type_array()
+        pixels = pygame.surfarray.pixels3d(self.map_surface)
+        for x, y in cells:
+            self.base_colors[x, y] = self.build_base_colors(types[x:x + 1, y:y + 1])[0, 0]
+            if self.explored[x, y]:
+                pixels[x, y] = self.base_colors[x, y]
+        del pixels  # Déverrouille la surface
+        self.dirty = True
+
+    def write_full_map(self):
+        """Écrit toute la carte (cases explorées en couleur, le reste masqué)."""
+        colors = np.where(self.explored[:, :, None], self.base_colors, np.uint8(UNEXPLORED_COLOR))
+        pygame.surfarray.blit_array(self.map_surface, colors.astype(np.uint8))
+        self.dirty = True
+
+    def reveal(self, center_x, center_y, radius):
+        """Marque comme explorées les cases du disque donné ; n'écrit que les nouvelles."""
+        x0, x1 = max(0, center_x - radius), min(self.width, center_x + radius + 1)
+        y0, y1 = max(0, center_y - radius), min(self.height, center_y + radius + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        xs = np.arange(x0, x1)[:, None] - center_x
+        ys = np.arange(y0, y1)[None, :] - center_y
+        disc = xs * xs + ys * ys <= radius * radius
+        window = self.explored[x0:x1, y0:y1]
+        new_cells = disc & ~window
+        if not new_cells.any():
+            return
+        window |= new_cells
+        pixels = pygame.surfarray.pixels3d(self.map_surface)
+        pixels[x0:x1, y0:y1][new_cells] = self.base_colors[x0:x1, y0:y1][new_cells]
+        del pixels  # Déverrouille la surface
+        self.dirty = True
+
+    def update(self, player_pos, fog_radius):
+        """
+        Met à jour l'exploration autour du joueur (seulement s'il a bougé). Appelée à
+        chaque frame par Game.update, que le widget soit affiché ou non.
+        """
+        if self.maze.revision != self.revision:
+            changes = self.maze.changes_since(self.revision)
+            if changes is None:
+                # Grille modifiée : reconstruire la couche de base
+                self.base_colors = self.build_base_colors()
+                self.write_full_map()
+            else:
+                self.update_cells(changes)
+            self.revision = self.maze.revision
+        if fog_radius is None:
+            return
+        reveal_key = (player_pos[0], player_pos[1], fog_radius)
+        if reveal_key != self.last_reveal:
+            self.reveal(player_pos[0], player_pos[1], fog_radius)
+            self.last_reveal = reveal_key
+
+    # ------------------------------------------------------------------
+    # Marqueurs
+    # ------------------------------------------------------------------
+
+    def get_marker_rect(self, cell):
+        """Rectangle du marqueur d'une case dans le widget (au moins 3x3 pixels)."""
+        size = max(3, int(self.cell_scale))
+        x = int((cell[0] + 0.5) * self.cell_scale) - size // 2
+        y = int((cell[1] + 0.5) * self.cell_scale) - size // 2
+        return pygame.Rect(x, y, size, size)
+
+    def update_markers(self, markers):
+        """
+        Met à jour les marqueurs {case: couleur} : seuls les marqueurs apparus, disparus
+        ou changés sont redessinés.
+        """
+        removed = [cell for cell in self.markers if cell not in markers]
+        changed = [cell for cell, color in markers.items() if self.markers.get(cell) != color]
+        if not removed and not changed:
+            return
+        cleared = []
+        for cell in removed + changed:
+            if cell in self.markers:
+                rect = self.get_marker_rect(cell)
+                self.marker_surface.fill((0, 0, 0, 0), rect)
+                cleared.append(rect)
+        # Redessiner les nouveaux marqueurs et ceux qu'un effacement a pu entamer
+        for cell, color in markers.items():
+            rect = self.get_marker_rect(cell)
+            if cell in changed or rect.collidelist(cleared) != -1:
+                self.marker_surface.fill(color, rect)
+        self.markers = dict(markers)
+
+    def build_markers(self, player_pos, enemies, potion_positions, compass_target, fog_radius):
+        """Marqueurs visibles : potions explorées (et cible de la boussole), ennemis en vue, joueur."""
+        markers = {}
+        for pos in potion_positions:
+            if self.explored[pos[0], pos[1]] or pos == compass_target:
+                markers[pos] = COLORS["yellow"]
+        for enemy in enemies:
+            pos = (enemy.grid_x, enemy.grid_y)
+            if fog_radius is None or (pos[0] - player_pos[0]) ** 2 + (pos[1] - player_pos[1]) ** 2 <= fog_radius ** 2:
+                markers[pos] = COLORS["red"]
+        markers[player_pos] = COLORS["cyan"]
+        return markers
+
+    # ------------------------------------------------------------------
+    # Affichage
+    # ------------------------------------------------------------------
+
+    def draw(self, screen, player_pos, enemies, potion_positions, compass_target, fog_radius):
+        """
+        Dessine le widget (la carte n'est remise à l'échelle que si elle a changé).
+        L'exploration n'est pas mise à jour ici (voir update).
+        """
+        self.update_markers(self.build_markers(player_pos, enemies, potion_positions, compass_target, fog_radius))
+        if self.dirty or self.scaled_surface is None:
+            self.scaled_surface = pygame.transform.scale(self.map_surface, self.widget_size)
+            self.dirty = False
+        x, y = self.position
+        pygame.draw.rect(screen, COLORS["white"], (x - 2, y - 2, self.widget_size[0] + 4, self.widget_size[1] + 4), 1)
+        screen.blit(self.scaled_surface, (x, y))
+        screen.blit(self.marker_surface, (x, y))
@@ -0,0 +1,158 @@
+"""
+Client graphique de la course en réseau : la coquille Game/Renderer habituelle, dont
+la simulation est remplacée par l'état reçu du serveur (netrace.RaceClient).
+
+Les déplacements sont envoyés au serveur et appliqués tout de suite en local
+(prédiction) ; à chaque frame la position repart de la dernière position confirmée
+par le serveur, puis les entrées qu'il n'a pas encore appliquées sont rejouées.
+Seules les entités de la zone d'intérêt du client sont affichées.
+"""
+
+import time
+import asyncio
+from collections import namedtuple
+
+import pygame
+
+from config_new import GameState, ItemType, NET_HOST, NET_PORT
+from game_new import Game
+from netrace import (
+    RaceClient, ENEMY_ID_BASE, EVENT_FINISH, EVENT_DEATH, EVENT_FREEZE, EVENT_VISION, EVENT_FOG
+)
+
+# Touches de déplacement -> actions du protocole (ordre de config_new.STEP_DIRECTIONS)
+MOVE_KEYS = {
+    pygame.K_UP: 0, pygame.K_z: 0,
+    pygame.K_DOWN: 1, pygame.K_s: 1,
+    pygame.K_LEFT: 2, pygame.K_q: 2,
+    pygame.K_RIGHT: 3, pygame.K_d: 3,
+}
+
+Rival = namedtuple("Rival", "grid_x grid_y")
+
+
+class NetGame(Game):
+    """Game piloté par un serveur de course : entrées envoyées, état appliqué depuis les deltas."""
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+        # Course en réseau : ni reprise, ni historique, ni cartes de chaleur locales
+        if self.autosave is not None:
+            self.autosave.close()
+        if self.run_history is not None:
+            self.run_history.close()
+        if self.telemetry is not None:
+            self.telemetry.close()
+        self.autosave = None
+        self.run_history = None
+        self.telemetry = None
+        self.saved_run_available = False
+        self.race_enemies = []  # Tous les ennemis de la course (seuls les visibles sont dans self.enemies)
+        self.view_sent = None
+        self.standings = []     # (id, temps en ms) des coureurs arrivés
+
+    def start_race(self):
+        """Démarre la partie locale sur le labyrinthe et les objets annoncés par le serveur."""
+        client = self.client
+        self.start_game(client.difficulty, client.maze)
+        for item, kind in zip(self.items, client.item_kinds):
+            item.type = kind
+        self.race_enemies = list(self.enemies)
+        self.enemies = []
+
+    def handle_events(self):
+        playing = self.state == GameState.PLAYING
+        events = super().handle_events()
+        if playing:
+            for event in events:
+                if event.type == pygame.KEYDOWN and event.key in MOVE_KEYS:
+                    self.client.send_input(MOVE_KEYS[event.key])
+        if self.state == GameState.MENU:
+            self.running = False  # Échap ou fin de course : le client se ferme
+        return events
+
+    def check_collisions(self):
+        """Collisions décidées par le serveur."""
+
+    def check_win_condition(self):
+        """Arrivée décidée par le serveur."""
+
+    def take_snapshot(self, save=False):
+        """Pas d'instantané d'une course en réseau."""
+        return None
+
+    def update(self):
+        """Applique l'état reçu (pas de simulation locale) et annonce la vue au serveur."""
+        if not self.client.connected:
+            self.running = False
+            return
+        if self.state != GameState.PLAYING:
+            return
+        client = self.client
+        now = pygame.time.get_ticks()
+        self.elapsed_time = time.time() - self.start_time
+        player = self.player
+        player.grid_x, player.grid_y = client.predicted_position()
+        health = client.health.get(client.player_id, player.health)
+        if health < player.health:
+            self.damage_flash_end = now + 200
+        player.health = health
+        for index in client.collected:
+            self.items[index].collected = True
+        player.potions_collected = sum(1 for index in client.collected if client.item_kinds[index] != ItemType.CHEST)
+
+        self.enemies = []
+        self.rivals = []
+        for entity, (x, y) in client.positions.items():
+            if entity >= ENEMY_ID_BASE:
+                enemy = self.race_enemies[entity - ENEMY_ID_BASE]
+                enemy.grid_x, enemy.grid_y = x, y
+                self.enemies.append(enemy)
+            elif entity != client.player_id:
+                self.rivals.append(Rival(x, y))
+
+        while client.events:
+            self.handle_race_event(*client.events.popleft(), now)
+
+        self.renderer.update_camera(player.grid_x, player.grid_y, self.maze.width, self.maze.height)
+        self.update_compass()
+        # Zone d'intérêt : suit le zoom du client
+        view = (int(self.renderer.view_width / self.renderer.tile_size / 2) + 1,
+                int(self.renderer.view_height / self.renderer.tile_size / 2) + 1)
+        if view != self.view_sent:
+            client.send_view(*view)
+            self.view_sent = view
+
+    def handle_race_event(self, racer_id, kind, value, now):
+        own = racer_id == self.client.player_id
+        if kind == EVENT_FINISH:
+            self.standings.append((racer_id, value))
+            print(f">>> NetGame: Coureur {racer_id} arrivé {len(self.standings)}e en {value / 1000:.2f}s")
+            if own:
+                self.elapsed_time = value / 1000
+                self.state = GameState.WIN
+        elif kind == EVENT_DEATH:
+            print(f">>> NetGame: Coureur {racer_id} éliminé")
+            if own:
+                self.state = GameState.GAME_OVER
+        elif kind == EVENT_FREEZE:
+            self.potion_effects["freeze"] = now + value
+        elif kind == EVENT_VISION and own:
+            self.potion_effects["vision"] = now + value
+        elif kind == EVENT_FOG and own:
+            self.renderer.fog_radius = value
+
+
+async def play(host=NET_HOST, port=NET_PORT):
+    """Rejoint une course et l'affiche jusqu'à la fermeture de la fenêtre ou de la connexion."""
+    client = RaceClient()
+    await client.connect(host, port)
+    game = NetGame(client)
+    game.start_race()
+    receiver = asyncio.ensure_future(client.receive())
+    try:
+        await game.run()
+    finally:
+        await client.close()
+        receiver.cancel()
@@ -0,0 +1,633 @@
+"""
+Course en réseau : plusieurs joueurs sur le même labyrinthe à graine, simulés par un
+serveur asyncio autoritaire (un processus, un tick toutes les 1000 / NET_TICK_RATE ms).
+
+Le serveur applique les entrées des clients (une par tick et par coureur) avec les
+règles de Player, Enemy et Game.check_collisions ; chaque coureur a ses propres
+potions et coffres, les ennemis (et le gel) sont communs à la course. Les clients
+reconstruisent le labyrinthe depuis sa graine et ne reçoivent ensuite que des deltas.
+
+Protocole binaire (TCP, chaque message précédé de sa longueur sur 2 octets) :
+- client -> serveur : HELLO (version, demi-vue en cases), INPUT (numéro, action), VIEW ;
+- serveur -> client : WELCOME (id, difficulté, graine, types des objets), puis à chaque
+  tick où quelque chose change un DELTA : entités déplacées, santés modifiées, objets
+  ramassés par ce coureur, entités sorties de la zone d'intérêt, événements de course,
+  et la dernière entrée appliquée (réconciliation de la prédiction locale).
+
+Gestion d'intérêt : un client ne reçoit que les entités dans sa vue (demi-largeur et
+demi-hauteur envoyées par le client), réduite au rayon du brouillard s'il y en a un.
+TCP étant fiable et ordonné, chaque delta est calculé par rapport au dernier état
+envoyé au client (pas d'accusé de réception par tick).
+
+Usage : python netrace.py server [--port P] [--difficulty easy] [--seed S]
+        python netrace.py client [--host H] [--port P]
+        python netrace.py loadtest [--sessions 8,32,128] [--seconds S]
+"""
+
+import os
+import sys
+import time
+import random
+import struct
+import asyncio
+import argparse
+import contextlib
+from collections import deque
+
+from config_new import (
+    Difficulty, ItemType, DIFFICULTY_SETTINGS, BOT_MOVE_FRAMES,
+    POTION_VISION_DURATION_MS, POTION_FREEZE_DURATION_MS, SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE,
+    NET_HOST, NET_PORT, NET_TICK_RATE, NET_ROOM_SIZE, NET_MAX_INPUTS, NET_MAX_WRITE_BUFFER,
+    STEP_DIRECTIONS  # Actions 0-3 (haut, bas, gauche, droite)
+)
+from entities_new import Player, CHEST_RESULTS, CHEST_ODDS, POTION_ODDS, draw, create_enemies_from_maze
+from maze_new import Maze, generate_valid_maze
+
+
+# ============================================================================
+# PROTOCOLE
+# ============================================================================
+
+PROTOCOL_VERSION = 1
+MSG_HELLO = 1
+MSG_INPUT = 2
+MSG_VIEW = 3
+MSG_WELCOME = 10
+MSG_DELTA = 11
+
+FRAME = struct.Struct("<H")           # Longueur du message qui suit
+HELLO = struct.Struct("<BBBB")        # type, version, demi-largeur, demi-hauteur de la vue (0 : défaut)
+INPUT = struct.Struct("<BIB")         # type, numéro de l'entrée, action
+VIEW = struct.Struct("<BBB")          # type, demi-largeur, demi-hauteur
+WELCOME = struct.Struct("<BBBIIHHBB")  # type, id, difficulté, graine, tick, largeur, hauteur, potions, objets
+DELTA = struct.Struct("<BIIBBBBB")    # type, tick, dernière entrée, déplacements, santés, objets, retraits, événements
+MOVE = struct.Struct("<Bhh")          # id, x, y
+HEALTH = struct.Struct("<BB")         # id, santé
+ITEM = struct.Struct("<B")            # indice de l'objet (potions puis coffres)
+REMOVE = struct.Struct("<B")          # id sorti de la zone d'intérêt
+EVENT = struct.Struct("<BBI")         # id du coureur, type, valeur
+
+ENEMY_ID_BASE = 128  # Ids 0..NET_ROOM_SIZE-1 : coureurs ; à partir de 128 : ennemis
+
+# Événements de course (valeur entre parenthèses)
+EVENT_FINISH = 1   # Arrivée (temps de course en ms), diffusé à tous
+EVENT_DEATH = 2    # Coureur éliminé, diffusé à tous
+EVENT_FREEZE = 3   # Ennemis gelés (durée en ms), diffusé à tous
+EVENT_VISION = 4   # Effet vision du coureur (durée en ms)
+EVENT_FOG = 5      # Coffre piégé : nouveau rayon du brouillard du coureur
+
+
+def encode_delta(tick, ack, moves, healths, items, removed, events):
+    """Message DELTA : en-tête puis sections de taille fixe (5 octets par entité déplacée)."""
+    parts = [DELTA.pack(MSG_DELTA, tick, ack, len(moves), len(healths), len(items), len(removed), len(events))]
+    parts.extend(MOVE.pack(*move) for move in moves)
+    parts.extend(HEALTH.pack(*health) for health in healths)
+    parts.extend(ITEM.pack(item) for item in items)
+    parts.extend(REMOVE.pack(entity) for entity in removed)
+    parts.extend(EVENT.pack(*event) for event in events)
+    return b"".join(parts)
+
+
+def decode_delta(payload):
+    """Inverse d'encode_delta : (tick, ack, moves, healths, items, removed, events)."""
+    _, tick, ack, n_moves, n_healths, n_items, n_removed, n_events = DELTA.unpack_from(payload)
+    offset = DELTA.size
+    sections = []
+    for layout, count in ((MOVE, n_moves), (HEALTH, n_healths), (ITEM, n_items), (REMOVE, n_removed), (EVENT, n_events)):
+        entries = [layout.unpack_from(payload, offset + i * layout.size) for i in range(count)]
+        offset += count * layout.size
+        sections.append(entries)
+    moves, healths, items, removed, events = sections
+    return tick, ack, moves, healths, [item for (item,) in items], [entity for (entity,) in removed], events
+
+
+def default_view():
+    """Demi-vue (cases) d'un écran au zoom 1, entités partiellement visibles comprises."""
+    return SCREEN_WIDTH // (2 * TILE_SIZE) + 1, SCREEN_HEIGHT // (2 * TILE_SIZE) + 1
+
+
+async def read_message(reader):
+    """Lit un message préfixé par sa longueur."""
+    (length,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+    return await reader.readexactly(length)
+
+
+def send_message(writer, payload):
+    writer.write(FRAME.pack(len(payload)) + payload)
+
+
+# ============================================================================
+# SERVEUR
+# ============================================================================
+
+class Racer:
+    """Un coureur connecté : son joueur autoritaire et l'état déjà envoyé à son client."""
+
+    def __init__(self, racer_id, player, writer, view, fog_radius, tick):
+        self.id = racer_id
+        self.player = player
+        self.writer = writer
+        self.view = view
+        self.fog_radius = fog_radius  # Réduit par les coffres piégés
+        self.joined_tick = tick
+        self.inputs = deque()         # (numéro, action) en attente
+        self.ack = 0                  # Dernière entrée appliquée
+        self.sent_ack = 0
+        self.collected = set()        # Objets ramassés (indices)
+        self.new_items = []           # Ramassés depuis le dernier delta
+        self.events = []              # Événements propres à ce coureur depuis le dernier delta
+        self.known = {}               # id -> position déjà envoyée (zone d'intérêt)
+        self.known_health = {}        # id -> santé déjà envoyée
+        self.vision_until = 0         # Tick de fin de l'effet vision
+        self.outcome = None           # None (en course), EVENT_FINISH ou EVENT_DEATH
+
+
+class RaceRoom:
+    """Une course : un labyrinthe à graine, ses ennemis communs et jusqu'à NET_ROOM_SIZE coureurs."""
+
+    def __init__(self, difficulty, seed, tick_rate=NET_TICK_RATE, size=NET_ROOM_SIZE):
+        self.difficulty = difficulty
+        self.settings = DIFFICULTY_SETTINGS[difficulty]
+        self.maze = generate_valid_maze(difficulty, seed=seed)
+        self.tick_rate = tick_rate
+        self.size = size
+        self.rng = random.Random(self.maze.seed)  # Types des potions et contenu des coffres
+        self.item_positions = list(self.maze.potions) + list(self.maze.chests)
+        self.item_kinds = ([draw(POTION_ODDS, self.rng.random()) for _ in self.maze.potions]
+                           + [ItemType.CHEST] * len(self.maze.chests))
+        self.item_at = {position: index for index, position in enumerate(self.item_positions)}
+        self.enemies = create_enemies_from_maze(self.maze, difficulty)
+        self.racers = {}
+        self.tick_count = 0
+        self.freeze_until = 0
+        self.events = []  # Événements diffusés à toute la course pendant ce tick
+        print(f">>> RaceRoom: Course {difficulty.name} (graine {self.maze.seed}), {len(self.enemies)} ennemis")
+
+    def ms_to_ticks(self, ms):
+        return ms * self.tick_rate // 1000
+
+    def is_full(self):
+        return len(self.racers) >= self.size
+
+    def join(self, writer, view):
+        """Ajoute un coureur au départ ; retourne son Racer."""
+        racer_id = next(i for i in range(self.size) if i not in self.racers)
+        start_x, start_y = self.maze.start_pos
+        player = Player(start_x, start_y, self.settings["potions"])
+        racer = Racer(racer_id, player, writer, view, self.settings.get("fog_radius"), self.tick_count)
+        self.racers[racer_id] = racer
+        return racer
+
+    def leave(self, racer):
+        self.racers.pop(racer.id, None)
+
+    def welcome(self, racer):
+        """Message WELCOME : de quoi reconstruire le labyrinthe et ses objets côté client."""
+        header = WELCOME.pack(MSG_WELCOME, racer.id, self.difficulty.value, self.maze.seed, self.tick_count,
+                              self.maze.width, self.maze.height, self.settings["potions"], len(self.item_kinds))
+        return header + bytes(kind.value for kind in self.item_kinds)
+
+    def tick(self):
+        """Un tick de simulation : entrées, minuteurs, ennemis, collisions, arrivées et éliminations."""
+        self.tick_count += 1
+        self.events = []
+        running = [racer for racer in self.racers.values() if racer.outcome is None]
+        for racer in running:
+            if racer.inputs:
+                racer.ack, action = racer.inputs.popleft()
+                if racer.player.move(STEP_DIRECTIONS[action], self.maze):
+                    self.check_collisions(racer)
+                    self.check_finish(racer)
+            racer.player.update(self.maze)
+        running = [racer for racer in running if racer.outcome is None]
+
+        # Ennemis communs (sauf gel) : chacun vise le coureur en course le plus proche
+        if running and self.tick_count >= self.freeze_until:
+            for enemy in self.enemies:
+                target = min(running, key=lambda racer: abs(racer.player.grid_x - enemy.grid_x)
+                             + abs(racer.player.grid_y - enemy.grid_y))
+                enemy.update(target.player.get_grid_position(), self.maze)
+
+        for racer in running:
+            self.check_collisions(racer)
+            if not racer.player.is_alive():
+                racer.outcome = EVENT_DEATH
+                self.events.append((racer.id, EVENT_DEATH, 0))
+                print(f">>> RaceRoom: Coureur {racer.id} éliminé")
+            else:
+                self.check_finish(racer)
+
+    def check_collisions(self, racer):
+        """Game.check_collisions pour un coureur : ennemis, puis ses potions et coffres."""
+        player = racer.player
+        position = player.get_grid_position()
+        for enemy in self.enemies:
+            if position == enemy.get_grid_position() and player.take_damage(1):
+                player.apply_knockback(enemy.grid_x, enemy.grid_y, self.maze)
+        index = self.item_at.get(position)
+        if index is None or index in racer.collected:
+            return
+        racer.collected.add(index)
+        racer.new_items.append(index)
+        kind = self.item_kinds[index]
+        if kind == ItemType.CHEST:
+            result = CHEST_RESULTS[draw(CHEST_ODDS, self.rng.random())]
+            if result["subtype"] == "health":
+                player.health = min(player.max_health, player.health + 1)
+            elif result["subtype"] == "damage":
+                player.take_damage(1)
+            elif result["subtype"] == "fog" and racer.fog_radius is not None:
+                racer.fog_radius = max(1, racer.fog_radius - 1)
+                racer.events.append((racer.id, EVENT_FOG, racer.fog_radius))
+            return
+        player.collect_potion()
+        if kind == ItemType.POTION_VISION:
+            racer.vision_until = self.tick_count + self.ms_to_ticks(POTION_VISION_DURATION_MS)
+            racer.events.append((racer.id, EVENT_VISION, POTION_VISION_DURATION_MS))
+        elif kind == ItemType.POTION_FREEZE:
+            self.freeze_until = self.tick_count + self.ms_to_ticks(POTION_FREEZE_DURATION_MS)
+            self.events.append((racer.id, EVENT_FREEZE, POTION_FREEZE_DURATION_MS))
+
+    def check_finish(self, racer):
+        """Game.check_win_condition : toutes les potions sur la sortie termine la course du coureur."""
+        if racer.player.has_all_potions() and racer.player.get_grid_position() == self.maze.exit_pos:
+            racer.outcome = EVENT_FINISH
+            race_ms = (self.tick_count - racer.joined_tick) * 1000 // self.tick_rate
+            self.events.append((racer.id, EVENT_FINISH, race_ms))
+            print(f">>> RaceRoom: Coureur {racer.id} arrivé en {race_ms / 1000:.2f}s")
+
+    def interest(self, racer):
+        """Demi-côtés de la zone d'intérêt : la vue du client, bornée par son brouillard."""
+        half_width, half_height = racer.view
+        if racer.fog_radius is not None:
+            radius = racer.fog_radius + (3 if self.tick_count < racer.vision_until else 0)
+            half_width, half_height = min(half_width, radius), min(half_height, radius)
+        return half_width, half_height
+
+    def build_delta(self, racer):
+        """Delta depuis le dernier envoi à ce coureur ; None si rien n'a changé."""
+        px, py = racer.player.get_grid_position()
+        half_width, half_height = self.interest(racer)
+        visible = {racer.id: (px, py)}
+        for other in self.racers.values():
+            if abs(other.player.grid_x - px) <= half_width and abs(other.player.grid_y - py) <= half_height:
+                visible[other.id] = other.player.get_grid_position()
+        for index, enemy in enumerate(self.enemies):
+            if abs(enemy.grid_x - px) <= half_width and abs(enemy.grid_y - py) <= half_height:
+                visible[ENEMY_ID_BASE + index] = enemy.get_grid_position()
+
+        known = racer.known
+        moves = [(entity, x, y) for entity, (x, y) in visible.items() if known.get(entity) != (x, y)]
+        removed = [entity for entity in known if entity not in visible]
+        healths = []
+        for entity in visible:
+            if entity < ENEMY_ID_BASE:
+                health = self.racers[entity].player.health
+                if racer.known_health.get(entity) != health:
+                    healths.append((entity, health))
+                    racer.known_health[entity] = health
+        for entity in removed:
+            racer.known_health.pop(entity, None)
+        racer.known = visible
+        events = self.events + racer.events
+        if not (moves or healths or racer.new_items or removed or events) and racer.ack == racer.sent_ack:
+            return None
+        data = encode_delta(self.tick_count, racer.ack, moves, healths, racer.new_items, removed, events)
+        racer.new_items = []
+        racer.events = []
+        racer.sent_ack = racer.ack
+        return data
+
+
+class RaceServer:
+    """Serveur asyncio : accepte les clients, les répartit en courses et fait tourner toutes les courses."""
+
+    def __init__(self, difficulty=Difficulty.MEDIUM, seed=0, host=NET_HOST, port=NET_PORT,
+                 tick_rate=NET_TICK_RATE, room_size=NET_ROOM_SIZE):
+        self.difficulty = difficulty
+        self.seed = seed
+        self.host = host
+        self.port = port
+        self.tick_rate = tick_rate
+        self.room_size = room_size
+        self.rooms = []
+        self.rooms_created = 0
+        self.server = None
+        self.ticker = None
+        # Statistiques (test de charge)
+        self.ticks = 0
+        self.late_ticks = 0
+        self.tick_seconds = 0.0
+        self.bytes_sent = 0
+        self.dropped = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]  # Port réel si 0 (choisi par le système)
+        self.ticker = asyncio.ensure_future(self.tick_loop())
+        print(f">>> RaceServer: En écoute sur {self.host}:{self.port} ({self.difficulty.name}, {self.tick_rate} ticks/s)")
+
+    async def close(self):
+        if self.ticker is not None:
+            self.ticker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.ticker
+        for room in self.rooms:
+            for racer in list(room.racers.values()):
+                racer.writer.close()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    def open_room(self):
+        """Première course ayant une place libre, sinon une nouvelle course (graine suivante)."""
+        for room in self.rooms:
+            if not room.is_full():
+                return room
+        room = RaceRoom(self.difficulty, self.seed + self.rooms_created, self.tick_rate, self.room_size)
+        self.rooms_created += 1
+        self.rooms.append(room)
+        return room
+
+    async def handle_client(self, reader, writer):
+        room = racer = None
+        try:
+            msg_type, version, half_width, half_height = HELLO.unpack(await read_message(reader))
+            if msg_type != MSG_HELLO or version != PROTOCOL_VERSION:
+                print(f">>> RaceServer: Client refusé (message {msg_type}, version {version})")
+                return
+            default_width, default_height = default_view()
+            room = self.open_room()
+            racer = room.join(writer, (half_width or default_width, half_height or default_height))
+            send_message(writer, room.welcome(racer))
+            while True:
+                payload = await read_message(reader)
+                if not payload:
+                    print(">>> RaceServer: Message vide, client retiré")
+                    return
+                if payload[0] == MSG_INPUT:
+                    _, sequence, action = INPUT.unpack(payload)
+                    if action < len(STEP_DIRECTIONS) and len(racer.inputs) < NET_MAX_INPUTS:
+                        racer.inputs.append((sequence, action))
+                elif payload[0] == MSG_VIEW:
+                    _, half_width, half_height = VIEW.unpack(payload)
+                    racer.view = (half_width or default_width, half_height or default_height)
+        except (asyncio.IncompleteReadError, ConnectionError, struct.error):
+            pass  # Client parti ou message invalide : on le retire de sa course
+        finally:
+            if racer is not None:
+                room.leave(racer)
+                if not room.racers:
+                    self.rooms.remove(room)
+            writer.close()
+
+    def tick_rooms(self):
+        """Un tick de toutes les courses puis l'envoi des deltas."""
+        for room in self.rooms:
+            room.tick()
+            for racer in list(room.racers.values()):
+                data = room.build_delta(racer)
+                if data is None:
+                    continue
+                if racer.writer.transport.get_write_buffer_size() > NET_MAX_WRITE_BUFFER:
+                    # Client trop lent : ses deltas ne peuvent plus être rattrapés. Retiré de la
+                    # course tout de suite (plus simulé ni recompté jusqu'à l'échec de sa lecture)
+                    self.dropped += 1
+                    room.leave(racer)
+                    racer.writer.close()
+                    continue
+                send_message(racer.writer, data)
+                self.bytes_sent += FRAME.size + len(data)
+
+    async def tick_loop(self):
+        loop = asyncio.get_running_loop()
+        period = 1.0 / self.tick_rate
+        deadline = loop.time()
+        while True:
+            start = time.perf_counter()
+            self.tick_rooms()
+            self.tick_seconds += time.perf_counter() - start
+            self.ticks += 1
+            deadline += period
+            delay = deadline - loop.time()
+            if delay < 0:
+                # Tick en retard : on repart de maintenant plutôt que d'enchaîner les ticks en rafale
+                self.late_ticks += 1
+                deadline = loop.time()
+            await asyncio.sleep(max(0.0, delay))
+
+    def sessions(self):
+        return sum(len(room.racers) for room in self.rooms)
+
+
+# ============================================================================
+# CLIENT RÉSEAU
+# ============================================================================
+
+class RaceClient:
+    """
+    Connexion à un serveur de course : reconstruit le labyrinthe depuis la graine et
+    tient un miroir de l'état reçu (positions et santés visibles, objets ramassés).
+    """
+
+    def __init__(self, mazes=None):
+        self.mazes = mazes  # Cache {(difficulté, graine): Maze} partagé entre clients (bots)
+        self.reader = None
+        self.writer = None
+        self.player_id = None
+        self.difficulty = None
+        self.maze = None
+        self.total_potions = 0
+        self.item_kinds = []
+        self.positions = {}   # id -> (x, y), entités dans la zone d'intérêt
+        self.health = {}      # id -> santé, coureurs visibles
+        self.collected = set()
+        self.events = deque()  # Événements non encore traités par l'affichage
+        self.tick = 0
+        self.ack = 0
+        self.sequence = 0
+        self.pending = deque()  # Entrées envoyées et pas encore appliquées par le serveur
+        self.bytes_received = 0
+        self.connected = False
+
+    async def connect(self, host=NET_HOST, port=NET_PORT, view=(0, 0)):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.connected = True
+        send_message(self.writer, HELLO.pack(MSG_HELLO, PROTOCOL_VERSION, *view))
+        payload = await read_message(self.reader)
+        (_, self.player_id, difficulty, seed, self.tick, width, height,
+         self.total_potions, item_count) = WELCOME.unpack_from(payload)
+        self.difficulty = Difficulty(difficulty)
+        self.item_kinds = [ItemType(value) for value in payload[WELCOME.size:WELCOME.size + item_count]]
+        key = (self.difficulty, seed)
+        if self.mazes is not None and key in self.mazes:
+            self.maze = self.mazes[key]
+        else:
+            self.maze = Maze(self.difficulty, seed=seed)
+            if self.mazes is not None:
+                self.mazes[key] = self.maze
+        assert (self.maze.width, self.maze.height) == (width, height)
+
+    async def receive(self):
+        """Applique les deltas jusqu'à la fermeture de la connexion."""
+        try:
+            while True:
+                payload = await read_message(self.reader)
+                self.bytes_received += FRAME.size + len(payload)
+                if payload[0] == MSG_DELTA:
+                    self.apply_delta(payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connected = False
+
+    def apply_delta(self, payload):
+        self.tick, self.ack, moves, healths, items, removed, events = decode_delta(payload)
+        while self.pending and self.pending[0][0] <= self.ack:
+            self.pending.popleft()
+        for entity in removed:
+            self.positions.pop(entity, None)
+            self.health.pop(entity, None)
+        for entity, x, y in moves:
+            self.positions[entity] = (x, y)
+        for entity, health in healths:
+            self.health[entity] = health
+        self.collected.update(items)
+        self.events.extend(events)
+
+    def send_input(self, action):
+        self.sequence += 1
+        self.pending.append((self.sequence, action))
+        send_message(self.writer, INPUT.pack(MSG_INPUT, self.sequence, action))
+
+    def send_view(self, half_width, half_height):
+        send_message(self.writer, VIEW.pack(MSG_VIEW, min(half_width, 255), min(half_height, 255)))
+
+    def predicted_position(self):
+        """Position du serveur, puis entrées pas encore appliquées rejouées contre les murs."""
+        x, y = self.positions.get(self.player_id, self.maze.start_pos)
+        for _, action in self.pending:
+            dx, dy = STEP_DIRECTIONS[action]
+            if self.maze.is_walkable(x + dx, y + dy):
+                x, y = x + dx, y + dy
+        return x, y
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            with contextlib.suppress(ConnectionError):
+                await self.writer.wait_closed()
+
+
+# ============================================================================
+# TEST DE CHARGE
+# ============================================================================
+
+async def run_bot(client, seed, stop):
+    """Bot de charge : un déplacement aléatoire possible toutes les BOT_MOVE_FRAMES ticks."""
+    rng = random.Random(seed)
+    receiver = asyncio.ensure_future(client.receive())
+    try:
+        while not stop.is_set():
+            x, y = client.predicted_position()
+            moves = [action for action, (dx, dy) in enumerate(STEP_DIRECTIONS)
+                     if client.maze.is_walkable(x + dx, y + dy)]
+            if moves and not client.pending:
+                client.send_input(rng.choice(moves))
+            await asyncio.sleep(BOT_MOVE_FRAMES / NET_TICK_RATE)
+    finally:
+        await client.close()
+        receiver.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await receiver
+
+
+async def load_test(sessions, seconds=5.0, difficulty=Difficulty.MEDIUM, seed=0):
+    """
+    Serveur et `sessions` bots dans le même processus sur localhost. Retourne le temps
+    de tick du serveur, les ticks en retard, le débit par client et la capacité estimée
+    (sessions tenables avant que les ticks ne dépassent leur période).
+    """
+    server = RaceServer(difficulty, seed, port=0)
+    await server.start()
+    mazes = {}
+    clients = []
+    for _ in range(sessions):
+        client = RaceClient(mazes)
+        await client.connect(NET_HOST, server.port)
+        clients.append(client)
+    stop = asyncio.Event()
+    bots = [asyncio.ensure_future(run_bot(client, seed + i, stop)) for i, client in enumerate(clients)]
+    ticks, tick_seconds, sent = server.ticks, server.tick_seconds, server.bytes_sent
+    start = time.perf_counter()
+    await asyncio.sleep(seconds)
+    elapsed = time.perf_counter() - start
+    ticks, tick_seconds, sent = server.ticks - ticks, server.tick_seconds - tick_seconds, server.bytes_sent - sent
+    hosted, rooms = server.sessions(), len(server.rooms)
+    stop.set()
+    await asyncio.gather(*bots)
+    await server.close()
+    tick_ms = tick_seconds * 1000 / max(1, ticks)
+    period_ms = 1000 / server.tick_rate
+    return {
+        "sessions": hosted,
+        "rooms": rooms,
+        "ticks_per_second": ticks / elapsed,
+        "tick_ms": tick_ms,
+        "late_ticks": server.late_ticks,
+        "bytes_per_client_per_second": sent / elapsed / max(1, hosted),
+        # Le coût d'un tick croît avec le nombre de sessions : capacité au coût mesuré par session
+        "capacity": int(hosted * period_ms / tick_ms) if tick_ms > 0 else 0,
+        "dropped": server.dropped,
+    }
+
+
+LOAD_REPORT_HEADER = f"{'sessions':>9}{'courses':>9}{'ticks/s':>9}{'tick ms':>9}{'retards':>9}{'o/s/client':>12}{'capacité':>10}"
+
+
+def format_load_row(row):
+    return (f"{row['sessions']:>9}{row['rooms']:>9}{row['ticks_per_second']:>9.1f}{row['tick_ms']:>9.3f}"
+            f"{row['late_ticks']:>9}{row['bytes_per_client_per_second']:>12.0f}{row['capacity']:>10}")
+
+
+# ============================================================================
+# LIGNE DE COMMANDE
+# ============================================================================
+
+async def serve(difficulty, seed, host, port):
+    server = RaceServer(difficulty, seed, host, port)
+    await server.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Course en réseau sur un labyrinthe à graine")
+    parser.add_argument("mode", choices=("server", "client", "loadtest"))
+    parser.add_argument("--host", default=NET_HOST)
+    parser.add_argument("--port", type=int, default=NET_PORT)
+    parser.add_argument("--difficulty", default="medium")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sessions", default="8,32,128")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args(argv)
+    difficulty = Difficulty[args.difficulty.upper()]
+
+    if args.mode == "server":
+        asyncio.run(serve(difficulty, args.seed, args.host, args.port))
+    elif args.mode == "client":
+        from net_game import play
+        asyncio.run(play(args.host, args.port))
+    else:
+        print(LOAD_REPORT_HEADER)
+        for sessions in (int(value) for value in args.sessions.split(",")):
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):  # Le serveur trace chaque action
+                row = asyncio.run(load_test(sessions, args.seconds, difficulty, args.seed))
+            print(format_load_row(row))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+"""
+Recherche de chemin sur la grille du labyrinthe : Jump Point Search 4-connexe
+(règles « sans diagonale » de pathfinding.js), BFS et A* de référence, et cache
+LRU des chemins invalidé à chaque révision de la grille.
+
+Les grilles générées sont surtout ouvertes (environ 20 % de murs isolés) : JPS
+saute les longues lignes droites au lieu d'empiler chaque case dans la file.
+"""
+
+import heapq
+from collections import OrderedDict, deque
+import numpy as np
+from config_new import CellType, PATH_CACHE_SIZE, HPA_CLUSTER_SIZE
+
+
+class WalkableGrid:
+    """
+    Grille de marche aplatie (octets 0/1, lignes de y) entourée d'une bordure de murs :
+    les boucles de recherche n'ont aucun test de bornes.
+    """
+
+    def __init__(self, walkable):
+        """walkable: tableau booléen NumPy indexé [x, y]."""
+        self.width, self.height = walkable.shape
+        self.stride = self.width + 2
+        padded = np.zeros((self.height + 2, self.width + 2), dtype=np.uint8)
+        padded[1:-1, 1:-1] = walkable.T
+        self.cells = padded.tobytes()
+
+    @classmethod
+    def from_maze(cls, maze):
+        """Grille de marche depuis le tableau des types du labyrinthe."""
+        return cls(maze.get_type_array() != CellType.WALL.value)
+
+    def index(self, x, y):
+        """Indice aplati de la case (x, y)."""
+        return (y + 1) * self.stride + x + 1
+
+    def position(self, index):
+        """Case (x, y) d'un indice aplati."""
+        y, x = divmod(index, self.stride)
+        return (x - 1, y - 1)
+
+    def is_walkable(self, x, y):
+        """Vrai si la case est dans la grille et traversable."""
+        return 0 <= x < self.width and 0 <= y < self.height and self.cells[self.index(x, y)] == 1
+
+    def update_cells(self, maze, cells):
+        """Recopie l'état de quelques cases du labyrinthe (sans reconstruire la grille)."""
+        buffer = bytearray(self.cells)
+        for x, y in cells:
+            buffer[self.index(x, y)] = 1 if maze.is_walkable(x, y) else 0
+        self.cells = bytes(buffer)
+
+    def expand(self, indices):
+        """Chemin case par case (tuple de positions) depuis une suite de points alignés."""
+        stride = self.stride
+        path = [self.position(indices[0])]
+        for a, b in zip(indices, indices[1:]):
+            step = (1 if b > a else -1) if abs(b - a) < stride else (stride if b > a else -stride)
+            path.extend(self.position(i) for i in range(a + step, b + step, step))
+        return tuple(path)
+
+
+# ----------------------------------------------------------------------
+# Jump Point Search
+# ----------------------------------------------------------------------
+
+def _jump_horizontal(cells, stride, node, step, goal):
+    """Saute horizontalement jusqu'au prochain point de saut (-1 si bloqué)."""
+    while True:
+        node += step
+        if not cells[node]:
+            return -1
+        if node == goal:
+            return node
+        # Voisin forcé : ouverture au-dessus ou en dessous derrière un mur
+        if (cells[node - stride] and not cells[node - step - stride]) or \
+           (cells[node + stride] and not cells[node - step + stride]):
+            return node
+
+
+def _jump_vertical(cells, stride, node, step, goal):
+    """Saute verticalement ; s'arrête aussi si un saut horizontal trouve un point de saut."""
+    while True:
+        node += step
+        if not cells[node]:
+            return -1
+        if node == goal:
+            return node
+        if (cells[node - 1] and not cells[node - 1 - step]) or \
+           (cells[node + 1] and not cells[node + 1 - step]):
+            return node
+        if _jump_horizontal(cells, stride, node, 1, goal) != -1 or \
+           _jump_horizontal(cells, stride, node, -1, goal) != -1:
+            return node
+
+
+def find_path_jps(grid, start, goal):
+    """
+    Plus court chemin 4-connexe par Jump Point Search.
+    Retourne un tuple de cases de start à goal inclus, ou None si goal est inaccessible.
+    """
+    if not grid.is_walkable(*start) or not grid.is_walkable(*goal):
+        return None
+    cells, stride = grid.cells, grid.stride
+    source, target = grid.index(*start), grid.index(*goal)
+    if source == target:
+        return (start,)
+    goal_y, goal_x = divmod(target, stride)
+
+    parents = {source: None}
+    costs = {source: 0}
+    closed = set()
+    open_list = [(0, 0, source)]
+    while open_list:
+        _, depth, node = heapq.heappop(open_list)
+        cost = -depth
+        if node in closed:
+            continue
+        if node == target:
+            points = []
+            while node is not None:
+                points.append(node)
+                node = parents[node]
+            return grid.expand(points[::-1])
+        closed.add(node)
+
+        # Directions élaguées : tout droit et les deux perpendiculaires, sauf au départ
+        parent = parents[node]
+        if parent is None:
+            steps = (1, -1, stride, -stride)
+        elif abs(node - parent) < stride:
+            forward = 1 if node > parent else -1
+            steps = (forward, stride, -stride)
+        else:
+            forward = stride if node > parent else -stride
+            steps = (forward, 1, -1)
+
+        for step in steps:
+            if not cells[node + step]:
+                continue
+            if step == 1 or step == -1:
+                jump = _jump_horizontal(cells, stride, node, step, target)
+                distance = abs(jump - node)
+            else:
+                jump = _jump_vertical(cells, stride, node, step, target)
+                distance = abs(jump - node) // stride
+            if jump == -1 or jump in closed:
+                continue
+            new_cost = cost + distance
+            if new_cost < costs.get(jump, new_cost + 1):
+                costs[jump] = new_cost
+                parents[jump] = node
+                y, x = divmod(jump, stride)
+                heapq.heappush(open_list, (new_cost + abs(x - goal_x) + abs(y - goal_y), -new_cost, jump))
+    return None
+
+
+# ----------------------------------------------------------------------
+# Références (benchmarks et tests)
+# ----------------------------------------------------------------------
+
+def _rebuild(grid, parents, node):
+    """Chemin depuis la table des parents case par case."""
+    path = []
+    while node is not None:
+        path.append(grid.position(node))
+        node = parents[node]
+    return tuple(path[::-1])
+
+
+def find_path_bfs(grid, start, goal):
+    """Plus court chemin par parcours en largeur (référence)."""
+    if not grid.is_walkable(*start) or not grid.is_walkable(*goal):
+        return None
+    cells, stride = grid.cells, grid.stride
+    source, target = grid.index(*start), grid.index(*goal)
+    parents = {source: None}
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        if node == target:
+            return _rebuild(grid, parents, node)
+        for step in (1, -1, stride, -stride):
+            neighbor = node + step
+            if cells[neighbor] and neighbor not in parents:
+                parents[neighbor] = node
+                queue.append(neighbor)
+    return None
+
+
+def bfs_distances(grid, start, targets, nearest_only=False):
+    """
+    Distances de chemin exactes de start vers chaque cible (un seul BFS).
+    Retourne un dictionnaire {cible: distance} sans les cibles inaccessibles.
+    """
+    if not grid.is_walkable(*start):
+        return {}
+    cells, stride = grid.cells, grid.stride
+    remaining = {grid.index(*target): target for target in targets if grid.is_walkable(*target)}
+    found = {}
+    source = grid.index(*start)
+    distances = {source: 0}
+    queue = deque([source])
+    while queue and remaining:
+        node = queue.popleft()
+        if node in remaining:
+            found[remaining.pop(node)] = distances[node]
+            if nearest_only:
+                break
+        distance = distances[node] + 1
+        for step in (1, -1, stride, -stride):
+            neighbor = node + step
+            if cells[neighbor] and neighbor not in distances:
+                distances[neighbor] = distance
+                queue.append(neighbor)
+    return found
+
+
+def find_path_astar(grid, start, goal):
+    """Plus court chemin par A* case par case avec heuristique de Manhattan (référence)."""
+    if not grid.is_walkable(*start) or not grid.is_walkable(*goal):
+        return None
+    cells, stride = grid.cells, grid.stride
+    source, target = grid.index(*start), grid.index(*goal)
+    goal_y, goal_x = divmod(target, stride)
+    parents = {source: None}
+    costs = {source: 0}
+    closed = set()
+    open_list = [(0, 0, source)]
+    while open_list:
+        _, depth, node = heapq.heappop(open_list)
+        cost = -depth
+        if node in closed:
+            continue
+        if node == target:
+            return _rebuild(grid, parents, node)
+        closed.add(node)
+        for step in (1, -1, stride, -stride):
+            neighbor = node + step
+            if not cells[neighbor] or neighbor in closed:
+                continue
+            new_cost = cost + 1
+            if new_cost < costs.get(neighbor, new_cost + 1):
+                costs[neighbor] = new_cost
+                parents[neighbor] = node
+                y, x = divmod(neighbor, stride)
+                heapq.heappush(open_list, (new_cost + abs(x - goal_x) + abs(y - goal_y), -new_cost, neighbor))
+    return None
+
+
+# ----------------------------------------------------------------------
+# Service de chemins d'un labyrinthe
+# ----------------------------------------------------------------------
+
+class Pathfinder:
+    """
+    Chemins JPS sur un labyrinthe, avec cache LRU. Une requête dont le départ se trouve
+    sur un chemin déjà calculé vers la même cible réutilise la fin de ce chemin.
+    """
+
+    def __init__(self, maze, cache_size=PATH_CACHE_SIZE):
+        self.maze = maze
+        self.cache_size = cache_size
+        self.grid = None
+        self.revision = None
+        self.paths = OrderedDict()     # (départ, cible) -> chemin (ou None)
+        self.goal_paths = OrderedDict()  # cible -> (chemin, {case: rang dans le chemin})
+        self.hits = 0
+        self.misses = 0
+
+    def get_grid(self):
+        """
+        Grille de marche à jour. Après quelques set_cell_type, seules les cases changées
+        sont recopiées et seuls les chemins qui les touchent oubliés ; sinon la grille est
+        reconstruite et le cache vidé.
+        """
+        if self.revision != self.maze.revision:
+            changes = None if self.grid is None else self.maze.changes_since(self.revision)
+            if changes is None:
+                self.grid = WalkableGrid.from_maze(self.maze)
+                self.paths.clear()
+                self.goal_paths.clear()
+            else:
+                self.grid.update_cells(self.maze, changes)
+                self.forget_paths(changes)
+            self.revision = self.maze.revision
+        return self.grid
+
+    def forget_paths(self, cells):
+        """
+        Oublie les chemins passant par les cases changées ou leurs voisines (une fermeture
+        les coupe, une ouverture peut les raccourcir), et les « inaccessible » si une case
+        s'est ouverte. Les autres chemins restent traversables.
+        """
+        touched = set()
+        opened = False
+        for x, y in cells:
+            touched.add((x, y))
+            touched.update(((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)))
+            opened = opened or self.grid.is_walkable(x, y)
+        for key, path in list(self.paths.items()):
+            if (path is None and opened) or (path is not None and not touched.isdisjoint(path)):
+                del self.paths[key]
+        for goal, (path, ranks) in list(self.goal_paths.items()):
+            if not touched.isdisjoint(ranks):
+                del self.goal_paths[goal]
+
+    def lookup(self, start, goal):
+        """Retourne (chemin, rang de start dans le chemin) ; (None, 0) si inaccessible."""
+        grid = self.get_grid()
+        key = (start, goal)
+        if key in self.paths:
+            self.paths.move_to_end(key)
+            self.hits += 1
+            return self.paths[key], 0
+        known = self.goal_paths.get(goal)
+        if known is not None and start in known[1]:
+            self.goal_paths.move_to_end(goal)
+            self.hits += 1
+            return known[0], known[1][start]
+
+        self.misses += 1
+        path = self.search(grid, start, goal)
+        self.remember(self.paths, key, path)
+        if path is not None:
+            self.remember(self.goal_paths, goal, (path, {cell: i for i, cell in enumerate(path)}))
+        return path, 0
+
+    def search(self, grid, start, goal):
+        """Requête non cachée : HPA* pour les longues distances des grands labyrinthes, JPS sinon."""
+        if self.maze.uses_hierarchical_search() and \
+           abs(start[0] - goal[0]) + abs(start[1] - goal[1]) > 2 * HPA_CLUSTER_SIZE:
+            return self.maze.get_hierarchical_pathfinder().find_path(start, goal)
+        return find_path_jps(grid, start, goal)
+
+    def remember(self, cache, key, value):
+        """Ajoute une entrée au cache LRU donné en évinçant la plus ancienne si besoin."""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def find_path(self, start, goal):
+        """Plus court chemin (tuple de cases, départ et cible inclus) ou None."""
+        path, rank = self.lookup(start, goal)
+        if path is None:
+            return None
+        return path[rank:] if rank else path
+
+    def next_step_towards(self, start, goal):
+        """Case suivante sur le plus court chemin vers goal (None si inaccessible ou déjà arrivé)."""
+        path, rank = self.lookup(start, goal)
+        if path is None or rank + 1 >= len(path):
+            return None
+        return path[rank + 1]
+
+    def cast_ray(self, start, direction, max_steps):
+        """Dernière case traversable en ligne droite depuis start (au plus max_steps cases)."""
+        grid = self.get_grid()
+        dx, dy = direction
+        node = grid.index(*start)
+        step = dx + dy * grid.stride
+        reached = 0
+        while reached < max_steps and grid.cells[node + step]:
+            node += step
+            reached += 1
+        return (start[0] + dx * reached, start[1] + dy * reached)
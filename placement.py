@@ -0,0 +1,123 @@
+"""
+Placement des objets selon les vraies distances de chemin (échantillonnage du point le
+plus éloigné).
+
+Les distances sont tenues dans un tableau aplati de la grille de marche bordée
+(pathfinding.WalkableGrid) et calculées par BFS multi-sources en NumPy, une couche du
+front par itération. Chaque objet placé ne relance qu'un BFS élagué : seules les cases
+qui se rapprochent d'un objet sont mises à jour, le front rétrécit à mesure que les
+objets se multiplient. Coût total O(cases x objets).
+"""
+
+import math
+import numpy as np
+from config_new import PLACEMENT_SLACK
+
+UNREACHED = np.iinfo(np.int32).max
+
+
+def walkable_cells(grid):
+    """Grille de marche bordée en tableau booléen aplati (indices de grid.index)."""
+    return np.frombuffer(grid.cells, dtype=np.uint8).astype(bool)
+
+
+def relax_distances(walkable, stride, sources, distances):
+    """
+    BFS multi-sources en place : abaisse `distances` (tableau aplati int32) aux distances
+    de chemin vers les sources là où elles sont plus courtes, et s'arrête aux cases
+    déjà plus proches d'une source précédente. Retourne `distances`.
+    """
+    for _ in iter_relax_distances(walkable, stride, sources, distances):
+        pass
+    return distances
+
+
+def iter_relax_distances(walkable, stride, sources, distances, chunk=None):
+    """
+    relax_distances découpé : générateur qui rend la main avec le nombre de cases
+    atteintes chaque fois qu'au moins `chunk` cases de plus l'ont été (jamais si None).
+    """
+    offsets = np.array((1, -1, stride, -stride), dtype=np.int64)
+    frontier = np.asarray(sources, dtype=np.int64)
+    frontier = frontier[distances[frontier] > 0]
+    distances[frontier] = 0
+    slots = np.empty(walkable.shape, dtype=np.int64)  # Dédoublonnage du front sans tri
+    level = 0
+    reached = frontier.size
+    next_yield = chunk
+    while frontier.size:
+        level += 1
+        neighbors = (frontier[:, None] + offsets).ravel()
+        neighbors = neighbors[walkable[neighbors] & (distances[neighbors] > level)]
+        order = np.arange(neighbors.size)
+        slots[neighbors] = order
+        frontier = neighbors[slots[neighbors] == order]
+        distances[frontier] = level
+        reached += frontier.size
+        if chunk is not None and reached >= next_yield:
+            next_yield = reached + chunk
+            yield reached
+
+
+def distance_field(walkable, stride, sources):
+    """Distances de chemin vers la source la plus proche (UNREACHED si inaccessible)."""
+    return relax_distances(walkable, stride, sources, np.full(walkable.shape, UNREACHED, dtype=np.int32))
+
+
+def farthest_points(walkable, stride, nearest, candidates, count, rng, slack=PLACEMENT_SLACK):
+    """
+    Générateur des indices de jusqu'à `count` cases parmi `candidates` (masque aplati),
+    chacune loin des sources de `nearest` et des cases déjà choisies : tirage au hasard
+    parmi celles dont la distance atteint `slack` fois la plus grande. `nearest` est mis
+    à jour en place après chaque case (un BFS élagué par objet).
+    """
+    available = candidates.copy()
+    for _ in range(count):
+        values = np.where(available, nearest, -1)
+        best = int(values.max())
+        if best < 0:
+            return
+        pool = np.flatnonzero(values >= min(best, max(1, math.ceil(best * slack))))
+        index = int(pool[rng.randrange(len(pool))])
+        available[index] = False
+        relax_distances(walkable, stride, [index], nearest)
+        yield index
+
+
+def spread_score(walkable, stride, sources):
+    """
+    Plus petite distance de chemin entre deux sources reliées (0 si moins de deux, None si
+    aucune ne se rejoint) : un BFS multi-sources étiqueté, puis le minimum de
+    d(a) + 1 + d(b) sur les passages entre deux zones d'étiquettes différentes.
+    """
+    sources = np.asarray(sources, dtype=np.int64)
+    if len(sources) < 2:
+        return 0
+    if len(np.unique(sources)) < len(sources):
+        return 0
+    offsets = np.array((1, -1, stride, -stride), dtype=np.int64)
+    distances = np.full(walkable.shape, UNREACHED, dtype=np.int32)
+    labels = np.full(walkable.shape, -1, dtype=np.int32)
+    distances[sources] = 0
+    labels[sources] = np.arange(len(sources))
+    frontier = sources
+    level = 0
+    while frontier.size:
+        level += 1
+        origins = np.repeat(frontier, len(offsets))
+        neighbors = (frontier[:, None] + offsets).ravel()
+        keep = walkable[neighbors] & (distances[neighbors] > level)
+        neighbors, origins = neighbors[keep], origins[keep]
+        neighbors, first = np.unique(neighbors, return_index=True)
+        distances[neighbors] = level
+        labels[neighbors] = labels[origins[first]]
+        frontier = neighbors
+    best = None
+    reached = np.flatnonzero(labels >= 0)
+    for offset in (1, stride):
+        other = reached + offset
+        border = (labels[other] >= 0) & (labels[other] != labels[reached])
+        if border.any():
+            length = int((distances[reached[border]] + distances[other[border]]).min()) + 1
+            best = length if best is None else min(best, length)
+    return best
@@ -4,54 +4,174 @@ Version révisée avec brouillard correct.
 """
 
 import pygame
-import os
+import numpy as np
+from atlas import load_atlas_steps
 from config_new import (
-    SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, COLORS, ASSET_MAPPING,
-    get_asset_path, get_fallback_color, CellType, EnemyType, ItemType
+    SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, RENDER_SCALE, COLORS, ASSET_MAPPING,
+    MAX_ZOOM, ZOOM_STEP, LOD_SPRITE_MIN_TILE, HEATMAP_MAX_ALPHA,
+    get_fallback_color, CellType, EnemyType, ItemType
 )
 
-print(">>> renderer_new.py: Démarrage du module")
-
 class Renderer:
     """Gère l'affichage du jeu avec optimisations."""
     
-    def __init__(self, screen):
+    def __init__(self, screen, render_scale=RENDER_SCALE, load_sprites=True):
+        """load_sprites=False : sprites chargés plus tard (iter_load_sprites, démarrage paresseux)."""
         print(">>> Renderer: Initialisation")
         self.screen = screen
         self.sprites = {}
+        self.sprites_loaded = False
         self.tile_size = TILE_SIZE
         self.camera_offset_x = 0  # Décalage de la caméra en pixels
         self.camera_offset_y = 0
         
+        # Cible de rendu du monde (l'écran, ou une surface réduite en mode basse résolution)
+        self.render_scale = 1
+        self.surface = screen
+        self.view_width = SCREEN_WIDTH
+        self.view_height = SCREEN_HEIGHT
+        self.upscale_target = None
+        self.wall_glyph = None
+        
+        # Zoom continu et niveau de détail ("sprites" ou "pixels")
+        self.base_tile_size = TILE_SIZE
+        self.zoom = 1.0
+        self.min_zoom = 1.0
+        self.lod_mode = "sprites"
+        self.lod_base_surface = None  # Fond de la vue d'ensemble (cases écrites en pixels)
+        self.lod_cache_key = None
+        
         # Brouillard de guerre
         self.fog_surface = None
         self.fog_radius = None  # Rayon en cases
         
-        # Chargement des sprites
-        self.load_sprites()
+        # Carte de chaleur (touche H) : une case = un pixel, agrandie pour la zone visible
+        self.heatmap_surface = None
+        self.heatmap_key = None
+        self.heatmap_scaled = None
+        self.heatmap_scaled_key = None
+        
+        # Chargement des sprites (à la taille de case de la cible de rendu)
+        self.set_render_scale(render_scale, reload_sprites=False)
+        if load_sprites:
+            self.load_sprites()
+            print(f">>> Renderer: {len(self.sprites)} sprites chargés")
+    
+    def set_render_scale(self, render_scale, reload_sprites=True):
+        """
+        Choisit le facteur d'agrandissement entier du monde.
+        1 : dessin direct à l'écran. N > 1 : le monde est dessiné à TILE_SIZE // N pixels
+        par case dans une surface N fois plus petite, puis agrandi une seule fois par frame.
+        """
+        if render_scale < 1 or TILE_SIZE % render_scale != 0:
+            print(f">>> Renderer: Facteur de rendu {render_scale} invalide (doit diviser {TILE_SIZE}), rendu direct")
+            render_scale = 1
+        
+        self.render_scale = render_scale
+        self.base_tile_size = TILE_SIZE // render_scale
+        self.tile_size = self.base_tile_size
+        self.view_width = SCREEN_WIDTH // render_scale
+        self.view_height = SCREEN_HEIGHT // render_scale
+        self.wall_glyph = None
+        self.zoom = 1.0
+        self.lod_mode = "sprites"
+        self.lod_base_surface = None
+        self.lod_cache_key = None
+        
+        if render_scale == 1:
+            self.surface = self.screen
+            self.upscale_target = None
+        else:
+            # Même format de pixels que l'écran pour un agrandissement sans conversion
+            self.surface = pygame.Surface((self.view_width, self.view_height), 0, self.screen)
+            # Agrandissement directement dans une zone de l'écran (pas de copie intermédiaire)
+            self.upscale_target = self.screen.subsurface(
+                (0, 0, self.view_width * render_scale, self.view_height * render_scale)
+            )
         
-        print(f">>> Renderer: {len(self.sprites)} sprites chargés")
+        # Le brouillard suit la taille de la cible de rendu
+        if self.fog_radius is not None:
+            self.init_fog(self.fog_radius)
+        if reload_sprites:
+            self.sprites = {}
+            self.load_sprites()
+        print(f">>> Renderer: Rendu du monde en {self.view_width}x{self.view_height} "
+              f"(cases de {self.tile_size} px, agrandissement x{render_scale})")
+    
+    def present_world(self):
+        """Agrandit la frame basse résolution vers l'écran (plus proche voisin, facteur entier)."""
+        if self.upscale_target is None:
+            return
+        pygame.transform.scale(self.surface, self.upscale_target.get_size(), self.upscale_target)
+        # Bandes non couvertes quand l'écran n'est pas un multiple exact du facteur
+        covered_width, covered_height = self.upscale_target.get_size()
+        if covered_width < SCREEN_WIDTH:
+            self.screen.fill(COLORS["black"], (covered_width, 0, SCREEN_WIDTH - covered_width, SCREEN_HEIGHT))
+        if covered_height < SCREEN_HEIGHT:
+            self.screen.fill(COLORS["black"], (0, covered_height, SCREEN_WIDTH, SCREEN_HEIGHT - covered_height))
+    
+    def set_zoom_limits(self, maze_width, maze_height):
+        """Zoom minimal : tout le labyrinthe tient dans la vue."""
+        fit_x = self.view_width / (maze_width * self.base_tile_size)
+        fit_y = self.view_height / (maze_height * self.base_tile_size)
+        self.min_zoom = min(1.0, fit_x, fit_y)
+    
+    def set_zoom(self, zoom):
+        """
+        Change le zoom (continu) et choisit le niveau de détail :
+        au-dessus de LOD_SPRITE_MIN_TILE pixels écran par case, sprites de l'atlas
+        à la taille entière la plus proche ; en dessous, vue d'ensemble en pixels.
+        """
+        self.zoom = max(self.min_zoom, min(MAX_ZOOM, zoom))
+        pixels_per_cell = self.base_tile_size * self.zoom
+        self.lod_cache_key = None
+        
+        if pixels_per_cell * self.render_scale >= LOD_SPRITE_MIN_TILE:
+            tile_size = max(1, int(round(pixels_per_cell)))
+            reload_sprites = self.lod_mode != "sprites" or tile_size != self.tile_size
+            self.lod_mode = "sprites"
+            self.tile_size = tile_size
+            if reload_sprites:
+                self.wall_glyph = None
+                self.load_sprites()
+        else:
+            # Taille de case fractionnaire possible (moins d'un pixel par case)
+            self.lod_mode = "pixels"
+            self.tile_size = pixels_per_cell
+            if self.lod_base_surface is None:
+                self.lod_base_surface = pygame.Surface((self.view_width, self.view_height), 0, self.surface)
+        print(f">>> Renderer: Zoom x{self.zoom:.2f} ({pixels_per_cell:.2f} px/case, rendu {self.lod_mode})")
+    
+    def zoom_in(self):
+        """Rapproche la vue d'un cran."""
+        self.set_zoom(self.zoom * ZOOM_STEP)
+    
+    def zoom_out(self):
+        """Éloigne la vue d'un cran."""
+        self.set_zoom(self.zoom / ZOOM_STEP)
     
     def load_sprites(self):
-        """Charge et redimensionne les sprites depuis le dossier assets."""
+        """Charge les sprites depuis l'atlas (une seule image, déjà à la taille des cases)."""
+        for _ in self.iter_load_sprites():
+            pass
+    
+    def iter_load_sprites(self):
+        """Chargement des sprites par étapes (une par tile si l'atlas doit être construit)."""
         print(">>> Renderer: Chargement des sprites...")
         
-        for key, filename in ASSET_MAPPING.items():
-            path = get_asset_path(key)
-            if path and os.path.exists(path):
-                try:
-                    # Charger l'image
-                    sprite = pygame.image.load(path).convert_alpha()
-                    # Redimensionner de 16x16 à 48x48 avec NEAREST neighbor
-                    sprite = pygame.transform.scale(sprite, (self.tile_size, self.tile_size))
-                    self.sprites[key] = sprite
-                    print(f"  ✓ {filename}")
-                except Exception as e:
-                    print(f"  ✗ {filename} (erreur: {e})")
-                    self.create_fallback_sprite(key)
-            else:
-                print(f"  ✗ {filename} (fichier non trouvé)")
+        try:
+            atlas = yield from load_atlas_steps(self.tile_size)
+            self.sprites = atlas.get_sprites()
+            origin = "cache disque" if atlas.from_cache else "construit depuis les PNG"
+            print(f">>> Renderer: Atlas {self.tile_size}px chargé ({origin})")
+        except pygame.error as e:
+            print(f">>> Renderer: Atlas indisponible (erreur: {e})")
+        
+        # Fallback pour toute clé absente de l'atlas
+        for key in ASSET_MAPPING:
+            if key not in self.sprites:
                 self.create_fallback_sprite(key)
+        self.sprites_loaded = True
     
     def create_fallback_sprite(self, key):
         """Crée un sprite de fallback (carré coloré)."""
@@ -70,7 +190,7 @@ class Renderer:
             print(">>> Renderer: Brouillard désactivé")
         else:
             # Créer une surface de la taille de l'écran
-            self.fog_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            self.fog_surface = pygame.Surface((self.view_width, self.view_height), pygame.SRCALPHA)
             print(f">>> Renderer: Brouillard activé (rayon: {fog_radius} cases)")
     
     def update_camera(self, player_grid_x, player_grid_y, maze_width, maze_height):
@@ -80,30 +200,30 @@ class Renderer:
         player_pixel_y = player_grid_y * self.tile_size + self.tile_size // 2
         
         # Calculer l'offset pour centrer le joueur
-        target_offset_x = player_pixel_x - SCREEN_WIDTH // 2
-        target_offset_y = player_pixel_y - SCREEN_HEIGHT // 2
+        target_offset_x = player_pixel_x - self.view_width // 2
+        target_offset_y = player_pixel_y - self.view_height // 2
         
         # Limiter l'offset aux bords du labyrinthe
-        max_offset_x = max(0, maze_width * self.tile_size - SCREEN_WIDTH)
-        max_offset_y = max(0, maze_height * self.tile_size - SCREEN_HEIGHT)
+        max_offset_x = max(0, maze_width * self.tile_size - self.view_width)
+        max_offset_y = max(0, maze_height * self.tile_size - self.view_height)
         
-        self.camera_offset_x = max(0, min(target_offset_x, max_offset_x))
-        self.camera_offset_y = max(0, min(target_offset_y, max_offset_y))
+        self.camera_offset_x = int(max(0, min(target_offset_x, max_offset_x)))
+        self.camera_offset_y = int(max(0, min(target_offset_y, max_offset_y)))
         
         # print(f">>> Renderer: Camera offset ({self.camera_offset_x}, {self.camera_offset_y})")
     
     def grid_to_screen(self, grid_x, grid_y):
         """Convertit des coordonnées grille en coordonnées écran."""
-        screen_x = grid_x * self.tile_size - self.camera_offset_x
-        screen_y = grid_y * self.tile_size - self.camera_offset_y
+        screen_x = int(grid_x * self.tile_size) - self.camera_offset_x
+        screen_y = int(grid_y * self.tile_size) - self.camera_offset_y
         return (screen_x, screen_y)
     
     def get_visible_grid_range(self, maze_width, maze_height):
         """Retourne la plage de cellules visibles à l'écran (culling)."""
         start_x = max(0, int(self.camera_offset_x // self.tile_size) - 1)
         start_y = max(0, int(self.camera_offset_y // self.tile_size) - 1)
-        end_x = min(maze_width, int((self.camera_offset_x + SCREEN_WIDTH) // self.tile_size) + 2)
-        end_y = min(maze_height, int((self.camera_offset_y + SCREEN_HEIGHT) // self.tile_size) + 2)
+        end_x = min(maze_width, int((self.camera_offset_x + self.view_width) // self.tile_size) + 2)
+        end_y = min(maze_height, int((self.camera_offset_y + self.view_height) // self.tile_size) + 2)
         
         return (start_x, start_y, end_x, end_y)
     
@@ -142,13 +262,14 @@ class Renderer:
                     if draw_walls:
                         # Mur : afficher un caractère "x" blanc (sonar)
                         self.draw_wall_char(screen_x, screen_y)
-                        # TEST : rectangle blanc 4x4 au centre pour vérification
-                        center_x = screen_x + self.tile_size // 2 - 2
-                        center_y = screen_y + self.tile_size // 2 - 2
+                        # TEST : rectangle blanc (4x4 à 48 px) au centre pour vérification
+                        marker = max(1, self.tile_size // 12)
+                        center_x = screen_x + (self.tile_size - marker) // 2
+                        center_y = screen_y + (self.tile_size - marker) // 2
                         pygame.draw.rect(
-                            self.screen,
+                            self.surface,
                             (255, 255, 255),
-                            (center_x, center_y, 4, 4)
+                            (center_x, center_y, marker, marker)
                         )
                 elif cell.type == CellType.EXIT:
                     self.draw_tile("exit", screen_x, screen_y)
@@ -160,18 +281,86 @@ class Renderer:
         if draw_walls:
             print(f">>> DEBUG : Nombre de murs détectés dans la grille : {wall_count}")
     
+    def draw_world_pixels(self, maze, player, enemies, items, rivals=()):
+        """
+        Vue d'ensemble (petites tailles de case) : les cases sont écrites directement
+        dans un tableau de pixels depuis le tableau des types du labyrinthe, et les
+        entités deviennent des points. Le fond n'est recalculé que si la vue change.
+        """
+        draw_walls = self.should_draw_walls()
+        key = (id(maze), maze.revision, self.tile_size, self.camera_offset_x, self.camera_offset_y, draw_walls)
+        if key != self.lod_cache_key:
+            self.build_lod_background(maze, draw_walls)
+            self.lod_cache_key = key
+        self.surface.blit(self.lod_base_surface, (0, 0))
+        
+        # Entités : un pixel par entité en dessous d'un pixel par case, sinon un point
+        dot = max(1, int(self.tile_size))
+        for item in items:
+            if not item.collected:
+                self.draw_dot(item.grid_x, item.grid_y, dot, self.get_item_color(item))
+        for enemy in enemies:
+            self.draw_dot(enemy.grid_x, enemy.grid_y, dot, get_fallback_color(self.get_enemy_sprite_key(enemy)))
+        for rival in rivals:
+            self.draw_dot(rival.grid_x, rival.grid_y, dot, COLORS["white"])
+        # Le joueur reste toujours repérable (au moins 3 pixels)
+        self.draw_dot(player.grid_x, player.grid_y, max(3, dot), get_fallback_color("player"))
+    
+    def build_lod_background(self, maze, draw_walls):
+        """Écrit les couleurs des cases visibles dans la surface de fond via surfarray."""
+        types = maze.get_type_array()
+        pixels_per_cell = self.tile_size
+        # Case correspondant à chaque colonne / ligne de pixels de la vue
+        columns = ((np.arange(self.view_width) + self.camera_offset_x) / pixels_per_cell).astype(np.intp)
+        rows = ((np.arange(self.view_height) + self.camera_offset_y) / pixels_per_cell).astype(np.intp)
+        
+        palette = np.zeros((256, 3), dtype=np.uint8)  # FLOOR / hors labyrinthe : noir
+        if draw_walls:
+            palette[CellType.WALL.value] = COLORS["light_gray"]
+        palette[CellType.EXIT.value] = get_fallback_color("exit")
+        
+        visible = types[np.minimum(columns, maze.width - 1)][:, np.minimum(rows, maze.height - 1)]
+        frame = palette[visible]
+        frame[columns >= maze.width] = 0
+        frame[:, rows >= maze.height] = 0
+        pygame.surfarray.blit_array(self.lod_base_surface, frame)
+    
+    def draw_dot(self, grid_x, grid_y, size, color):
+        """Dessine une entité sous forme de point (vue d'ensemble)."""
+        screen_x, screen_y = self.grid_to_screen(grid_x, grid_y)
+        offset = (int(self.tile_size) - size) // 2
+        self.surface.fill(color, (screen_x + offset, screen_y + offset, size, size))
+    
+    def get_item_color(self, item):
+        """Couleur d'un item en vue d'ensemble (couleur de fallback de son sprite)."""
+        if item.type == ItemType.POTION_NORMAL:
+            return get_fallback_color("potion_normal")
+        elif item.type == ItemType.POTION_VISION:
+            return get_fallback_color("potion_vision")
+        elif item.type == ItemType.POTION_FREEZE:
+            return get_fallback_color("potion_freeze")
+        return get_fallback_color("chest")
+    
+    def get_enemy_sprite_key(self, enemy):
+        """Clé de sprite selon le type d'ennemi."""
+        if enemy.type == EnemyType.WIZARD:
+            return "enemy_wizard"
+        elif enemy.type == EnemyType.GHOST:
+            return "enemy_ghost"
+        return "enemy_monster"
+    
     def draw_wall_char(self, screen_x, screen_y):
         """Dessine un caractère 'x' blanc centré pour représenter un mur."""
-        # Utiliser "x" simple (caractère ASCII)
-        char = "x"
-        
-        # Créer une police
-        font_size = self.tile_size - 10
-        font = pygame.font.Font(None, font_size)
-        text = font.render(char, True, COLORS["white"])
+        # Le glyphe est rendu une seule fois par taille de case, puis simplement blitté
+        if self.wall_glyph is None:
+            # Utiliser "x" simple (caractère ASCII), police proportionnelle (38 px à 48 px)
+            font_size = max(6, self.tile_size * 19 // 24)
+            font = pygame.font.Font(None, font_size)
+            self.wall_glyph = font.render("x", True, COLORS["white"])
+        text = self.wall_glyph
         text_rect = text.get_rect(center=(screen_x + self.tile_size // 2,
                                           screen_y + self.tile_size // 2))
-        self.screen.blit(text, text_rect)
+        self.surface.blit(text, text_rect)
     
     def should_draw_walls(self):
         """
@@ -192,14 +381,48 @@ class Renderer:
         flash_surface.fill((255, 0, 0, alpha))
         self.screen.blit(flash_surface, (0, 0))
     
+    def draw_heatmap(self, heat, key):
+        """
+        Carte de chaleur par-dessus le monde (heat : niveaux [x, y] dans [0, 1], key : clé
+        de cache). Les couleurs ne sont recalculées que si la carte change, l'agrandissement
+        que si la zone visible ou la taille des cases change.
+        """
+        width, height = heat.shape
+        if key != self.heatmap_key:
+            if self.heatmap_surface is None or self.heatmap_surface.get_size() != (width, height):
+                self.heatmap_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            # Du rouge (rare) au jaune (fréquent), transparent pour les cases jamais touchées
+            colors = pygame.surfarray.pixels3d(self.heatmap_surface)
+            colors[..., 0] = 255
+            colors[..., 1] = (heat * 255).astype(np.uint8)
+            colors[..., 2] = 40
+            del colors
+            alpha = pygame.surfarray.pixels_alpha(self.heatmap_surface)
+            alpha[:] = np.where(heat > 0, 50 + heat * (HEATMAP_MAX_ALPHA - 50), 0).astype(np.uint8)
+            del alpha
+            self.heatmap_key = key
+            self.heatmap_scaled_key = None
+        
+        start_x, start_y, end_x, end_y = self.get_visible_grid_range(width, height)
+        if end_x <= start_x or end_y <= start_y:
+            return
+        scaled_key = (key, start_x, start_y, end_x, end_y, self.tile_size)
+        if scaled_key != self.heatmap_scaled_key:
+            region = self.heatmap_surface.subsurface((start_x, start_y, end_x - start_x, end_y - start_y))
+            size = (int(end_x * self.tile_size) - int(start_x * self.tile_size),
+                    int(end_y * self.tile_size) - int(start_y * self.tile_size))
+            self.heatmap_scaled = pygame.transform.scale(region, size)
+            self.heatmap_scaled_key = scaled_key
+        self.surface.blit(self.heatmap_scaled, self.grid_to_screen(start_x, start_y))
+    
     def draw_tile(self, tile_key, screen_x, screen_y):
         """Dessine une tile à la position écran donnée."""
         if tile_key in self.sprites:
-            self.screen.blit(self.sprites[tile_key], (screen_x, screen_y))
+            self.surface.blit(self.sprites[tile_key], (screen_x, screen_y))
         else:
             # Fallback ultime
             pygame.draw.rect(
-                self.screen,
+                self.surface,
                 COLORS["red"],
                 (screen_x, screen_y, self.tile_size, self.tile_size)
             )
@@ -211,7 +434,7 @@ class Renderer:
         
         if cell.has_wall("N"):
             pygame.draw.line(
-                self.screen,
+                self.surface,
                 wall_color,
                 (screen_x, screen_y),
                 (screen_x + self.tile_size, screen_y),
@@ -219,7 +442,7 @@ class Renderer:
             )
         if cell.has_wall("S"):
             pygame.draw.line(
-                self.screen,
+                self.surface,
                 wall_color,
                 (screen_x, screen_y + self.tile_size),
                 (screen_x + self.tile_size, screen_y + self.tile_size),
@@ -227,7 +450,7 @@ class Renderer:
             )
         if cell.has_wall("W"):
             pygame.draw.line(
-                self.screen,
+                self.surface,
                 wall_color,
                 (screen_x, screen_y),
                 (screen_x, screen_y + self.tile_size),
@@ -235,7 +458,7 @@ class Renderer:
             )
         if cell.has_wall("E"):
             pygame.draw.line(
-                self.screen,
+                self.surface,
                 wall_color,
                 (screen_x + self.tile_size, screen_y),
                 (screen_x + self.tile_size, screen_y + self.tile_size),
@@ -254,34 +477,34 @@ class Renderer:
     
     def draw_player_trail(self, player):
         """Dessine la traînée magique du joueur (positions récentes)."""
-        current_time = pygame.time.get_ticks()
-        for (x, y, timestamp) in player.trail:
-            # Vérifier si la position est récente (moins de 1000 ms)
-            if current_time - timestamp > 1000:
-                continue
+        # Seule la fenêtre vivante du tampon est parcourue (positions de moins de 1000 ms)
+        for (x, y, timestamp) in player.trail.iter_live(pygame.time.get_ticks()):
             screen_x, screen_y = self.grid_to_screen(x, y)
             # Dessiner un petit cercle blanc au centre de la case
             center_x = screen_x + self.tile_size // 2
             center_y = screen_y + self.tile_size // 2
             pygame.draw.circle(
-                self.screen,
+                self.surface,
                 COLORS["white"],
                 (center_x, center_y),
-                3  # rayon 3 pixels
+                max(1, self.tile_size // 16)  # rayon 3 pixels à 48 px
             )
     
+    def draw_rivals(self, rivals):
+        """Dessine les autres coureurs (course en réseau) : sprite du joueur encadré de blanc."""
+        for rival in rivals:
+            screen_x, screen_y = self.grid_to_screen(rival.grid_x, rival.grid_y)
+            self.draw_tile("player", screen_x, screen_y)
+            size = int(self.tile_size)
+            pygame.draw.rect(self.surface, COLORS["white"], (screen_x, screen_y, size, size), 1)
+    
     def draw_enemies(self, enemies):
         """Dessine tous les ennemis."""
         for enemy in enemies:
             screen_x, screen_y = self.grid_to_screen(enemy.grid_x, enemy.grid_y)
             
             # Déterminer la clé du sprite selon le type
-            if enemy.type == EnemyType.WIZARD:
-                key = "enemy_wizard"
-            elif enemy.type == EnemyType.GHOST:
-                key = "enemy_ghost"
-            else:  # MONSTER
-                key = "enemy_monster"
+            key = self.get_enemy_sprite_key(enemy)
             
             self.draw_tile(key, screen_x, screen_y)
     
@@ -333,7 +556,7 @@ class Renderer:
         )
         
         # Appliquer le brouillard sur l'écran
-        self.screen.blit(self.fog_surface, (0, 0))
+        self.surface.blit(self.fog_surface, (0, 0))
     
     def draw_hud(self, player, elapsed_time, potion_effects=None):
         """Dessine le HUD (vies, potions, temps) avec indicateurs d'effets."""
@@ -523,28 +746,39 @@ class Renderer:
         text_rect = text_surface.get_rect(center=(compass_x, compass_y + radius + 10))
         self.screen.blit(text_surface, text_rect)
     
-    def draw_all(self, maze, player, enemies, items, elapsed_time, potion_effects=None, compass_target=None):
-        """Dessine tous les éléments du jeu (ordre de rendu correct)."""
+    def draw_all(self, maze, player, enemies, items, elapsed_time, potion_effects=None, compass_target=None, rivals=(),
+                 heatmap=None):
+        """
+        Dessine tous les éléments du jeu (ordre de rendu correct).
+        heatmap : (niveaux, clé) de la carte de chaleur affichée, ou None.
+        """
         if potion_effects is None:
             potion_effects = {}
         
-        # Fond noir
-        self.screen.fill(COLORS["black"])
-        
-        # 1. Labyrinthe
-        self.draw_maze(maze)
-        
-        # 2. Items (potions, pièges)
-        self.draw_items(items)
-        
-        # 3. Ennemis
-        self.draw_enemies(enemies)
+        # Fond noir (sur la cible de rendu du monde)
+        self.surface.fill(COLORS["black"])
         
-        # 4. Traînée magique du joueur
-        self.draw_player_trail(player)
-        
-        # 5. Joueur
-        self.draw_player(player)
+        if self.lod_mode == "pixels":
+            # 1-5. Vue d'ensemble : labyrinthe en pixels, entités en points
+            self.draw_world_pixels(maze, player, enemies, items, rivals)
+        else:
+            # 1. Labyrinthe
+            self.draw_maze(maze)
+            
+            # 2. Items (potions, pièges)
+            self.draw_items(items)
+            
+            # 3. Ennemis
+            self.draw_enemies(enemies)
+            
+            # 3 bis. Autres coureurs (course en réseau)
+            self.draw_rivals(rivals)
+            
+            # 4. Traînée magique du joueur
+            self.draw_player_trail(player)
+            
+            # 5. Joueur
+            self.draw_player(player)
         
         # 6. Brouillard de guerre (par-dessus tout mais sous le HUD)
         # Ajuster le rayon du brouillard si effet vision actif
@@ -553,15 +787,20 @@ class Renderer:
         original_fog_radius = self.fog_radius
         if vision_active and original_fog_radius is not None:
             self.fog_radius = original_fog_radius + 3  # +3 cases de visibilité
-            # Recalculer la surface de brouillard
-            self.init_fog(self.fog_radius)
+            # (la surface de brouillard ne dépend pas du rayon : pas de réallocation)
         
         self.draw_fog(player.grid_x, player.grid_y)
         
         # Restaurer le rayon original après le dessin
         if vision_active and original_fog_radius is not None:
             self.fog_radius = original_fog_radius
-            self.init_fog(self.fog_radius)
+        
+        # 6 bis. Carte de chaleur (analyse : par-dessus le brouillard)
+        if heatmap is not None and heatmap[0] is not None:
+            self.draw_heatmap(*heatmap)
+        
+        # Agrandissement du monde vers l'écran (mode basse résolution)
+        self.present_world()
         
         # 7. HUD (toujours visible) avec indicateurs d'effets
         self.draw_hud(player, elapsed_time, potion_effects)
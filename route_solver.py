@@ -0,0 +1,53 @@
+"""
+Ordre de visite de plusieurs cibles (potions puis sortie) : plus proche voisin,
+puis améliorations 2-opt. Les distances viennent d'une matrice de distances de
+chemin (voir Maze.plan_route).
+"""
+
+INFINITY = float('inf')
+
+
+def route_length(order, matrix, end=None):
+    """Longueur d'une tournée (indices de la matrice, 0 = départ) avec arrivée optionnelle."""
+    stops = [0] + list(order) + ([end] if end is not None else [])
+    return sum(matrix[a][b] for a, b in zip(stops, stops[1:]))
+
+
+def nearest_neighbor_order(matrix, stops):
+    """Tournée gloutonne depuis le départ (indice 0) vers la cible la plus proche à chaque étape."""
+    remaining = set(stops)
+    order = []
+    current = 0
+    while remaining:
+        current = min(remaining, key=lambda stop: (matrix[current][stop], stop))
+        order.append(current)
+        remaining.discard(current)
+    return order
+
+
+def two_opt(order, matrix, end=None):
+    """Inverse des segments de la tournée tant que cela la raccourcit (départ et arrivée fixes)."""
+    order = list(order)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(len(order) - 1):
+            before = order[i - 1] if i > 0 else 0
+            for j in range(i + 1, len(order)):
+                after = order[j + 1] if j + 1 < len(order) else end
+                old = matrix[before][order[i]] + (matrix[order[j]][after] if after is not None else 0)
+                new = matrix[before][order[j]] + (matrix[order[i]][after] if after is not None else 0)
+                if new < old:
+                    order[i:j + 1] = reversed(order[i:j + 1])
+                    improved = True
+    return order
+
+
+def solve_route(matrix, end=None):
+    """
+    Ordre de visite des cibles 1..n-1 (ou 1..n-2 si end est l'indice de l'arrivée) depuis l'indice 0.
+    Retourne (ordre, longueur) ; les cibles inaccessibles depuis le départ sont ignorées.
+    """
+    stops = [i for i in range(1, len(matrix)) if i != end and matrix[0][i] < INFINITY]
+    order = two_opt(nearest_neighbor_order(matrix, stops), matrix, end)
+    return order, route_length(order, matrix, end)
@@ -0,0 +1,170 @@
+"""
+Historique des parties : base SQLite embarquée (journal WAL) qui garde chaque
+partie jouée (graine, difficulté, temps, déplacements, dégâts, potions, issue).
+
+Les écritures passent par un thread d'écriture dédié : terminer une partie ne
+fait que déposer une ligne dans une file, la frame n'attend jamais le disque.
+Les lectures (classements) utilisent leur propre connexion ; en mode WAL elles
+ne sont pas bloquées par une écriture en cours.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from config_new import RUN_HISTORY_FILE, HIGHSCORE_FILE, RUN_HISTORY_TOP_N
+
+# Issues possibles d'une partie
+OUTCOME_WIN = "win"
+OUTCOME_DEATH = "death"
+OUTCOME_QUIT = "quit"
+
+DIFFICULTY_KEYS = ("easy", "medium", "hard", "extreme")
+COLUMNS = ("played_at", "seed", "difficulty", "time", "moves", "damage", "potions", "outcome")
+INSERT_RUN = f"INSERT INTO runs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    seed INTEGER,
+    difficulty TEXT NOT NULL,
+    time REAL NOT NULL,
+    moves INTEGER,
+    damage INTEGER,
+    potions INTEGER,
+    outcome TEXT NOT NULL
+);
+-- Classement par difficulté et par graine : meilleurs temps des victoires,
+-- lus dans l'ordre de l'index (ni parcours de table ni tri)
+CREATE INDEX IF NOT EXISTS runs_by_difficulty ON runs (difficulty, outcome, time);
+CREATE INDEX IF NOT EXISTS runs_by_seed ON runs (seed, outcome, time);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def connect(path):
+    """Connexion SQLite en mode WAL (synchronous=NORMAL suffit à ne rien corrompre en WAL)."""
+    connection = sqlite3.connect(path, timeout=5.0)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class RunHistory:
+    """Base des parties jouées, écrite en tâche de fond et interrogée par index."""
+
+    def __init__(self, path=RUN_HISTORY_FILE, highscore_file=HIGHSCORE_FILE):
+        self.path = path
+        self.connection = connect(path)  # Lectures (thread du jeu)
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+        self.migrate_highscores(highscore_file)
+        self.pending = queue.Queue()
+        self.written = 0
+        self.writer = threading.Thread(target=self.write_loop, name="run-history", daemon=True)
+        self.writer.start()
+        print(f">>> RunHistory: Base ouverte ({path})")
+
+    def migrate_highscores(self, highscore_file):
+        """
+        Importe une seule fois les meilleurs temps de l'ancien highscore.json
+        (victoires sans graine ni statistiques). Le marqueur est écrit dans la même
+        transaction que les lignes : une migration interrompue est simplement refaite.
+        """
+        if self.connection.execute("SELECT 1 FROM meta WHERE key = 'highscores_migrated'").fetchone():
+            return 0
+        scores = {}
+        if highscore_file and os.path.exists(highscore_file):
+            try:
+                with open(highscore_file, "r") as f:
+                    scores = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f">>> RunHistory: highscore.json illisible, rien à importer: {e}")
+        rows = []
+        played_at = os.path.getmtime(highscore_file) if scores else time.time()
+        for key in DIFFICULTY_KEYS:
+            best = float(scores.get(key, 0.0) or 0.0)
+            if best > 0.0:  # 0.0 : aucun score enregistré
+                rows.append((played_at, None, key, best, None, None, None, OUTCOME_WIN))
+        with self.connection:
+            self.connection.executemany(INSERT_RUN, rows)
+            self.connection.execute("INSERT INTO meta (key, value) VALUES ('highscores_migrated', ?)",
+                                    (str(highscore_file),))
+        print(f">>> RunHistory: {len(rows)} meilleur(s) temps importé(s) depuis highscore.json")
+        return len(rows)
+
+    def record_run(self, seed, difficulty, elapsed, moves, damage, potions, outcome):
+        """Dépose une partie terminée dans la file d'écriture (ne bloque pas)."""
+        self.pending.put((time.time(), seed, difficulty, float(elapsed), moves, damage, potions, outcome))
+
+    def write_loop(self):
+        """Thread d'écriture : regroupe les parties en attente dans une transaction."""
+        connection = connect(self.path)
+        running = True
+        while running:
+            rows = [self.pending.get()]
+            while True:
+                try:
+                    rows.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            if None in rows:  # Fermeture demandée : écrire ce qui précède puis s'arrêter
+                running = False
+                rows = [row for row in rows if row is not None]
+            try:
+                if rows:
+                    with connection:
+                        connection.executemany(INSERT_RUN, rows)
+                    self.written += len(rows)
+            except sqlite3.Error as e:
+                print(f">>> RunHistory: Erreur d'écriture ({len(rows)} partie(s) perdue(s)): {e}")
+            finally:
+                for _ in range(len(rows) + (0 if running else 1)):
+                    self.pending.task_done()
+        connection.close()
+
+    def flush(self):
+        """Attend que toutes les parties déposées soient écrites."""
+        self.pending.join()
+
+    def close(self):
+        """Écrit les parties en attente, arrête le thread et ferme les connexions."""
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+        self.connection.close()
+
+    def top_runs(self, difficulty, limit=RUN_HISTORY_TOP_N):
+        """Meilleures victoires d'une difficulté (index runs_by_difficulty)."""
+        return [dict(row) for row in self.connection.execute(
+            "SELECT * FROM runs WHERE difficulty = ? AND outcome = ? ORDER BY time LIMIT ?",
+            (difficulty, OUTCOME_WIN, limit))]
+
+    def top_runs_for_seed(self, seed, limit=RUN_HISTORY_TOP_N):
+        """Meilleures victoires sur un même labyrinthe (index runs_by_seed)."""
+        return [dict(row) for row in self.connection.execute(
+            "SELECT * FROM runs WHERE seed = ? AND outcome = ? ORDER BY time LIMIT ?",
+            (seed, OUTCOME_WIN, limit))]
+
+    def best_times(self):
+        """Meilleur temps par difficulté (0.0 si aucune victoire), format de l'ancien highscore.json."""
+        best = {}
+        for key in DIFFICULTY_KEYS:
+            row = self.connection.execute(
+                "SELECT MIN(time) FROM runs WHERE difficulty = ? AND outcome = ?", (key, OUTCOME_WIN)).fetchone()
+            best[key] = row[0] if row[0] is not None else 0.0
+        return best
+
+    def count_runs(self, difficulty=None):
+        """Nombre de parties enregistrées (toutes ou pour une difficulté)."""
+        if difficulty is None:
+            return self.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        return self.connection.execute("SELECT COUNT(*) FROM runs WHERE difficulty = ?", (difficulty,)).fetchone()[0]
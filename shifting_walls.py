@@ -0,0 +1,215 @@
+"""
+Murs mouvants : des cases s'ouvrent et se ferment en cours de partie sans jamais couper
+le joueur du départ, des potions restantes ni de la sortie.
+
+Les composantes connexes des cases traversables sont tenues dans un union-find. Une
+ouverture ne peut que fusionner des composantes (union avec les voisins). Une fermeture
+ne peut que séparer : des BFS entrelacées partent des voisins de la case fermée et
+s'arrêtent dès qu'elles se rejoignent (rien n'est coupé) ou qu'une d'elles s'épuise (poche
+détachée, explorée en entière, donc petite). La fermeture est refusée si une poche
+détachée contient une case à garder, ou si la recherche dépasse son budget : aucune
+BFS sur tout le labyrinthe n'est nécessaire.
+"""
+
+import random
+from collections import deque
+from config_new import (
+    CellType, STEP_DIRECTIONS, SHIFTING_RADIUS, SHIFTING_SEARCH_BUDGET, SHIFTING_PICK_TRIES
+)
+
+
+class ShiftingWalls:
+    """Ouvertures et fermetures de cases d'un labyrinthe, connexité maintenue par union-find."""
+
+    def __init__(self, maze, seed=None, radius=SHIFTING_RADIUS, search_budget=SHIFTING_SEARCH_BUDGET):
+        self.maze = maze
+        self.rng = random.Random(seed)
+        self.radius = radius
+        self.search_budget = search_budget
+        self.parent = []   # Union-find (éléments)
+        self.node = []     # case (x + y * largeur) -> élément
+        self.stats = {"opened": 0, "closed": 0, "rejected": 0, "searched": 0, "pockets": 0}
+        self.build()
+
+    # ------------------------------------------------------------------
+    # Union-find
+    # ------------------------------------------------------------------
+
+    def build(self):
+        """Composantes de la grille courante (un élément par case, unions entre voisins traversables)."""
+        maze = self.maze
+        width, height = maze.width, maze.height
+        walkable = (maze.get_type_array() != CellType.WALL.value).tolist()
+        self.parent = list(range(width * height))
+        self.node = list(range(width * height))
+        for x in range(width):
+            column = walkable[x]
+            right = walkable[x + 1] if x + 1 < width else None
+            for y in range(height):
+                if not column[y]:
+                    continue
+                if y + 1 < height and column[y + 1]:
+                    self.union(x + y * width, x + (y + 1) * width)
+                if right is not None and right[y]:
+                    self.union(x + y * width, x + 1 + y * width)
+
+    def find(self, element):
+        """Racine d'un élément (compression de chemin par division)."""
+        parent = self.parent
+        while parent[element] != element:
+            parent[element] = parent[parent[element]]
+            element = parent[element]
+        return element
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[root_b] = root_a
+
+    def new_element(self):
+        """Élément isolé (case fermée ou poche détachée : ses anciennes unions ne valent plus)."""
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    def component(self, cell):
+        """Identifiant de la composante d'une case traversable."""
+        return self.find(self.node[cell[0] + cell[1] * self.maze.width])
+
+    def connected(self, cells):
+        """Vrai si toutes les cases (traversables) sont dans la même composante."""
+        return len({self.component(cell) for cell in cells}) <= 1
+
+    def walkable_neighbors(self, cell):
+        x, y = cell
+        is_walkable = self.maze.is_walkable
+        return [(x + dx, y + dy) for dx, dy in STEP_DIRECTIONS if is_walkable(x + dx, y + dy)]
+
+    # ------------------------------------------------------------------
+    # Ouverture et fermeture
+    # ------------------------------------------------------------------
+
+    def open(self, cell):
+        """Ouvre une case fermée (toujours accepté : ne peut que relier des composantes)."""
+        x, y = cell
+        if self.maze.is_walkable(x, y):
+            return False
+        self.maze.set_cell_type(x, y, CellType.FLOOR)
+        element = self.node[x + y * self.maze.width]
+        for neighbor in self.walkable_neighbors(cell):
+            self.union(element, self.node[neighbor[0] + neighbor[1] * self.maze.width])
+        self.stats["opened"] += 1
+        return True
+
+    def try_close(self, cell, anchors=()):
+        """
+        Ferme une case traversable si aucune case de `anchors` ne s'en trouve coupée du
+        reste ; retourne True si la case a été fermée.
+        """
+        x, y = cell
+        anchors = frozenset(anchors)
+        if cell in anchors or not self.maze.is_walkable(x, y) or self.maze.grid[x][y].type != CellType.FLOOR:
+            return False
+        neighbors = self.walkable_neighbors(cell)
+        pockets = []
+        if len(neighbors) > 1:
+            # Cul-de-sac (un seul voisin) : rien ne peut être coupé
+            pockets = self.find_pockets(cell, neighbors)
+            if pockets is None or any(other in anchors for pocket in pockets for other in pocket):
+                self.stats["rejected"] += 1
+                return False
+        self.maze.set_cell_type(x, y, CellType.WALL)
+        width = self.maze.width
+        self.node[x + y * width] = self.new_element()
+        for pocket in pockets:
+            element = self.new_element()
+            for px, py in pocket:
+                self.node[px + py * width] = element
+        self.stats["closed"] += 1
+        self.stats["pockets"] += len(pockets)
+        if len(self.parent) > 2 * len(self.node):
+            self.build()  # Trop d'éléments abandonnés : repartir de la grille
+        return True
+
+    def find_pockets(self, closed, starts):
+        """
+        BFS entrelacées depuis les voisins de la case fermée (une case par recherche et par
+        tour). Deux recherches qui se touchent fusionnent ; une recherche épuisée a exploré
+        une poche détachée. Retourne les poches (listes de cases) une fois qu'il ne reste
+        qu'une recherche, ou None si le budget est dépassé.
+        """
+        is_walkable = self.maze.is_walkable
+        owner = {closed: -1}
+        alias = {}    # recherche fusionnée -> recherche qui l'a absorbée
+        searches = {}  # recherche -> (file, cases visitées)
+        for index, start in enumerate(starts):
+            owner[start] = index
+            searches[index] = (deque([start]), [start])
+        pockets = []
+        budget = self.search_budget
+        while len(searches) > 1:
+            for index in list(searches):
+                if index not in searches:
+                    continue  # Absorbée pendant ce tour
+                if len(searches) == 1:
+                    break
+                queue, cells = searches[index]
+                if not queue:
+                    pockets.append(cells)
+                    del searches[index]
+                    continue
+                budget -= 1
+                if budget < 0:
+                    self.stats["searched"] += self.search_budget
+                    return None
+                x, y = queue.popleft()
+                for dx, dy in STEP_DIRECTIONS:
+                    neighbor = (x + dx, y + dy)
+                    other = owner.get(neighbor)
+                    if other is None:
+                        if is_walkable(*neighbor):
+                            owner[neighbor] = index
+                            queue.append(neighbor)
+                            cells.append(neighbor)
+                        continue
+                    while other in alias:
+                        other = alias[other]
+                    if other >= 0 and other != index:
+                        # Jonction : les deux recherches sont dans la même composante
+                        other_queue, other_cells = searches.pop(other)
+                        queue.extend(other_queue)
+                        cells.extend(other_cells)
+                        alias[other] = index
+        self.stats["searched"] += self.search_budget - budget
+        return pockets
+
+    # ------------------------------------------------------------------
+    # Déplacement de murs autour du joueur
+    # ------------------------------------------------------------------
+
+    def pick(self, center, walkable, blocked):
+        """Case au hasard près de center, traversable ou non selon `walkable`, hors `blocked`."""
+        maze = self.maze
+        cx, cy = center
+        for _ in range(SHIFTING_PICK_TRIES):
+            x = self.rng.randint(max(0, cx - self.radius), min(maze.width - 1, cx + self.radius))
+            y = self.rng.randint(max(0, cy - self.radius), min(maze.height - 1, cy + self.radius))
+            if (x, y) not in blocked and maze.is_walkable(x, y) == walkable:
+                return (x, y)
+        return None
+
+    def shift(self, center, anchors, blocked=()):
+        """
+        Un mur se déplace près de center : une case libre (hors `blocked`) se ferme si elle
+        ne coupe aucune case de `anchors`, puis une case fermée s'ouvre.
+        Retourne (case fermée, case ouverte), None pour ce qui n'a pas bougé.
+        """
+        blocked = set(blocked) | set(anchors)
+        closed = self.pick(center, True, blocked)
+        if closed is not None and not self.try_close(closed, anchors):
+            closed = None
+        if closed is not None:
+            blocked.add(closed)  # Ne pas rouvrir aussitôt la case fermée
+        opened = self.pick(center, False, blocked)
+        if opened is not None and not self.open(opened):
+            opened = None
+        return closed, opened
@@ -0,0 +1,437 @@
+"""
+Instantanés de la partie : état complet de la simulation (grille, joueur et
+traînée, ennemis et ordonnanceur, objets, minuteries, effets de potion, cartes
+d'influence, exploration de la minimap, état du générateur aléatoire) empaqueté
+en binaire compact avec struct, compressé par zlib pour le disque.
+
+La capture produit un bloc `bytes` immuable sur le thread du jeu : la partie
+continue de modifier ses objets sans toucher à l'instantané (copie à l'écriture,
+la grille est recopiée depuis les tableaux NumPy déjà maintenus par le labyrinthe).
+La compression et l'écriture atomique (fichier temporaire, fsync, renommage) se
+font sur le thread de sauvegarde automatique. Les mêmes instantanés, gardés en
+mémoire dans un anneau (compressés rapidement), servent au retour en arrière des rejeux.
+
+Des cartes d'influence ne sont gardées que les trois couches de base, sur la zone
+déjà mise à jour (nulles au-delà) : signal et carte combinée s'en déduisent case par
+case et sont recalculés à la restauration.
+
+Les minuteries en millisecondes (pygame.time.get_ticks) sont stockées en temps
+restant ou en âge, et recalées sur l'horloge courante à la restauration.
+"""
+
+import os
+import random
+import struct
+import threading
+import zlib
+from collections import deque
+
+import numpy as np
+from config_new import CellType, Difficulty, EnemyType, ItemType, ROLLBACK_CAPACITY
+from maze_new import Maze
+from ai_lod import TIER_FULL, TIER_COARSE, TIER_FROZEN
+
+MAGIC = b"LABS"
+VERSION = 2
+
+# En-tête : version, difficulté, taille et graine de la grille, chronomètre, minuteries,
+# zoom (il décide des niveaux de détail de l'IA), horloge des ennemis, puis le nombre d'éléments de chaque section qui suit
+HEADER = struct.Struct("<4sHBHqdiiiidd?qHHHHHHH??")
+PLAYER = struct.Struct("<hhhhHH?ibbii?bbdd?hhbbII")
+TRAIL_ENTRY = struct.Struct("<hhi")      # x, y, âge (ms)
+ENEMY = struct.Struct("<hhBh?ihBq")       # ..., niveau de détail, tick du gel
+SCHEDULE_ENTRY = struct.Struct("<Hq")     # indice de l'ennemi, tick de sa prochaine action
+ITEM = struct.Struct("<hhB??B")
+INFLUENCE_HEADER = struct.Struct("<qqhhhh")  # ticks, mises à jour, zone (x0, y0, x1, y1)
+RNG_STATE = struct.Struct("<625I?d")
+
+INFLUENCE_LAYERS = ("scent", "density", "attraction")  # signal et combined s'en déduisent
+TIER_CODES = {TIER_FULL: 1, TIER_COARSE: 2, TIER_FROZEN: 3}
+TIERS = {code: tier for tier, code in TIER_CODES.items()}
+CHEST_RESULT_CODES = {None: 0, "trap": 1, "bonus": 2, "neutral": 3}
+CHEST_RESULTS = {code: result for result, code in CHEST_RESULT_CODES.items()}
+POTION_TYPES = (ItemType.POTION_NORMAL, ItemType.POTION_VISION, ItemType.POTION_FREEZE)
+RING_COMPRESSION_LEVEL = 1  # Anneau en mémoire : compression rapide (les couches nulles dominent)
+
+
+class SnapshotError(ValueError):
+    """Instantané illisible (format inconnu, données tronquées ou corrompues)."""
+
+
+def pack_positions(positions):
+    return struct.pack(f"<{2 * len(positions)}h", *(v for position in positions for v in position))
+
+
+def unpack_positions(view, offset, count):
+    values = struct.unpack_from(f"<{2 * count}h", view, offset)
+    return [(values[i], values[i + 1]) for i in range(0, len(values), 2)], offset + 4 * count
+
+
+def remaining(end, now):
+    """Temps restant (ms) avant `end`, 0 si déjà passé."""
+    return max(0, end - now)
+
+
+def capture(game, now):
+    """Instantané binaire (non compressé) de la partie en cours ; `now` = pygame.time.get_ticks()."""
+    maze, player = game.maze, game.player
+    scheduler = game.enemy_scheduler
+    lod = scheduler.lod
+    minimap = game.minimap
+    influence = game.influence_map
+    enemy_index = {enemy: i for i, enemy in enumerate(game.enemies)}
+    schedule = [(enemy_index[enemy], due) for enemy, due in scheduler.get_schedule() if enemy in enemy_index]
+    trail = list(player.trail.iter_live())
+    fog_radius = game.renderer.fog_radius
+
+    parts = [HEADER.pack(
+        MAGIC, VERSION, game.difficulty.value, maze.grid_size, maze.seed, game.elapsed_time,
+        remaining(game.potion_effects["vision"], now), remaining(game.potion_effects["freeze"], now),
+        remaining(game.damage_flash_end, now), -1 if fog_radius is None else fog_radius,
+        game.compass_cooldown, game.renderer.zoom, game.compass_active, scheduler.tick,
+        len(maze.potions), len(maze.chests), len(maze.enemy_positions), len(trail),
+        len(game.enemies), len(schedule), len(game.items), minimap is not None, influence is not None,
+    )]
+
+    # Grille : tableaux déjà maintenus par le labyrinthe, recopiés tels quels
+    parts.append(maze.get_wall_array().tobytes())
+    parts.append(maze.get_type_array().tobytes())
+    parts.append(pack_positions(maze.potions))
+    parts.append(pack_positions(maze.chests))
+    parts.append(pack_positions(maze.enemy_positions))
+
+    target = player.dash_target
+    parts.append(PLAYER.pack(
+        player.grid_x, player.grid_y, player.health, player.max_health, player.potions_collected,
+        player.total_potions, player.invincible, player.invincible_timer, *player.knockback_direction,
+        player.knockback_timer, player.dash_cooldown, player.dash_active, *player.dash_direction,
+        player.dash_progress, player.dash_speed, target is not None, *(target or (0, 0)),
+        *player.last_direction, player.moves, player.damage_taken,
+    ))
+    parts.extend(TRAIL_ENTRY.pack(x, y, now - timestamp) for x, y, timestamp in trail)
+
+    for enemy in game.enemies:
+        tier = lod.tiers.get(enemy) if lod is not None else None
+        frozen_since = lod.frozen_since.get(enemy, -1) if lod is not None else -1
+        parts.append(ENEMY.pack(
+            enemy.grid_x, enemy.grid_y, enemy.type.value, enemy.detection_range_base, enemy.night_blindness,
+            enemy.move_timer, enemy.cooldown_counter, TIER_CODES.get(tier, 0), frozen_since,
+        ))
+    parts.extend(SCHEDULE_ENTRY.pack(index, due) for index, due in schedule)
+    for item in game.items:
+        parts.append(ITEM.pack(item.grid_x, item.grid_y, item.type.value, item.collected,
+                               item.chest_opened, CHEST_RESULT_CODES[item.chest_result]))
+
+    if minimap is not None:
+        parts.append(np.packbits(minimap.explored).tobytes())
+    if influence is not None:
+        x0, y0, x1, y1 = influence.extent or (0, 0, 0, 0)
+        parts.append(INFLUENCE_HEADER.pack(influence.ticks, influence.updates, x0, y0, x1, y1))
+        parts.extend(getattr(influence, layer)[x0:x1, y0:y1].tobytes() for layer in INFLUENCE_LAYERS)
+
+    _, state, gauss_next = random.getstate()
+    parts.append(RNG_STATE.pack(*state, gauss_next is not None, gauss_next or 0.0))
+    return b"".join(parts)
+
+
+def restore(game, data, now):
+    """
+    Remet la partie dans l'état de l'instantané. Le labyrinthe courant est gardé
+    s'il a la même grille de murs (retour en arrière), sinon il est reconstruit
+    depuis les tableaux sans repasser par la génération.
+    """
+    view = memoryview(data)
+    try:
+        (magic, version, difficulty, grid_size, seed, elapsed, vision_left, freeze_left, flash_left,
+         fog_radius, compass_cooldown, zoom, compass_active, tick, n_potions, n_chests, n_enemy_positions,
+         n_trail, n_enemies, n_schedule, n_items, has_minimap, has_influence) = HEADER.unpack_from(view, 0)
+    except struct.error as e:
+        raise SnapshotError(f"En-tête tronqué: {e}") from e
+    if magic != MAGIC or version != VERSION:
+        raise SnapshotError(f"Format inconnu ({magic!r}, version {version})")
+    try:
+        difficulty = Difficulty(difficulty)
+        offset = HEADER.size
+        cells = grid_size * grid_size
+        walls = np.frombuffer(view, np.uint8, cells, offset).reshape(grid_size, grid_size)
+        types = np.frombuffer(view, np.uint8, cells, offset + cells).reshape(grid_size, grid_size)
+        offset += 2 * cells
+        potions, offset = unpack_positions(view, offset, n_potions)
+        chests, offset = unpack_positions(view, offset, n_chests)
+        enemy_positions, offset = unpack_positions(view, offset, n_enemy_positions)
+        player_fields = PLAYER.unpack_from(view, offset)
+        offset += PLAYER.size
+        trail = [TRAIL_ENTRY.unpack_from(view, offset + i * TRAIL_ENTRY.size) for i in range(n_trail)]
+        offset += n_trail * TRAIL_ENTRY.size
+        enemy_fields = [ENEMY.unpack_from(view, offset + i * ENEMY.size) for i in range(n_enemies)]
+        offset += n_enemies * ENEMY.size
+        schedule = [SCHEDULE_ENTRY.unpack_from(view, offset + i * SCHEDULE_ENTRY.size) for i in range(n_schedule)]
+        offset += n_schedule * SCHEDULE_ENTRY.size
+        item_fields = [ITEM.unpack_from(view, offset + i * ITEM.size) for i in range(n_items)]
+        offset += n_items * ITEM.size
+        explored = None
+        if has_minimap:
+            packed = (cells + 7) // 8
+            explored = np.unpackbits(np.frombuffer(view, np.uint8, packed, offset), count=cells)
+            offset += packed
+        layers = None
+        if has_influence:
+            influence_ticks, influence_updates, *extent = INFLUENCE_HEADER.unpack_from(view, offset)
+            offset += INFLUENCE_HEADER.size
+            x0, y0, x1, y1 = extent
+            if not (0 <= x0 <= x1 <= grid_size and 0 <= y0 <= y1 <= grid_size):
+                raise ValueError(f"zone d'influence invalide {extent}")
+            area = (x1 - x0) * (y1 - y0)
+            layers = []
+            for _ in INFLUENCE_LAYERS:
+                layers.append(np.frombuffer(view, np.float32, area, offset).reshape(x1 - x0, y1 - y0))
+                offset += 4 * area
+        rng_fields = RNG_STATE.unpack_from(view, offset)
+    except (struct.error, ValueError) as e:
+        raise SnapshotError(f"Instantané tronqué ou corrompu: {e}") from e
+
+    # Labyrinthe : réutilisé si la grille de murs est la même, sinon reconstruit
+    maze = game.maze
+    if (maze is None or maze.seed != seed or maze.difficulty != difficulty or maze.grid_size != grid_size
+            or not np.array_equal(maze.get_wall_array(), walls)):
+        maze = Maze.from_arrays(difficulty, seed, walls, types)
+    else:
+        for x, y in zip(*np.nonzero(maze.get_type_array() != types)):
+            maze.set_cell_type(int(x), int(y), CellType(int(types[x, y])))
+    maze.potions, maze.chests, maze.enemy_positions = potions, chests, enemy_positions
+
+    # Partie neuve sur cette grille, puis état de l'instantané par-dessus
+    game.start_game(difficulty, maze)
+    game.start_time -= elapsed
+    game.elapsed_time = elapsed
+    game.potion_effects["vision"] = now + vision_left if vision_left else 0
+    game.potion_effects["freeze"] = now + freeze_left if freeze_left else 0
+    game.damage_flash_end = now + flash_left if flash_left else 0
+    game.renderer.fog_radius = None if fog_radius < 0 else fog_radius
+    game.renderer.set_zoom(zoom)
+    game.compass_cooldown = compass_cooldown
+    game.compass_active = compass_active
+
+    player = game.player
+    (player.grid_x, player.grid_y, player.health, player.max_health, player.potions_collected,
+     player.total_potions, player.invincible, player.invincible_timer, knockback_x, knockback_y,
+     player.knockback_timer, player.dash_cooldown, player.dash_active, dash_x, dash_y,
+     player.dash_progress, player.dash_speed, has_target, target_x, target_y,
+     last_x, last_y, player.moves, player.damage_taken) = player_fields
+    player.knockback_direction = (knockback_x, knockback_y)
+    player.dash_direction = (dash_x, dash_y)
+    player.dash_target = (target_x, target_y) if has_target else None
+    player.last_direction = (last_x, last_y)
+    player.trail.clear()
+    for x, y, age in trail:
+        player.trail.append(x, y, now - age)
+
+    # Entités : les réserves reprennent celles créées par start_game
+    game.enemy_pool.release_all()
+    game.item_pool.release_all()
+    scheduler = game.enemy_scheduler
+    lod = scheduler.lod
+    enemies = []
+    for (x, y, enemy_type, detection_range, night_blindness, move_timer, cooldown_counter,
+         tier, frozen_since) in enemy_fields:
+        enemy = game.enemy_pool.acquire(x, y, EnemyType(enemy_type), difficulty)
+        enemy.detection_range_base = detection_range
+        enemy.night_blindness = night_blindness
+        enemy.move_timer = move_timer
+        enemy.cooldown_counter = cooldown_counter
+        if lod is not None and tier:
+            lod.tiers[enemy] = TIERS[tier]
+            if frozen_since >= 0:
+                lod.frozen_since[enemy] = frozen_since
+        enemies.append(enemy)
+    game.enemies = enemies
+    scheduler.restore_schedule(tick, [(enemies[index], due) for index, due in schedule])
+
+    items = []
+    for x, y, item_type, collected, chest_opened, chest_result in item_fields:
+        item = game.item_pool.acquire(x, y, ItemType(item_type))
+        item.collected = collected
+        item.chest_opened = chest_opened
+        item.chest_result = CHEST_RESULTS[chest_result]
+        items.append(item)
+    game.items = items
+    game.uncollected_potions = [item.get_grid_position() for item in items
+                                if item.type in POTION_TYPES and not item.collected]
+
+    if explored is not None and game.minimap is not None:
+        game.minimap.explored[:] = explored.reshape(grid_size, grid_size).astype(bool)
+        game.minimap.write_full_map()
+        game.minimap.last_reveal = None
+    if layers is not None and game.influence_map is not None:
+        influence = game.influence_map  # Neuve (start_game) : couches nulles
+        zone = (slice(x0, x1), slice(y0, y1))
+        for name, layer in zip(INFLUENCE_LAYERS, layers):
+            getattr(influence, name)[zone] = layer
+        influence.combine(zone)
+        influence.extent = tuple(extent) if area else None
+        influence.ticks = influence_ticks
+        influence.updates = influence_updates
+        influence.potion_key = None  # Attraction recalculée à l'identique
+
+    game.renderer.update_camera(player.grid_x, player.grid_y, maze.width, maze.height)
+
+    *state, has_gauss, gauss_next = rng_fields
+    random.setstate((3, tuple(state), gauss_next if has_gauss else None))
+
+
+def read_run_summary(data):
+    """
+    (graine, difficulté, chronomètre, déplacements, dégâts, potions, taille de la grille)
+    de la partie d'un instantané, lus dans l'en-tête et le bloc du joueur sans restaurer la partie.
+    """
+    try:
+        header = HEADER.unpack_from(data, 0)
+        magic, version, difficulty, grid_size, seed, elapsed = header[:6]
+        if magic != MAGIC or version != VERSION:
+            raise SnapshotError(f"Format inconnu ({magic!r}, version {version})")
+        n_potions, n_chests, n_enemy_positions = header[14:17]
+        offset = HEADER.size + 2 * grid_size * grid_size + 4 * (n_potions + n_chests + n_enemy_positions)
+        player_fields = PLAYER.unpack_from(data, offset)
+        difficulty = Difficulty(difficulty)
+    except (struct.error, ValueError) as e:
+        raise SnapshotError(f"Instantané tronqué ou corrompu: {e}") from e
+    return seed, difficulty, elapsed, player_fields[-2], player_fields[-1], player_fields[4], grid_size
+
+
+def compress(data):
+    return zlib.compress(data)
+
+
+def decompress(blob):
+    """Données brutes d'un instantané compressé (SnapshotError si corrompu)."""
+    try:
+        return zlib.decompress(blob)
+    except zlib.error as e:
+        raise SnapshotError(f"Sauvegarde corrompue: {e}") from e
+
+
+def write_atomic(path, blob):
+    """Écrit `blob` dans un fichier temporaire, le force sur disque puis le renomme sur `path`."""
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def read_snapshot(path):
+    """Instantané brut lu depuis une sauvegarde, ou None si le fichier n'existe pas."""
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+    except FileNotFoundError:
+        return None
+    return decompress(blob)
+
+
+class AutosaveWriter:
+    """
+    Thread de sauvegarde automatique : compresse et écrit atomiquement le dernier
+    instantané soumis. Un instantané remplacé avant d'être écrit est simplement sauté.
+    """
+
+    DISCARD = object()  # Demande de suppression de la sauvegarde
+
+    def __init__(self, path):
+        self.path = path
+        self.condition = threading.Condition()
+        self.pending = None
+        self.busy = False
+        self.closed = False
+        self.writes = 0
+        self.thread = threading.Thread(target=self.write_loop, name="autosave", daemon=True)
+        self.thread.start()
+
+    def submit(self, data):
+        """Programme l'écriture de l'instantané (ne bloque pas)."""
+        with self.condition:
+            self.pending = data
+            self.condition.notify_all()
+
+    def discard(self):
+        """Programme la suppression de la sauvegarde (partie terminée)."""
+        self.submit(self.DISCARD)
+
+    def flush(self):
+        """Attend que la dernière demande soit traitée."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.pending is None and not self.busy)
+
+    def close(self):
+        """Traite la demande en attente puis arrête le thread."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+
+    def write_loop(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending is not None or self.closed)
+                if self.pending is None:
+                    return
+                data, self.pending = self.pending, None
+                self.busy = True
+            try:
+                if data is self.DISCARD:
+                    if os.path.exists(self.path):
+                        os.remove(self.path)
+                else:
+                    write_atomic(self.path, compress(data))
+                    self.writes += 1
+            except OSError as e:
+                print(f">>> Autosave: Erreur d'écriture de {self.path}: {e}")
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+
+class RollbackRing:
+    """
+    Derniers instantanés en mémoire (anneau de capacité fixe) pour revenir en arrière.
+    Chaque entrée est compressée ; la grille, qui change rarement d'un instantané à
+    l'autre, n'est compressée qu'à son changement et partagée par les entrées suivantes.
+    """
+
+    def __init__(self, capacity=ROLLBACK_CAPACITY):
+        self.snapshots = deque(maxlen=capacity)  # (grille compressée, reste compressé)
+        self.last_grid = None  # (grille brute, compressée) de la dernière entrée
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def push(self, data):
+        grid_size = HEADER.unpack_from(data, 0)[3]
+        end = HEADER.size + 2 * grid_size * grid_size
+        grid = data[HEADER.size:end]
+        if self.last_grid is None or self.last_grid[0] != grid:
+            self.last_grid = (grid, zlib.compress(grid, RING_COMPRESSION_LEVEL))
+        rest = zlib.compress(data[:HEADER.size] + data[end:], RING_COMPRESSION_LEVEL)
+        self.snapshots.append((self.last_grid[1], rest))
+
+    def peek(self, steps=1):
+        """Instantané pris `steps` captures en arrière (1 = le plus récent), sans le retirer."""
+        if not 1 <= steps <= len(self.snapshots):
+            return None
+        grid, rest = self.snapshots[-steps]
+        rest = zlib.decompress(rest)
+        return rest[:HEADER.size] + zlib.decompress(grid) + rest[HEADER.size:]
+
+    def rewind(self, steps=1):
+        """Instantané pris `steps` captures en arrière ; les plus récents sont oubliés."""
+        data = self.peek(steps)
+        if data is not None:
+            for _ in range(steps - 1):
+                self.snapshots.pop()
+        return data
+
+    def clear(self):
+        self.snapshots.clear()
+        self.last_grid = None
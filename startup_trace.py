@@ -0,0 +1,85 @@
+"""
+Trace du démarrage : repères horodatés depuis le lancement du processus (import
+de ce module en tout premier par main.py) jusqu'à la première frame du menu et
+la fin du chargement de fond.
+
+Usage : python startup_trace.py   (démarrage sans fenêtre, affiche la trace)
+"""
+
+import time
+
+# Origine des mesures : premier import de ce module
+_origin = time.perf_counter()
+_marks = []  # [(repère, ms depuis l'origine)] dans l'ordre
+
+
+def mark(label):
+    """Enregistre un repère (une seule fois par libellé) ; retourne son temps en ms."""
+    for existing, elapsed in _marks:
+        if existing == label:
+            return elapsed
+    elapsed = (time.perf_counter() - _origin) * 1000
+    _marks.append((label, elapsed))
+    return elapsed
+
+
+def get_mark(label):
+    """Temps (ms) d'un repère, ou None s'il n'est pas encore atteint."""
+    for existing, elapsed in _marks:
+        if existing == label:
+            return elapsed
+    return None
+
+
+def get_marks():
+    return list(_marks)
+
+
+def reset(origin=None):
+    """Repart de zéro (nouvelle mesure dans le même processus, depuis `origin` si donné)."""
+    global _origin
+    _origin = time.perf_counter() if origin is None else origin
+    _marks.clear()
+
+
+def report():
+    """Affiche les repères et l'écart avec le précédent."""
+    previous = 0.0
+    for label, elapsed in _marks:
+        print(f">>> Startup: {label:<20} {elapsed:8.1f} ms  (+{elapsed - previous:.1f})")
+        previous = elapsed
+
+
+def main():
+    """Démarrage complet sans fenêtre jusqu'aux sprites chargés, puis affichage de la trace."""
+    import asyncio
+    import contextlib
+    import io
+    import os
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    # Lancé en script, ce fichier est __main__ : les modules du jeu écrivent dans
+    # le module startup_trace importé, recalé sur l'origine de ce processus
+    import startup_trace
+    startup_trace.reset(_origin)
+
+    async def run():
+        from game_new import Game
+        startup_trace.mark("imports")
+        # Sans historique, sauvegarde ni télémétrie : rien n'est écrit dans le dossier courant
+        game = Game(headless=True)
+        task = asyncio.ensure_future(game.run())
+        while startup_trace.get_mark("sprites") is None and not task.done():
+            await asyncio.sleep(0.001)
+        game.running = False
+        await task
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(run())
+    startup_trace.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+Télémétrie de position : cartes de chaleur par case des passages du joueur, des
+dégâts subis, des morts, des coffres ouverts et des dashs.
+
+Pendant la partie, chaque événement n'est qu'un incrément dans un tableau NumPy
+(couches x largeur x hauteur) ; les passages ne sont comptés que lorsque le joueur
+change de case. En fin de partie, les compteurs sont confiés à un thread d'écriture
+qui les ajoute au fichier de la graine (.npz compressé, écriture atomique) : un
+fichier par labyrinthe (difficulté, taille, graine) cumule toutes les sessions.
+Une partie interrompue (Échap, fermeture) écrit ses compteurs sans compter de
+session : elle n'est comptée qu'une fois, à la fin de la partie reprise ou à son abandon.
+Les fichiers de plusieurs machines se fusionnent avec merge_directories.
+
+Usage : python telemetry.py [--dir telemetry] [--merge dossier...] [--top N]
+"""
+
+import io
+import os
+import glob
+import queue
+import argparse
+import zipfile
+import threading
+
+import numpy as np
+from config_new import TELEMETRY_DIR
+from snapshot import write_atomic
+
+LAYERS = ("visits", "damage", "deaths", "chests", "dashes")
+VISITS, DAMAGE, DEATHS, CHESTS, DASHES = range(len(LAYERS))
+
+
+def heatmap_filename(difficulty, width, height, seed):
+    """Nom du fichier de cartes de chaleur d'un labyrinthe."""
+    return f"{difficulty.name.lower()}_{width}x{height}_{seed}.npz"
+
+
+def load_heatmaps(path):
+    """
+    (compteurs [couche, x, y] uint32, sessions) d'un fichier, ou None s'il n'existe pas
+    (ValueError si le fichier est illisible).
+    """
+    try:
+        with np.load(path) as data:
+            return data["counts"], int(data["sessions"])
+    except FileNotFoundError:
+        return None
+    except (EOFError, KeyError, zipfile.BadZipFile) as e:
+        raise ValueError(f"Cartes de chaleur illisibles ({path}): {e}") from e
+
+
+def save_heatmaps(path, counts, sessions):
+    """Écrit les compteurs (npz compressé) atomiquement : un lecteur ne voit jamais un fichier partiel."""
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, counts=counts, sessions=np.int64(sessions), layers=np.array(LAYERS))
+    write_atomic(path, buffer.getvalue())
+
+
+def accumulate(path, counts, sessions=1):
+    """Ajoute des compteurs au fichier `path` (créé s'il n'existe pas) ; retourne les totaux."""
+    existing = load_heatmaps(path)
+    if existing is not None and existing[0].shape == counts.shape:
+        counts = existing[0] + counts
+        sessions += existing[1]
+    elif existing is not None:
+        print(f">>> Telemetry: {path} ignoré (taille {existing[0].shape} au lieu de {counts.shape})")
+    save_heatmaps(path, counts, sessions)
+    return counts, sessions
+
+
+def merge_directories(sources, target):
+    """Cumule les fichiers de plusieurs dossiers dans `target`, graine par graine ; retourne le nombre de fichiers lus."""
+    os.makedirs(target, exist_ok=True)
+    merged = 0
+    for source in sources:
+        for path in sorted(glob.glob(os.path.join(source, "*.npz"))):
+            counts, sessions = load_heatmaps(path)
+            accumulate(os.path.join(target, os.path.basename(path)), counts, sessions)
+            merged += 1
+    return merged
+
+
+def heat_levels(counts):
+    """Compteurs d'une couche ramenés dans [0, 1] sur une échelle logarithmique (0 : jamais)."""
+    peak = counts.max()
+    if peak == 0:
+        return np.zeros(counts.shape, dtype=np.float32)
+    return (np.log1p(counts) / np.log1p(peak)).astype(np.float32)
+
+
+class TelemetryWriter:
+    """
+    Thread d'écriture des cartes de chaleur : chaque session soumise est ajoutée au
+    fichier de sa graine. Contrairement à la sauvegarde automatique, aucune demande
+    n'est sautée (une file, pas un dernier état). Les totaux du dernier fichier écrit
+    restent lisibles sans attendre le thread (latest).
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.writes = 0
+        self.latest = None  # (chemin, compteurs cumulés) du dernier fichier écrit
+        self.thread = threading.Thread(target=self.write_loop, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def submit(self, path, counts, sessions=1):
+        """Programme l'ajout des compteurs (et de `sessions` sessions) au fichier (ne bloque pas)."""
+        self.queue.put((path, counts, sessions))
+
+    def flush(self):
+        """Attend que toutes les sessions soumises soient écrites."""
+        self.queue.join()
+
+    def close(self):
+        """Écrit les sessions en attente puis arrête le thread."""
+        self.queue.put(None)
+        self.thread.join()
+
+    def write_loop(self):
+        while True:
+            request = self.queue.get()
+            try:
+                if request is None:
+                    return
+                path, counts, sessions = request
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                totals, _ = accumulate(path, counts, sessions)
+                self.latest = (path, totals)  # Publié avant le compteur : lu d'un bloc par le jeu
+                self.writes += 1
+            except (OSError, ValueError) as e:
+                print(f">>> Telemetry: Erreur d'écriture: {e}")
+            finally:
+                self.queue.task_done()
+
+
+class Telemetry:
+    """
+    Compteurs de la session en cours et cartes cumulées du labyrinthe (pour l'affichage).
+    Les méthodes record_* sont appelées sur le chemin de la frame : un incrément NumPy.
+    """
+
+    def __init__(self, directory=TELEMETRY_DIR):
+        self.directory = directory
+        self.writer = TelemetryWriter()
+        self.path = None
+        self.counts = None
+        self.last_cell = None
+        self.revision = 0        # Incrémenté à chaque événement (cache de l'affichage)
+        self.history = None      # Compteurs cumulés des sessions précédentes (lus à la demande)
+        self.history_writes = None  # writer.writes au moment de la lecture de history
+        self.heat_key = None
+        self.heat = None
+
+    def begin(self, maze, difficulty):
+        """
+        Commence une session sur le labyrinthe. Le même labyrinthe (retour en arrière,
+        reprise) continue la session ouverte au lieu d'en commencer une autre.
+        """
+        path = os.path.join(self.directory, heatmap_filename(difficulty, maze.width, maze.height, maze.seed))
+        if path == self.path and self.counts is not None:
+            self.last_cell = None
+            return
+        self.end()
+        self.path = path
+        self.counts = np.zeros((len(LAYERS), maze.width, maze.height), dtype=np.uint32)
+        self.last_cell = None
+        self.history = None
+        self.revision += 1
+
+    def end(self):
+        """Termine la session (partie finie) : ses compteurs partent au thread d'écriture."""
+        self.submit(sessions=1)
+
+    def suspend(self):
+        """
+        Partie interrompue, reprise possible : compteurs écrits, session comptée plus tard
+        (end à la fin de la partie reprise, ou end_abandoned si elle est abandonnée).
+        """
+        self.submit(sessions=0)
+
+    def submit(self, sessions):
+        if self.counts is None:
+            return
+        if self.counts.any() or sessions:
+            self.writer.submit(self.path, self.counts, sessions)
+        self.counts = None
+
+    def end_abandoned(self, difficulty, width, height, seed):
+        """Compte la session d'une partie suspendue puis abandonnée (compteurs déjà écrits)."""
+        path = os.path.join(self.directory, heatmap_filename(difficulty, width, height, seed))
+        self.writer.submit(path, np.zeros((len(LAYERS), width, height), dtype=np.uint32))
+
+    def close(self):
+        """Fermeture du jeu : une partie en cours est suspendue (reprise à la prochaine session)."""
+        self.suspend()
+        self.writer.close()
+
+    def record(self, layer, x, y):
+        if self.counts is not None:
+            self.counts[layer, x, y] += 1
+            self.revision += 1
+
+    def record_visit(self, cell):
+        """Passage du joueur : compté seulement quand il change de case."""
+        if cell != self.last_cell:
+            self.last_cell = cell
+            self.record(VISITS, *cell)
+
+    def record_damage(self, x, y):
+        self.record(DAMAGE, x, y)
+
+    def record_death(self, x, y):
+        self.record(DEATHS, x, y)
+
+    def record_chest(self, x, y):
+        self.record(CHESTS, x, y)
+
+    def record_dash(self, x, y):
+        self.record(DASHES, x, y)
+
+    def get_totals(self, layer):
+        """
+        Compteurs d'une couche : sessions déjà écrites de ce labyrinthe + session en cours.
+        Sans attendre le thread d'écriture : une session encore en file apparaît dès qu'il
+        l'a écrite (totaux publiés dans writer.latest).
+        """
+        if self.counts is None:
+            return None
+        writes = self.writer.writes
+        if self.history is None or writes != self.history_writes:
+            self.history_writes = writes
+            latest = self.writer.latest
+            if latest is not None and latest[0] == self.path:
+                self.set_history(latest[1])
+            elif self.history is None:
+                try:
+                    stored = load_heatmaps(self.path)
+                except (OSError, ValueError) as e:
+                    print(f">>> Telemetry: {e}")
+                    stored = None
+                self.set_history(None if stored is None else stored[0])
+        return self.history[layer].astype(np.int64) + self.counts[layer]
+
+    def set_history(self, stored):
+        same_shape = stored is not None and stored.shape == self.counts.shape
+        self.history = stored if same_shape else np.zeros_like(self.counts)
+
+    def get_heat(self, layer):
+        """(niveaux [x, y] dans [0, 1], clé de cache) de la couche pour l'affichage, ou (None, None)."""
+        key = (self.path, layer, self.revision, self.writer.writes)
+        if key != self.heat_key:
+            totals = self.get_totals(layer)
+            self.heat = None if totals is None else heat_levels(totals)
+            self.heat_key = key
+        return self.heat, self.heat_key
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cartes de chaleur enregistrées")
+    parser.add_argument("--dir", default=TELEMETRY_DIR, help="Dossier des cartes (cible de --merge)")
+    parser.add_argument("--merge", nargs="+", help="Dossiers à cumuler dans --dir")
+    parser.add_argument("--top", type=int, default=3, help="Cases les plus chaudes listées par couche")
+    args = parser.parse_args()
+
+    if args.merge:
+        count = merge_directories(args.merge, args.dir)
+        print(f">>> Telemetry: {count} fichiers cumulés dans {args.dir}")
+    for path in sorted(glob.glob(os.path.join(args.dir, "*.npz"))):
+        counts, sessions = load_heatmaps(path)
+        print(f"{os.path.basename(path)}: {sessions} sessions")
+        for layer, name in enumerate(LAYERS):
+            flat = counts[layer].ravel()
+            hottest = np.argsort(flat)[::-1][:args.top]
+            cells = [(*divmod(int(i), counts.shape[2]), int(flat[i])) for i in hottest if flat[i]]
+            print(f"  {name:<7}{int(flat.sum()):>8}  {cells}")
+
+
+if __name__ == "__main__":
+    main()
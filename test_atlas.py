@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test de l'atlas de sprites et de son cache disque.
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+sys.path.insert(0, '.')
+
+import pygame
+from config_new import ASSET_MAPPING, ATLAS_DIR, TILE_SIZE
+import atlas as atlas_module
+from atlas import SpriteAtlas
+
+def init_display():
+    """(Ré)initialise un petit affichage (d'autres scripts de test appellent pygame.quit())."""
+    pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+
+def test_atlas_build_and_cache():
+    print("=== Test construction + cache de l'atlas ===")
+    init_display()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        atlas = SpriteAtlas(48, cache_dir=cache_dir, shipped_dir=None).load()
+        assert not atlas.from_cache, "Premier chargement : l'atlas doit être construit"
+        assert set(atlas.rects) == set(ASSET_MAPPING), "Chaque clé doit avoir un rectangle"
+        for key, rect in atlas.rects.items():
+            assert rect.size == (48, 48), f"Rectangle de {key} à la mauvaise taille"
+        assert os.path.exists(atlas.get_index_path())
+
+        # Deuxième chargement : un seul fichier image lu, aucun redimensionnement
+        cached = SpriteAtlas(48, cache_dir=cache_dir, shipped_dir=None).load()
+        assert cached.from_cache, "Deuxième chargement : l'atlas doit venir du cache"
+        assert cached.rects == atlas.rects
+        sprite = cached.get_sprite("player")
+        assert sprite.get_size() == (48, 48)
+        assert pygame.image.tostring(sprite, "RGBA") == pygame.image.tostring(atlas.get_sprite("player"), "RGBA")
+
+        # Une autre taille de case a son propre cache
+        small = SpriteAtlas(16, cache_dir=cache_dir, shipped_dir=None).load()
+        assert not small.from_cache
+        assert small.get_sprite("wall").get_size() == (16, 16)
+    print("OK: atlas construit puis rechargé depuis le cache.")
+
+def test_atlas_pixels_match_sources():
+    print("\n=== Test fidélité des pixels ===")
+    init_display()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        atlas = SpriteAtlas(48, cache_dir=cache_dir, shipped_dir=None).load()
+        source = pygame.image.load(os.path.join("assets", ASSET_MAPPING["exit"]))
+        expected = pygame.transform.scale(source, (48, 48)).convert_alpha()
+        got = atlas.get_sprite("exit")
+        for x in range(0, 48, 7):
+            for y in range(0, 48, 7):
+                assert got.get_at((x, y)) == expected.get_at((x, y)), f"Pixel ({x},{y}) différent"
+    print("OK: les sprites de l'atlas correspondent aux PNG redimensionnés.")
+
+def test_atlas_build_steps():
+    print("\n=== Test construction par étapes ===")
+    init_display()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        atlas = SpriteAtlas(16, cache_dir=cache_dir, shipped_dir=None)
+        steps = list(atlas.load_steps())
+        assert len(steps) == len(set(ASSET_MAPPING.values())), "Une étape par tile chargée"
+        assert set(atlas.rects) == set(ASSET_MAPPING) and os.path.exists(atlas.get_index_path())
+        assert list(SpriteAtlas(16, cache_dir=cache_dir, shipped_dir=None).load_steps()) == [], "Depuis le cache : aucune étape"
+    print("OK: la construction rend la main après chaque tile.")
+
+def test_shipped_atlas():
+    print("\n=== Test atlas livré (build web) ===")
+    init_display()
+    with tempfile.TemporaryDirectory() as shipped_dir, tempfile.TemporaryDirectory() as cache_dir:
+        built = SpriteAtlas(48, cache_dir=shipped_dir, shipped_dir=None).load()
+        # Dates des sources différentes (assets copiés) : l'empreinte de l'index fait foi,
+        # aucun PNG source n'est relu
+        index_path = built.get_index_path()
+        with open(index_path) as f:
+            index = json.load(f)
+        for entry in index["sources"].values():
+            entry[1] += 1
+        with open(index_path, "w") as f:
+            json.dump(index, f)
+        compute_source_hash = atlas_module.compute_source_hash
+        def fail():
+            raise AssertionError("Sources relues pour l'atlas livré")
+        atlas_module.compute_source_hash = fail
+        try:
+            shipped = SpriteAtlas(48, cache_dir=cache_dir, shipped_dir=shipped_dir).load()
+        finally:
+            atlas_module.compute_source_hash = compute_source_hash
+        assert shipped.from_cache and shipped.rects == built.rects and not os.listdir(cache_dir)
+        # Taille d'une source changée : atlas livré périmé, reconstruit dans le cache local
+        filename = next(iter(index["sources"]))
+        index["sources"][filename][0] += 1
+        with open(index_path, "w") as f:
+            json.dump(index, f)
+        rebuilt = SpriteAtlas(48, cache_dir=cache_dir, shipped_dir=shipped_dir).load()
+        assert not rebuilt.from_cache and os.path.exists(rebuilt.get_index_path())
+
+    # L'atlas livré avec le jeu correspond aux tiles actuelles (sinon : python atlas.py --ship)
+    index_path = SpriteAtlas(TILE_SIZE).get_index_path(ATLAS_DIR)
+    with open(index_path) as f:
+        index = json.load(f)
+    assert index["source_hash"] == atlas_module.compute_source_hash(), "Atlas livré périmé"
+    assert os.path.exists(SpriteAtlas(TILE_SIZE).get_image_path(index["source_hash"], ATLAS_DIR))
+    print("OK: atlas livré chargé sans relire les sources, périmé s'il ne correspond plus.")
+
+def test_imports_without_side_effects():
+    print("\n=== Test imports sans effet de bord ===")
+    code = ("import pygame, game_new, startup_trace; "
+            "assert not pygame.get_init(), 'pygame initialisé à l import'; "
+            "assert startup_trace.get_marks() == []")
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "", f"Les imports ne doivent rien afficher: {result.stdout!r}"
+    print("OK: importer les modules du jeu n'initialise rien et n'affiche rien.")
+
+def main():
+    try:
+        test_atlas_build_and_cache()
+        test_atlas_pixels_match_sources()
+        test_atlas_build_steps()
+        test_shipped_atlas()
+        test_imports_without_side_effects()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
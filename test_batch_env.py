@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test de l'environnement par lots (règles du jeu vectorisées, redémarrage automatique).
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import random
+import numpy as np
+import pygame
+from config_new import Difficulty, GameState, FPS, BOT_MOVE_FRAMES, PLAYER_MAX_HEALTH, PLAYER_INVINCIBILITY_DURATION
+from maze_new import generate_valid_maze
+from batch_env import (BatchEnv, STEP_DIRECTIONS, ACTION_WAIT, OUTCOME_RUNNING, OUTCOME_WIN,
+                       OUTCOME_DEATH, OUTCOME_TIMEOUT, REWARD_DAMAGE)
+from tournament import VirtualClock, RoutePolicy
+
+def test_same_rules_as_game():
+    print("=== Test mêmes règles que Game (déplacements, potions, victoire) ===")
+    from game_new import Game
+    maze = generate_valid_maze(Difficulty.EASY, seed=21)
+    maze.enemy_positions = []  # Patrouilles aléatoires et coffres exclus de la comparaison
+    maze.chests = []
+    clock = VirtualClock()
+    get_ticks = pygame.time.get_ticks
+    pygame.time.get_ticks = clock
+    try:
+        game = Game(headless=True)
+        game.start_game(Difficulty.EASY, maze)
+        env = BatchEnv(1, Difficulty.EASY, mazes=[maze], seed=0)
+        policy = RoutePolicy(0)
+        rng = random.Random(5)
+        for step in range(400):
+            # Route vers les potions, entrecoupée de coups au hasard (souvent dans un mur)
+            direction = policy.choose(game) if step % 3 else rng.choice(STEP_DIRECTIONS)
+            action = ACTION_WAIT if direction is None else STEP_DIRECTIONS.index(direction)
+            for frame in range(BOT_MOVE_FRAMES):
+                clock.now += 1000 // FPS
+                if frame == 0 and direction is not None:
+                    game.step_player(direction)
+                if game.state == GameState.PLAYING:
+                    game.update()
+            observation, rewards, dones, info = env.step([action])
+            if dones[0]:
+                break
+            assert tuple(observation["player"][0]) == game.player.get_grid_position(), step
+            assert observation["potions"][0] == game.player.potions_collected
+        assert game.state == GameState.WIN and info["outcome"][0] == OUTCOME_WIN
+        assert info["episode_potions"][0] == game.player.potions_collected
+    finally:
+        pygame.time.get_ticks = get_ticks
+    print(f"OK: même partie pas à pas, victoire au pas {step}.")
+
+def test_damage_invincibility_and_death():
+    print("\n=== Test dégâts, invincibilité, knockback et mort ===")
+    env = BatchEnv(2, Difficulty.EASY, pool_size=2, seed=1)
+    env.chest_alive[:] = False
+    env.freeze_until[:] = 1 << 40  # Ennemis immobiles
+    env.enemy_cells[0, 0] = env.pos[0]  # Ennemi posé sur le joueur de la partie 0
+    observation, rewards, dones, info = env.step([ACTION_WAIT, ACTION_WAIT])
+    assert observation["health"][0] == PLAYER_MAX_HEALTH - 1 and observation["health"][1] == PLAYER_MAX_HEALTH
+    assert rewards[0] < rewards[1] and env.knockback[0] > 0
+    # Knockback : le déplacement voulu est refusé
+    start = env.pos[0]
+    walkable = [a for a in range(4) if env.walkable[env.base[0] + start + env.offsets[a]]]
+    env.step([walkable[0], ACTION_WAIT])
+    assert env.pos[0] == start
+    # Invincible pendant PLAYER_INVINCIBILITY_DURATION frames, puis touché à nouveau
+    steps = 0
+    while env.health[0] == PLAYER_MAX_HEALTH - 1:
+        observation, rewards, dones, info = env.step([ACTION_WAIT, ACTION_WAIT])
+        steps += 1
+    assert (steps + 2) * BOT_MOVE_FRAMES >= PLAYER_INVINCIBILITY_DURATION
+    while not dones[0]:
+        observation, rewards, dones, info = env.step([ACTION_WAIT, ACTION_WAIT])
+    assert info["outcome"][0] == OUTCOME_DEATH and info["episode_damage"][0] == PLAYER_MAX_HEALTH
+    assert rewards[0] < REWARD_DAMAGE and not dones[1]
+    # Partie redémarrée dans la même réponse
+    assert observation["health"][0] == PLAYER_MAX_HEALTH and env.steps[0] == 0
+    print("OK: un dégât par période d'invincibilité, mort puis redémarrage automatique.")
+
+def test_batch_invariants_and_timeout():
+    print("\n=== Test invariants sur un lot et fin par limite de pas ===")
+    env = BatchEnv(64, Difficulty.EXTREME, pool_size=4, seed=2, max_steps=50)
+    rng = np.random.default_rng(3)
+    outcomes = set()
+    for _ in range(120):
+        observation, rewards, dones, info = env.step(rng.integers(5, size=env.n))
+        outcomes.update(info["outcome"][dones].tolist())
+        assert env.walkable[env.base + env.pos].all(), "Joueur dans un mur"
+        assert env.walkable[(env.base[:, None] + env.enemy_cells)[env.enemy_valid]].all(), "Ennemi dans un mur"
+        assert (env.health > 0).all() and (env.steps < 50).all()
+        maze = observation["maze"]
+        assert (observation["exit"] == [[env.width - 1, env.height - 1]]).all()
+        assert env.walkable_grid[maze, observation["player"][:, 0], observation["player"][:, 1]].all()
+    assert OUTCOME_TIMEOUT in outcomes and OUTCOME_RUNNING not in outcomes
+    print(f"OK: issues observées {sorted(outcomes)}, positions toujours traversables.")
+
+def main():
+    try:
+        test_same_rules_as_game()
+        test_damage_invincibility_and_death()
+        test_batch_invariants_and_timeout()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
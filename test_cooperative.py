@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test de la poursuite coopérative (table de réservation espace-temps, WHCA*).
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import random
+from config_new import CellType, Difficulty, EnemyType
+from maze_new import Maze
+from entities_new import Enemy
+from enemy_scheduler import EnemyScheduler
+from cooperative import CooperativePlanner, ReservationTable
+
+def corridor_maze(length=20):
+    """Labyrinthe réduit à un couloir horizontal (y = 5, x de 1 à length)."""
+    random.seed(1)
+    maze = Maze(Difficulty.EXTREME)
+    for x in range(maze.width):
+        for y in range(maze.height):
+            maze.set_cell_type(x, y, CellType.WALL)
+    for x in range(1, length + 1):
+        maze.set_cell_type(x, 5, CellType.FLOOR)
+    return maze
+
+def make_chaser(x, y):
+    """Stalker qui voit toujours le joueur (pas de cécité nocturne)."""
+    enemy = Enemy(x, y, EnemyType.MONSTER, Difficulty.EXTREME)
+    enemy.detection_range_base = 1000
+    enemy.night_blindness = False
+    return enemy
+
+def make_planner(maze, enemies):
+    scheduler = EnemyScheduler(enemies)
+    planner = CooperativePlanner(maze, scheduler)
+    scheduler.planner = planner
+    return scheduler, planner
+
+def test_reservation_table():
+    print("=== Test table de réservation ===")
+    a, b = object(), object()
+    table = ReservationTable()
+    table.reserve(a, (3, 3), 10, 14, origin=(2, 3))
+    assert not table.is_free((3, 3), 12, 4, b) and table.is_free((3, 3), 12, 4, a)
+    assert table.is_free((3, 3), 14, 4, b), "Réservation limitée à [10, 14)"
+    assert table.is_swap((3, 3), (2, 3), 10, b), "Échange de cases interdit"
+    table.prune(12)
+    assert table.is_free((3, 3), 10, 2, b) and not table.is_free((3, 3), 12, 1, b)
+    table.release(a)
+    assert not table.cells and not table.edges and not table.owned
+    print("OK: cases, échanges, oubli du passé et libération.")
+
+def test_plans_avoid_each_other():
+    print("\n=== Test plans sans conflit dans un couloir ===")
+    maze = corridor_maze()
+    first, second = make_chaser(2, 5), make_chaser(3, 5)
+    scheduler, planner = make_planner(maze, [first, second])
+    goal = (15, 5)
+    plan_second = planner.plan(second, goal)
+    plan_first = planner.plan(first, goal)
+    occupied = {}
+    for enemy, plan in ((first, plan_first), (second, plan_second)):
+        interval = enemy.get_action_interval()
+        for tick, cell in plan:
+            for t in range(tick, tick + interval):
+                assert occupied.setdefault((cell, t), enemy) is enemy, f"Conflit en {cell} au tick {t}"
+    assert plan_second[-1][1][0] > 3, "Le premier ennemi avance"
+    assert plan_first[-1][1][0] < plan_second[-1][1][0], "Le second reste derrière sans le traverser"
+    print("OK: les deux plans ne partagent aucune case au même tick.")
+
+def test_no_stacking_in_chase():
+    print("\n=== Test poursuite sans empilement ===")
+    random.seed(4)
+    maze = Maze(Difficulty.EXTREME)
+    floor = [(x, y) for x in range(maze.width) for y in range(maze.height) if maze.is_walkable(x, y)]
+    player_pos = floor[len(floor) // 2]
+    chasers = [make_chaser(*cell) for cell in random.sample(floor, 6)]
+    scheduler, planner = make_planner(maze, chasers)
+    start_distance = sum(len(maze.find_path((e.grid_x, e.grid_y), player_pos) or []) for e in chasers)
+    for _ in range(300):
+        scheduler.advance(player_pos, maze)
+        planner.run(player_pos, budget_ms=50)
+        positions = [(e.grid_x, e.grid_y) for e in chasers]
+        assert len(set(positions)) == len(positions), f"Ennemis empilés: {positions}"
+        assert all(maze.is_walkable(*p) for p in positions)
+    end_distance = sum(len(maze.find_path((e.grid_x, e.grid_y), player_pos) or []) for e in chasers)
+    assert end_distance < start_distance, "Les ennemis se rapprochent du joueur"
+    assert planner.stats["plans"] > 0
+    print(f"OK: {planner.stats['plans']} plans, distance totale {start_distance} -> {end_distance}.")
+
+def test_planning_budget():
+    print("\n=== Test budget de planification ===")
+    random.seed(6)
+    maze = Maze(Difficulty.EXTREME)
+    floor = [(x, y) for x in range(maze.width) for y in range(maze.height) if maze.is_walkable(x, y)]
+    chasers = [make_chaser(*cell) for cell in random.sample(floor, 20)]
+    scheduler, planner = make_planner(maze, chasers)
+    for enemy in chasers:
+        planner.request(enemy)
+    assert planner.run(floor[0], budget_ms=0) == 0, "Budget nul : aucun plan calculé"
+    assert len(planner.queue) == 20
+
+    # Sans plan, l'ennemi fait un pas de repli (réservé) au lieu de planifier sur place
+    enemy = chasers[0]
+    scheduler.tick = scheduler.get_due_tick(enemy)
+    enemy.act(floor[0], maze, planner=planner)
+    assert planner.stats["fallbacks"] == 1 and planner.stats["plans"] == 0
+
+    planned = 0
+    frames = 0
+    while planner.queue:
+        planned += planner.run(floor[0], budget_ms=1)
+        frames += 1
+    assert planned == 20 and not planner.queued
+    print(f"OK: 20 plans répartis sur {frames} frame(s) de 1 ms.")
+
+def main():
+    try:
+        test_reservation_table()
+        test_plans_avoid_each_other()
+        test_no_stacking_in_chase()
+        test_planning_budget()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
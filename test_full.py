@@ -11,7 +11,7 @@ def run_game():
     """Lance le jeu et le quitte après 3 secondes."""
     try:
         from game_new import Game
-        game = Game()
+        game = Game(headless=True)
         # Démarrer une partie en facile
         game.reset_game(game.difficulty)
         start = time.time()
@@ -20,7 +20,7 @@ def run_game():
             game.update()
             game.render()
             pygame.display.flip()
-            game.clock.tick(30)
+            time.sleep(1 / 30)
         print("✅ Test d'intégration terminé sans crash.")
     except Exception as e:
         print(f"❌ Erreur lors de l'exécution du jeu: {e}")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test de la génération découpée (générateurs repris frame après frame, état LOADING).
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import gc
+import time
+import pygame
+from config_new import Difficulty, GameState, GENERATION_SLICE_MS
+from maze_new import generate_valid_maze, iter_generate_valid_maze, generation_progress, GENERATION_PHASES
+
+def maze_signature(maze):
+    return (maze.get_wall_array().tobytes(), maze.get_type_array().tobytes(), maze.start_pos, maze.exit_pos,
+            maze.potions, maze.enemy_positions, maze.chests)
+
+def test_same_maze_as_blocking_generation():
+    print("=== Test même labyrinthe qu'en un seul tenant ===")
+    for difficulty in Difficulty:
+        steps = iter_generate_valid_maze(difficulty, seed=11)
+        phases = []
+        while True:
+            try:
+                maze, phase, fraction = next(steps)
+            except StopIteration as stop:
+                sliced = stop.value
+                break
+            assert 0.0 <= fraction <= 1.0, (phase, fraction)
+            if not phases or phases[-1] != phase:
+                phases.append(phase)
+        assert maze_signature(sliced) == maze_signature(generate_valid_maze(difficulty, seed=11)), difficulty
+        assert sliced.carve_order is None, "Aperçu libéré en fin de génération"
+    # Sur une grande grille, toutes les phases rendent la main, dans l'ordre
+    order = [name for name, _, _ in GENERATION_PHASES]
+    assert phases == sorted(phases, key=order.index) and "carve" in phases and "walls" in phases, phases
+    assert "grid" in phases and "flood" in phases, phases
+    print(f"OK: graines identiques -> labyrinthes identiques ; phases {phases}.")
+
+def test_bounded_slices():
+    print("\n=== Test étapes courtes sur un grand labyrinthe ===")
+    # Ramasse-miettes actif, comme dans le jeu (gel après chaque étape, voir Game.update_loading)
+    gc.collect()
+    try:
+        maze, count, longest, phases = run_bounded_slices()
+    finally:
+        gc.unfreeze()
+    # Toutes les phases rendent la main, y compris la construction de la grille et les distances
+    assert phases == {name for name, _, _ in GENERATION_PHASES}, phases
+    assert count > 100 and longest * 1000 < 50, (count, longest)
+    assert maze.is_valid()
+    print(f"OK: {count} étapes, la plus longue {longest * 1000:.2f} ms.")
+
+def run_bounded_slices():
+    """
+    Génère un grand labyrinthe étape par étape en gelant les objets créés après chaque
+    étape, comme Game.update_loading ; (labyrinthe, étapes, plus longue, phases).
+    """
+    steps = iter_generate_valid_maze(Difficulty.HARD, grid_size=401, seed=3)
+    longest = 0.0
+    count = 0
+    phases = set()
+    previous = None
+    carving = None
+    while True:
+        start = time.perf_counter()
+        try:
+            maze, phase, fraction = next(steps)
+        except StopIteration as stop:
+            maze = stop.value
+            break
+        longest = max(longest, time.perf_counter() - start)
+        gc.freeze()
+        count += 1
+        phases.add(phase)
+        # Le creusement avance sans reculer (chaque nouvel essai repart de zéro)
+        if phase == "carve":
+            assert maze is not previous or fraction >= carving, fraction
+            previous, carving = maze, fraction
+        assert 0.0 <= generation_progress(phase, fraction) <= 1.0
+    return maze, count, longest, phases
+
+def test_loading_state():
+    print("\n=== Test écran de chargement dans Game ===")
+    from game_new import Game
+    game = Game(headless=True)
+    game.grid_size = 61
+    game.begin_loading(Difficulty.MEDIUM, seed=8)
+    frames = 0
+    while game.state == GameState.LOADING:
+        start = time.perf_counter()
+        game.update()
+        # Une tranche ne dépasse son budget que d'une étape
+        assert (time.perf_counter() - start) * 1000 < GENERATION_SLICE_MS + 50
+        game.render()
+        frames += 1
+    assert game.state == GameState.PLAYING and frames > 1
+    assert maze_signature(game.maze) == maze_signature(generate_valid_maze(Difficulty.MEDIUM, grid_size=61, seed=8))
+    # Échap pendant le chargement : retour au menu
+    game.begin_loading(Difficulty.HARD)
+    game.update()
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE))
+    game.handle_events()
+    assert game.state == GameState.MENU and game.loading is None and game.running
+    print(f"OK: partie démarrée après {frames} frames de chargement, annulation par Échap.")
+
+def main():
+    try:
+        test_same_maze_as_blocking_generation()
+        test_bounded_slices()
+        test_loading_state()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
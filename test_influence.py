@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test des cartes d'influence de l'IA (odeur du joueur, densité d'ennemis, potions).
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import random
+import numpy as np
+from config_new import CellType, Difficulty, EnemyType, DIFFICULTY_SETTINGS
+from maze_new import Maze
+from entities_new import Enemy
+from influence import InfluenceMap, propagate
+
+def open_maze(difficulty=Difficulty.HARD):
+    """Labyrinthe sans murs (cases toutes traversables)."""
+    random.seed(1)
+    maze = Maze(difficulty)
+    for x in range(maze.width):
+        for y in range(maze.height):
+            maze.set_cell_type(x, y, CellType.FLOOR)
+    return maze
+
+def test_propagation_blocked_by_walls():
+    print("=== Test propagation masquée par les murs ===")
+    walkable = np.ones((9, 9), dtype=np.float32)
+    walkable[4, :] = 0  # Mur vertical complet
+    layer = np.zeros_like(walkable)
+    layer[1, 4] = 1.0
+    layer = propagate(layer, walkable, steps=10, decay=0.5)
+    assert layer[2, 4] == 0.5 and layer[3, 4] == 0.25
+    assert not layer[4:, :].any(), "L'influence ne traverse pas les murs"
+    print("OK: atténuation par case, murs infranchissables.")
+
+def test_enemy_follows_scent():
+    print("\n=== Test suivi de l'odeur du joueur ===")
+    maze = open_maze()
+    influence = InfluenceMap(maze, update_ticks=1)
+    player_pos = (10, 10)
+    trail = [(10 - i, 10, 1000 - 100 * i) for i in range(1, 6)]
+    enemy = Enemy(3, 10, EnemyType.GHOST, Difficulty.HARD)
+    for _ in range(3):
+        influence.tick(player_pos, trail, [enemy], [], 1000)
+    distance = abs(enemy.grid_x - 10) + abs(enemy.grid_y - 10)
+    for _ in range(6):
+        enemy.act(player_pos, maze, influence)
+        influence.tick(player_pos, trail, [enemy], [], 1000)
+    assert abs(enemy.grid_x - 10) + abs(enemy.grid_y - 10) == distance - 6, "L'ennemi remonte la traînée"
+    print("OK: l'ennemi remonte la traînée jusqu'au joueur.")
+
+def test_density_and_attraction():
+    print("\n=== Test densité d'ennemis et attraction des potions ===")
+    maze = open_maze()
+    influence = InfluenceMap(maze, update_ticks=1)
+    far_player = (0, 0)
+    influence.update(far_player, [], [], [(20, 20)], 0)
+    assert influence.choose_step(20, 22) == (20, 21), "Attiré par la potion"
+    alone = influence.combined[20, 21]
+    crowd = [Enemy(20, 21, EnemyType.MONSTER, Difficulty.HARD) for _ in range(3)]
+    influence.update(far_player, [], crowd, [(20, 20)], 0)
+    assert influence.combined[20, 21] < alone, "Les ennemis repoussent leurs congénères"
+    # Sans signal, l'ennemi revient à la patrouille aléatoire
+    assert influence.choose_step(2, 28) is None
+    print("OK: potions attractives, groupes d'ennemis répulsifs.")
+
+def test_game_uses_influence():
+    print("\n=== Test activation par difficulté ===")
+    assert DIFFICULTY_SETTINGS[Difficulty.HARD].get("influence_ai")
+    assert not DIFFICULTY_SETTINGS[Difficulty.EASY].get("influence_ai")
+    import pygame
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    from game_new import Game
+    game = Game(headless=True)
+    game.reset_game(Difficulty.HARD)
+    assert game.influence_map is not None and game.enemy_scheduler.influence is game.influence_map
+    for _ in range(10):
+        game.update()
+    assert game.influence_map.updates >= 3
+    game.reset_game(Difficulty.EASY)
+    assert game.influence_map is None
+    print("OK: cartes d'influence actives en Difficile et Extrême seulement.")
+
+def main():
+    try:
+        test_propagation_blocked_by_walls()
+        test_enemy_follows_scent()
+        test_density_and_attraction()
+        test_game_uses_influence()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
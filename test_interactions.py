@@ -9,7 +9,9 @@ sys.path.insert(0, '.')
 
 from config_new import CellType, Difficulty, DIFFICULTY_SETTINGS
 from maze_new import Maze, Cell
-from entities_new import Player
+from entities_new import Player, Enemy, Item, EntityPool, CHEST_RESULTS, create_enemies_from_maze
+from config_new import ItemType, EnemyType
+from trail_buffer import TrailBuffer
 import pygame
 
 # Initialiser pygame pour les tests (sans affichage)
@@ -92,7 +94,7 @@ def test_collision_logic():
     result = chest.open_chest()
     assert chest.chest_opened == True
     assert result is not None
-    assert result["type"] in ["bonus", "trap"]
+    assert result["type"] in ["bonus", "trap", "neutral"]
     print(f"  Coffre ouvert: {result}")
     
     print("✓ Logique de collision des objets valide")
@@ -118,6 +120,63 @@ def test_last_direction():
     
     print("✓ last_direction fonctionne")
 
+def test_trail_buffer():
+    """Test du tampon circulaire de la traînée (expiration par âge, écrasement)."""
+    print("\n--- Test traînée circulaire ---")
+    trail = TrailBuffer(capacity=4, max_age=1000)
+    for i in range(6):
+        trail.append(i, 0, 100 * i)
+    assert len(trail) == 4, "Capacité fixe : les plus anciennes sont écrasées"
+    assert [x for x, _, _ in trail] == [2, 3, 4, 5]
+    assert [x for x, _, _ in trail.iter_live(1350)] == [4, 5], "Seule la fenêtre vivante est lue"
+    assert len(trail) == 4, "La lecture ne modifie pas le tampon"
+    trail.expire(1350)
+    assert len(trail) == 2 and list(trail) == [(4, 0, 400), (5, 0, 500)]
+    trail.append(9, 9, 1400)
+    trail.expire(5000)
+    assert len(trail) == 0 and list(trail) == []
+
+    # Le joueur garde le même tampon d'une frame à l'autre
+    maze = Maze(Difficulty.EASY)
+    player = Player(*maze.start_pos, total_potions=3)
+    buffer = player.trail
+    for direction in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
+        player.move(direction, maze)
+    player.update(maze)
+    assert player.trail is buffer
+    print("✓ Traînée circulaire sans recopie")
+
+def test_compact_entities():
+    """Test des entités compactes (__slots__), des murs en masque et des réserves."""
+    print("\n--- Test entités compactes et réserves ---")
+    maze = Maze(Difficulty.MEDIUM)
+    for entity in (Player(1, 1, 3), Enemy(1, 1, EnemyType.GHOST, Difficulty.MEDIUM),
+                   Item(1, 1, ItemType.CHEST), Cell(1, 1)):
+        assert not hasattr(entity, "__dict__"), f"{type(entity).__name__} doit utiliser __slots__"
+
+    cell = Cell(0, 0)
+    cell.remove_wall("E")
+    assert cell.walls == {"N": True, "S": True, "E": False, "W": True}
+    assert not cell.has_wall("E") and cell.has_wall("N")
+
+    chest = Item(2, 2, ItemType.CHEST)
+    result = chest.open_chest()
+    assert result in CHEST_RESULTS.values() and chest.chest_result == result["type"]
+    try:
+        result["type"] = "bonus"
+        assert False, "Le résultat partagé doit être en lecture seule"
+    except TypeError:
+        pass
+
+    pool = EntityPool(Enemy)
+    first = create_enemies_from_maze(maze, Difficulty.MEDIUM, pool)
+    pool.release_all()
+    second = create_enemies_from_maze(maze, Difficulty.EXTREME, pool)
+    assert {id(e) for e in first} == {id(e) for e in second}, "Les ennemis sont réutilisés"
+    assert pool.created == len(first) and pool.reused == len(second)
+    assert all(e.difficulty == Difficulty.EXTREME and e.move_timer == 0 for e in second)
+    print("✓ Entités compactes, résultats partagés et réserves réutilisées")
+
 def main():
     """Exécute tous les tests."""
     print("=== Tests des corrections de bugs ===")
@@ -127,6 +186,8 @@ def main():
         test_dash_movement()
         test_collision_logic()
         test_last_direction()
+        test_trail_buffer()
+        test_compact_entities()
         print("\n✅ Tous les tests passent avec succès !")
         return 0
     except AssertionError as e:
@@ -21,7 +21,7 @@ screen = pygame.display.set_mode((800, 600))
 pygame.display.set_caption("Test Labyrinthe")
 
 # Créer une instance de Game
-game = Game()
+game = Game(headless=True)
 print("Game créé.")
 
 # Forcer la difficulté EASY et démarrer une partie
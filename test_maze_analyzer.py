@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test de l'analyseur de labyrinthes hors ligne (mesures comparées aux calculs de
+référence du jeu, paquets répartis sur des processus, colonnes et corpus relus).
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import os
+import tempfile
+from collections import deque
+import numpy as np
+from config_new import Difficulty
+from maze_new import generate_valid_maze
+from maze_analyzer import (COLUMNS, analyze_layout, analyze_seed_range, analyze_corpus, build_tasks,
+                           save_columns, load_columns, summarize, select_seeds, format_report)
+
+def components(cells):
+    """Tailles des composantes connexes (4-voisinage) d'un ensemble de cases."""
+    seen, sizes = set(), []
+    for cell in cells:
+        if cell in seen:
+            continue
+        seen.add(cell)
+        queue, size = deque([cell]), 0
+        while queue:
+            x, y = queue.popleft()
+            size += 1
+            for other in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+                if other in cells and other not in seen:
+                    seen.add(other)
+                    queue.append(other)
+        sizes.append(size)
+    return sizes
+
+def test_metrics_against_reference():
+    print("=== Test mesures = calculs de référence ===")
+    for difficulty in (Difficulty.MEDIUM, Difficulty.HARD):
+        for seed in range(3):
+            maze = generate_valid_maze(difficulty, seed=seed)
+            metrics = analyze_layout(maze.get_type_array(), maze.start_pos, maze.exit_pos,
+                                     maze.potions, maze.enemy_positions)
+            _, length = maze.plan_route(maze.start_pos, maze.potions, maze.exit_pos)
+            assert metrics["route_length"] == length and metrics["route_missed"] == 0
+            reachable = set(maze.get_accessible_tiles())
+            floor = [(x, y) for x in range(maze.width) for y in range(maze.height) if maze.is_walkable(x, y)]
+            assert abs(metrics["reachable_ratio"] - len(reachable) / len(floor)) < 1e-9
+            degree = {cell: sum(maze.is_walkable(cell[0] + dx, cell[1] + dy)
+                                for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0))) for cell in reachable}
+            assert metrics["dead_ends"] == sum(1 for value in degree.values() if value == 1)
+            corridors = components({cell for cell, value in degree.items() if value == 2})
+            assert metrics["corridor_max"] == max(corridors)
+            assert abs(metrics["corridor_mean"] - np.mean(corridors)) < 1e-9
+            assert 0.0 <= metrics["enemy_pressure"] <= 1.0 and metrics["enemy_route_distance"] >= 0
+    print("OK: tournée, accessibilité, culs-de-sac et couloirs identiques.")
+
+def test_route_pressure():
+    print("\n=== Test pression des ennemis sur la tournée ===")
+    maze = generate_valid_maze(Difficulty.MEDIUM, seed=5)
+    types = maze.get_type_array()
+    route, _ = maze.plan_route(maze.start_pos, maze.potions, maze.exit_pos)
+    path = maze.find_path(maze.start_pos, route[0])
+    # Un ennemi posé sur la tournée : distance 0 et pression positive
+    on_route = analyze_layout(types, maze.start_pos, maze.exit_pos, maze.potions, [path[len(path) // 2]])
+    assert on_route["enemy_route_distance"] == 0 and on_route["enemy_pressure"] > 0
+    alone = analyze_layout(types, maze.start_pos, maze.exit_pos, maze.potions, [])
+    assert alone["enemy_pressure"] == 0.0 and alone["enemy_route_distance"] == -1
+    # Sortie murée : tournée impossible
+    walled = types.copy()
+    walled[maze.exit_pos] = 1
+    cut = analyze_layout(walled, maze.start_pos, maze.exit_pos, maze.potions, maze.enemy_positions)
+    assert cut["route_length"] == -1 and cut["enemy_pressure"] == 0.0
+    print(f"OK: pression {on_route['enemy_pressure']:.2f} avec un ennemi sur la tournée.")
+
+def test_parallel_batches():
+    print("\n=== Test paquets répartis sur des processus ===")
+    tasks = build_tasks(["easy", "medium"], 10, first_seed=3, batch_size=4)
+    assert [task[2] for task in tasks] == [4, 4, 2, 4, 4, 2] and tasks[1][1] == 7
+    columns, layouts = analyze_seed_range(["easy", "medium"], 10, first_seed=3, workers=2, keep_layouts=True)
+    assert set(columns) == set(COLUMNS) and all(len(column) == 20 for column in columns.values())
+    assert all(columns[name].dtype == dtype for name, dtype in COLUMNS.items())
+    assert columns["seed"].tolist() == list(range(3, 13)) * 2
+    assert (columns["difficulty"][:10] == Difficulty.EASY.value).all()
+    # Même graine, mêmes mesures, quel que soit le découpage
+    single, _ = analyze_seed_range(["medium"], 4, first_seed=9, workers=1)
+    for name in COLUMNS:
+        assert (single[name] == columns[name][16:20]).all(), name
+    # Corpus réanalysé sans génération : mêmes mesures
+    again = analyze_corpus(layouts, workers=1, batch_size=7)
+    for name in COLUMNS:
+        if name != "attempts":
+            assert (again[name] == columns[name]).all(), name
+    assert (again["attempts"] == 0).all() and (columns["attempts"] >= 1).all()
+    print("OK: mesures déterministes, corpus réanalysé à l'identique.")
+
+def test_storage_and_report():
+    print("\n=== Test fichier en colonnes et rapport ===")
+    columns, _ = analyze_seed_range(["easy", "hard"], 6, workers=1)
+    path = os.path.join(tempfile.mkdtemp(), "mesures.npz")
+    save_columns(path, columns)
+    loaded = load_columns(path)
+    assert all((loaded[name] == columns[name]).all() and loaded[name].dtype == columns[name].dtype
+               for name in COLUMNS)
+    summary = summarize(loaded)
+    assert [group["difficulty"] for group in summary["groups"]] == ["easy", "hard"]
+    p10, p50, p90 = summary["groups"][1]["metrics"]["route_length"]
+    assert p10 <= p50 <= p90 and p50 in columns["route_length"][6:].tolist()
+    assert "route_length" in format_report(summary)
+    seeds = select_seeds(loaded, "route_length", low=p50, difficulty=Difficulty.HARD)
+    hard = columns["route_length"][6:]
+    assert seeds == [seed for seed, value in zip(range(6), hard.tolist()) if value >= p50]
+    print(f"OK: {len(COLUMNS)} colonnes relues, p50 tournée HARD = {p50}.")
+
+def main():
+    try:
+        test_metrics_against_reference()
+        test_route_pressure()
+        test_parallel_batches()
+        test_storage_and_report()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Test de la course en réseau (protocole delta, gestion d'intérêt, serveur et clients sur localhost).
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import asyncio
+from config_new import Difficulty, GameState, NET_HOST
+import netrace
+from netrace import RaceRoom, RaceServer, RaceClient, STEP_DIRECTIONS, ENEMY_ID_BASE
+
+def test_delta_encoding():
+    print("=== Test encodage des deltas ===")
+    moves = [(0, 3, 4), (ENEMY_ID_BASE + 2, 10, 1)]
+    events = [(1, netrace.EVENT_FINISH, 12345)]
+    data = netrace.encode_delta(77, 9, moves, [(0, 2)], [4], [5], events)
+    assert netrace.decode_delta(data) == (77, 9, moves, [(0, 2)], [4], [5], events)
+    expected = netrace.DELTA.size + 2 * netrace.MOVE.size + netrace.HEALTH.size + 1 + 1 + netrace.EVENT.size
+    assert len(data) == expected == 34, len(data)
+    print(f"OK: delta de {len(data)} octets (2 déplacements, 1 santé, 1 objet, 1 retrait, 1 événement).")
+
+def move_to(room, racer, position):
+    racer.player.grid_x, racer.player.grid_y = position
+
+def test_interest_management():
+    print("\n=== Test gestion d'intérêt ===")
+    room = RaceRoom(Difficulty.MEDIUM, seed=4)
+    room.enemies = []
+    first = room.join(None, (3, 3))
+    second = room.join(None, (3, 3))
+    floor = sorted(room.maze.get_accessible_tiles())
+    far = max(floor, key=lambda cell: cell[0] + cell[1])
+    move_to(room, second, far)
+    tick, ack, moves, healths, items, removed, events = netrace.decode_delta(room.build_delta(first))
+    assert [entity for entity, _, _ in moves] == [first.id], "Coureur lointain hors de la zone d'intérêt"
+    assert room.build_delta(first) is None, "Rien n'a changé : aucun message"
+    # Le second coureur entre dans la vue, puis en ressort
+    near = next(cell for cell in floor if 0 < abs(cell[0] - first.player.grid_x) + abs(cell[1] - first.player.grid_y) <= 2)
+    move_to(room, second, near)
+    _, _, moves, healths, _, removed, _ = netrace.decode_delta(room.build_delta(first))
+    assert moves == [(second.id, *near)] and healths == [(second.id, second.player.health)] and not removed
+    move_to(room, second, far)
+    _, _, moves, _, _, removed, _ = netrace.decode_delta(room.build_delta(first))
+    assert moves == [] and removed == [second.id]
+    # Le brouillard réduit la vue : MEDIUM a un rayon de 5
+    first.view = (20, 20)
+    assert room.interest(first) == (5, 5)
+    print("OK: entités envoyées à l'entrée dans la vue, retirées à la sortie, rien si rien ne change.")
+
+async def race_on_localhost():
+    server = RaceServer(Difficulty.EASY, seed=3, port=0)
+    await server.start()
+    clients = [RaceClient() for _ in range(2)]
+    for client in clients:
+        await client.connect(NET_HOST, server.port)
+    receivers = [asyncio.ensure_future(client.receive()) for client in clients]
+    try:
+        first = clients[0]
+        room = server.rooms[0]
+        assert len(server.rooms) == 1 and first.maze.seed == room.maze.seed
+        assert first.item_kinds == room.item_kinds
+        # Un mur puis quelques pas valides : le serveur rejette le mur
+        x, y = first.maze.start_pos
+        blocked = next(a for a, (dx, dy) in enumerate(STEP_DIRECTIONS) if not first.maze.is_walkable(x + dx, y + dy))
+        first.send_input(blocked)
+        expected = (x, y)
+        for _ in range(4):
+            action = next(a for a, (dx, dy) in enumerate(STEP_DIRECTIONS)
+                          if first.maze.is_walkable(expected[0] + dx, expected[1] + dy))
+            first.send_input(action)
+            dx, dy = STEP_DIRECTIONS[action]
+            expected = (expected[0] + dx, expected[1] + dy)
+        assert first.predicted_position() == expected, "Prédiction locale immédiate"
+        for _ in range(100):
+            await asyncio.sleep(0.02)
+            if not first.pending:
+                break
+        racer = room.racers[first.player_id]
+        x, y = racer.player.get_grid_position()
+        assert not first.pending and first.ack == first.sequence == 5
+        assert first.positions[first.player_id] == racer.player.get_grid_position()
+        assert first.predicted_position() == racer.player.get_grid_position()
+        # Le miroir du client ne contient que sa zone d'intérêt
+        half_width, half_height = room.interest(racer)
+        assert all(abs(px - x) <= half_width + 1 and abs(py - y) <= half_height + 1
+                   for px, py in first.positions.values()), first.positions
+        assert server.bytes_sent > 0 and first.bytes_received > 0
+    finally:
+        for client in clients:
+            await client.close()
+        await asyncio.gather(*receivers)
+        await server.close()
+
+async def empty_message_on_localhost():
+    loop = asyncio.get_running_loop()
+    errors = []
+    loop.set_exception_handler(lambda _, context: errors.append(context))
+    server = RaceServer(Difficulty.EASY, seed=2, port=0)
+    await server.start()
+    try:
+        reader, writer = await asyncio.open_connection(NET_HOST, server.port)
+        netrace.send_message(writer, netrace.HELLO.pack(netrace.MSG_HELLO, netrace.PROTOCOL_VERSION, 0, 0))
+        await netrace.read_message(reader)  # Accueil
+        netrace.send_message(writer, b"")
+        await writer.drain()
+        while await reader.read(4096):
+            pass  # Le serveur ferme la connexion
+        writer.close()
+        await asyncio.sleep(0.05)
+        assert not server.rooms and not errors, errors
+    finally:
+        await server.close()
+
+class SlowWriter:
+    """Connexion dont le tampon d'envoi déborde (client qui ne lit plus)."""
+    def __init__(self):
+        self.transport = self
+        self.closed = False
+    def get_write_buffer_size(self):
+        return netrace.NET_MAX_WRITE_BUFFER + 1
+    def close(self):
+        self.closed = True
+
+def test_slow_client_dropped_once():
+    print("\n=== Test client trop lent retiré de sa course ===")
+    server = RaceServer(Difficulty.EASY, seed=2)
+    room = server.open_room()
+    writer = SlowWriter()
+    racer = room.join(writer, (3, 3))
+    for _ in range(5):
+        server.tick_rooms()
+    assert server.dropped == 1 and writer.closed and racer.id not in room.racers
+    # La lecture qui échoue ensuite retire le coureur une seconde fois : sans effet
+    room.leave(racer)
+    assert server.sessions() == 0
+    print("OK: compté une seule fois, plus simulé après le retrait.")
+
+def test_empty_message():
+    print("\n=== Test message vide : client retiré sans exception ===")
+    asyncio.run(empty_message_on_localhost())
+    print("OK: connexion fermée proprement, course vidée.")
+
+def test_localhost_race():
+    print("\n=== Test course sur localhost (serveur autoritaire) ===")
+    asyncio.run(race_on_localhost())
+    print("OK: entrées appliquées par le serveur, mur refusé, miroir limité à la zone d'intérêt.")
+
+async def net_game_frames():
+    import pygame
+    from net_game import NetGame, MOVE_KEYS
+    server = RaceServer(Difficulty.MEDIUM, seed=5, port=0)
+    await server.start()
+    client = RaceClient()
+    await client.connect(NET_HOST, server.port)
+    game = NetGame(client)
+    game.start_race()
+    receiver = asyncio.ensure_future(client.receive())
+    keys = {action: key for key, action in MOVE_KEYS.items()}
+    visited = set()
+    try:
+        for frame in range(90):
+            if frame % 5 == 0:
+                # Touche fléchée vers une case libre (la dernière trouvée : on avance dans le couloir)
+                x, y = client.predicted_position()
+                action = [a for a, (dx, dy) in enumerate(STEP_DIRECTIONS) if game.maze.is_walkable(x + dx, y + dy)][-1]
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=keys[action]))
+            game.handle_events()
+            game.update()
+            game.render()
+            visited.add(game.player.get_grid_position())
+            await asyncio.sleep(1 / 30)
+        for _ in range(50):
+            if not client.pending:
+                break
+            await asyncio.sleep(0.02)
+        game.update()
+        racer = server.rooms[0].racers[client.player_id]
+        assert game.state == GameState.PLAYING and len(visited) > 1
+        assert client.sequence == 18 and not client.pending
+        assert game.player.get_grid_position() == racer.player.get_grid_position()
+        assert game.view_sent == racer.view and game.autosave is None and game.telemetry is None
+    finally:
+        await client.close()
+        await receiver
+        await server.close()
+
+def test_net_game_shell():
+    print("\n=== Test client Game/Renderer piloté par le serveur ===")
+    asyncio.run(net_game_frames())
+    print("OK: touches envoyées au serveur, position affichée = position autoritaire.")
+
+def test_load_test():
+    print("\n=== Test de charge (petit) ===")
+    row = asyncio.run(netrace.load_test(12, seconds=1.0, difficulty=Difficulty.EASY))
+    assert row["sessions"] == 12 and row["rooms"] == 2
+    assert row["ticks_per_second"] > 10 and row["capacity"] >= 12
+    print(netrace.LOAD_REPORT_HEADER)
+    print(netrace.format_load_row(row))
+    print("OK: sessions réparties en courses, capacité estimée.")
+
+def main():
+    try:
+        test_delta_encoding()
+        test_interest_management()
+        test_localhost_race()
+        test_empty_message()
+        test_slow_client_dropped_once()
+        test_net_game_shell()
+        test_load_test()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
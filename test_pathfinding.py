@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Test de la recherche de chemin (JPS, HPA*, graphe de couloirs, cache des chemins,
+rayon de dash, tournées).
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import random
+import itertools
+import numpy as np
+from config_new import CellType, Difficulty, EnemyType
+from maze_new import Maze
+from entities_new import Enemy
+from corridor_graph import CorridorGraph
+from pathfinding import WalkableGrid, find_path_jps, find_path_bfs, find_path_astar, bfs_distances
+
+def check_path(grid, path, start, goal):
+    """Vérifie qu'un chemin relie start à goal par des pas d'une case traversables."""
+    assert path[0] == start and path[-1] == goal
+    for (ax, ay), (bx, by) in zip(path, path[1:]):
+        assert abs(ax - bx) + abs(ay - by) == 1, f"Pas invalide {(ax, ay)} -> {(bx, by)}"
+    assert all(grid.is_walkable(x, y) for x, y in path)
+
+def test_jps_matches_bfs():
+    print("=== Test JPS contre BFS et A* ===")
+    rng = np.random.default_rng(4)
+    checked = unreachable = 0
+    for size in (5, 12, 40):
+        for density in (0.1, 0.2, 0.35):
+            grid = WalkableGrid(rng.random((size, size)) >= density)
+            free = [(x, y) for x in range(size) for y in range(size) if grid.is_walkable(x, y)]
+            for _ in range(25):
+                start = free[rng.integers(len(free))]
+                goal = free[rng.integers(len(free))]
+                reference = find_path_bfs(grid, start, goal)
+                jps = find_path_jps(grid, start, goal)
+                astar = find_path_astar(grid, start, goal)
+                if reference is None:
+                    assert jps is None and astar is None
+                    unreachable += 1
+                    continue
+                assert len(jps) == len(reference) == len(astar), f"{size}x{size}: {len(jps)} != {len(reference)}"
+                check_path(grid, jps, start, goal)
+                checked += 1
+    print(f"OK: {checked} chemins JPS optimaux, {unreachable} cibles inaccessibles détectées.")
+
+def test_maze_path_cache():
+    print("\n=== Test cache des chemins du labyrinthe ===")
+    random.seed(6)
+    maze = Maze(Difficulty.HARD)
+    pathfinder = maze.get_pathfinder()
+    path = maze.find_path(maze.start_pos, maze.exit_pos)
+    assert path is not None and pathfinder.misses == 1
+    # Une requête depuis une case du chemin réutilise sa fin
+    assert maze.find_path(path[3], maze.exit_pos) == path[3:]
+    assert maze.next_step_towards(path[3], maze.exit_pos) == path[4]
+    assert pathfinder.misses == 1 and pathfinder.hits == 2
+
+    # Murer une case du chemin invalide le cache
+    x, y = path[len(path) // 2]
+    maze.set_cell_type(x, y, CellType.WALL)
+    new_path = maze.find_path(maze.start_pos, maze.exit_pos)
+    assert pathfinder.misses == 2
+    assert new_path is None or (x, y) not in new_path
+    print("OK: chemins réutilisés, cache invalidé par les changements de cases.")
+
+def test_cast_ray_and_chase():
+    print("\n=== Test rayon de dash et poursuite ===")
+    random.seed(2)
+    maze = Maze(Difficulty.EXTREME)
+    for x in range(maze.width):
+        for y in range(maze.height):
+            maze.set_cell_type(x, y, CellType.FLOOR)
+    maze.set_cell_type(5, 3, CellType.WALL)
+    assert maze.cast_ray((5, 0), (0, 1), 3) == (5, 2), "Arrêt avant le mur"
+    assert maze.cast_ray((0, 0), (-1, 0), 3) == (0, 0), "Arrêt au bord de la grille"
+    assert maze.cast_ray((0, 0), (1, 0), 3) == (3, 0)
+
+    # Mur en U entre l'ennemi et le joueur : le pas glouton bloquerait, le chemin contourne
+    for y in range(2, 9):
+        maze.set_cell_type(10, y, CellType.WALL)
+    maze.set_cell_type(9, 2, CellType.WALL)
+    maze.set_cell_type(9, 8, CellType.WALL)
+    enemy = Enemy(9, 5, EnemyType.MONSTER, Difficulty.EXTREME)
+    player_pos = (12, 5)
+    steps = 0
+    while (enemy.grid_x, enemy.grid_y) != player_pos and steps < 30:
+        enemy.move_towards_player(player_pos, maze)
+        steps += 1
+    assert (enemy.grid_x, enemy.grid_y) == player_pos, "L'ennemi doit contourner le mur"
+    assert steps == len(maze.find_path((9, 5), player_pos)) - 1
+    print(f"OK: dash arrêté par les obstacles, poursuite en {steps} pas.")
+
+def test_hierarchical_paths():
+    print("\n=== Test HPA* et reconstruction locale ===")
+    random.seed(9)
+    maze = Maze(Difficulty.HARD, grid_size=120)
+    assert maze.uses_hierarchical_search()
+    hpa = maze.get_hierarchical_pathfinder()
+    grid = maze.get_pathfinder().get_grid()
+    rng = random.Random(4)
+    free = [(x, y) for x in range(maze.width) for y in range(maze.height) if maze.is_walkable(x, y)]
+    pairs = [(rng.choice(free), rng.choice(free)) for _ in range(40)]
+    for start, goal in pairs:
+        reference = find_path_bfs(grid, start, goal)
+        path = hpa.find_path(start, goal)
+        assert (reference is None) == (path is None)
+        if reference is not None:
+            check_path(grid, path, start, goal)
+            assert len(path) <= len(reference) * 1.2, "HPA* doit rester proche de l'optimal"
+    assert hpa.stats["full_builds"] == 1
+
+    # Murer des cases : seuls les clusters voisins sont reconstruits, les chemins restent justes
+    built = hpa.stats["rebuilt_clusters"]
+    for x, y in rng.sample(free, 5):
+        maze.set_cell_type(x, y, CellType.WALL)
+    grid = maze.get_pathfinder().get_grid()
+    for start, goal in pairs[:15]:
+        reference = find_path_bfs(grid, start, goal)
+        path = hpa.find_path(start, goal)
+        assert (reference is None) == (path is None)
+        if path is not None:
+            check_path(grid, path, start, goal)
+    assert hpa.stats["full_builds"] == 1
+    assert hpa.stats["rebuilt_clusters"] - built <= 5 * 5, "Reconstruction limitée aux clusters touchés"
+    print("OK: chemins HPA* valides et quasi optimaux, reconstruction incrémentale.")
+
+def test_compass_and_route():
+    print("\n=== Test plus proche cible et tournée ===")
+    random.seed(3)
+    maze = Maze(Difficulty.EXTREME)
+    grid = maze.get_pathfinder().get_grid()
+    potions = maze.potions[:6]
+    exact = bfs_distances(grid, maze.start_pos, potions)
+    nearest = maze.nearest_target(maze.start_pos, potions)
+    assert nearest is not None and nearest[1] == min(exact.values())
+
+    order, length = maze.plan_route(maze.start_pos, potions, maze.exit_pos)
+    assert sorted(order) == sorted(p for p in potions if p in exact)
+    # Comparaison avec toutes les permutations (6 cibles)
+    def tour(sequence):
+        stops = [maze.start_pos] + list(sequence) + [maze.exit_pos]
+        return sum(bfs_distances(grid, a, [b])[b] for a, b in zip(stops, stops[1:]))
+    best = min(tour(permutation) for permutation in itertools.permutations(order))
+    assert length == tour(order) and length <= best * 1.15, f"Tournée {length} contre optimum {best}"
+    print(f"OK: plus proche potion à {nearest[1]} cases, tournée {length} (optimum {best}).")
+
+def test_corridor_graph():
+    print("\n=== Test graphe de couloirs ===")
+    random.seed(7)
+    maze = Maze(Difficulty.HARD)
+    graph = CorridorGraph.from_maze(maze)
+    # Chaque case traversable est un sommet ou l'intérieur d'un seul couloir
+    interior = int(graph.edge_cell_ptr[-1])
+    assert graph.node_count + interior == int(graph.walkable.sum())
+    assert graph.indptr[-1] == 2 * graph.edge_count
+    assert graph.get_compression_ratio() >= 1.0
+
+    grid = maze.get_pathfinder().get_grid()
+    rng = random.Random(1)
+    free = [(x, y) for x in range(maze.width) for y in range(maze.height) if maze.is_walkable(x, y)]
+    for _ in range(60):
+        start, goal = rng.choice(free), rng.choice(free)
+        reference = find_path_bfs(grid, start, goal)
+        path = graph.find_path(start, goal)
+        assert (reference is None) == (path is None)
+        if reference is not None:
+            check_path(grid, path, start, goal)
+            assert len(path) == len(reference)
+        assert graph.distances_from(start, [goal]) == bfs_distances(grid, start, [goal])
+    assert graph.all_reachable(maze.start_pos, maze.potions + [maze.exit_pos])
+
+    # Anneau sans carrefour + couloir isolé : boucle fermée et deux composantes
+    walkable = np.zeros((7, 7), dtype=bool)
+    walkable[1:6, 1] = walkable[1:6, 5] = walkable[1, 1:6] = walkable[5, 1:6] = True
+    walkable[3, 3] = True
+    ring = CorridorGraph(walkable)
+    assert ring.node_count == 2 and ring.edge_count == 1
+    assert len(ring.find_path((1, 2), (2, 1))) == 3 and len(ring.find_path((1, 3), (5, 3))) == 9
+    assert ring.find_path((1, 1), (3, 3)) is None
+    components = ring.get_cell_components()
+    assert components[1, 1] == components[5, 5] != components[3, 3]
+    print(f"OK: graphe {graph.node_count} sommets / {graph.edge_count} couloirs, chemins identiques au BFS.")
+
+def main():
+    try:
+        test_jps_matches_bfs()
+        test_maze_path_cache()
+        test_cast_ray_and_chase()
+        test_hierarchical_paths()
+        test_compass_and_route()
+        test_corridor_graph()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
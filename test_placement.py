@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test du placement des objets par distances de chemin (BFS multi-sources NumPy,
+point le plus éloigné, distance minimale des ennemis au départ).
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import random
+import numpy as np
+from config_new import Difficulty, DIFFICULTY_SETTINGS
+from maze_new import generate_valid_maze
+from pathfinding import bfs_distances
+from placement import UNREACHED, walkable_cells, distance_field, relax_distances, spread_score
+
+def test_distance_fields():
+    print("=== Test distances NumPy = BFS case par case ===")
+    maze = generate_valid_maze(Difficulty.HARD, seed=6)
+    grid = maze.get_pathfinder().get_grid()
+    walkable = walkable_cells(grid)
+    floor = sorted(maze.get_accessible_tiles())
+    rng = random.Random(1)
+    sources = rng.sample(floor, 3)
+    field = distance_field(walkable, grid.stride, [grid.index(*cell) for cell in sources])
+    for cell in rng.sample(floor, 100):
+        expected = min(bfs_distances(grid, source, [cell])[cell] for source in sources)
+        assert field[grid.index(*cell)] == expected, cell
+    # Mise à jour élaguée source par source = champ multi-sources calculé d'un coup
+    incremental = distance_field(walkable, grid.stride, [grid.index(*sources[0])])
+    for cell in sources[1:]:
+        relax_distances(walkable, grid.stride, [grid.index(*cell)], incremental)
+    assert (incremental == field).all()
+    walls = [(x, y) for x in range(maze.width) for y in range(maze.height) if not maze.is_walkable(x, y)]
+    assert all(field[grid.index(*cell)] == UNREACHED for cell in walls)
+    print("OK: distances exactes, mise à jour élaguée identique.")
+
+def test_spread_score():
+    print("\n=== Test score d'étalement ===")
+    maze = generate_valid_maze(Difficulty.MEDIUM, seed=2)
+    grid = maze.get_pathfinder().get_grid()
+    points = [maze.start_pos] + maze.potions
+    expected = min(bfs_distances(grid, a, [b])[b] for i, a in enumerate(points) for b in points[i + 1:])
+    assert maze.get_potion_spread() == expected
+    assert spread_score(walkable_cells(grid), grid.stride, [grid.index(*maze.start_pos)]) == 0
+    print(f"OK: plus petite distance entre potions (ou départ) = {expected}.")
+
+def test_placement_rules():
+    print("\n=== Test règles de placement ===")
+    for difficulty in Difficulty:
+        settings = DIFFICULTY_SETTINGS[difficulty]
+        for seed in range(5):
+            maze = generate_valid_maze(difficulty, seed=seed)
+            grid = maze.get_pathfinder().get_grid()
+            objects = maze.potions + maze.enemy_positions + maze.chests
+            assert len(set(objects)) == len(objects), "Une case par objet"
+            assert maze.start_pos not in objects and maze.exit_pos not in objects
+            assert len(maze.potions) == settings["potions"] and len(maze.enemy_positions) == settings["enemies"]
+            distances = bfs_distances(grid, maze.start_pos, objects)
+            assert len(distances) == len(objects), "Objets accessibles"
+            assert all(distances[enemy] >= settings["enemy_min_distance"] for enemy in maze.enemy_positions)
+    print("OK: objets distincts, accessibles, ennemis loin du départ.")
+
+def test_spread_against_shuffle():
+    print("\n=== Test étalement comparé au tirage au hasard ===")
+    spread, shuffled = [], []
+    for seed in range(8):
+        maze = generate_valid_maze(Difficulty.EXTREME, seed=seed)
+        spread.append(maze.get_potion_spread())
+        # Ancien placement : cases accessibles mélangées, prises dans l'ordre
+        floor = sorted(set(maze.get_accessible_tiles()) - {maze.start_pos, maze.exit_pos})
+        random.Random(seed).shuffle(floor)
+        maze.potions = floor[:len(maze.potions)]
+        shuffled.append(maze.get_potion_spread())
+    assert np.mean(spread) > 2 * np.mean(shuffled), (spread, shuffled)
+    print(f"OK: étalement moyen {np.mean(spread):.1f} cases contre {np.mean(shuffled):.1f} au hasard.")
+
+def main():
+    try:
+        test_distance_fields()
+        test_spread_score()
+        test_placement_rules()
+        test_spread_against_shuffle()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
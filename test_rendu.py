@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test des modes de rendu (cible basse résolution, zoom, minimap).
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import random
+import pygame
+from config_new import SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE, COLORS, CellType, Difficulty
+from maze_new import Maze
+from entities_new import Player
+from renderer_new import Renderer
+from minimap import Minimap
+
+def init_display():
+    """(Ré)initialise l'affichage (d'autres scripts de test appellent pygame.quit())."""
+    pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    return pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+def render_player_tile(render_scale, maze, player):
+    """Dessine une frame et retourne les pixels de la case du joueur à l'écran."""
+    screen = init_display()
+    renderer = Renderer(screen, render_scale=render_scale)
+    renderer.update_camera(player.grid_x, player.grid_y, maze.width, maze.height)
+    renderer.draw_all(maze, player, [], [], 0)
+    # Position écran de la case du joueur (coordonnées pleine résolution)
+    x = player.grid_x * TILE_SIZE - renderer.camera_offset_x * render_scale
+    y = player.grid_y * TILE_SIZE - renderer.camera_offset_y * render_scale
+    return renderer, [screen.get_at((x + dx, y + dy)) for dx in range(0, TILE_SIZE, 5) for dy in range(0, TILE_SIZE, 5)]
+
+def test_lowres_render_target():
+    print("=== Test rendu basse résolution x3 ===")
+    random.seed(3)
+    maze = Maze(Difficulty.EASY)
+    player = Player(2, 2, 3)
+    renderer, direct = render_player_tile(1, maze, player)
+    assert renderer.surface is renderer.screen, "Facteur 1 : dessin direct à l'écran"
+
+    renderer, lowres = render_player_tile(3, maze, player)
+    assert renderer.tile_size == TILE_SIZE // 3
+    assert renderer.surface.get_size() == (SCREEN_WIDTH // 3, SCREEN_HEIGHT // 3)
+    assert renderer.sprites["player"].get_size() == (16, 16), "Sprites natifs 16x16 attendus"
+    assert direct == lowres, "Le sprite agrandi x3 doit être identique au sprite 48 px"
+    print("OK: la frame basse résolution agrandie correspond au rendu direct.")
+
+def test_invalid_render_scale():
+    print("\n=== Test facteur de rendu invalide ===")
+    screen = init_display()
+    renderer = Renderer(screen, render_scale=5)  # 48 n'est pas divisible par 5
+    assert renderer.render_scale == 1
+    assert renderer.tile_size == TILE_SIZE
+    print("OK: un facteur invalide revient au rendu direct.")
+
+def test_zoom_lod_pixels():
+    print("\n=== Test zoom et vue d'ensemble en pixels ===")
+    screen = init_display()
+    random.seed(5)
+    maze = Maze(Difficulty.HARD, grid_size=120)
+    player = Player(*maze.start_pos, 3)
+    renderer = Renderer(screen)
+    renderer.init_fog(None)
+    renderer.should_draw_walls = lambda: True  # Phase sonar "murs visibles"
+    renderer.set_zoom_limits(maze.width, maze.height)
+    renderer.set_zoom(0.1)
+    assert renderer.zoom == renderer.min_zoom, "Le zoom est borné par la taille du labyrinthe"
+    assert renderer.lod_mode == "pixels"
+    renderer.update_camera(player.grid_x, player.grid_y, maze.width, maze.height)
+    renderer.draw_all(maze, player, [], [], 0)
+
+    types = maze.get_type_array()
+    ts = renderer.tile_size
+    for (x, y) in [(x, y) for x in range(maze.width) for y in range(maze.height)][::37]:
+        if abs(x - player.grid_x) + abs(y - player.grid_y) <= 2 or (y + 0.5) * ts < 90:
+            continue  # point du joueur, ou case sous le HUD
+        pixel = tuple(screen.get_at((int((x + 0.5) * ts), int((y + 0.5) * ts))))[:3]
+        if types[x, y] == CellType.WALL.value:
+            assert pixel == COLORS["light_gray"], f"Mur ({x},{y}) mal dessiné: {pixel}"
+        elif types[x, y] == CellType.FLOOR.value:
+            assert pixel == COLORS["black"], f"Sol ({x},{y}) mal dessiné: {pixel}"
+
+    renderer.set_zoom(1.0)
+    assert renderer.lod_mode == "sprites" and renderer.tile_size == TILE_SIZE
+    print("OK: la vue d'ensemble écrit les cases depuis le tableau des types.")
+
+def test_type_array_follows_grid():
+    print("\n=== Test tableau des types ===")
+    maze = Maze(Difficulty.EASY)
+    types = maze.get_type_array()
+    assert types.shape == (maze.width, maze.height)
+    revision = maze.revision
+    maze.set_cell_type(3, 4, CellType.WALL)
+    assert maze.get_type_array()[3, 4] == CellType.WALL.value
+    assert maze.revision == revision + 1
+    print("OK: le tableau des types suit les changements de cases.")
+
+def test_minimap_incremental():
+    print("\n=== Test minimap incrémentale ===")
+    screen = init_display()
+    random.seed(8)
+    maze = Maze(Difficulty.EXTREME)
+    minimap = Minimap(maze, fog_radius=2)
+    assert not minimap.explored.any(), "Rien n'est exploré au départ avec brouillard"
+    minimap.update((5, 5), 2)
+    minimap.draw(screen, (5, 5), [], [], None, 2)
+    explored = int(minimap.explored.sum())
+    assert minimap.explored[5, 5] and explored == 13, f"Disque de rayon 2 attendu, {explored} cases"
+    # Un case explorée prend la couleur réelle de la case
+    expected = minimap.base_colors[5, 5]
+    assert tuple(minimap.map_surface.get_at((5, 5)))[:3] == tuple(int(c) for c in expected)
+
+    # Même position : aucune écriture, la carte n'est pas remise à l'échelle
+    minimap.update((5, 5), 2)
+    minimap.draw(screen, (5, 5), [], [], None, 2)
+    assert not minimap.dirty
+    # Déplacement d'une case : seules les nouvelles cases sont ajoutées
+    minimap.update((6, 5), 2)
+    assert int(minimap.explored.sum()) == explored + 5
+    minimap.draw(screen, (6, 5), [], [], None, 2)
+
+    # Marqueurs : la potion cible de la boussole est visible même inexplorée
+    minimap.draw(screen, (6, 5), [], [(30, 30)], (30, 30), 2)
+    assert minimap.markers[(30, 30)] == COLORS["yellow"]
+    minimap.draw(screen, (6, 5), [], [], None, 2)
+    assert (30, 30) not in minimap.markers
+    print("OK: la minimap ne met à jour que les cases qui changent.")
+
+def test_hidden_minimap_exploration():
+    print("\n=== Test exploration suivie avec la minimap masquée ===")
+    init_display()
+    from game_new import Game
+    game = Game(headless=True)
+    game.reset_game(Difficulty.HARD, seed=4)
+    game.enemies = []
+    game.minimap_visible = False
+    game.update()
+    start = game.player.get_grid_position()
+    assert game.minimap.explored[start], "Case de départ explorée sans afficher la minimap"
+    explored = int(game.minimap.explored.sum())
+    x, y = start
+    step = next((dx, dy) for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1)) if game.maze.is_walkable(x + dx, y + dy))
+    game.step_player(step)
+    game.update()
+    assert game.minimap.explored[game.player.get_grid_position()] and int(game.minimap.explored.sum()) > explored
+    # Affichage : le widget montre l'exploration déjà faite, sans la recalculer
+    game.minimap_visible = True
+    before = game.minimap.explored.copy()
+    game.render()
+    assert (game.minimap.explored == before).all()
+    print(f"OK: {int(before.sum())} cases explorées pendant que la minimap était masquée.")
+
+def main():
+    try:
+        test_lowres_render_target()
+        test_invalid_render_scale()
+        test_zoom_lod_pixels()
+        test_type_array_follows_grid()
+        test_minimap_incremental()
+        test_hidden_minimap_exploration()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Test de l'historique des parties (SQLite WAL, écriture en tâche de fond, migration).
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import os
+import json
+import sqlite3
+import tempfile
+import threading
+from config_new import Difficulty, GameState
+from maze_new import Maze, generate_valid_maze
+from run_history import RunHistory, OUTCOME_WIN, OUTCOME_DEATH, OUTCOME_QUIT
+
+def walls_of(maze):
+    return [[maze.grid[x][y].wall_bits for y in range(maze.height)] for x in range(maze.width)]
+
+def test_seeded_maze():
+    print("=== Test labyrinthe rejouable par graine ===")
+    first = Maze(Difficulty.MEDIUM, seed=1234)
+    second = Maze(Difficulty.MEDIUM, seed=1234)
+    assert first.seed == 1234
+    assert walls_of(first) == walls_of(second) and first.potions == second.potions
+    assert walls_of(Maze(Difficulty.MEDIUM, seed=1235)) != walls_of(first)
+    valid = generate_valid_maze(Difficulty.EASY, seed=99)
+    assert walls_of(Maze(Difficulty.EASY, seed=valid.seed)) == walls_of(valid)
+    print("OK: même graine, même labyrinthe (et la graine retenue le reproduit).")
+
+def test_migration_once():
+    print("\n=== Test migration de highscore.json ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "runs.db")
+        scores = os.path.join(tmp, "highscore.json")
+        with open(scores, "w") as f:
+            json.dump({"easy": 10.5, "medium": 0.0, "hard": 42.0}, f)
+        history = RunHistory(path, scores)
+        assert history.best_times() == {"easy": 10.5, "medium": 0.0, "hard": 42.0, "extreme": 0.0}
+        history.close()
+        # Deuxième ouverture : rien n'est réimporté
+        history = RunHistory(path, scores)
+        assert history.count_runs() == 2
+        mode = history.connection.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal", mode
+        history.close()
+    print("OK: meilleurs temps importés une seule fois, base en WAL.")
+
+def test_background_writes_and_leaderboards():
+    print("\n=== Test écritures en tâche de fond et classements ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        history = RunHistory(os.path.join(tmp, "runs.db"), None)
+        caller = threading.current_thread()
+        for i in range(50):
+            outcome = OUTCOME_WIN if i % 2 == 0 else OUTCOME_DEATH
+            history.record_run(i % 5, "hard", 100.0 - i, i * 3, i % 3, 2, outcome)
+        history.flush()
+        assert history.written == 50 and history.writer is not caller
+        top = history.top_runs("hard", 3)
+        assert [run["time"] for run in top] == [52.0, 54.0, 56.0], top
+        assert all(run["outcome"] == OUTCOME_WIN for run in top)
+        by_seed = history.top_runs_for_seed(3)
+        assert by_seed and all(run["seed"] == 3 for run in by_seed)
+        assert by_seed == sorted(by_seed, key=lambda run: run["time"])
+        assert history.best_times()["hard"] == 52.0
+        plan = " ".join(row[-1] for row in history.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM runs WHERE difficulty = 'hard' AND outcome = 'win' ORDER BY time LIMIT 3"))
+        assert "runs_by_difficulty" in plan and "TEMP B-TREE" not in plan, plan
+        history.record_run(7, "easy", 5.0, 10, 0, 1, OUTCOME_WIN)
+        history.close()
+        # Les parties encore en file sont écrites à la fermeture
+        connection = sqlite3.connect(os.path.join(tmp, "runs.db"))
+        assert connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 51
+        connection.close()
+    print("OK: écritures hors du thread du jeu, classements lus par index.")
+
+def test_quit_recorded_once():
+    print("\n=== Test partie quittée, reprise puis terminée : une seule ligne ===")
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    import snapshot
+    from game_new import Game
+    with tempfile.TemporaryDirectory() as tmp:
+        game = Game(headless=True)
+        game.run_history = RunHistory(os.path.join(tmp, "runs.db"), None)
+        game.autosave = snapshot.AutosaveWriter(os.path.join(tmp, "autosave.bin"))
+        def outcomes():
+            game.run_history.flush()
+            return [tuple(row) for row in game.run_history.connection.execute("SELECT seed, outcome FROM runs ORDER BY id")]
+        def quit_to_menu():
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE))
+            game.handle_events()
+            assert game.state == GameState.MENU and game.saved_run_available
+
+        # Échap, reprise, mort : seule la mort est enregistrée
+        game.reset_game(Difficulty.EASY, seed=21)
+        game.enemies = []
+        game.update()
+        first = game.maze.seed
+        quit_to_menu()
+        assert outcomes() == []
+        assert game.resume_game() and game.maze.seed == first
+        game.player.health = 1
+        game.player.take_damage(1)
+        game.check_game_over()
+        assert outcomes() == [(first, OUTCOME_DEATH)]
+        game.autosave.flush()
+        assert not game.saved_run_available and not os.path.exists(game.autosave.path)
+
+        # Échap puis nouvelle partie : la partie sauvegardée est enregistrée comme abandonnée
+        game.reset_game(Difficulty.EASY, seed=40)
+        second = game.maze.seed
+        game.player.moves = 7
+        quit_to_menu()
+        game.reset_game(Difficulty.MEDIUM, seed=60)
+        assert outcomes() == [(first, OUTCOME_DEATH), (second, OUTCOME_QUIT)]
+        row = game.run_history.connection.execute("SELECT difficulty, moves FROM runs WHERE seed = ?",
+                                                  (second,)).fetchone()
+        assert tuple(row) == ("easy", 7)
+        game.autosave.flush()
+        assert not game.saved_run_available and not os.path.exists(game.autosave.path)
+        game.autosave.close()
+        game.run_history.close()
+    print("OK: une partie reprise n'est comptée qu'une fois, une partie abandonnée l'est aussi.")
+
+def main():
+    try:
+        test_seeded_maze()
+        test_migration_once()
+        test_background_writes_and_leaderboards()
+        test_quit_recorded_once()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
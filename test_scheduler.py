@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test des ordonnanceurs : frames asynchrones et roue temporelle des ennemis.
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import asyncio
+import random
+from config_new import Difficulty, EnemyType
+from maze_new import Maze
+from entities_new import Enemy, create_enemies_from_maze
+from frame_scheduler import FrameScheduler
+from enemy_scheduler import EnemyScheduler
+from ai_lod import AILevelOfDetail, TIER_FULL, TIER_COARSE, TIER_FROZEN
+
+class FakeTime:
+    """Horloge (secondes) et sleep factices : le temps n'avance que par le calcul simulé et les attentes."""
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+    def __call__(self):
+        return self.now
+    async def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+        await asyncio.sleep(0)  # Laisse tourner les autres coroutines comme une vraie attente
+
+def test_frame_pacing():
+    print("=== Test cadence des frames ===")
+    fake = FakeTime()
+    async def run():
+        scheduler = FrameScheduler(fps=50, idle_fps=10, clock=fake, sleep=fake.sleep)
+        start = fake.now
+        for _ in range(10):
+            fake.now += 0.005  # 5 ms de calcul par frame
+            await scheduler.wait_next_frame()
+        return scheduler, fake.now - start
+    scheduler, elapsed = asyncio.run(run())
+    print(f"10 frames à 50 FPS en {elapsed * 1000:.0f} ms, {scheduler.get_stats()}")
+    assert abs(elapsed - 0.2) < 1e-9, "10 frames à 50 FPS durent 200 ms"
+    assert all(abs(delay - 0.015) < 1e-9 for delay in fake.sleeps), "Attente = budget - calcul"
+    assert abs(scheduler.work_time_ms - 5) < 1e-6 and abs(scheduler.frame_time_ms - 20) < 1e-6
+    assert scheduler.overruns == 0 and scheduler.max_drift_ms < 1e-6
+    print("OK: la boucle attend le temps restant de chaque frame.")
+
+def test_overrun_and_idle():
+    print("\n=== Test dépassement et cadence de repos ===")
+    fake = FakeTime()
+    async def run():
+        scheduler = FrameScheduler(fps=50, idle_fps=10, clock=fake, sleep=fake.sleep)
+        fake.now += 0.05  # Frame trop longue (2,5 budgets)
+        await scheduler.wait_next_frame()
+        assert scheduler.overruns == 1 and scheduler.resyncs == 1
+        scheduler.set_idle(True)
+        start = fake.now
+        await scheduler.wait_next_frame()
+        await scheduler.wait_next_frame()
+        return fake.now - start
+    elapsed = asyncio.run(run())
+    assert abs(elapsed - 0.2) < 1e-9, "Au repos, deux frames à 10 FPS durent 200 ms"
+    print("OK: dépassements comptés, cadence réduite au repos.")
+
+def test_background_tasks_run_in_spare_time():
+    print("\n=== Test tâches de fond ===")
+    async def run():
+        scheduler = FrameScheduler(fps=50)
+        steps = []
+        async def background():
+            for i in range(5):
+                steps.append(i)
+                await asyncio.sleep(0)
+        scheduler.spawn(background())
+        for _ in range(3):
+            await scheduler.wait_next_frame()
+        return steps, scheduler
+    steps, scheduler = asyncio.run(run())
+    assert steps == [0, 1, 2, 3, 4], "La tâche de fond doit avancer pendant l'attente des frames"
+    assert not scheduler.background_tasks
+    print("OK: les coroutines de fond tournent dans le budget restant.")
+
+def run_enemies(difficulty, frames, use_scheduler, frozen_frames=()):
+    """Positions des ennemis à chaque frame (compte à rebours par frame ou roue temporelle)."""
+    random.seed(11)
+    maze = Maze(difficulty)
+    enemies = create_enemies_from_maze(maze, difficulty)
+    scheduler = EnemyScheduler(enemies, wheel_size=4)  # Petite roue : le tas de débordement sert aussi
+    player_pos = maze.start_pos
+    random.seed(12)
+    history = []
+    for frame in range(frames):
+        if frame not in frozen_frames:
+            if use_scheduler:
+                scheduler.advance(player_pos, maze)
+            else:
+                for enemy in enemies:
+                    enemy.update(player_pos, maze)
+        history.append([(enemy.grid_x, enemy.grid_y) for enemy in enemies])
+    return history, scheduler, maze
+
+def test_enemy_scheduler_parity():
+    print("\n=== Test roue temporelle des ennemis ===")
+    for difficulty in Difficulty:
+        reference, _, _ = run_enemies(difficulty, 120, use_scheduler=False)
+        scheduled, scheduler, maze = run_enemies(difficulty, 120, use_scheduler=True)
+        assert reference == scheduled, f"{difficulty}: les mouvements doivent être identiques"
+        assert len(scheduler) == len(scheduled[0])
+    print("OK: mêmes mouvements aux mêmes frames qu'avec le compte à rebours.")
+
+def test_enemy_scheduler_freeze_and_remove():
+    print("\n=== Test gel et retrait d'ennemis ===")
+    frozen = set(range(10, 40))
+    reference, _, _ = run_enemies(Difficulty.MEDIUM, 90, use_scheduler=False, frozen_frames=frozen)
+    scheduled, scheduler, maze = run_enemies(Difficulty.MEDIUM, 90, use_scheduler=True, frozen_frames=frozen)
+    assert reference == scheduled, "Le gel doit décaler le planning sans le modifier"
+    assert scheduled[10] == scheduled[39], "Aucun mouvement pendant le gel"
+
+    enemy = next(iter(scheduler.due_ticks))
+    scheduler.remove(enemy)
+    position = (enemy.grid_x, enemy.grid_y)
+    for _ in range(50):
+        scheduler.advance(maze.start_pos, maze)
+    assert (enemy.grid_x, enemy.grid_y) == position and scheduler.get_due_tick(enemy) is None
+    print("OK: le gel suspend l'horloge, un ennemi retiré n'est plus réveillé.")
+
+def test_ai_lod_tiers():
+    print("\n=== Test niveaux de détail de l'IA ===")
+    random.seed(21)
+    maze = Maze(Difficulty.EXTREME, grid_size=120)
+    lod = AILevelOfDetail(view_margin=2, coarse_distance=20)
+    view = (0, 0, 10, 10)
+    near = Enemy(12, 5, EnemyType.GHOST, Difficulty.EXTREME)
+    middle = Enemy(25, 5, EnemyType.GHOST, Difficulty.EXTREME)
+    far = Enemy(100, 100, EnemyType.GHOST, Difficulty.EXTREME)
+    assert lod.classify(near, (5, 5), view) == TIER_FULL
+    assert lod.classify(middle, (5, 5), view) == TIER_COARSE
+    assert lod.classify(far, (5, 5), view) == TIER_FROZEN
+    # La portée de détection (7 cases en Extrême) garde la pleine cadence hors de l'écran
+    assert lod.classify(middle, (20, 5), view) == TIER_FULL
+
+    # Ennemi gelé : plus aucun mouvement, puis avance rapide sur une case atteignable
+    x, y = random.choice([(x, y) for x in range(90, 110) for y in range(90, 110) if maze.is_walkable(x, y)])
+    far.grid_x, far.grid_y = x, y
+    assert lod.wake(far, (5, 5), maze, view, tick=10) == lod.frozen_check
+    assert (far.grid_x, far.grid_y) == (x, y) and lod.get_tier(far) == TIER_FROZEN
+    lod.wake(far, (x, y), maze, (x - 5, y - 5, x + 5, y + 5), tick=10 + 3000)
+    assert lod.get_tier(far) == TIER_FULL and lod.stats["fast_forwards"] == 1
+    assert maze.is_walkable(far.grid_x, far.grid_y)
+    assert abs(far.grid_x - x) + abs(far.grid_y - y) <= lod.snap_radius + 1
+    print("OK: pleine cadence près de l'écran, gel au loin, retour sur une case valide.")
+
+def test_ai_lod_full_view_parity():
+    print("\n=== Test niveaux de détail avec tout le labyrinthe visible ===")
+    random.seed(11)
+    maze = Maze(Difficulty.HARD)
+    enemies = create_enemies_from_maze(maze, Difficulty.HARD)
+    scheduler = EnemyScheduler(enemies, lod=AILevelOfDetail())
+    random.seed(12)
+    history = []
+    for _ in range(120):
+        scheduler.advance(maze.start_pos, maze, (0, 0, maze.width, maze.height))
+        history.append([(enemy.grid_x, enemy.grid_y) for enemy in enemies])
+    reference, _, _ = run_enemies(Difficulty.HARD, 120, use_scheduler=False)
+    assert history == reference, "Ennemis visibles : simulation identique à la pleine cadence"
+    print("OK: les ennemis à l'écran ne sont pas approximés.")
+
+def main():
+    try:
+        test_frame_pacing()
+        test_overrun_and_idle()
+        test_background_tasks_run_in_spare_time()
+        test_enemy_scheduler_parity()
+        test_enemy_scheduler_freeze_and_remove()
+        test_ai_lod_tiers()
+        test_ai_lod_full_view_parity()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test des murs mouvants (connexité par union-find, refus des fermetures qui coupent,
+mise à jour locale des caches de chemins et de distances).
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import random
+from collections import deque
+import pygame
+from config_new import Difficulty, GameState, CellType, SHIFTING_INTERVAL_MS
+from maze_new import generate_valid_maze
+from pathfinding import find_path_bfs
+from shifting_walls import ShiftingWalls
+
+def reachable(maze, start):
+    """Vérité terrain : BFS complète depuis start."""
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for cell in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+            if cell not in seen and maze.is_walkable(*cell):
+                seen.add(cell)
+                queue.append(cell)
+    return seen
+
+def test_connectivity_invariant():
+    print("=== Test connexité maintenue sur 2000 déplacements de murs ===")
+    maze = generate_valid_maze(Difficulty.HARD, seed=4, grid_size=41)
+    walls = ShiftingWalls(maze, seed=1, radius=10)
+    rng = random.Random(2)
+    anchors = [maze.start_pos, maze.exit_pos] + maze.potions
+    revision = maze.revision
+    for step in range(2000):
+        walls.shift((rng.randrange(maze.width), rng.randrange(maze.height)), anchors)
+        if step % 100 == 0:
+            region = reachable(maze, maze.start_pos)
+            assert all(anchor in region for anchor in anchors), step
+            # L'union-find donne les mêmes composantes que la BFS
+            floor = [(x, y) for x in range(maze.width) for y in range(maze.height) if maze.is_walkable(x, y)]
+            for cell in rng.sample(floor, 200):
+                assert (cell in region) == (walls.component(cell) == walls.component(maze.start_pos)), (step, cell)
+    assert maze.revision > revision and walls.stats["closed"] > 1000 and walls.stats["opened"] > 1000
+    print(f"OK: {walls.stats}")
+
+def test_rejects_cutting_closure():
+    print("\n=== Test fermeture refusée si elle coupe une potion ===")
+    maze = generate_valid_maze(Difficulty.MEDIUM, seed=0)
+    walls = ShiftingWalls(maze, seed=0)
+    anchors = [maze.start_pos, maze.exit_pos] + maze.potions
+    # Cases dont la fermeture couperait une ancre (vérifié par BFS complète)
+    cutting, safe = [], []
+    for x in range(maze.width):
+        for y in range(maze.height):
+            if maze.grid[x][y].type != CellType.FLOOR or (x, y) in anchors:
+                continue
+            maze.grid[x][y].type = CellType.WALL
+            region = reachable(maze, maze.start_pos)
+            maze.grid[x][y].type = CellType.FLOOR
+            (safe if all(anchor in region for anchor in anchors) else cutting).append((x, y))
+    assert cutting and safe
+    revision = maze.revision
+    for cell in cutting:
+        assert not walls.try_close(cell, anchors), cell
+    assert maze.revision == revision, "Fermeture refusée : grille inchangée"
+    assert walls.try_close(safe[0], anchors) and not maze.is_walkable(*safe[0])
+    # Réouverture : de nouveau traversable et relié
+    assert walls.open(safe[0]) and walls.connected(anchors + [safe[0]])
+    print(f"OK: {len(cutting)} fermetures coupantes refusées, {len(safe)} possibles.")
+
+def test_border_cells_shift():
+    print("\n=== Test cases de la bordure (jouables, sans mur d'enceinte) ===")
+    for difficulty, seed in ((Difficulty.EASY, 3), (Difficulty.MEDIUM, 1)):
+        maze = generate_valid_maze(difficulty, seed=seed)
+        border = [(x, y) for x in range(maze.width) for y in range(maze.height)
+                  if x in (0, maze.width - 1) or y in (0, maze.height - 1)]
+        before = [maze.is_walkable(*cell) for cell in border]
+        walls = ShiftingWalls(maze, seed=0, radius=3)
+        anchors = [maze.start_pos, maze.exit_pos] + maze.potions
+        corners = [(0, 0), (maze.width - 1, 0), (0, maze.height - 1), (maze.width - 1, maze.height - 1)]
+        for step in range(400):
+            walls.shift(corners[step % 4], anchors)
+            if step % 20 == 0:
+                region = reachable(maze, maze.start_pos)  # BFS indépendant de l'union-find
+                assert all(anchor in region for anchor in anchors), f"Ancres séparées au déplacement {step}"
+        assert [maze.is_walkable(*cell) for cell in border] != before, "Bordure jamais déplacée"
+        assert all(maze.is_walkable(*cell) for cell in anchors)
+    print("OK: bordure déplacée dans les coins, ancres toujours reliées.")
+
+def test_local_cache_updates():
+    print("\n=== Test mise à jour locale des caches ===")
+    maze = generate_valid_maze(Difficulty.MEDIUM, seed=9)
+    walls = ShiftingWalls(maze, seed=0)
+    pathfinder = maze.get_pathfinder()
+    floor = sorted(reachable(maze, maze.start_pos))
+    far = max(floor, key=lambda cell: cell[0] + cell[1])
+    path = maze.find_path(maze.start_pos, far)
+    grid = pathfinder.get_grid()
+    # Fermer une case du chemin (si possible) : seul ce chemin est oublié
+    anchors = [maze.start_pos, far, maze.exit_pos] + maze.potions
+    closed = next(cell for cell in path[1:-1] if walls.try_close(cell, anchors))
+    other = next(cell for cell in floor if cell != closed and abs(cell[0] - closed[0]) + abs(cell[1] - closed[1]) > 6)
+    maze.find_path(other, other)  # Entrée de cache loin de la case fermée
+    assert maze.changes_since(maze.revision - 1) == [closed]
+    new_path = maze.find_path(maze.start_pos, far)
+    assert pathfinder.grid is grid, "Grille mise à jour sur place"
+    assert closed not in new_path and len(new_path) == len(find_path_bfs(pathfinder.grid, maze.start_pos, far))
+    assert (other, other) in pathfinder.paths
+    # Journal dépassé ou reconstruction complète : tout est recalculé
+    assert maze.changes_since(None) is None
+    # Champ de distances coopératif : une case lointaine ne le recalcule pas
+    from cooperative import CooperativePlanner
+    from enemy_scheduler import EnemyScheduler
+    planner = CooperativePlanner(maze, EnemyScheduler([]))
+    planner.update_distance_field(maze.start_pos)
+    field = planner.distance_field
+    distant = next(cell for cell in floor if abs(cell[0] - maze.start_pos[0]) + abs(cell[1] - maze.start_pos[1])
+                   > planner.heuristic_radius and walls.try_close(cell, anchors))
+    planner.update_distance_field(maze.start_pos)
+    assert planner.distance_field is field and planner.field_revision == maze.revision
+    print(f"OK: chemin recalculé autour de {closed}, autres entrées gardées, champ gardé après {distant}.")
+
+def test_game_mode():
+    print("\n=== Test mode murs mouvants dans Game ===")
+    from game_new import Game
+    from tournament import VirtualClock
+    clock = VirtualClock()
+    get_ticks = pygame.time.get_ticks
+    pygame.time.get_ticks = clock
+    try:
+        game = Game(headless=True)
+        game.shifting_walls_mode = True
+        game.reset_game(Difficulty.MEDIUM, seed=12)
+        game.enemies = []
+        game.minimap_visible = True
+        revision = game.maze.revision
+        for _ in range(40):
+            clock.now += SHIFTING_INTERVAL_MS
+            game.update()
+            game.render()
+        assert game.state == GameState.PLAYING and game.maze.revision > revision
+        region = reachable(game.maze, game.player.get_grid_position())
+        assert all(potion in region for potion in game.uncollected_potions) and game.maze.exit_pos in region
+        assert game.minimap.revision == game.maze.revision
+        assert (game.minimap.base_colors == game.minimap.build_base_colors()).all(), "Minimap recolorée sur place"
+    finally:
+        pygame.time.get_ticks = get_ticks
+    print(f"OK: {game.shifting_walls.stats['closed']} fermetures, {game.shifting_walls.stats['opened']} ouvertures en partie.")
+
+def main():
+    try:
+        test_connectivity_invariant()
+        test_rejects_cutting_closure()
+        test_border_cells_shift()
+        test_local_cache_updates()
+        test_game_mode()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test des instantanés de partie (capture binaire, reprise, retour en arrière, sauvegarde atomique).
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import os
+import random
+import tempfile
+import time
+import pygame
+from config_new import CellType, Difficulty, DIRECTIONS, FPS
+import snapshot
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+from game_new import Game
+
+class FakeClock:
+    """Horloge pygame factice (33 ms par frame) pour rejouer à l'identique."""
+    def __init__(self):
+        self.now = 100000
+    def __call__(self):
+        return self.now
+
+def play(game, clock, frames, script):
+    """Joue `frames` frames en suivant le script de déplacements ; trace joueur et ennemis."""
+    trace = []
+    for frame in range(frames):
+        clock.now += 1000 // FPS
+        game.player.move(DIRECTIONS[script[frame % len(script)]], game.maze)
+        game.update()
+        trace.append((game.player.get_grid_position(), game.player.health,
+                      tuple(enemy.get_grid_position() for enemy in game.enemies)))
+    return trace
+
+def test_round_trip():
+    print("=== Test capture / restauration à l'identique ===")
+    random.seed(3)
+    game = Game(headless=True)
+    game.reset_game(Difficulty.EXTREME)
+    for _ in range(40):
+        game.player.move(DIRECTIONS[random.choice(list(DIRECTIONS))], game.maze)
+        game.update()
+    now = pygame.time.get_ticks()
+    data = snapshot.capture(game, now)
+
+    # Reprise dans un autre jeu : labyrinthe reconstruit depuis les tableaux
+    other = Game(headless=True)
+    start = time.perf_counter()
+    snapshot.restore(other, data, now)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert other.maze is not game.maze and other.maze.seed == game.maze.seed
+    assert snapshot.capture(other, now) == data, "Deuxième capture identique à la première"
+    # Couches d'influence : seule la zone mise à jour est stockée, signal et carte combinée recalculés
+    for layer in ("scent", "density", "attraction", "signal", "combined"):
+        assert (getattr(other.influence_map, layer) == getattr(game.influence_map, layer)).all(), layer
+    # Octet de difficulté corrompu : SnapshotError, pas une ValueError nue
+    corrupt = bytearray(data)
+    corrupt[6] = 99
+    for reader in (lambda: snapshot.restore(other, bytes(corrupt), now),
+                   lambda: snapshot.read_run_summary(bytes(corrupt))):
+        try:
+            reader()
+            raise AssertionError("Difficulté inconnue acceptée")
+        except snapshot.SnapshotError:
+            pass
+    assert elapsed_ms < 1000 / FPS, f"Reprise en {elapsed_ms:.1f} ms"
+    print(f"OK: {len(data)} octets ({len(snapshot.compress(data))} compressés), reprise en {elapsed_ms:.1f} ms.")
+
+def test_rollback_replay():
+    print("\n=== Test retour en arrière et rejeu exact ===")
+    clock = FakeClock()
+    get_ticks = pygame.time.get_ticks
+    pygame.time.get_ticks = clock
+    try:
+        random.seed(8)
+        game = Game(headless=True)
+        game.reset_game(Difficulty.HARD)
+        script = ["RIGHT", "DOWN", "DOWN", "RIGHT", "LEFT", "UP", "RIGHT", "DOWN"]
+        play(game, clock, 30, script)
+        game.take_snapshot()
+        kept = len(game.rollback_ring)
+        first = play(game, clock, 90, script)
+        # Instantanés périodiques pris entre-temps : revenir jusqu'à celui du test
+        assert game.rewind(len(game.rollback_ring) - kept + 1)
+        second = play(game, clock, 90, script)
+        assert first == second, "Le rejeu diverge après le retour en arrière"
+        assert len(set(entry[2] for entry in first)) > 1, "Les ennemis bougent pendant le rejeu"
+    finally:
+        pygame.time.get_ticks = get_ticks
+    print("OK: 90 frames rejouées à l'identique depuis l'instantané.")
+
+def test_rollback_ring():
+    print("\n=== Test anneau de retour en arrière ===")
+    random.seed(5)
+    game = Game(headless=True)
+    game.reset_game(Difficulty.HARD)
+    ring = snapshot.RollbackRing(capacity=3)
+    captures = []
+    for i in range(5):
+        game.player.move(DIRECTIONS[random.choice(list(DIRECTIONS))], game.maze)
+        game.update()
+        captures.append(snapshot.capture(game, pygame.time.get_ticks()))
+        ring.push(captures[-1])
+    assert len(ring) == 3 and ring.peek(3) == captures[2] and ring.peek(4) is None
+    # Grille inchangée : un seul bloc compressé partagé, entrées bien plus petites que l'instantané
+    assert len({id(grid) for grid, _ in ring.snapshots}) == 1
+    stored = sum(len(grid) + len(rest) for grid, rest in ring.snapshots)
+    assert stored < len(captures[-1]), (stored, len(captures[-1]))
+    # Case changée (murs mouvants) : nouvelle grille pour les entrées suivantes
+    x, y = game.maze.exit_pos
+    game.maze.set_cell_type(x, y, CellType.WALL)
+    changed = snapshot.capture(game, pygame.time.get_ticks())
+    ring.push(changed)
+    assert ring.peek(1) == changed and ring.peek(2) == captures[4]
+    assert ring.rewind(2) == captures[4] and len(ring) == 2
+    print(f"OK: capacité fixe, {stored} octets pour 3 instantanés de {len(captures[-1])} octets.")
+
+def test_autosave_writer():
+    print("\n=== Test sauvegarde automatique atomique ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "autosave.bin")
+        writer = snapshot.AutosaveWriter(path)
+        for i in range(20):
+            writer.submit(bytes([i]) * 1000)
+        writer.flush()
+        assert snapshot.read_snapshot(path) == bytes([19]) * 1000
+        assert not os.path.exists(path + ".tmp")
+        writer.discard()
+        writer.flush()
+        assert snapshot.read_snapshot(path) is None
+        with open(path, "wb") as f:
+            f.write(b"pas un instantane")
+        try:
+            snapshot.read_snapshot(path)
+            raise AssertionError("Sauvegarde corrompue acceptée")
+        except snapshot.SnapshotError:
+            pass
+        writer.close()
+    print("OK: dernière version écrite, suppression et corruption détectées.")
+
+def main():
+    try:
+        test_round_trip()
+        test_rollback_replay()
+        test_rollback_ring()
+        test_autosave_writer()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
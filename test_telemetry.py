@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Test de la télémétrie de position (compteurs par case, écriture en tâche de fond
+des fichiers par graine, fusion, carte de chaleur affichée dans le jeu).
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import tempfile
+import time
+import pygame
+from config_new import Difficulty, FPS, ItemType
+from maze_new import generate_valid_maze
+from entities_new import Player
+from telemetry import (Telemetry, LAYERS, VISITS, DAMAGE, DEATHS, CHESTS, DASHES,
+                       load_heatmaps, merge_directories, heatmap_filename)
+
+def test_counters():
+    print("=== Test compteurs de la session ===")
+    maze = generate_valid_maze(Difficulty.MEDIUM, seed=4)
+    recorder = Telemetry(tempfile.mkdtemp())
+    recorder.begin(maze, Difficulty.MEDIUM)
+    for cell in [(1, 1), (1, 1), (1, 2), (1, 2), (1, 1)]:
+        recorder.record_visit(cell)
+    assert recorder.counts[VISITS, 1, 1] == 2 and recorder.counts[VISITS, 1, 2] == 1, "Passage = changement de case"
+    # Dégâts enregistrés par Player.take_damage (pas pendant l'invincibilité)
+    player = Player(3, 4, 1)
+    player.telemetry = recorder
+    assert player.take_damage(1) and not player.take_damage(1)
+    assert recorder.counts[DAMAGE, 3, 4] == 1 and recorder.counts[DAMAGE].sum() == 1
+    # Même labyrinthe (retour en arrière, reprise) : la session continue
+    recorder.begin(maze, Difficulty.MEDIUM)
+    assert recorder.counts[VISITS].sum() == 3
+    # Coût sur le chemin de la frame
+    start = time.perf_counter()
+    for i in range(20000):
+        recorder.record_visit((1 + i % 2, 1))
+    cost_us = (time.perf_counter() - start) * 1e6 / 20000
+    assert cost_us < 50, f"{cost_us:.1f} µs par passage"
+    recorder.close()
+    print(f"OK: {cost_us:.2f} µs par passage compté.")
+
+def test_persistence_and_merge():
+    print("\n=== Test fichiers par graine et fusion ===")
+    directory = tempfile.mkdtemp()
+    maze = generate_valid_maze(Difficulty.EASY, seed=7)
+    recorder = Telemetry(directory)
+    for session in range(3):
+        recorder.begin(maze, Difficulty.EASY)
+        recorder.record_visit(maze.start_pos)
+        recorder.record_chest(2, 3)
+        recorder.end()
+    recorder.writer.flush()
+    path = os.path.join(directory, heatmap_filename(Difficulty.EASY, maze.width, maze.height, maze.seed))
+    counts, sessions = load_heatmaps(path)
+    assert sessions == 3 and counts.shape == (len(LAYERS), maze.width, maze.height)
+    assert counts[VISITS][maze.start_pos] == 3 and counts[CHESTS, 2, 3] == 3 and counts.sum() == 6
+    # Carte affichée : sessions écrites + session en cours
+    recorder.begin(maze, Difficulty.EASY)
+    recorder.record_visit(maze.start_pos)
+    heat, key = recorder.get_heat(VISITS)
+    assert heat[maze.start_pos] == 1.0 and heat.sum() == 1.0
+    assert recorder.get_heat(VISITS)[0] is heat, "Carte en cache tant que rien ne change"
+    # Fermeture en cours de partie : compteurs écrits, session comptée à la fin de la reprise
+    recorder.close()
+    counts, sessions = load_heatmaps(path)
+    assert sessions == 3 and counts[VISITS][maze.start_pos] == 4
+    # Fusion de dossiers venus d'autres machines
+    target = tempfile.mkdtemp()
+    assert merge_directories([directory, directory], target) == 2
+    merged, merged_sessions = load_heatmaps(os.path.join(target, os.path.basename(path)))
+    assert merged_sessions == 6 and (merged == 2 * load_heatmaps(path)[0]).all()
+    # Fichier corrompu : erreur explicite
+    broken = os.path.join(directory, "broken.npz")
+    with open(broken, "wb") as f:
+        f.write(b"pas un npz")
+    try:
+        load_heatmaps(broken)
+        assert False, "ValueError attendue"
+    except ValueError:
+        pass
+    print(f"OK: {sessions} sessions cumulées, fusion de deux dossiers.")
+
+def test_game_integration():
+    print("\n=== Test télémétrie dans le jeu et carte de chaleur (touche H) ===")
+    from game_new import Game
+    from tournament import VirtualClock
+    clock = VirtualClock()
+    get_ticks = pygame.time.get_ticks
+    pygame.time.get_ticks = clock
+    directory = tempfile.mkdtemp()
+    try:
+        game = Game(headless=True)
+        game.telemetry = Telemetry(directory)
+        game.reset_game(Difficulty.EXTREME, seed=3)
+        game.enemies = []
+        assert game.player.telemetry is game.telemetry
+        game.update()  # Première frame : la case de départ est comptée
+        visited = {game.maze.start_pos}
+        for _ in range(60):
+            clock.now += 1000 // FPS
+            x, y = game.player.get_grid_position()
+            step = next(((dx, dy) for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1))
+                         if game.maze.is_walkable(x + dx, y + dy) and (x + dx, y + dy) not in visited), (0, 0))
+            if step != (0, 0):
+                game.step_player(step)
+            game.update()
+            visited.add(game.player.get_grid_position())
+        assert game.telemetry.counts[VISITS].sum() >= len(visited) - 1
+        # Dash (touche espace) et coffre ouvert sous le joueur
+        clock.now += 5000
+        game.player.dash_cooldown = 0
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        game.handle_events()
+        assert game.telemetry.counts[DASHES].sum() == 1
+        chest = next(item for item in game.items if item.type == ItemType.CHEST)
+        game.player.grid_x, game.player.grid_y = chest.get_grid_position()
+        game.player.invincible = True  # Un coffre piégé ne tue pas le joueur
+        game.check_collisions()
+        assert game.telemetry.counts[CHESTS][chest.get_grid_position()] == 1
+
+        # Carte affichée : couches successives, puis masquée
+        for layer in range(len(LAYERS)):
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_h))
+            game.handle_events()
+            assert game.heatmap_layer == layer
+            game.render()
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_h))
+        game.handle_events()
+        assert game.heatmap_layer is None
+        game.heatmap_layer = VISITS
+        game.render()
+        alpha = pygame.surfarray.array_alpha(game.renderer.heatmap_surface)
+        unvisited = next((x, y) for x in range(game.maze.width) for y in range(game.maze.height)
+                         if game.maze.is_walkable(x, y) and (x, y) not in visited)
+        assert alpha[game.maze.start_pos] > 0 and alpha[unvisited] == 0
+
+        # Mort : comptée à la position du joueur, session écrite
+        game.player.invincible = False
+        game.player.health = 1
+        game.player.take_damage(1)
+        game.check_game_over()
+        game.telemetry.writer.flush()
+        path = os.path.join(directory, heatmap_filename(Difficulty.EXTREME, game.maze.width, game.maze.height,
+                                                        game.maze.seed))
+        counts, sessions = load_heatmaps(path)
+        assert sessions == 1 and counts[DEATHS].sum() == 1 and counts[DAMAGE].sum() >= 1
+        assert counts[DEATHS][game.player.get_grid_position()] == 1
+        game.telemetry.close()
+    finally:
+        pygame.time.get_ticks = get_ticks
+    print(f"OK: {int(counts[VISITS].sum())} passages, {os.path.getsize(path)} octets pour la graine.")
+
+def test_suspended_run_counted_once():
+    print("\n=== Test partie interrompue puis reprise : une seule session ===")
+    import snapshot
+    from game_new import Game
+    with tempfile.TemporaryDirectory() as tmp:
+        game = Game(headless=True)
+        game.telemetry = Telemetry(os.path.join(tmp, "telemetry"))
+        game.autosave = snapshot.AutosaveWriter(os.path.join(tmp, "autosave.bin"))
+        def quit_to_menu():
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_ESCAPE))
+            game.handle_events()
+        def stored(maze):
+            game.telemetry.writer.flush()
+            return load_heatmaps(os.path.join(game.telemetry.directory, heatmap_filename(
+                Difficulty.EASY, maze.width, maze.height, maze.seed)))
+
+        # Échap, reprise, mort : compteurs des deux morceaux, une session
+        game.reset_game(Difficulty.EASY, seed=21)
+        game.enemies = []
+        game.update()
+        maze = game.maze
+        quit_to_menu()
+        assert stored(maze)[1] == 0 and stored(maze)[0][VISITS].sum() == 1
+        assert game.resume_game()
+        game.enemies = []
+        game.player.grid_x, game.player.grid_y = next(
+            (maze.start_pos[0] + dx, maze.start_pos[1] + dy) for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1))
+            if maze.is_walkable(maze.start_pos[0] + dx, maze.start_pos[1] + dy))
+        game.update()
+        game.player.health = 1
+        game.player.take_damage(1)
+        game.check_game_over()
+        counts, sessions = stored(maze)
+        assert sessions == 1 and counts[VISITS].sum() == 2 and counts[DEATHS].sum() == 1
+
+        # Échap puis nouvelle partie : la partie abandonnée compte aussi pour une session
+        game.reset_game(Difficulty.EASY, seed=40)
+        game.update()
+        abandoned = game.maze
+        quit_to_menu()
+        game.reset_game(Difficulty.EASY, seed=60)
+        assert stored(abandoned)[1] == 1 and stored(abandoned)[0][VISITS].sum() == 1
+        # Carte affichée sans attendre le thread d'écriture : la session écrite y apparaît
+        game.reset_game(Difficulty.EASY, seed=40)
+        game.update()
+        heat, _ = game.telemetry.get_heat(VISITS)
+        assert heat[abandoned.start_pos] == 1.0
+        game.telemetry.close()
+        game.autosave.close()
+    print("OK: partie reprise comptée une fois, partie abandonnée comptée à l'abandon.")
+
+def main():
+    try:
+        test_counters()
+        test_persistence_and_merge()
+        test_game_integration()
+        test_suspended_run_counted_once()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test du tournoi de bots (parties sans affichage réparties sur un pool de processus).
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from tournament import (build_tasks, run_tournament, run_game, init_worker, summarize, format_report,
+                        get_policy, RoutePolicy, _worker)
+
+def result_key(result):
+    return (result["seed"], result["difficulty"], result["policy"], result["outcome"],
+            result["frames"], result["damage"], result["potions"], result["moves"])
+
+def test_tournament_is_reproducible():
+    print("=== Test tournoi reproductible sur deux processus ===")
+    tasks = build_tasks(["easy", "medium"], ["route", "tournament:RandomPolicy"], 3, base_seed=10, max_seconds=30)
+    first = run_tournament(tasks, workers=2)
+    second = run_tournament(tasks, workers=2)
+    assert [result_key(r) for r in first] == [result_key(r) for r in second], "Même graine, même partie"
+    assert len(first) == len(tasks)
+    summary = summarize(first, wall_seconds=1.0)
+    route_easy = next(row for row in summary["groups"] if row["difficulty"] == "easy" and row["policy"] == "route")
+    assert route_easy["games"] == 3 and route_easy["win_rate"] > 0
+    assert route_easy["time_p10"] <= route_easy["time_p50"] <= route_easy["time_p90"]
+    assert sum(worker["games"] for worker in summary["workers"]) == len(tasks)
+    assert all(worker["fps"] > 0 for worker in summary["workers"])
+    print(format_report(summary))
+    print("OK: résultats identiques d'un tournoi à l'autre, rapport agrégé.")
+
+def test_same_task_same_game():
+    print("\n=== Test même tâche, même partie (processus réutilisé, ordre, nombre de processus) ===")
+    # HARD : pulsations et niveaux de détail ; EXTREME : planification coopérative
+    tasks = build_tasks(["hard", "extreme"], ["route", "cautious"], 2, base_seed=1, max_seconds=20)
+    get_ticks = pygame.time.get_ticks
+    try:
+        init_worker(quiet=False)  # Ce processus joue le rôle d'un processus du pool
+        forward = [result_key(run_game(task)) for task in tasks]
+        again = [result_key(run_game(task)) for task in tasks]
+        backward = [result_key(run_game(task)) for task in reversed(tasks)][::-1]
+    finally:
+        pygame.time.get_ticks = get_ticks
+        _worker.clear()
+    assert forward == again == backward, "Partie dépendante des parties précédentes du processus"
+    single = [result_key(r) for r in run_tournament(tasks, workers=1)]
+    several = [result_key(r) for r in run_tournament(tasks, workers=3)]
+    assert single == several == forward, "Partie dépendante du processus"
+    print(f"OK: {len(tasks)} parties identiques dans un même processus et sur 1 ou 3 processus.")
+
+def test_policy_lookup():
+    print("\n=== Test chargement des politiques ===")
+    assert get_policy("route") is RoutePolicy
+    assert get_policy("tournament:CautiousPolicy").__name__ == "CautiousPolicy"
+    try:
+        get_policy("inconnue")
+        raise AssertionError("Politique inconnue acceptée")
+    except ValueError:
+        pass
+    print("OK: politiques enregistrées et chemins module:Classe.")
+
+def main():
+    try:
+        test_tournament_is_reproducible()
+        test_same_task_same_game()
+        test_policy_lookup()
+        print("\n=== TOUS LES TESTS PASSÉS ===")
+        return 0
+    except Exception as e:
+        print(f"\nÉCHEC: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""
+Tournoi de bots : des milliers de parties sans affichage, à graine fixée, réparties
+sur un pool de processus (un par cœur par défaut), chacune pilotée par une
+politique de bot interchangeable. Le temps est simulé (une frame = 1000 / FPS ms
+sur une horloge virtuelle remise à zéro à chaque partie), les parties tournent donc
+aussi vite que le processeur et une même tâche donne la même partie, quels que
+soient le processus, l'ordre des tâches et la machine.
+
+Rapport agrégé par difficulté et politique : taux de victoire, distribution des
+temps de victoire, dégâts subis ; puis frames simulées par seconde de chaque processus.
+
+Une politique est une classe construite avec une graine et dont choose(game)
+retourne une direction (dx, dy) ou None (attendre). Politiques fournies :
+random, route, cautious ; --policy module:Classe en charge une autre.
+
+Usage : python tournament.py [--games N] [--difficulty easy,hard] [--policy route,cautious]
+                             [--workers N] [--max-seconds S] [--seed S] [--json rapport.json]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import importlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from config_new import Difficulty, GameState, FPS, BOT_MOVE_FRAMES, BOT_MAX_SECONDS, STEP_DIRECTIONS
+
+OUTCOMES = ("win", "death", "timeout")
+
+
+# ============================================================================
+# POLITIQUES DE BOT
+# ============================================================================
+
+class RandomPolicy:
+    """Marche aléatoire (référence basse)."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def choose(self, game):
+        x, y = game.player.get_grid_position()
+        moves = [(dx, dy) for dx, dy in STEP_DIRECTIONS if game.maze.is_walkable(x + dx, y + dy)]
+        return self.rng.choice(moves) if moves else None
+
+
+class RoutePolicy:
+    """Plus court chemin vers la potion la plus proche, puis vers la sortie ; ignore les ennemis."""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def get_target(self, game):
+        position = game.player.get_grid_position()
+        if game.uncollected_potions:
+            nearest = game.maze.nearest_target(position, game.uncollected_potions)
+            if nearest is not None:
+                return nearest[0]
+        return game.maze.exit_pos
+
+    def choose(self, game):
+        x, y = game.player.get_grid_position()
+        step = game.maze.next_step_towards((x, y), self.get_target(game))
+        if step is None:
+            return None
+        return (step[0] - x, step[1] - y)
+
+
+class CautiousPolicy(RoutePolicy):
+    """Comme route, mais n'entre jamais sur une case voisine d'un ennemi (contourne ou attend)."""
+
+    def is_threatened(self, game, cell):
+        return any(abs(enemy.grid_x - cell[0]) + abs(enemy.grid_y - cell[1]) <= 1 for enemy in game.enemies)
+
+    def choose(self, game):
+        direction = super().choose(game)
+        if direction is None:
+            return None
+        x, y = game.player.get_grid_position()
+        if not self.is_threatened(game, (x + direction[0], y + direction[1])):
+            return direction
+        safe = [(dx, dy) for dx, dy in STEP_DIRECTIONS
+                if game.maze.is_walkable(x + dx, y + dy) and not self.is_threatened(game, (x + dx, y + dy))]
+        if not safe or not self.is_threatened(game, (x, y)):
+            return None  # Attendre que la voie se libère
+        return self.rng.choice(safe)  # Fuir une case menacée
+
+
+POLICIES = {"random": RandomPolicy, "route": RoutePolicy, "cautious": CautiousPolicy}
+
+
+def get_policy(name):
+    """Classe de politique : nom enregistré dans POLICIES ou chemin "module:Classe"."""
+    if name in POLICIES:
+        return POLICIES[name]
+    if ":" in name:
+        module_name, class_name = name.split(":", 1)
+        return getattr(importlib.import_module(module_name), class_name)
+    raise ValueError(f"Politique inconnue: {name} (connues: {', '.join(POLICIES)})")
+
+
+# ============================================================================
+# PROCESSUS DE TRAVAIL
+# ============================================================================
+
+class VirtualClock:
+    """Remplace pygame.time.get_ticks dans un processus de tournoi : avance d'une frame à la fois."""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+_worker = {}  # Jeu sans affichage et horloge du processus courant
+
+
+def init_worker(quiet=True):
+    """Prépare le processus : un seul Game sans affichage, réutilisé par toutes ses parties."""
+    if quiet:
+        sys.stdout = open(os.devnull, "w")  # Le jeu trace chaque action
+    import pygame
+    from game_new import Game
+    clock = VirtualClock()
+    pygame.time.get_ticks = clock
+    _worker["clock"] = clock
+    _worker["game"] = Game(headless=True)
+
+
+def run_game(task):
+    """Joue une partie (graine, difficulté, politique, frames max) ; retourne ses statistiques."""
+    seed, difficulty, policy_name, max_frames = task
+    if not _worker:
+        init_worker()
+    game, clock = _worker["game"], _worker["clock"]
+    random.seed(seed)  # Coffres, patrouilles : même graine, même partie
+    clock.now = 0  # Le jeu lit des ticks absolus (pulsations, dash) : chaque partie repart de zéro
+    setup_start = time.perf_counter()
+    game.reset_game(Difficulty[difficulty.upper()], seed=seed)
+    policy = get_policy(policy_name)(seed)
+
+    start = time.perf_counter()
+    frames = 0
+    while game.state == GameState.PLAYING and frames < max_frames:
+        clock.now = (frames + 1) * 1000 // FPS  # Sans dérive : frames / FPS secondes simulées
+        if frames % BOT_MOVE_FRAMES == 0:
+            direction = policy.choose(game)
+            if direction is not None:
+                game.step_player(direction)
+        if game.state == GameState.PLAYING:
+            game.update()
+        frames += 1
+    end = time.perf_counter()
+
+    if game.state == GameState.WIN:
+        outcome = "win"
+    elif game.state == GameState.GAME_OVER:
+        outcome = "death"
+    else:
+        outcome = "timeout"
+    return {
+        "seed": seed, "difficulty": difficulty, "policy": policy_name, "outcome": outcome,
+        "time": frames / FPS, "frames": frames, "damage": game.player.damage_taken,
+        "potions": game.player.potions_collected, "total_potions": game.player.total_potions,
+        "moves": game.player.moves, "setup_seconds": start - setup_start, "sim_seconds": end - start,
+        "worker": os.getpid(),
+    }
+
+
+# ============================================================================
+# TOURNOI ET RAPPORT
+# ============================================================================
+
+def build_tasks(difficulties, policies, games, base_seed=0, max_seconds=BOT_MAX_SECONDS):
+    """Mêmes graines pour chaque politique : les politiques sont comparées sur les mêmes labyrinthes."""
+    max_frames = int(max_seconds * FPS)
+    return [(base_seed + i, difficulty, policy, max_frames)
+            for difficulty in difficulties for policy in policies for i in range(games)]
+
+
+def run_tournament(tasks, workers=None):
+    """Répartit les parties sur `workers` processus (tous les cœurs par défaut) ; résultats dans l'ordre."""
+    workers = workers or os.cpu_count() or 1
+    # Paquets de parties : peu d'allers-retours entre processus, charge encore équilibrée
+    chunksize = max(1, len(tasks) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        return list(pool.map(run_game, tasks, chunksize=chunksize))
+
+
+def percentile(values, fraction):
+    """Centile (plus proche rang) d'une liste triée, None si vide."""
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def summarize(results, wall_seconds=None):
+    """Agrège les parties par (difficulté, politique) et par processus."""
+    groups = defaultdict(list)
+    for result in results:
+        groups[(result["difficulty"], result["policy"])].append(result)
+    rows = []
+    for (difficulty, policy), runs in groups.items():
+        win_times = sorted(run["time"] for run in runs if run["outcome"] == "win")
+        counts = {outcome: sum(1 for run in runs if run["outcome"] == outcome) for outcome in OUTCOMES}
+        rows.append({
+            "difficulty": difficulty, "policy": policy, "games": len(runs), **counts,
+            "win_rate": counts["win"] / len(runs),
+            "time_mean": sum(win_times) / len(win_times) if win_times else None,
+            "time_p10": percentile(win_times, 0.10),
+            "time_p50": percentile(win_times, 0.50),
+            "time_p90": percentile(win_times, 0.90),
+            "damage_mean": sum(run["damage"] for run in runs) / len(runs),
+            "potion_ratio": sum(run["potions"] / max(1, run["total_potions"]) for run in runs) / len(runs),
+        })
+
+    workers = defaultdict(lambda: {"games": 0, "frames": 0, "sim_seconds": 0.0, "setup_seconds": 0.0})
+    for result in results:
+        worker = workers[result["worker"]]
+        worker["games"] += 1
+        worker["frames"] += result["frames"]
+        worker["sim_seconds"] += result["sim_seconds"]
+        worker["setup_seconds"] += result["setup_seconds"]
+    worker_rows = []
+    for pid, worker in sorted(workers.items()):
+        busy = worker["sim_seconds"] + worker["setup_seconds"]
+        worker_rows.append({"worker": pid, **worker,
+                            "fps": worker["frames"] / worker["sim_seconds"] if worker["sim_seconds"] else 0.0,
+                            "games_per_second": worker["games"] / busy if busy else 0.0})
+
+    total_frames = sum(result["frames"] for result in results)
+    return {
+        "games": len(results), "frames": total_frames, "wall_seconds": wall_seconds,
+        "games_per_second": len(results) / wall_seconds if wall_seconds else None,
+        "groups": sorted(rows, key=lambda row: (Difficulty[row["difficulty"].upper()].value, row["policy"])),
+        "workers": worker_rows,
+    }
+
+
+def format_seconds(value):
+    return "    -" if value is None else f"{value:5.1f}"
+
+
+def format_report(summary):
+    """Rapport texte du tournoi."""
+    lines = [f"{'difficulté':<11}{'politique':<12}{'parties':>8}{'victoires':>10}{'morts':>7}{'délai':>8}"
+             f"{'moy s':>7}{'p10':>7}{'p50':>7}{'p90':>7}{'dégâts':>8}{'potions':>9}"]
+    for row in summary["groups"]:
+        lines.append(
+            f"{row['difficulty']:<11}{row['policy']:<12}{row['games']:>8}{row['win_rate']:>9.1%} "
+            f"{row['death']:>6}{row['timeout']:>8} {format_seconds(row['time_mean'])}  "
+            f"{format_seconds(row['time_p10'])}  {format_seconds(row['time_p50'])}  "
+            f"{format_seconds(row['time_p90'])}{row['damage_mean']:>8.2f}{row['potion_ratio']:>9.0%}")
+    lines.append("")
+    lines.append(f"{'processus':>10}{'parties':>9}{'frames':>10}{'frames/s':>10}{'parties/s':>11}")
+    for worker in summary["workers"]:
+        lines.append(f"{worker['worker']:>10}{worker['games']:>9}{worker['frames']:>10}"
+                     f"{worker['fps']:>10.0f}{worker['games_per_second']:>11.2f}")
+    if summary["wall_seconds"]:
+        lines.append("")
+        lines.append(f"{summary['games']} parties, {summary['frames']} frames simulées en "
+                     f"{summary['wall_seconds']:.1f} s ({summary['games_per_second']:.1f} parties/s)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tournoi de bots sans affichage")
+    parser.add_argument("--games", type=int, default=100, help="Parties par difficulté et par politique")
+    parser.add_argument("--difficulty", default="easy,medium,hard,extreme")
+    parser.add_argument("--policy", default="route,cautious")
+    parser.add_argument("--workers", type=int, default=None, help="Processus (défaut : tous les cœurs)")
+    parser.add_argument("--max-seconds", type=float, default=BOT_MAX_SECONDS, help="Temps simulé maximal par partie")
+    parser.add_argument("--seed", type=int, default=0, help="Graine de la première partie")
+    parser.add_argument("--json", help="Écrit aussi le rapport et les parties dans ce fichier")
+    args = parser.parse_args()
+
+    difficulties = [name.strip().lower() for name in args.difficulty.split(",")]
+    policies = [name.strip() for name in args.policy.split(",")]
+    for name in difficulties:
+        Difficulty[name.upper()]  # Nom invalide : KeyError avant de lancer les processus
+    for name in policies:
+        get_policy(name)
+
+    tasks = build_tasks(difficulties, policies, args.games, args.seed, args.max_seconds)
+    workers = args.workers or os.cpu_count() or 1
+    print(f">>> Tournament: {len(tasks)} parties sur {workers} processus")
+    start = time.perf_counter()
+    results = run_tournament(tasks, workers)
+    summary = summarize(results, time.perf_counter() - start)
+    print(format_report(summary))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"summary": summary, "results": results}, f, indent=2)
+        print(f">>> Tournament: rapport écrit dans {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Traînée du joueur : tampon circulaire de capacité fixe (tableaux préalloués,
+indice de tête) avec expiration par âge, sans allocation à chaque frame.
+"""
+
+from array import array
+from config_new import TRAIL_CAPACITY, TRAIL_DURATION_MS
+
+
+class TrailBuffer:
+    """
+    Dernières positions (x, y, ticks) du joueur, de la plus ancienne à la plus récente.
+    Les entrées sont ajoutées dans l'ordre du temps : expirer revient à avancer la queue,
+    et une entrée trop ancienne écrasée par la tête n'est jamais relue.
+    """
+
+    def __init__(self, capacity=TRAIL_CAPACITY, max_age=TRAIL_DURATION_MS):
+        if capacity <= 0:
+            raise ValueError(f"Capacité de traînée invalide ({capacity})")
+        self.capacity = capacity
+        self.max_age = max_age
+        self.xs = array('i', [0]) * capacity
+        self.ys = array('i', [0]) * capacity
+        self.times = array('q', [0]) * capacity
+        self.head = 0   # Indice de la prochaine écriture
+        self.count = 0  # Entrées vivantes (les `count` cases avant la tête)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return self.iter_live()
+
+    def get_tail(self):
+        """Indice de l'entrée la plus ancienne."""
+        return (self.head - self.count) % self.capacity
+
+    def append(self, x, y, timestamp):
+        """Ajoute une position ; la plus ancienne est écrasée si le tampon est plein."""
+        head = self.head
+        self.xs[head] = x
+        self.ys[head] = y
+        self.times[head] = timestamp
+        self.head = (head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def expire(self, current_time):
+        """Oublie les positions de plus de max_age ms (la queue avance, rien n'est recopié)."""
+        tail = self.get_tail()
+        while self.count and current_time - self.times[tail] > self.max_age:
+            self.count -= 1
+            tail = (tail + 1) % self.capacity
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def iter_live(self, current_time=None):
+        """Positions (x, y, ticks) de la plus ancienne à la plus récente, sans les expirées."""
+        tail = self.get_tail()
+        skip = 0
+        if current_time is not None:
+            # Fenêtre vivante : les entrées expirées sont toutes en début de tampon
+            while skip < self.count and current_time - self.times[(tail + skip) % self.capacity] > self.max_age:
+                skip += 1
+        for offset in range(skip, self.count):
+            index = (tail + offset) % self.capacity
+            yield self.xs[index], self.ys[index], self.times[index]